@@ -0,0 +1,275 @@
+"""
+Module catalog_cache.py
+-----------------------
+Cache persistant des catalogues PostgreSQL et Oracle.
+
+Chaque catalogue extrait est sérialisé sur disque avec une empreinte du
+schéma source. L'empreinte est peu coûteuse à calculer :
+- PostgreSQL : hash des xmin de pg_class, pg_attribute, pg_attrdef,
+  pg_constraint, pg_enum, pg_rewrite, pg_trigger et pg_proc du schéma
+  (toute modification DDL crée une nouvelle version de ces lignes), plus
+  la date du dernier ANALYZE / VACUUM de chaque table (pg_stat_user_tables) :
+  ANALYZE met à jour reltuples et pg_statistic sans changer leur xmin, et
+  les statistiques du snapshot (lignes, n_distinct, corrélation, largeur
+  moyenne) seraient sinon celles de la première extraction ;
+- Oracle : nombre d'objets, somme des object_id et dernier last_ddl_time
+  de user_objects.
+Si l'empreinte n'a pas changé, le catalogue est relu depuis le disque en
+quelques millisecondes au lieu d'être réintrospecté.
+
+L'état des séquences (last_value) n'entre pas dans l'empreinte : nextval
+ne modifie aucune ligne du catalogue et chaque insertion invaliderait le
+cache. Il est relu à chaque chargement (pg_sequences, une requête) pour
+que le START WITH des séquences Oracle reste au-dessus des valeurs
+existantes.
+
+Un snapshot peut aussi être chargé sans aucune connexion, ce qui permet
+de générer le DDL hors ligne.
+"""
+
+import os
+import pickle
+from datetime import datetime
+
+import psycopg2
+import oracledb
+
+import target_profile
+from catalog_model import build_catalog, convert_catalog_types
+from catalog_postgres import extract_catalog
+from catalog_oracle import extract_oracle_catalog
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".catalog_cache")
+
+SNAPSHOT_VERSION = 12
+
+POSTGRES_FINGERPRINT_QUERY = """
+    SELECT md5(string_agg(part, '|' ORDER BY part))
+    FROM (
+        SELECT 'c' || c.oid::text || ':' || c.xmin::text AS part
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        SELECT 'a' || a.attrelid::text || '.' || a.attnum::text || ':' || a.xmin::text
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %(schema)s AND a.attnum > 0
+        UNION ALL
+        SELECT 'd' || d.oid::text || ':' || d.xmin::text
+        FROM pg_attrdef d
+        JOIN pg_class c ON c.oid = d.adrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        SELECT 'k' || con.oid::text || ':' || con.xmin::text
+        FROM pg_constraint con
+        JOIN pg_namespace n ON n.oid = con.connamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        SELECT 'e' || e.oid::text || ':' || e.xmin::text
+        FROM pg_enum e
+        JOIN pg_type t ON t.oid = e.enumtypid
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        SELECT 'r' || r.oid::text || ':' || r.xmin::text
+        FROM pg_rewrite r
+        JOIN pg_class c ON c.oid = r.ev_class
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        SELECT 't' || tg.oid::text || ':' || tg.xmin::text
+        FROM pg_trigger tg
+        JOIN pg_class c ON c.oid = tg.tgrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        SELECT 'p' || p.oid::text || ':' || p.xmin::text
+        FROM pg_proc p
+        JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE n.nspname = %(schema)s
+        UNION ALL
+        -- Fraîcheur des statistiques (les compteurs n_tup_* évoluent à
+        -- chaque écriture et invalideraient le cache en permanence)
+        SELECT 's' || s.relid::text || ':' || COALESCE(GREATEST(
+            s.last_analyze, s.last_autoanalyze, s.last_vacuum, s.last_autovacuum)::text, '')
+        FROM pg_stat_user_tables s
+        WHERE s.schemaname = %(schema)s
+    ) parts
+"""
+
+SEQUENCE_STATE_QUERY = """
+    SELECT sequencename, last_value
+    FROM pg_sequences
+    WHERE schemaname = %s
+"""
+
+ORACLE_FINGERPRINT_QUERY = """
+    SELECT COUNT(*) || ':' || SUM(object_id) || ':' ||
+           TO_CHAR(MAX(last_ddl_time), 'YYYYMMDDHH24MISS')
+    FROM user_objects
+"""
+
+
+def postgres_fingerprint(cursor, schema_name='public'):
+    """Empreinte du schéma PostgreSQL (xmin du catalogue et date des dernières statistiques)."""
+    cursor.execute(POSTGRES_FINGERPRINT_QUERY, {'schema': schema_name})
+    return cursor.fetchone()[0] or ''
+
+
+def refresh_sequence_state(cursor, catalog, schema_name='public'):
+    """
+    Relit la dernière valeur de chaque séquence d'un catalogue en cache.
+
+    :param cursor: curseur psycopg2
+    :param catalog: Catalog (Sequence.last_value modifié en place)
+    :param schema_name: schéma PostgreSQL
+    """
+    cursor.execute(SEQUENCE_STATE_QUERY, (schema_name,))
+    last_values = dict(cursor.fetchall())
+    for sequence in catalog.sequences:
+        if sequence.name in last_values:
+            sequence.last_value = last_values[sequence.name]
+
+
+def oracle_fingerprint(cursor):
+    """Empreinte du schéma Oracle (user_objects.last_ddl_time)."""
+    cursor.execute(ORACLE_FINGERPRINT_QUERY)
+    return cursor.fetchone()[0] or ''
+
+
+def snapshot_path(name, cache_dir=CACHE_DIR):
+    """Chemin du fichier snapshot pour un catalogue donné."""
+    return os.path.join(cache_dir, f"{name}.pickle")
+
+
+def save_snapshot(catalog, path, fingerprint=None):
+    """
+    Sérialise un catalogue sur disque.
+
+    :param catalog: catalogue à sauvegarder (Catalog ou dictionnaire Oracle)
+    :param path: fichier de destination
+    :param fingerprint: empreinte du schéma au moment de l'extraction
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": fingerprint,
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "catalog": catalog,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """Relit un snapshot ; retourne None s'il est absent ou illisible."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        print(f"⚠ Snapshot illisible ignoré ({path}) : {e}")
+        return None
+    if payload.get("version") != SNAPSHOT_VERSION:
+        return None
+    return payload
+
+
+def load_snapshot(path):
+    """
+    Charge un catalogue depuis un snapshot, sans connexion (mode hors ligne).
+
+    :param path: fichier snapshot
+    :return: catalogue sauvegardé
+    """
+    payload = read_snapshot(path)
+    if payload is None:
+        raise FileNotFoundError(f"Snapshot introuvable ou invalide : {path}")
+    print(f"✅ Catalogue chargé hors ligne depuis {path} (extrait le {payload['created']})")
+    return retarget_catalog(payload["catalog"])
+
+
+def retarget_catalog(catalog):
+    """
+    Recalcule les types Oracle d'un catalogue sauvegardé pour une autre
+    version cible que celle de son extraction (target_profile.TARGET).
+
+    :param catalog: Catalog
+    :return: le même catalogue
+    """
+    if catalog.target != target_profile.TARGET:
+        convert_catalog_types(catalog)
+    return catalog
+
+
+def load_postgres_catalog(connection_params, schema_name='public', cache_dir=CACHE_DIR, refresh=False):
+    """
+    Retourne le catalogue PostgreSQL typé, depuis le cache si l'empreinte
+    du schéma n'a pas changé, sinon par extraction puis mise en cache.
+
+    :param connection_params: paramètres de connexion PostgreSQL
+    :param schema_name: schéma à extraire
+    :param cache_dir: dossier du cache
+    :param refresh: force la réextraction
+    :return: Catalog
+    """
+    path = snapshot_path(f"postgres_{connection_params.get('database', 'db')}_{schema_name}", cache_dir)
+
+    conn = psycopg2.connect(**connection_params)
+    try:
+        with conn.cursor() as cursor:
+            fingerprint = postgres_fingerprint(cursor, schema_name)
+
+            payload = None if refresh else read_snapshot(path)
+            if payload and payload["fingerprint"] == fingerprint:
+                catalog = payload["catalog"]
+                refresh_sequence_state(cursor, catalog, schema_name)
+                print(f"✅ Catalogue PostgreSQL '{schema_name}' inchangé : chargé depuis le cache")
+                return retarget_catalog(catalog)
+
+            catalog = build_catalog(extract_catalog(cursor, schema_name))
+    finally:
+        conn.close()
+
+    save_snapshot(catalog, path, fingerprint)
+    print(f"✅ Catalogue PostgreSQL '{schema_name}' extrait ({len(catalog.tables)} tables) et mis en cache")
+    return catalog
+
+
+def load_oracle_catalog_cached(oracle_config, cache_dir=CACHE_DIR, refresh=False):
+    """
+    Retourne le dictionnaire Oracle, depuis le cache si user_objects n'a pas changé.
+
+    :param oracle_config: paramètres de connexion oracledb
+    :param cache_dir: dossier du cache
+    :param refresh: force la réextraction
+    :return: catalogue Oracle (voir catalog_oracle.extract_oracle_catalog)
+    """
+    path = snapshot_path(f"oracle_{oracle_config.get('user', 'user').replace('#', '')}", cache_dir)
+
+    conn = oracledb.connect(**oracle_config)
+    try:
+        cursor = conn.cursor()
+        fingerprint = oracle_fingerprint(cursor)
+
+        payload = None if refresh else read_snapshot(path)
+        if payload and payload["fingerprint"] == fingerprint:
+            cursor.close()
+            print("✅ Dictionnaire Oracle inchangé : chargé depuis le cache")
+            return payload["catalog"]
+
+        catalog = extract_oracle_catalog(cursor)
+        cursor.close()
+    finally:
+        conn.close()
+
+    save_snapshot(catalog, path, fingerprint)
+    print(f"✅ Dictionnaire Oracle extrait ({len(catalog['tables'])} tables) et mis en cache")
+    return catalog
@@ -0,0 +1,131 @@
+"""
+Module catalog_mapping.py
+-------------------------
+Construction du mapping tables/colonnes PostgreSQL → Oracle.
+
+Les deux côtés sont indexés par nom normalisé (minuscules) dans des
+dictionnaires : chaque correspondance est une recherche O(1) au lieu d'un
+parcours linéaire. Le dictionnaire Oracle provient d'une seule requête
+user_tab_columns (catalog_oracle). Les objets sans correspondance sont
+collectés et signalés en une fois au lieu d'interrompre la découverte.
+"""
+
+from enum_encoding import enum_codes
+
+
+def normalize_name(name):
+    """Nom normalisé utilisé pour rapprocher PostgreSQL et Oracle."""
+    return name.lower()
+
+
+def build_mapping(catalog, oracle_catalog):
+    """
+    Construit le mapping entre le catalogue PostgreSQL et le dictionnaire Oracle.
+
+    :param catalog: Catalog PostgreSQL (catalog_model)
+    :param oracle_catalog: dictionnaire Oracle (catalog_oracle)
+    :return: dictionnaire {tables, columns, column_types, not_null, unmatched}
+    """
+    oracle_tables = {
+        normalize_name(name): table
+        for name, table in oracle_catalog["tables"].items()
+    }
+
+    table_mapping = {}
+    column_mapping = {}
+    column_types_mapping = {}
+    not_null_constraints = {}  # {table: {column: True/False, ...}, ...}
+    # Codes des ENUM stockés en NUMBER(3) (mode compact), calculés une fois par type
+    codes_by_enum = {name: enum_codes(enum_type.values) for name, enum_type in catalog.enums.items()}
+
+    unmatched_tables = []
+    unmatched_columns = []  # [(table, column), ...]
+    extra_oracle_columns = []  # [(table ORACLE, colonne ORACLE), ...]
+
+    for pg_table, table in catalog.tables.items():
+        oracle_table = oracle_tables.get(normalize_name(pg_table))
+        if oracle_table is None:
+            unmatched_tables.append(pg_table)
+            continue
+
+        oracle_columns = {
+            normalize_name(name): col
+            for name, col in oracle_table["columns"].items()
+        }
+
+        col_map = {}
+        col_types = {}
+        col_nullable = {}
+        missing = []
+
+        for column in table.columns:
+            oracle_col = oracle_columns.pop(normalize_name(column.name), None)
+            if oracle_col is None:
+                missing.append((pg_table, column.name))
+                continue
+            # Colonne virtuelle (colonne générée) : calculée par Oracle, non chargée
+            if oracle_col.get("virtual"):
+                continue
+
+            col_map[column.name] = oracle_col["name"]
+            col_types[column.name] = {
+                'pg_type': column.data_type,
+                'pg_udt': column.udt_name,
+                'oracle_type': oracle_col["data_type"],
+                'oracle_nullable': 'Y' if oracle_col["nullable"] else 'N'
+            }
+            if column.is_enum and oracle_col["data_type"] == 'NUMBER':
+                col_types[column.name]['enum_codes'] = codes_by_enum.get(column.udt_name)
+            # Enregistrer si la colonne est NOT NULL dans Oracle
+            col_nullable[column.name] = not oracle_col["nullable"]
+
+        extra_oracle_columns.extend(
+            (oracle_table["name"], col["name"]) for col in oracle_columns.values()
+        )
+
+        # Une table dont une colonne manque ne peut pas être chargée
+        if missing:
+            unmatched_columns.extend(missing)
+            continue
+
+        table_mapping[pg_table] = oracle_table["name"]
+        column_mapping[pg_table] = col_map
+        column_types_mapping[pg_table] = col_types
+        not_null_constraints[pg_table] = col_nullable
+
+    return {
+        'tables': table_mapping,
+        'columns': column_mapping,
+        'column_types': column_types_mapping,
+        'not_null': not_null_constraints,
+        'unmatched': {
+            'tables': unmatched_tables,
+            'columns': unmatched_columns,
+            'extra_oracle_columns': extra_oracle_columns,
+        },
+    }
+
+
+def print_unmatched_report(mapping):
+    """Affiche en une fois les tables et colonnes sans correspondance."""
+    unmatched = mapping['unmatched']
+
+    if unmatched['tables']:
+        print(f"⚠️ {len(unmatched['tables'])} table(s) PostgreSQL absente(s) d'Oracle (ignorées) :")
+        for table in unmatched['tables']:
+            print(f"  - {table}")
+        print()
+
+    if unmatched['columns']:
+        tables = sorted({table for table, _ in unmatched['columns']})
+        print(f"❌ {len(unmatched['columns'])} colonne(s) absente(s) d'Oracle, "
+              f"{len(tables)} table(s) exclue(s) du chargement :")
+        for table, column in unmatched['columns']:
+            print(f"  - {table}.{column}")
+        print()
+
+    if unmatched['extra_oracle_columns']:
+        print(f"ℹ️ {len(unmatched['extra_oracle_columns'])} colonne(s) Oracle sans équivalent PostgreSQL :")
+        for table, column in unmatched['extra_oracle_columns']:
+            print(f"  - {table}.{column}")
+        print()
@@ -0,0 +1,405 @@
+"""
+Module catalog_model.py
+-----------------------
+Modèle typé et compact du catalogue PostgreSQL partagé par toute la migration
+(tables, colonnes, contraintes, index, ENUM, séquences, vues, triggers et
+fonctions).
+
+Le catalogue est construit une seule fois par exécution (à partir de
+catalog_postgres.extract_catalog) puis transmis à la génération DDL, à la
+découverte du mapping et au chargement des données. Les objets utilisent
+__slots__ et portent les valeurs précalculées dont les générateurs ont
+besoin : type Oracle, DEFAULT nettoyé et identifiants entre guillemets.
+"""
+
+import target_profile
+from catalog_postgres import extract_postgres_catalog
+from type_mapping import convert_column_type, clean_default_value
+
+
+def quote_identifier(name):
+    """Entoure l'identifiant de guillemets doubles (casse préservée dans Oracle)."""
+    if name is None:
+        return None
+    return f'"{name}"'
+
+
+class Column:
+    """Colonne d'une table avec son type Oracle précalculé."""
+
+    __slots__ = (
+        'name', 'position', 'data_type', 'udt_name', 'length', 'precision',
+        'scale', 'nullable', 'default', 'identity', 'is_enum', 'generated',
+        'quoted_name', 'oracle_type', 'oracle_default',
+    )
+
+    def __init__(self, name, position, data_type, udt_name=None, length=None,
+                 precision=None, scale=None, nullable=True, default=None,
+                 identity=None, is_enum=False, generated=None):
+        self.name = name
+        self.position = position
+        self.data_type = data_type
+        self.udt_name = udt_name
+        self.length = length
+        self.precision = precision
+        self.scale = scale
+        self.nullable = nullable
+        self.default = default
+        self.identity = identity
+        self.is_enum = is_enum
+        # Expression d'une colonne GENERATED ALWAYS AS (...) STORED
+        self.generated = generated
+        self.quoted_name = quote_identifier(name)
+        self.oracle_type = None
+        self.oracle_default = None
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.data_type!r} -> {self.oracle_type!r})"
+
+
+class Constraint:
+    """Contrainte PRIMARY KEY, FOREIGN KEY, UNIQUE ou CHECK."""
+
+    __slots__ = (
+        'name', 'type', 'table', 'columns', 'referenced_table',
+        'referenced_columns', 'on_delete', 'definition', 'quoted_name',
+    )
+
+    def __init__(self, name, type, table, columns, referenced_table=None,
+                 referenced_columns=None, on_delete=None, definition=None):
+        self.name = name
+        self.type = type
+        self.table = table
+        self.columns = tuple(columns)
+        self.referenced_table = referenced_table
+        self.referenced_columns = tuple(referenced_columns or ())
+        self.on_delete = on_delete
+        self.definition = definition
+        self.quoted_name = quote_identifier(name[:30])
+
+    def __repr__(self):
+        return f"Constraint({self.name!r}, {self.type!r}, {self.columns!r})"
+
+
+class Index:
+    """Index PostgreSQL (colonnes ou expressions, éventuellement partiel)."""
+
+    __slots__ = (
+        'name', 'table', 'index_type', 'unique', 'primary', 'columns',
+        'expressions', 'predicate', 'definition', 'constraint', 'opclasses',
+        'statistics', 'key_count', 'quoted_name',
+    )
+
+    def __init__(self, name, table, index_type, unique, primary, columns,
+                 expressions, predicate=None, definition=None, constraint=None,
+                 opclasses=(), statistics=None, key_count=None):
+        self.name = name
+        self.table = table
+        self.index_type = index_type
+        self.unique = unique
+        self.primary = primary
+        self.columns = tuple(columns)
+        self.expressions = tuple(expressions)
+        self.predicate = predicate
+        self.definition = definition
+        self.constraint = constraint
+        self.opclasses = tuple(opclasses)
+        # {rows, index_bytes, correlations, key_widths, n_distinct} (pg_class / pg_stats)
+        self.statistics = statistics or {}
+        # Nombre de colonnes de clé (pg_index.indnkeyatts), le reste est INCLUDE
+        self.key_count = key_count if key_count is not None else len(self.columns)
+        self.quoted_name = quote_identifier(name)
+
+    @property
+    def has_expressions(self):
+        return any(self.expressions)
+
+    @property
+    def key_columns(self):
+        return self.columns[:self.key_count]
+
+    @property
+    def include_columns(self):
+        return self.columns[self.key_count:]
+
+    def __repr__(self):
+        return f"Index({self.name!r}, {self.table!r}, {self.columns!r})"
+
+
+class EnumType:
+    """Type ENUM PostgreSQL et ses valeurs ordonnées."""
+
+    __slots__ = ('name', 'values', 'oracle_type')
+
+    def __init__(self, name, values):
+        self.name = name
+        self.values = tuple(values)
+        self.oracle_type = convert_column_type('USER-DEFINED', name, enum_values=self.values)
+
+    def __repr__(self):
+        return f"EnumType({self.name!r}, {len(self.values)} valeurs)"
+
+
+class Sequence:
+    """Séquence PostgreSQL, avec la colonne propriétaire éventuelle."""
+
+    __slots__ = (
+        'name', 'start_value', 'min_value', 'max_value', 'increment_by',
+        'last_value', 'cycle', 'owner_table', 'owner_column', 'quoted_name',
+    )
+
+    def __init__(self, name, start_value=1, min_value=None, max_value=None,
+                 increment_by=1, last_value=None, cycle=False,
+                 owner_table=None, owner_column=None):
+        self.name = name
+        self.start_value = start_value
+        self.min_value = min_value
+        self.max_value = max_value
+        self.increment_by = increment_by
+        self.last_value = last_value
+        self.cycle = cycle
+        self.owner_table = owner_table
+        self.owner_column = owner_column
+        self.quoted_name = quote_identifier(name)
+
+    @property
+    def is_owned(self):
+        return self.owner_table is not None
+
+    def __repr__(self):
+        return f"Sequence({self.name!r})"
+
+
+class View:
+    """Vue (ou vue matérialisée) PostgreSQL."""
+
+    __slots__ = ('name', 'definition', 'materialized', 'quoted_name')
+
+    def __init__(self, name, definition, materialized=False):
+        self.name = name
+        self.definition = definition
+        self.materialized = materialized
+        self.quoted_name = quote_identifier(name)
+
+    def __repr__(self):
+        return f"View({self.name!r})"
+
+
+class Trigger:
+    """Trigger PostgreSQL et la définition de sa fonction."""
+
+    __slots__ = ('name', 'table', 'event', 'timing', 'level', 'action', 'function_definition')
+
+    def __init__(self, name, table, event, timing, level=None, action=None, function_definition=None):
+        self.name = name
+        self.table = table
+        self.event = event
+        self.timing = timing
+        self.level = level
+        self.action = action
+        self.function_definition = function_definition
+
+    @property
+    def is_auto_increment(self):
+        """Trigger alimentant une séquence : remplacé par GENERATED AS IDENTITY."""
+        return bool(self.function_definition) and 'nextval' in self.function_definition.lower()
+
+    def __repr__(self):
+        return f"Trigger({self.name!r}, {self.table!r})"
+
+
+class Routine:
+    """Fonction ou procédure PostgreSQL."""
+
+    __slots__ = ('name', 'definition', 'return_type', 'arguments', 'routine_type')
+
+    def __init__(self, name, definition, return_type=None, arguments=None, routine_type='FUNCTION'):
+        self.name = name
+        self.definition = definition
+        self.return_type = return_type
+        self.arguments = arguments
+        self.routine_type = routine_type
+
+    @property
+    def is_procedure(self):
+        return self.routine_type == 'PROCEDURE'
+
+    @property
+    def is_trigger_function(self):
+        return bool(self.return_type) and 'trigger' in self.return_type.lower()
+
+    def __repr__(self):
+        return f"Routine({self.name!r}, {self.routine_type!r})"
+
+
+class Table:
+    """Table avec ses colonnes, contraintes et index."""
+
+    __slots__ = (
+        'name', 'oid', 'columns', 'primary_key', 'foreign_keys', 'unique',
+        'checks', 'indexes', 'statistics', 'quoted_name', '_columns_by_name',
+    )
+
+    def __init__(self, name, oid=None, statistics=None):
+        self.name = name
+        self.oid = oid
+        # {rows, inserts, observed_seconds} (pg_class, pg_stat_user_tables)
+        self.statistics = statistics or {}
+        self.columns = []
+        self.primary_key = None
+        self.foreign_keys = []
+        self.unique = []
+        self.checks = []
+        self.indexes = []
+        self.quoted_name = quote_identifier(name)
+        self._columns_by_name = {}
+
+    def add_column(self, column):
+        self.columns.append(column)
+        self._columns_by_name[column.name] = column
+
+    def column(self, name):
+        """Retourne la colonne nommée (ou None)."""
+        return self._columns_by_name.get(name)
+
+    @property
+    def column_names(self):
+        return [col.name for col in self.columns]
+
+    def __repr__(self):
+        return f"Table({self.name!r}, {len(self.columns)} colonnes)"
+
+
+class Catalog:
+    """Catalogue complet d'un schéma PostgreSQL."""
+
+    __slots__ = ('schema', 'tables', 'enums', 'sequences', 'views', 'triggers', 'routines', 'target')
+
+    def __init__(self, schema, tables=None, enums=None, sequences=None,
+                 views=None, triggers=None, routines=None):
+        self.schema = schema
+        # Version Oracle cible des types précalculés (target_profile.TARGET)
+        self.target = None
+        self.tables = tables if tables is not None else {}
+        self.enums = enums if enums is not None else {}
+        self.sequences = sequences if sequences is not None else []
+        self.views = views if views is not None else []
+        self.triggers = triggers if triggers is not None else []
+        self.routines = routines if routines is not None else []
+
+    def table(self, name):
+        """Retourne la table nommée (ou None)."""
+        return self.tables.get(name)
+
+    def iter_columns(self):
+        """Itère sur toutes les colonnes sous forme (table, colonne)."""
+        for table in self.tables.values():
+            for column in table.columns:
+                yield table, column
+
+    def iter_constraints(self):
+        """Itère sur toutes les contraintes PK, UNIQUE, FK puis CHECK."""
+        for table in self.tables.values():
+            if table.primary_key:
+                yield table.primary_key
+            yield from table.unique
+            yield from table.foreign_keys
+            yield from table.checks
+
+    def __repr__(self):
+        return f"Catalog({self.schema!r}, {len(self.tables)} tables)"
+
+
+def convert_catalog_types(catalog):
+    """
+    Calcule le type et le DEFAULT Oracle de chaque colonne pour la version
+    cible courante (à rappeler si target_profile.TARGET a changé).
+
+    :param catalog: Catalog
+    """
+    for _, column in catalog.iter_columns():
+        enum_type = catalog.enums.get(column.udt_name) if column.is_enum else None
+        column.oracle_type = convert_column_type(
+            column.data_type, column.udt_name, column.length,
+            column.precision, column.scale, column.default,
+            enum_values=enum_type.values if enum_type else None,
+        )
+        column.oracle_default = None
+        if column.default and 'nextval(' not in str(column.default):
+            column.oracle_default = clean_default_value(column.default)
+    catalog.target = target_profile.TARGET
+
+
+def build_catalog(raw_catalog):
+    """
+    Construit le modèle typé à partir du dictionnaire produit par
+    catalog_postgres.extract_catalog, en précalculant types et DEFAULT Oracle.
+
+    :param raw_catalog: dictionnaire {schema, tables, enums, sequences}
+    :return: Catalog
+    """
+    enums = {
+        name: EnumType(name, values)
+        for name, values in raw_catalog.get("enums", {}).items()
+    }
+    catalog = Catalog(raw_catalog["schema"], enums=enums)
+
+    for table_name, raw_table in raw_catalog["tables"].items():
+        table = Table(table_name, raw_table.get("oid"), raw_table.get("statistics"))
+
+        for raw_col in raw_table["columns"]:
+            column = Column(
+                raw_col["name"], raw_col["position"], raw_col["data_type"],
+                udt_name=raw_col["udt_name"], length=raw_col["length"],
+                precision=raw_col["precision"], scale=raw_col["scale"],
+                nullable=raw_col["nullable"], default=raw_col["default"],
+                identity=raw_col["identity"], is_enum=raw_col["is_enum"],
+                generated=raw_col.get("generated"),
+            )
+            table.add_column(column)
+
+        def make_constraint(raw):
+            return Constraint(
+                raw["name"], raw["type"], table_name, raw["columns"],
+                raw.get("referenced_table"), raw.get("referenced_columns"),
+                raw.get("on_delete"), raw.get("definition"),
+            )
+
+        if raw_table["primary_key"]:
+            table.primary_key = make_constraint(raw_table["primary_key"])
+        table.foreign_keys = [make_constraint(raw) for raw in raw_table["foreign_keys"]]
+        table.unique = [make_constraint(raw) for raw in raw_table["unique"]]
+        table.checks = [make_constraint(raw) for raw in raw_table["checks"]]
+        table.indexes = [
+            Index(
+                raw["name"], table_name, raw["index_type"], raw["unique"],
+                raw["primary"], raw["columns"], raw["expressions"],
+                raw["predicate"], raw["definition"], raw["constraint"],
+                raw.get("opclasses", ()), raw.get("statistics"), raw.get("key_count"),
+            )
+            for raw in raw_table["indexes"]
+        ]
+
+        catalog.tables[table_name] = table
+
+    convert_catalog_types(catalog)
+    catalog.sequences = [
+        Sequence(**raw) for raw in raw_catalog.get("sequences", [])
+    ]
+    catalog.views = [View(**raw) for raw in raw_catalog.get("views", [])]
+    catalog.triggers = [Trigger(**raw) for raw in raw_catalog.get("triggers", [])]
+    catalog.routines = [Routine(**raw) for raw in raw_catalog.get("routines", [])]
+
+    return catalog
+
+
+def load_catalog(connection_params, schema_name='public'):
+    """
+    Extrait le catalogue PostgreSQL et construit le modèle typé.
+    À appeler une seule fois par exécution.
+
+    :param connection_params: paramètres de connexion PostgreSQL
+    :param schema_name: schéma à extraire
+    :return: Catalog
+    """
+    return build_catalog(extract_postgres_catalog(connection_params, schema_name))
@@ -0,0 +1,179 @@
+"""
+Module catalog_oracle.py
+------------------------
+Extraction ensembliste du dictionnaire Oracle de l'utilisateur cible.
+
+Toutes les colonnes des tables utilisateur sont lues en une seule requête
+(user_tab_cols, colonnes visibles) avec un arraysize élevé, au lieu d'une
+requête par table.
+Les contraintes (user_constraints), index (user_indexes) et noms des vues
+(user_views) sont lus de la même façon, une requête chacun.
+"""
+
+import oracledb
+
+
+# Nombre de lignes ramenées par aller-retour réseau
+FETCH_ARRAYSIZE = 5000
+
+TAB_COLUMNS_QUERY = """
+    SELECT
+        c.table_name,
+        c.column_name,
+        c.data_type,
+        c.data_length,
+        c.char_length,
+        c.data_precision,
+        c.data_scale,
+        c.nullable,
+        c.column_id,
+        c.virtual_column
+    FROM user_tab_cols c
+    JOIN user_tables t ON t.table_name = c.table_name
+    WHERE t.table_name NOT LIKE 'BIN$%'
+      AND t.secondary = 'N'
+      AND c.hidden_column = 'NO'
+    ORDER BY c.table_name, c.column_id
+"""
+
+CONSTRAINTS_QUERY = """
+    SELECT
+        c.table_name,
+        c.constraint_name,
+        c.constraint_type,
+        c.generated,
+        c.status,
+        c.index_name,
+        r.table_name AS referenced_table,
+        cc.column_name
+    FROM user_constraints c
+    LEFT JOIN user_cons_columns cc
+           ON cc.constraint_name = c.constraint_name AND cc.table_name = c.table_name
+    LEFT JOIN user_constraints r ON r.constraint_name = c.r_constraint_name
+    WHERE c.constraint_type IN ('P', 'U', 'R', 'C')
+      AND c.table_name NOT LIKE 'BIN$%'
+    ORDER BY c.table_name, c.constraint_name, cc.position
+"""
+
+INDEXES_QUERY = """
+    SELECT
+        i.table_name,
+        i.index_name,
+        i.uniqueness,
+        i.index_type,
+        ic.column_name
+    FROM user_indexes i
+    JOIN user_ind_columns ic ON ic.index_name = i.index_name
+    WHERE i.table_name NOT LIKE 'BIN$%'
+      AND i.index_type <> 'LOB'
+    ORDER BY i.table_name, i.index_name, ic.column_position
+"""
+
+VIEWS_QUERY = """
+    SELECT view_name
+    FROM user_views
+    ORDER BY view_name
+"""
+
+
+def _extract_constraints(cursor, tables):
+    """Ajoute les contraintes de chaque table ; retourne les noms des index qui les portent."""
+    cursor.execute(CONSTRAINTS_QUERY)
+    backing_indexes = set()
+    for (table_name, constraint_name, constraint_type, generated, status,
+         index_name, referenced_table, column_name) in cursor:
+        table = tables.get(table_name)
+        if table is None:
+            continue
+        constraint = table["constraints"].setdefault(constraint_name, {
+            "name": constraint_name,
+            "type": constraint_type,
+            "generated": generated == 'GENERATED NAME',
+            "enabled": status == 'ENABLED',
+            "referenced_table": referenced_table,
+            "columns": [],
+        })
+        if column_name is not None:
+            constraint["columns"].append(column_name)
+        if index_name:
+            backing_indexes.add(index_name)
+    return backing_indexes
+
+
+def _extract_indexes(cursor, tables, backing_indexes):
+    """Ajoute les index de chaque table (hors index portés par une contrainte)."""
+    cursor.execute(INDEXES_QUERY)
+    for table_name, index_name, uniqueness, index_type, column_name in cursor:
+        table = tables.get(table_name)
+        if table is None:
+            continue
+        index = table["indexes"].setdefault(index_name, {
+            "name": index_name,
+            "unique": uniqueness == 'UNIQUE',
+            "index_type": index_type,
+            "constraint_backed": index_name in backing_indexes,
+            "columns": [],
+        })
+        index["columns"].append(column_name)
+
+
+def extract_oracle_catalog(cursor):
+    """
+    Charge les tables, colonnes, contraintes et index Oracle de l'utilisateur
+    courant (une requête par vue du dictionnaire).
+
+    :param cursor: curseur oracledb connecté à Oracle
+    :return: dictionnaire {tables: {TABLE: {columns: {COLONNE: {...}},
+             constraints: {NOM: {...}}, indexes: {NOM: {...}}}}, views: [VUE]}
+    """
+    cursor.arraysize = FETCH_ARRAYSIZE
+    cursor.prefetchrows = FETCH_ARRAYSIZE + 1
+    cursor.execute(TAB_COLUMNS_QUERY)
+
+    tables = {}
+    for (table_name, column_name, data_type, data_length, char_length,
+         data_precision, data_scale, nullable, column_id, virtual_column) in cursor:
+        table = tables.setdefault(table_name, {
+            "name": table_name, "columns": {}, "constraints": {}, "indexes": {},
+        })
+        table["columns"][column_name] = {
+            "name": column_name,
+            "data_type": data_type,
+            "data_length": data_length,
+            "char_length": char_length,
+            "precision": data_precision,
+            "scale": data_scale,
+            "nullable": nullable == 'Y',
+            "column_id": column_id,
+            # Colonne virtuelle : calculée par Oracle, jamais chargée
+            "virtual": virtual_column == 'YES',
+        }
+
+    backing_indexes = _extract_constraints(cursor, tables)
+    _extract_indexes(cursor, tables, backing_indexes)
+
+    cursor.execute(VIEWS_QUERY)
+    views = [view_name for (view_name,) in cursor]
+
+    return {"tables": tables, "views": views}
+
+
+def load_oracle_catalog(oracle_config):
+    """
+    Ouvre une connexion Oracle et extrait le dictionnaire de l'utilisateur.
+
+    :param oracle_config: paramètres de connexion oracledb
+    :return: catalogue Oracle (voir extract_oracle_catalog)
+    """
+    conn = oracledb.connect(**oracle_config)
+    try:
+        cursor = conn.cursor()
+        catalog = extract_oracle_catalog(cursor)
+        cursor.close()
+    finally:
+        conn.close()
+
+    column_count = sum(len(t["columns"]) for t in catalog["tables"].values())
+    print(f"✅ Dictionnaire Oracle extrait : {len(catalog['tables'])} tables, {column_count} colonnes")
+
+    return catalog
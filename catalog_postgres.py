@@ -0,0 +1,462 @@
+"""
+Module catalog_postgres.py
+--------------------------
+Extraction ensembliste du catalogue PostgreSQL via pg_catalog.
+
+Au lieu d'interroger information_schema table par table (N+1 requêtes),
+toutes les tables, colonnes, contraintes (PK, FK, UNIQUE, CHECK), index,
+types ENUM, séquences, valeurs DEFAULT, vues, triggers et fonctions d'un
+schéma sont chargés en une poignée de requêtes paramétrées. Le résultat est un modèle unique en mémoire destiné
+à être consommé par tous les générateurs.
+"""
+
+import psycopg2
+
+
+TABLES_QUERY = """
+    SELECT
+        c.oid,
+        c.relname,
+        c.reltuples,
+        s.n_tup_ins,
+        EXTRACT(EPOCH FROM now() - COALESCE(d.stats_reset, pg_postmaster_start_time())) AS observed_seconds
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    LEFT JOIN pg_stat_database d ON d.datname = current_database()
+    WHERE n.nspname = %s
+      AND c.relkind IN ('r', 'p')
+      AND NOT c.relispartition
+    ORDER BY c.relname
+"""
+
+COLUMNS_QUERY = """
+    SELECT
+        c.relname AS table_name,
+        a.attnum,
+        a.attname AS column_name,
+        CASE
+            WHEN t.typtype = 'e' THEN 'USER-DEFINED'
+            WHEN t.typcategory = 'A' THEN 'ARRAY'
+            WHEN t.typtype = 'd' THEN format_type(t.typbasetype, NULL)
+            ELSE format_type(a.atttypid, NULL)
+        END AS data_type,
+        t.typname AS udt_name,
+        t.typtype,
+        CASE
+            WHEN a.atttypid IN (1042, 1043) AND a.atttypmod > 4 THEN a.atttypmod - 4
+        END AS character_maximum_length,
+        CASE
+            WHEN a.atttypid = 1700 AND a.atttypmod > 4 THEN ((a.atttypmod - 4) >> 16) & 65535
+        END AS numeric_precision,
+        CASE
+            WHEN a.atttypid = 1700 AND a.atttypmod > 4 THEN (a.atttypmod - 4) & 65535
+        END AS numeric_scale,
+        NOT a.attnotnull AS is_nullable,
+        pg_get_expr(d.adbin, d.adrelid) AS column_default,
+        a.attidentity,
+        a.attgenerated
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_type t ON t.oid = a.atttypid
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE n.nspname = %s
+      AND c.relkind IN ('r', 'p')
+      AND NOT c.relispartition
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+    ORDER BY c.relname, a.attnum
+"""
+
+CONSTRAINTS_QUERY = """
+    SELECT
+        c.relname AS table_name,
+        con.conname AS constraint_name,
+        con.contype,
+        ARRAY(
+            SELECT a.attname::text
+            FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            ORDER BY k.ord
+        ) AS columns,
+        rt.relname AS referenced_table,
+        ARRAY(
+            SELECT a.attname::text
+            FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+            ORDER BY k.ord
+        ) AS referenced_columns,
+        con.confdeltype,
+        pg_get_constraintdef(con.oid) AS definition
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_class rt ON rt.oid = con.confrelid
+    WHERE n.nspname = %s
+      AND con.contype IN ('p', 'f', 'u', 'c')
+    ORDER BY c.relname, con.conname
+"""
+
+INDEXES_QUERY = """
+    SELECT
+        t.relname AS table_name,
+        i.relname AS index_name,
+        am.amname AS index_type,
+        ix.indisunique,
+        ix.indisprimary,
+        ARRAY(
+            SELECT COALESCE(a.attname::text, pg_get_indexdef(ix.indexrelid, k.n, true))
+            FROM generate_series(1, ix.indnatts) AS k(n)
+            LEFT JOIN pg_attribute a
+                ON a.attrelid = ix.indrelid
+               AND a.attnum = ix.indkey[k.n - 1]
+               AND ix.indkey[k.n - 1] <> 0
+            ORDER BY k.n
+        ) AS index_keys,
+        ARRAY(
+            SELECT ix.indkey[k.n - 1] = 0
+            FROM generate_series(1, ix.indnatts) AS k(n)
+            ORDER BY k.n
+        ) AS is_expression,
+        pg_get_expr(ix.indpred, ix.indrelid) AS predicate,
+        pg_get_indexdef(ix.indexrelid) AS definition,
+        con.conname AS constraint_name,
+        ARRAY(
+            SELECT opc.opcname::text
+            FROM generate_series(1, ix.indnkeyatts) AS k(n)
+            JOIN pg_opclass opc ON opc.oid = ix.indclass[k.n - 1]
+            ORDER BY k.n
+        ) AS opclasses,
+        t.reltuples,
+        pg_relation_size(ix.indexrelid) AS index_bytes,
+        ARRAY(
+            SELECT s.correlation
+            FROM generate_series(1, ix.indnkeyatts) AS k(n)
+            LEFT JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = ix.indkey[k.n - 1]
+            LEFT JOIN pg_stats s
+                ON s.schemaname = n.nspname AND s.tablename = t.relname
+               AND s.attname = a.attname AND NOT s.inherited
+            ORDER BY k.n
+        ) AS correlations,
+        ARRAY(
+            SELECT s.avg_width
+            FROM generate_series(1, ix.indnkeyatts) AS k(n)
+            LEFT JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = ix.indkey[k.n - 1]
+            LEFT JOIN pg_stats s
+                ON s.schemaname = n.nspname AND s.tablename = t.relname
+               AND s.attname = a.attname AND NOT s.inherited
+            ORDER BY k.n
+        ) AS key_widths,
+        ix.indnkeyatts AS key_count,
+        ARRAY(
+            SELECT s.n_distinct
+            FROM generate_series(1, ix.indnkeyatts) AS k(n)
+            LEFT JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = ix.indkey[k.n - 1]
+            LEFT JOIN pg_stats s
+                ON s.schemaname = n.nspname AND s.tablename = t.relname
+               AND s.attname = a.attname AND NOT s.inherited
+            ORDER BY k.n
+        ) AS n_distincts
+    FROM pg_index ix
+    JOIN pg_class i ON i.oid = ix.indexrelid
+    JOIN pg_class t ON t.oid = ix.indrelid
+    JOIN pg_namespace n ON n.oid = t.relnamespace
+    JOIN pg_am am ON am.oid = i.relam
+    LEFT JOIN pg_constraint con ON con.conindid = ix.indexrelid AND con.contype IN ('p', 'u', 'x')
+    WHERE n.nspname = %s
+      AND t.relkind IN ('r', 'p')
+    ORDER BY t.relname, i.relname
+"""
+
+ENUMS_QUERY = """
+    SELECT t.typname, array_agg(e.enumlabel::text ORDER BY e.enumsortorder)
+    FROM pg_type t
+    JOIN pg_enum e ON e.enumtypid = t.oid
+    JOIN pg_namespace n ON n.oid = t.typnamespace
+    WHERE n.nspname = %s
+    GROUP BY t.typname
+    ORDER BY t.typname
+"""
+
+SEQUENCES_QUERY = """
+    SELECT
+        s.relname AS sequence_name,
+        ps.start_value,
+        ps.min_value,
+        ps.max_value,
+        ps.increment_by,
+        ps.last_value,
+        ps.cycle,
+        t.relname AS owner_table,
+        a.attname AS owner_column
+    FROM pg_class s
+    JOIN pg_namespace n ON n.oid = s.relnamespace
+    JOIN pg_sequences ps ON ps.schemaname = n.nspname AND ps.sequencename = s.relname
+    LEFT JOIN pg_depend dep
+        ON dep.objid = s.oid
+       AND dep.classid = 'pg_class'::regclass
+       AND dep.refclassid = 'pg_class'::regclass
+       AND dep.deptype IN ('a', 'i')
+    LEFT JOIN pg_class t ON t.oid = dep.refobjid
+    LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = dep.refobjsubid
+    WHERE n.nspname = %s
+      AND s.relkind = 'S'
+    ORDER BY s.relname
+"""
+
+VIEWS_QUERY = """
+    SELECT viewname, definition, FALSE AS materialized
+    FROM pg_views
+    WHERE schemaname = %(schema)s
+    UNION ALL
+    SELECT matviewname, definition, TRUE
+    FROM pg_matviews
+    WHERE schemaname = %(schema)s
+    ORDER BY 1
+"""
+
+TRIGGERS_QUERY = """
+    SELECT
+        t.trigger_name,
+        t.event_manipulation AS trigger_event,
+        t.event_object_table AS table_name,
+        t.action_timing AS trigger_timing,
+        t.action_orientation AS trigger_level,
+        t.action_statement AS trigger_action,
+        pg_get_functiondef(tg.tgfoid) AS function_definition
+    FROM information_schema.triggers t
+    JOIN pg_namespace n ON n.nspname = t.event_object_schema
+    JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = t.event_object_table
+    -- Fonction du trigger par son oid (tgfoid) : pas de doublon pour une
+    -- fonction surchargée ou homonyme dans un autre schéma
+    JOIN pg_trigger tg ON tg.tgrelid = c.oid AND tg.tgname = t.trigger_name
+    WHERE t.trigger_schema = %(schema)s
+    ORDER BY t.event_object_table, t.trigger_name
+"""
+
+ROUTINES_QUERY = """
+    SELECT
+        p.proname AS function_name,
+        pg_get_functiondef(p.oid) AS function_definition,
+        pg_get_function_result(p.oid) AS return_type,
+        pg_get_function_arguments(p.oid) AS arguments,
+        CASE WHEN p.prokind = 'p' THEN 'PROCEDURE' ELSE 'FUNCTION' END AS function_type
+    FROM pg_proc p
+    JOIN pg_namespace n ON p.pronamespace = n.oid
+    LEFT JOIN pg_depend dep ON dep.objid = p.oid AND dep.deptype = 'e'
+    WHERE n.nspname = %(schema)s
+      AND p.prokind IN ('f', 'p')
+      AND dep.objid IS NULL
+      AND p.proname NOT LIKE 'uuid\\_%%'
+    ORDER BY function_type, p.proname
+"""
+
+CONSTRAINT_TYPES = {
+    'p': 'PRIMARY KEY',
+    'f': 'FOREIGN KEY',
+    'u': 'UNIQUE',
+    'c': 'CHECK',
+}
+
+
+def _new_table(oid, table_name, statistics=None):
+    """Structure vide d'une table du catalogue."""
+    return {
+        "oid": oid,
+        "name": table_name,
+        "statistics": statistics or {},
+        "columns": [],
+        "primary_key": None,
+        "foreign_keys": [],
+        "unique": [],
+        "checks": [],
+        "indexes": [],
+    }
+
+
+def extract_catalog(cursor, schema_name='public'):
+    """
+    Charge le catalogue complet d'un schéma PostgreSQL en requêtes ensemblistes.
+
+    :param cursor: curseur psycopg2 connecté à PostgreSQL
+    :param schema_name: schéma à extraire
+    :return: dictionnaire {schema, tables, enums, sequences, views, triggers, routines}
+    """
+    params = (schema_name,)
+
+    # Tables
+    cursor.execute(TABLES_QUERY, params)
+    tables = {}
+    for oid, name, reltuples, inserts, observed_seconds in cursor.fetchall():
+        # Débit d'insertion depuis la remise à zéro des statistiques
+        tables[name] = _new_table(oid, name, {
+            "rows": int(reltuples) if reltuples is not None and reltuples >= 0 else None,
+            "inserts": inserts,
+            "observed_seconds": float(observed_seconds) if observed_seconds is not None else None,
+        })
+
+    # Colonnes + DEFAULT
+    cursor.execute(COLUMNS_QUERY, params)
+    for row in cursor.fetchall():
+        table = tables.get(row[0])
+        if table is None:
+            continue
+        table["columns"].append({
+            "position": row[1],
+            "name": row[2],
+            "data_type": row[3],
+            "udt_name": row[4],
+            "is_enum": row[5] == 'e',
+            "length": row[6],
+            "precision": row[7],
+            "scale": row[8],
+            "nullable": row[9],
+            # Colonne générée (STORED) : pg_attrdef porte l'expression, pas un DEFAULT
+            "default": row[10] if row[12] != 's' else None,
+            "identity": row[11] or None,
+            "generated": row[10] if row[12] == 's' else None,
+        })
+
+    # Contraintes PK / FK / UNIQUE / CHECK
+    cursor.execute(CONSTRAINTS_QUERY, params)
+    for table_name, name, contype, columns, ref_table, ref_columns, on_delete, definition in cursor.fetchall():
+        table = tables.get(table_name)
+        if table is None:
+            continue
+        constraint = {
+            "name": name,
+            "type": CONSTRAINT_TYPES[contype],
+            "columns": list(columns or []),
+            "definition": definition,
+        }
+        if contype == 'p':
+            table["primary_key"] = constraint
+        elif contype == 'f':
+            constraint["referenced_table"] = ref_table
+            constraint["referenced_columns"] = list(ref_columns or [])
+            constraint["on_delete"] = on_delete
+            table["foreign_keys"].append(constraint)
+        elif contype == 'u':
+            table["unique"].append(constraint)
+        else:
+            table["checks"].append(constraint)
+
+    # Index
+    cursor.execute(INDEXES_QUERY, params)
+    for row in cursor.fetchall():
+        table = tables.get(row[0])
+        if table is None:
+            continue
+        table["indexes"].append({
+            "name": row[1],
+            "index_type": row[2],
+            "unique": row[3],
+            "primary": row[4],
+            "columns": list(row[5] or []),
+            "expressions": list(row[6] or []),
+            "predicate": row[7],
+            "definition": row[8],
+            "constraint": row[9],
+            "opclasses": list(row[10] or []),
+            # Statistiques de l'optimiseur au moment de l'extraction
+            "statistics": {
+                "rows": row[11] if row[11] is not None and row[11] >= 0 else None,
+                "index_bytes": row[12],
+                "correlations": list(row[13] or []),
+                "key_widths": list(row[14] or []),
+                "n_distinct": list(row[16] or []),
+            },
+            # Colonnes au-delà de key_count : INCLUDE (...)
+            "key_count": row[15],
+        })
+
+    # Types ENUM
+    cursor.execute(ENUMS_QUERY, params)
+    enums = {enum_type: list(labels) for enum_type, labels in cursor.fetchall()}
+
+    # Séquences (avec la colonne propriétaire pour les serial / identity)
+    cursor.execute(SEQUENCES_QUERY, params)
+    sequences = [
+        {
+            "name": row[0],
+            "start_value": row[1],
+            "min_value": row[2],
+            "max_value": row[3],
+            "increment_by": row[4],
+            "last_value": row[5],
+            "cycle": row[6],
+            "owner_table": row[7],
+            "owner_column": row[8],
+        }
+        for row in cursor.fetchall()
+    ]
+
+    # Vues et vues matérialisées
+    cursor.execute(VIEWS_QUERY, {'schema': schema_name})
+    views = [
+        {"name": name, "definition": definition, "materialized": materialized}
+        for name, definition, materialized in cursor.fetchall()
+    ]
+
+    # Triggers (avec la définition de leur fonction)
+    cursor.execute(TRIGGERS_QUERY, {'schema': schema_name})
+    triggers = [
+        {
+            "name": row[0],
+            "event": row[1],
+            "table": row[2],
+            "timing": row[3],
+            "level": row[4],
+            "action": row[5],
+            "function_definition": row[6],
+        }
+        for row in cursor.fetchall()
+    ]
+
+    # Fonctions et procédures (hors extensions)
+    cursor.execute(ROUTINES_QUERY, {'schema': schema_name})
+    routines = [
+        {
+            "name": row[0],
+            "definition": row[1],
+            "return_type": row[2],
+            "arguments": row[3],
+            "routine_type": row[4],
+        }
+        for row in cursor.fetchall()
+    ]
+
+    return {
+        "schema": schema_name,
+        "tables": tables,
+        "enums": enums,
+        "sequences": sequences,
+        "views": views,
+        "triggers": triggers,
+        "routines": routines,
+    }
+
+
+def extract_postgres_catalog(connection_params, schema_name='public'):
+    """
+    Ouvre une connexion PostgreSQL et extrait le catalogue du schéma.
+
+    :param connection_params: paramètres de connexion PostgreSQL
+    :param schema_name: schéma à extraire
+    :return: catalogue (voir extract_catalog)
+    """
+    # « with connect() » termine la transaction sans fermer la connexion
+    conn = psycopg2.connect(**connection_params)
+    try:
+        with conn.cursor() as cursor:
+            catalog = extract_catalog(cursor, schema_name)
+    finally:
+        conn.close()
+
+    column_count = sum(len(t["columns"]) for t in catalog["tables"].values())
+    index_count = sum(len(t["indexes"]) for t in catalog["tables"].values())
+    print(f"✅ Catalogue '{schema_name}' extrait : {len(catalog['tables'])} tables, "
+          f"{column_count} colonnes, {index_count} index, {len(catalog['enums'])} ENUM")
+
+    return catalog
@@ -0,0 +1,222 @@
+"""
+Module catalog_statistics.py
+----------------------------
+Statistiques de cardinalité PostgreSQL pour les décisions d'indexation.
+
+Au lieu de COUNT(*) / COUNT(DISTINCT) sur chaque table (parcours complet),
+les estimations de l'optimiseur sont chargées une seule fois pour tout le
+schéma :
+- pg_class.reltuples : nombre de lignes ;
+- pg_stats.n_distinct : valeurs distinctes par colonne ;
+- pg_stats_ext (statistiques étendues ndistinct) : valeurs distinctes d'un
+  groupe de colonnes (index multi-colonnes).
+Pour une table jamais analysée, un échantillon TABLESAMPLE SYSTEM est lu.
+Les résultats sont mémorisés par (table, colonnes) pour toute l'exécution.
+"""
+
+import json
+
+import psycopg2
+from psycopg2 import sql
+
+
+# Pourcentage de blocs lus quand les statistiques sont absentes
+SAMPLE_PERCENT = 1
+# En dessous de ce nombre de pages, la table est lue entièrement
+SMALL_TABLE_PAGES = 1000
+
+TABLE_STATS_QUERY = """
+    SELECT c.relname, c.reltuples, c.relpages
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %(schema)s
+      AND c.relkind IN ('r', 'p', 'm')
+"""
+
+COLUMN_STATS_QUERY = """
+    SELECT tablename, attname, n_distinct, null_frac, correlation, avg_width
+    FROM pg_stats
+    WHERE schemaname = %(schema)s
+      AND NOT inherited
+"""
+
+EXT_STATS_QUERY = """
+    SELECT tablename, n_distinct::text
+    FROM pg_stats_ext
+    WHERE schemaname = %(schema)s
+      AND n_distinct IS NOT NULL
+"""
+
+ATTNUMS_QUERY = """
+    SELECT c.relname, a.attnum, a.attname
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %(schema)s
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+"""
+
+_STATISTICS = {}
+
+
+def resolve_n_distinct(n_distinct, row_count):
+    """
+    Convertit pg_stats.n_distinct en nombre de valeurs distinctes.
+    Une valeur négative est une fraction du nombre de lignes, 0 signifie inconnu.
+    """
+    if n_distinct is None or n_distinct == 0:
+        return None
+    if n_distinct > 0:
+        return n_distinct
+    return -n_distinct * row_count
+
+
+class ColumnStatistics:
+    """Statistiques de cardinalité d'un schéma, chargées une fois et mémorisées."""
+
+    def __init__(self, cursor, schema_name='public'):
+        self.cursor = cursor
+        self.schema = schema_name
+        self.tables = {}      # {table: (lignes estimées ou None, pages)}
+        self.columns = {}     # {(table, colonne): {n_distinct, null_frac, correlation, avg_width}}
+        self.extended = {}    # {(table, frozenset(colonnes)): ndistinct}
+        self._cardinality = {}
+        self._load()
+
+    def _load(self):
+        params = {'schema': self.schema}
+
+        self.cursor.execute(TABLE_STATS_QUERY, params)
+        for table_name, reltuples, relpages in self.cursor.fetchall():
+            # reltuples = -1 (PG14+) ou 0 avec relpages = 0 : jamais analysée
+            analyzed = reltuples is not None and reltuples >= 0 and not (reltuples == 0 and relpages == 0)
+            self.tables[table_name] = (int(reltuples) if analyzed else None, relpages or 0)
+
+        self.cursor.execute(COLUMN_STATS_QUERY, params)
+        for table_name, column_name, n_distinct, null_frac, correlation, avg_width in self.cursor.fetchall():
+            self.columns[(table_name, column_name)] = {
+                'n_distinct': n_distinct,
+                'null_frac': null_frac,
+                'correlation': correlation,
+                'avg_width': avg_width,
+            }
+
+        self._load_extended(params)
+
+    def _load_extended(self, params):
+        """Statistiques étendues ndistinct (CREATE STATISTICS ... (ndistinct))."""
+        connection = self.cursor.connection
+        try:
+            self.cursor.execute(ATTNUMS_QUERY, params)
+            attnames = {(table, attnum): name for table, attnum, name in self.cursor.fetchall()}
+            self.cursor.execute(EXT_STATS_QUERY, params)
+            rows = self.cursor.fetchall()
+        except psycopg2.Error as e:
+            # pg_stats_ext.n_distinct n'existe qu'à partir de PostgreSQL 12
+            if not connection.autocommit:
+                connection.rollback()
+            print(f"ℹ️ Statistiques étendues indisponibles : {str(e).strip()[:80]}")
+            return
+
+        # n_distinct = {"1, 2": 4213, ...} : clés = numéros des colonnes du groupe
+        for table_name, n_distinct_text in rows:
+            for attnums, ndistinct in json.loads(n_distinct_text).items():
+                names = frozenset(
+                    attnames.get((table_name, int(attnum)))
+                    for attnum in attnums.split(',')
+                )
+                self.extended[(table_name, names)] = ndistinct
+
+    def row_count(self, table_name):
+        rows, _ = self.tables.get(table_name, (None, 0))
+        return rows
+
+    def _sample(self, table_name, columns):
+        """Estimation par échantillonnage TABLESAMPLE SYSTEM (statistiques absentes)."""
+        _, pages = self.tables.get(table_name, (None, 0))
+        percent = 100 if pages < SMALL_TABLE_PAGES else SAMPLE_PERCENT
+
+        columns_sql = sql.SQL(', ').join(sql.Identifier(col) for col in columns)
+        query = sql.SQL(
+            "SELECT COUNT(*), COUNT(DISTINCT ({columns})) "
+            "FROM {table} TABLESAMPLE SYSTEM ({percent})"
+        ).format(
+            columns=columns_sql,
+            table=sql.Identifier(self.schema, table_name),
+            percent=sql.Literal(percent),
+        )
+        try:
+            self.cursor.execute(query)
+            sample_rows, sample_distinct = self.cursor.fetchone()
+        except psycopg2.Error:
+            if not self.cursor.connection.autocommit:
+                self.cursor.connection.rollback()
+            raise
+
+        total_rows = round(sample_rows * 100 / percent)
+        ratio = sample_distinct / sample_rows if sample_rows else 1.0
+        return total_rows, round(ratio * total_rows), ratio, 'tablesample'
+
+    def _estimate(self, table_name, columns):
+        total_rows = self.row_count(table_name)
+        if total_rows is None:
+            return None
+
+        if len(columns) > 1:
+            ndistinct = self.extended.get((table_name, frozenset(columns)))
+            if ndistinct is not None:
+                return total_rows, ndistinct, 'pg_stats_ext'
+
+        distinct_values = 1
+        for column in columns:
+            stats = self.columns.get((table_name, column))
+            column_distinct = resolve_n_distinct(stats and stats['n_distinct'], total_rows)
+            if column_distinct is None:
+                return None
+            distinct_values *= column_distinct
+
+        # Sans statistique étendue : produit des cardinalités, borné par le nombre de lignes
+        distinct_values = min(distinct_values, total_rows)
+        return total_rows, distinct_values, 'pg_stats'
+
+    def cardinality(self, table_name, columns):
+        """
+        Cardinalité estimée d'une colonne ou d'un groupe de colonnes.
+
+        :param table_name: nom de la table
+        :param columns: liste des colonnes (dans l'ordre de l'index)
+        :return: tuple (total_rows, distinct_values, cardinality_ratio, source)
+        """
+        key = (table_name, tuple(columns))
+        if key in self._cardinality:
+            return self._cardinality[key]
+
+        estimate = self._estimate(table_name, columns)
+        if estimate is not None:
+            total_rows, distinct_values, source = estimate
+            ratio = distinct_values / total_rows if total_rows > 0 else 1.0
+            result = (total_rows, round(distinct_values), ratio, source)
+        else:
+            result = self._sample(table_name, columns)
+
+        self._cardinality[key] = result
+        return result
+
+
+def get_column_statistics(cursor, schema_name='public'):
+    """
+    Retourne les statistiques du schéma, chargées une seule fois par base.
+
+    :param cursor: curseur psycopg2 connecté à PostgreSQL
+    :param schema_name: schéma analysé
+    :return: ColumnStatistics
+    """
+    key = (cursor.connection.dsn, schema_name)
+    statistics = _STATISTICS.get(key)
+    if statistics is None:
+        statistics = _STATISTICS[key] = ColumnStatistics(cursor, schema_name)
+    else:
+        # Curseur courant pour les éventuels échantillonnages
+        statistics.cursor = cursor
+    return statistics
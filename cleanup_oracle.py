@@ -1,5 +1,7 @@
 import oracledb
 
+from oracle_batch import execute_ddl_batch, print_batch_report
+
 # Configuration de la connexion Oracle
 ORACLE_CONFIG = {
     'user': 'C##TEST',
@@ -7,18 +9,17 @@ ORACLE_CONFIG = {
     'dsn': 'localhost:1521/PROJET'
 }
 
-def run_sql(cursor, sql):
-    try:
-        cursor.execute(sql)
-        print(f"OK: {sql}")
-    except Exception as e:
-        print(f"Erreur lors de l'exécution de: {sql}\n  → {e}")
+def run_batch(cursor, title, items):
+    """Exécute un lot d'instructions et n'affiche que le bilan et les erreurs."""
+    print(title)
+    results = execute_ddl_batch(cursor, items)
+    print_batch_report(results)
+    return results
 
 def drop_all_objects():
     conn = oracledb.connect(**ORACLE_CONFIG)
     cursor = conn.cursor()
 
-    print("Désactivation des contraintes Foreign Key...")
     cursor.execute("""
         SELECT constraint_name, table_name
         FROM user_constraints
@@ -26,47 +27,56 @@ def drop_all_objects():
         ORDER BY table_name
     """)
     fk_constraints = cursor.fetchall()
-    for constraint_name, table_name in fk_constraints:
-        run_sql(cursor, f'ALTER TABLE "{table_name}" DISABLE CONSTRAINT "{constraint_name}"')
+    run_batch(cursor, "Désactivation des contraintes Foreign Key...", [
+        (f"{table_name}.{constraint_name}", f'ALTER TABLE "{table_name}" DISABLE CONSTRAINT "{constraint_name}"')
+        for constraint_name, table_name in fk_constraints
+    ])
     conn.commit()
 
-    print("Suppression des vues...")
     cursor.execute("SELECT view_name FROM user_views")
-    for (view_name,) in cursor.fetchall():
-        run_sql(cursor, f'DROP VIEW "{view_name}" CASCADE CONSTRAINTS')
+    run_batch(cursor, "Suppression des vues...", [
+        (view_name, f'DROP VIEW "{view_name}" CASCADE CONSTRAINTS')
+        for (view_name,) in cursor.fetchall()
+    ])
 
-    print("Suppression des tables...")
     cursor.execute("SELECT table_name FROM user_tables")
-    for (table_name,) in cursor.fetchall():
-        run_sql(cursor, f'DROP TABLE "{table_name}" CASCADE CONSTRAINTS PURGE')
+    run_batch(cursor, "Suppression des tables...", [
+        (table_name, f'DROP TABLE "{table_name}" CASCADE CONSTRAINTS PURGE')
+        for (table_name,) in cursor.fetchall()
+    ])
 
-    print("Suppression des séquences utilisateur...")
     cursor.execute("SELECT sequence_name FROM user_sequences WHERE sequence_name NOT LIKE 'SYS_LOB%'")
-    for (seq_name,) in cursor.fetchall():
-        run_sql(cursor, f'DROP SEQUENCE "{seq_name}"')
+    run_batch(cursor, "Suppression des séquences utilisateur...", [
+        (seq_name, f'DROP SEQUENCE "{seq_name}"')
+        for (seq_name,) in cursor.fetchall()
+    ])
 
-    print("Suppression des synonymes...")
     cursor.execute("SELECT synonym_name FROM user_synonyms")
-    for (syn_name,) in cursor.fetchall():
-        run_sql(cursor, f'DROP SYNONYM "{syn_name}"')
+    run_batch(cursor, "Suppression des synonymes...", [
+        (syn_name, f'DROP SYNONYM "{syn_name}"')
+        for (syn_name,) in cursor.fetchall()
+    ])
 
-    print("Suppression des triggers...")
     cursor.execute("SELECT trigger_name FROM user_triggers")
-    for (trigger_name,) in cursor.fetchall():
-        run_sql(cursor, f'DROP TRIGGER "{trigger_name}"')
+    run_batch(cursor, "Suppression des triggers...", [
+        (trigger_name, f'DROP TRIGGER "{trigger_name}"')
+        for (trigger_name,) in cursor.fetchall()
+    ])
 
-    print("Suppression des procédures et fonctions...")
     cursor.execute("""
         SELECT object_name, object_type
         FROM user_objects
         WHERE object_type IN ('PROCEDURE', 'FUNCTION')
     """)
-    for object_name, object_type in cursor.fetchall():
-        run_sql(cursor, f'DROP {object_type} "{object_name}"')
+    run_batch(cursor, "Suppression des procédures et fonctions...", [
+        (object_name, f'DROP {object_type} "{object_name}"')
+        for object_name, object_type in cursor.fetchall()
+    ])
 
-    print("Réactivation des contraintes Foreign Key...")
-    for constraint_name, table_name in fk_constraints:
-        run_sql(cursor, f'ALTER TABLE "{table_name}" ENABLE CONSTRAINT "{constraint_name}"')
+    run_batch(cursor, "Réactivation des contraintes Foreign Key...", [
+        (f"{table_name}.{constraint_name}", f'ALTER TABLE "{table_name}" ENABLE CONSTRAINT "{constraint_name}"')
+        for constraint_name, table_name in fk_constraints
+    ])
     conn.commit()
 
     cursor.close()
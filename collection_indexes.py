@@ -3,17 +3,37 @@ Module collection_indexes.py
 ----------------------------
 Ce module contient toutes les fonctions pour la collecte, l'analyse, 
 la manipulation et la conversion des index PostgreSQL vers Oracle,
-avec analyse intelligente de la cardinalité pour les index BITMAP.
+avec analyse intelligente de la cardinalité pour les index BITMAP
+(statistiques de l'optimiseur, voir catalog_statistics).
 """
 
+import os
+
 import psycopg2
 
+from catalog_model import build_catalog, quote_identifier
+from catalog_postgres import extract_catalog
+from catalog_statistics import get_column_statistics
+from generate_ddl_v2 import render_index, compression_clause
+from index_planner import plan_indexes, print_index_plan, TIERS
+from index_translation import (
+    TEXT_PREFERENCES_DDL, classify_index, oracle_type_bytes, uses_substring_wordlist,
+)
+from index_compression import index_compression, format_savings
+
+
+BASE_DIR = r"D:\MEMOIRE\PROJET"
+# Script des index créés après le chargement (étape 4b de migration_complete.py),
+# distinct de schemas_oracle_post_load.sql (index des FK, generate_migration.py)
+POST_LOAD_FILE = os.path.join(BASE_DIR, "schemas_oracle_post_load_indexes.sql")
+
 
-def collect_postgresql_indexes(cursor):
+def collect_postgresql_indexes(cursor, schema_name='public'):
     """
     Récupère tous les index PostgreSQL avec leurs détails et affiche les résultats.
     
     :param cursor: curseur psycopg2 connecté à PostgreSQL
+    :param schema_name: schéma PostgreSQL
     :return: liste des index récupérés
     """
     query = """
@@ -25,17 +45,21 @@ def collect_postgresql_indexes(cursor):
         am.amname AS index_type,
         array_agg(a.attname ORDER BY a.attnum) AS indexed_columns
     FROM pg_indexes i
-    JOIN pg_class c ON c.relname = i.indexname
+    JOIN pg_namespace n ON n.nspname = i.schemaname
+    JOIN pg_class c ON c.relname = i.indexname AND c.relnamespace = n.oid
     JOIN pg_index idx ON idx.indexrelid = c.oid
     JOIN pg_class t ON t.oid = idx.indrelid
     JOIN pg_am am ON am.oid = c.relam
     LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(idx.indkey)
-    WHERE i.schemaname = 'public'
+    WHERE i.schemaname = %s
+      -- Mêmes tables que le catalogue : ni partitions ni vues matérialisées
+      AND t.relkind IN ('r', 'p')
+      AND NOT t.relispartition
     GROUP BY i.schemaname, i.tablename, i.indexname, i.indexdef, am.amname
     ORDER BY i.tablename, i.indexname;
     """
     
-    cursor.execute(query)
+    cursor.execute(query, (schema_name,))
     indexes = cursor.fetchall()
     
     # Affichage des résultats
@@ -44,7 +68,7 @@ def collect_postgresql_indexes(cursor):
     print(f"{'='*80}\n")
     
     if not indexes:
-        print("Aucun index trouvé dans le schéma 'public'.\n")
+        print(f"Aucun index trouvé dans le schéma '{schema_name}'.\n")
         return indexes
     
     print(f"Nombre total d'index trouvés : {len(indexes)}\n")
@@ -158,37 +182,43 @@ def analyze_indexes(indexes):
     }
 
 
-def analyze_column_cardinality(cursor, table_name, column_name):
+def analyze_column_cardinality(cursor, table_name, column_name, schema_name='public'):
     """
     Analyse la cardinalité d'une colonne pour déterminer si un index BITMAP est approprié.
+    Utilise les statistiques de l'optimiseur (pg_class.reltuples, pg_stats.n_distinct)
+    au lieu d'un parcours complet de la table.
     
     :param cursor: curseur psycopg2
     :param table_name: nom de la table
     :param column_name: nom de la colonne
+    :param schema_name: schéma PostgreSQL
     :return: tuple (total_rows, distinct_values, cardinality_ratio)
     """
+    total_rows, distinct_values, cardinality_ratio, _ = analyze_columns_cardinality(
+        cursor, table_name, [column_name], schema_name
+    )
+    return total_rows, distinct_values, cardinality_ratio
+
+
+def analyze_columns_cardinality(cursor, table_name, columns, schema_name='public'):
+    """
+    Analyse la cardinalité d'un groupe de colonnes (index multi-colonnes).
+    Les statistiques du schéma sont chargées une fois et les résultats mémorisés.
+    
+    :param cursor: curseur psycopg2
+    :param table_name: nom de la table
+    :param columns: liste des colonnes indexées
+    :param schema_name: schéma PostgreSQL
+    :return: tuple (total_rows, distinct_values, cardinality_ratio, source)
+    """
     try:
-        # Récupérer le nombre total de lignes
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        total_rows = cursor.fetchone()[0]
-        
-        # Récupérer le nombre de valeurs distinctes
-        cursor.execute(f"SELECT COUNT(DISTINCT {column_name}) FROM {table_name}")
-        distinct_values = cursor.fetchone()[0]
-        
-        # Calculer le ratio de cardinalité
-        if total_rows > 0:
-            cardinality_ratio = distinct_values / total_rows
-        else:
-            cardinality_ratio = 1.0
-        
-        return total_rows, distinct_values, cardinality_ratio
+        return get_column_statistics(cursor, schema_name).cardinality(table_name, list(columns))
     except Exception as e:
-        print(f"⚠ Erreur analyse cardinalité pour {table_name}.{column_name}: {e}")
-        return 0, 0, 1.0
+        print(f"⚠ Erreur analyse cardinalité pour {table_name}.{', '.join(columns)}: {e}")
+        return 0, 0, 1.0, 'erreur'
 
 
-def should_use_bitmap_index(cursor, table_name, columns):
+def should_use_bitmap_index(cursor, table_name, columns, schema_name='public'):
     """
     Détermine si un index BITMAP est approprié basé sur la cardinalité.
     
@@ -200,24 +230,26 @@ def should_use_bitmap_index(cursor, table_name, columns):
     :param cursor: curseur psycopg2
     :param table_name: nom de la table
     :param columns: liste des colonnes indexées
+    :param schema_name: schéma PostgreSQL
     :return: tuple (should_use_bitmap, recommendation_message)
     """
     if not columns or len(columns) == 0:
         return False, "Colonnes non définies, utilisation BTREE par défaut"
     
-    # Analyser la première colonne (pour simplifier)
-    column_name = columns[0] if isinstance(columns, list) else columns
+    # Toutes les colonnes de l'index (statistiques étendues si disponibles)
+    columns = columns if isinstance(columns, (list, tuple)) else [columns]
     
     try:
-        total_rows, distinct_values, cardinality_ratio = analyze_column_cardinality(
-            cursor, table_name, column_name
+        total_rows, distinct_values, cardinality_ratio, source = analyze_columns_cardinality(
+            cursor, table_name, columns, schema_name
         )
+        details = f"{distinct_values} valeurs distinctes sur {total_rows} lignes, source: {source}"
         
         # Règles de décision
         if cardinality_ratio < 0.05:  # Moins de 5% de valeurs distinctes
-            return True, f"BITMAP recommandé (cardinalité: {cardinality_ratio:.2%}, {distinct_values} valeurs distinctes sur {total_rows} lignes)"
+            return True, f"BITMAP recommandé (cardinalité: {cardinality_ratio:.2%}, {details})"
         elif cardinality_ratio > 0.20:  # Plus de 20% de valeurs distinctes
-            return False, f"BTREE recommandé (cardinalité: {cardinality_ratio:.2%}, {distinct_values} valeurs distinctes sur {total_rows} lignes)"
+            return False, f"BTREE recommandé (cardinalité: {cardinality_ratio:.2%}, {details})"
         else:
             return False, f"BTREE par défaut (cardinalité: {cardinality_ratio:.2%}, analyse manuelle recommandée)"
     
@@ -225,84 +257,144 @@ def should_use_bitmap_index(cursor, table_name, columns):
         return False, f"Erreur d'analyse: {str(e)}, utilisation BTREE par défaut"
 
 
-def convert_index_type_with_analysis(cursor, pg_index_type, table_name, columns):
+# Forme Oracle (index_translation.classify_index) -> type affiché par ce module
+ORACLE_INDEX_TYPES = {
+    'btree': 'BTREE',
+    'function_based': 'FUNCTION_BASED',
+    'json_search': 'JSON_SEARCH',
+    'text_context': 'CONTEXT',
+    'zone_map': 'CLUSTERING',
+    'untranslated': 'NONE',
+}
+
+
+def is_scalar_gin(index, table):
+    """
+    Vrai pour un GIN sur une colonne scalaire (opclasses btree_gin) : sans
+    équivalent inversé, il devient un BITMAP ou un B-tree selon la cardinalité.
+    """
+    if index.index_type != 'gin' or index.has_expressions or len(index.key_columns) != 1:
+        return False
+    column = table.column(index.key_columns[0])
+    return (column is not None and column.data_type != 'ARRAY'
+            and oracle_type_bytes(column.oracle_type) is not None)
+
+
+def convert_index_type_with_analysis(cursor, index, table, schema_name='public'):
     """
-    Convertit le type d'index PostgreSQL vers Oracle avec analyse intelligente.
+    Convertit le type d'index PostgreSQL vers Oracle avec analyse intelligente :
+    même classification que generate_ddl_v2 (index_translation.classify_index,
+    types des colonnes lus dans le catalogue), plus l'analyse de cardinalité
+    des GIN sur colonnes scalaires (BITMAP).
     
     :param cursor: curseur psycopg2
-    :param pg_index_type: type d'index PostgreSQL
-    :param table_name: nom de la table
-    :param columns: colonnes indexées
+    :param index: Index du catalogue
+    :param table: Table de l'index
+    :param schema_name: schéma PostgreSQL (statistiques de cardinalité)
     :return: tuple (oracle_type, recommendation)
     """
-    # Pour les index GIN (généralement sur colonnes à faible cardinalité)
-    if pg_index_type.lower() == 'gin':
-        use_bitmap, message = should_use_bitmap_index(cursor, table_name, columns)
-        if use_bitmap:
+    kind, reason = classify_index(index, table)
+    if kind == 'untranslated' and is_scalar_gin(index, table):
+        use_bitmap, message = should_use_bitmap_index(cursor, table.name, list(index.key_columns), schema_name)
+        if use_bitmap and not index.unique:
             return 'BITMAP', message
-        else:
-            return 'BTREE', message
-    
-    # Pour les autres types, utiliser le mapping standard
-    index_type_mapping = {
-        'btree': ('BTREE', 'Type standard Oracle (B-tree)'),
-        'hash': ('BTREE', 'Hash non supporté en Oracle, conversion en BTREE'),
-        'gist': ('BTREE', 'GiST converti en BTREE (recherche spatiale non supportée directement)'),
-        'spgist': ('BTREE', 'SP-GiST converti en BTREE'),
-        'brin': ('BTREE', 'BRIN converti en BTREE (Block Range Index non supporté)')
-    }
-    
-    oracle_type, message = index_type_mapping.get(pg_index_type.lower(), ('BTREE', 'Type inconnu, utilisation BTREE par défaut'))
-    return oracle_type, message
+        return 'BTREE', message
+    return ORACLE_INDEX_TYPES[kind], reason
 
 
-def generate_oracle_index_ddl_smart(cursor, index_name, table_name, columns, pg_index_type, unique=False):
+def generate_oracle_index_ddl_smart(cursor, index, table, schema_name='public'):
     """
-    Génère le DDL Oracle pour un index avec analyse intelligente.
+    Génère le DDL Oracle pour un index avec analyse intelligente
+    (DDL de generate_ddl_v2.render_index, sauf BITMAP).
     
     :param cursor: curseur psycopg2
-    :param index_name: nom de l'index
-    :param table_name: nom de la table
-    :param columns: liste des colonnes indexées
-    :param pg_index_type: type d'index PostgreSQL
-    :param unique: True si l'index est unique
-    :return: tuple (ddl, recommendation)
+    :param index: Index du catalogue
+    :param table: Table de l'index
+    :param schema_name: schéma PostgreSQL
+    :return: tuple (ddl, recommendation) ; ddl vaut None pour un index
+             créé avec sa contrainte (PRIMARY KEY, UNIQUE)
     """
     # Analyse intelligente du type d'index
-    oracle_index_type, recommendation = convert_index_type_with_analysis(
-        cursor, pg_index_type, table_name, columns
-    )
-    
-    unique_clause = "UNIQUE " if unique else ""
-    columns_str = ", ".join(columns) if isinstance(columns, list) else columns
+    oracle_index_type, recommendation = convert_index_type_with_analysis(cursor, index, table, schema_name)
+    columns_str = ", ".join(quote_identifier(col) for col in index.key_columns)
     
-    # Les index BITMAP ne peuvent pas être UNIQUE
-    if oracle_index_type == 'BITMAP' and unique:
-        oracle_index_type = 'BTREE'
-        recommendation += " (UNIQUE index converti en BTREE car BITMAP ne supporte pas UNIQUE)"
-    
-    # Génération du DDL
+    if oracle_index_type == 'NONE':
+        return f"-- {index.name} non migré ({table.name}: {columns_str})\n", recommendation
     if oracle_index_type == 'BITMAP':
-        ddl = f"CREATE BITMAP INDEX {index_name}\n"
-        ddl += f"  ON {table_name} ({columns_str});\n"
-    else:
-        ddl = f"CREATE {unique_clause}INDEX {index_name}\n"
-        ddl += f"  ON {table_name} ({columns_str});\n"
-    
+        ddl = f"CREATE BITMAP INDEX {index.quoted_name}\n"
+        ddl += f"  ON {table.quoted_name} ({columns_str});\n"
+        return ddl, recommendation
+    if oracle_index_type == 'BTREE' and index.index_type == 'gin':
+        unique_clause = "UNIQUE " if index.unique else ""
+        ddl = f"CREATE {unique_clause}INDEX {index.quoted_name}\n"
+        ddl += f"  ON {table.quoted_name} ({columns_str}){compression_clause(index)};\n"
+        return ddl, recommendation
+    
+    if oracle_index_type in ('BTREE', 'FUNCTION_BASED'):
+        compression = index_compression(index)
+        if compression:
+            recommendation += (f" ; {compression['clause']} ({compression['reason']}, "
+                               f"gain estimé {format_savings(compression)})")
+    ddl = render_index(index, table)
+    if ddl is None:
+        return None, "index créé avec sa contrainte"
+    ddl += "\n"
+    if oracle_index_type == 'CONTEXT' and uses_substring_wordlist(index):
+        # Préférence WORDLIST des index de sous-chaînes (bloc idempotent)
+        ddl = f"{TEXT_PREFERENCES_DDL}\n{ddl}"
     return ddl, recommendation
 
 
-def generate_indexes_ddl(connection_params):
+def catalog_index_map(catalog):
+    """Index du catalogue par (table, nom d'index), avec leur table."""
+    return {
+        (table.name, index.name): (index, table)
+        for table in catalog.tables.values() for index in table.indexes
+    }
+
+
+def split_constraint_indexes(indexes_data, catalog_indexes):
+    """
+    Sépare les index créés avec leur contrainte (PRIMARY KEY, UNIQUE) des
+    index à convertir, d'après le catalogue (Index.primary, Index.constraint)
+    et non d'après le nom : un index UNIQUE sans contrainte est un index
+    autonome à convertir.
+
+    :param indexes_data: catégories de analyze_indexes
+    :param catalog_indexes: index du catalogue (voir catalog_index_map)
+    :return: tuple (index de contraintes, index à convertir, index absents du catalogue)
+    """
+    auto_indexes, converted_indexes, missing_indexes = [], [], []
+    for category in ('primary_key', 'unique', 'foreign_key', 'manual'):
+        for idx in indexes_data.get(category, []):
+            entry = catalog_indexes.get((idx['table'], idx['name']))
+            if entry is None:
+                missing_indexes.append(idx)
+            elif entry[0].primary or entry[0].constraint:
+                auto_indexes.append(idx)
+            else:
+                converted_indexes.append(idx)
+    return auto_indexes, converted_indexes, missing_indexes
+
+
+def generate_indexes_ddl(connection_params, post_load_file=None, schema_name='public'):
     """
     Fonction principale pour générer les DDL Oracle des index avec analyse intelligente.
     Collecte, analyse et convertit tous les index PostgreSQL.
+
+    Avec post_load_file, les index du niveau « après le chargement » sont
+    écrits dans ce fichier (POST_LOAD_FILE, exécuté par l'étape 4b de
+    migration_complete.py) au lieu d'être affichés avec les autres.
     
     :param connection_params: paramètres de connexion PostgreSQL
+    :param post_load_file: script des index créés après le chargement (None : tout afficher)
+    :param schema_name: schéma PostgreSQL
     """
-    with psycopg2.connect(**connection_params) as conn:
+    conn = psycopg2.connect(**connection_params)
+    try:
         with conn.cursor() as cursor:
             # Étape 1 : Collecter les index
-            indexes = collect_postgresql_indexes(cursor)
+            indexes = collect_postgresql_indexes(cursor, schema_name)
             
             if not indexes:
                 print("✓ Aucun index à traiter.\n")
@@ -311,11 +403,16 @@ def generate_indexes_ddl(connection_params):
             # Étape 2 : Analyser et catégoriser
             indexes_data = analyze_indexes(indexes)
             
-            # Étape 3 : Gérer les index automatiques
-            auto_indexes = (
-                indexes_data.get('primary_key', []) + 
-                indexes_data.get('unique', [])
-            )
+            # Catalogue (types des colonnes, statistiques des index), lu une fois
+            catalog = build_catalog(extract_catalog(cursor, schema_name))
+            catalog_indexes = catalog_index_map(catalog)
+            
+            # Étape 3 : Classer selon l'usage réel (pg_stat_user_indexes, pg_stat_statements)
+            plan = plan_indexes(cursor, schema_name)
+            print_index_plan(plan)
+            
+            # Étape 4 : Gérer les index automatiques (portés par une contrainte)
+            auto_indexes, manual_indexes, missing_indexes = split_constraint_indexes(indexes_data, catalog_indexes)
             
             if auto_indexes:
                 print(f"\n{'='*80}")
@@ -323,54 +420,95 @@ def generate_indexes_ddl(connection_params):
                 print(f"{'='*80}\n")
                 
                 for idx in auto_indexes:
+                    index, _ = catalog_indexes[(idx['table'], idx['name'])]
+                    constraint = "PRIMARY KEY" if index.primary else f"UNIQUE {index.constraint}"
                     print(f"❌ Index '{idx['name']}' sur table '{idx['table']}'")
-                    print(f"   → NE PAS CRÉER : sera créé automatiquement avec la contrainte {idx['type'].upper()}\n")
+                    print(f"   → NE PAS CRÉER : sera créé automatiquement avec la contrainte {constraint}\n")
+            
+            for idx in missing_indexes:
+                print(f"⚠ Index '{idx['name']}' ignoré : table '{idx['table']}' absente du catalogue")
             
-            # Étape 4 : Convertir les index manuels et de clés étrangères
-            manual_indexes = (
-                indexes_data.get('manual', []) + 
-                indexes_data.get('foreign_key', [])
-            )
+            # Étape 5 : Convertir les autres index, par niveau
+            tier_titles = {
+                'create_now': "INDEX À CRÉER AVEC LES TABLES",
+                'create_after_load': "INDEX À CRÉER APRÈS LE CHARGEMENT DES DONNÉES",
+                'skip_candidate': "INDEX NON UTILISÉS (DDL EN COMMENTAIRE)",
+            }
+            post_load_ddl = []
             
-            if manual_indexes:
+            for tier in TIERS:
+                tier_indexes = [
+                    idx for idx in manual_indexes
+                    if plan.get(idx['name'], {}).get('tier', 'create_after_load') == tier
+                ]
+                if not tier_indexes:
+                    continue
+                
                 print(f"\n{'='*80}")
-                print("CONVERSION DES INDEX EN ORACLE (avec analyse intelligente)")
+                print(f"CONVERSION DES INDEX EN ORACLE - {tier_titles[tier]}")
                 print(f"{'='*80}\n")
                 
-                for idx in manual_indexes:
-                    # Déterminer si l'index est unique
-                    is_unique = 'UNIQUE' in idx['definition'].upper()
+                for idx in tier_indexes:
+                    index, table = catalog_indexes[(idx['table'], idx['name'])]
                     
                     # Génération avec analyse intelligente
-                    oracle_ddl, recommendation = generate_oracle_index_ddl_smart(
-                        cursor,
-                        idx['name'],
-                        idx['table'],
-                        idx['columns'],
-                        idx['index_type'],
-                        is_unique
-                    )
+                    oracle_ddl, recommendation = generate_oracle_index_ddl_smart(cursor, index, table, schema_name)
+                    if oracle_ddl is None:
+                        continue
+                    if tier == 'skip_candidate':
+                        oracle_ddl = "\n".join(f"-- {line}" for line in oracle_ddl.splitlines()) + "\n"
+                    elif tier == 'create_after_load' and post_load_file:
+                        post_load_ddl.append(f"-- {idx['table']}.{idx['name']} : {recommendation}\n{oracle_ddl}")
+                        oracle_ddl = f"-- → {post_load_file}\n"
                     
                     print(f"-- Index PostgreSQL: {idx['name']}")
                     print(f"-- Table: {idx['table']}")
                     print(f"-- Type PostgreSQL: {idx['index_type']}")
                     print(f"-- Colonnes: {', '.join(idx['columns'])}")
                     print(f"-- Recommandation: {recommendation}")
+                    if idx['name'] in plan:
+                        print(f"-- Usage: {plan[idx['name']]['reason']}")
                     print(f"\n{oracle_ddl}")
                     print("-" * 80 + "\n")
             
+            if post_load_file:
+                write_post_load_indexes(post_load_file, post_load_ddl)
+            
             # Résumé final
             print(f"\n{'='*80}")
             print("RÉSUMÉ DE LA MIGRATION DES INDEX")
             print(f"{'='*80}")
             print(f"✓ Index automatiques ignorés : {len(auto_indexes)}")
             print(f"✓ Index manuels/FK convertis : {len(manual_indexes)}")
+            if missing_indexes:
+                print(f"⚠ Index hors catalogue ignorés : {len(missing_indexes)}")
+            for tier in TIERS:
+                count = sum(1 for idx in manual_indexes
+                            if plan.get(idx['name'], {}).get('tier', 'create_after_load') == tier)
+                print(f"    {tier:18} : {count}")
+            if post_load_file:
+                print(f"✓ Index différés écrits dans {post_load_file} : {len(post_load_ddl)}")
             print(f"\n💡 CONSEILS POST-MIGRATION :")
             print(f"   - Les index BITMAP sont optimaux pour colonnes à faible cardinalité (<5%)")
             print(f"   - Vérifiez la performance après création en environnement de test")
             print(f"   - Utilisez EXPLAIN PLAN pour valider l'utilisation des index")
             print(f"   - Surveillez les performances OLTP si vous utilisez des BITMAP")
             print(f"{'='*80}\n")
+    finally:
+        conn.close()
+
+
+def write_post_load_indexes(path, ddl_blocks):
+    """
+    Écrit les index du niveau « après le chargement » dans le script post-chargement.
+
+    :param path: fichier de destination (ex: POST_LOAD_FILE)
+    :param ddl_blocks: DDL des index, un bloc par index
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("-- INDEX À CRÉER APRÈS LE CHARGEMENT DES DONNÉES (plan d'usage)\n\n")
+        for block in ddl_blocks:
+            f.write(block + "\n")
 
 
 # Exemple d'utilisation
@@ -383,4 +521,4 @@ if __name__ == "__main__":
         'port': 5432
     }
     
-    generate_indexes_ddl(conn_params)
+    generate_indexes_ddl(conn_params, post_load_file=POST_LOAD_FILE)
@@ -322,9 +322,9 @@ def generate_oracle_function_ddl(func_name, arguments, return_type, plpgsql_defi
     
     # S'assurer qu'il y a un END; à la fin
     if not oracle_body.strip().endswith('END;'):
-        ddl += "\nEND;\n"
+        ddl += "\nEND;"
     
-    ddl += "/\n"
+    ddl += "\n/\n"
     
     return ddl
 
@@ -0,0 +1,166 @@
+"""
+Module ddl_cache.py
+-------------------
+Cache adressé par contenu du DDL Oracle converti, objet par objet.
+
+La clé de chaque entrée est un hash de la définition source de l'objet
+(tous les attributs du catalogue : colonnes, types, DEFAULT, contraintes,
+corps PL/pgSQL...) et de la version du convertisseur. La version du
+convertisseur est elle-même un hash du code des modules de conversion :
+toute modification de type_mapping ou d'un générateur invalide le cache.
+
+À la génération suivante, seuls les objets modifiés en amont sont
+reconvertis ; les autres sont repris tels quels depuis le cache.
+"""
+
+import os
+import json
+import hashlib
+import importlib
+import threading
+
+import target_profile
+
+
+DDL_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".catalog_cache", "ddl_cache.json"
+)
+
+# À incrémenter si le format des entrées change
+DDL_CACHE_VERSION = "1"
+
+# Modules dont le code détermine le DDL produit
+CONVERTER_MODULES = (
+    'type_mapping',
+    'catalog_model',
+    'generate_ddl_v2',
+    'index_expressions',
+    'index_translation',
+    'index_compression',
+    'pk_contention',
+    'uuid_storage',
+    'enum_encoding',
+    'generated_columns',
+    'target_profile',
+    'collection_type_enum',
+    'collections_views',
+    'collection_triggers',
+    'collections_functions_procedures',
+)
+
+# Statistiques d'activité sans effet sur le DDL de l'objet lui-même : les
+# décisions qui en dépendent sont passées explicitement au renderer
+VOLATILE_SLOTS = {
+    'Table': ('statistics',),
+}
+
+
+def converter_version():
+    """Hash du code des modules de conversion, de la version du format et de la version Oracle cible."""
+    digest = hashlib.sha256(f"{DDL_CACHE_VERSION}:{target_profile.TARGET}".encode())
+    for name in CONVERTER_MODULES:
+        module = importlib.import_module(name)
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _source_state(value):
+    """Représentation stable d'un objet du catalogue (attributs __slots__ publics)."""
+    slots = getattr(type(value), '__slots__', None)
+    if slots is not None:
+        volatile = VOLATILE_SLOTS.get(type(value).__name__, ())
+        return (type(value).__name__,) + tuple(
+            (slot, _source_state(getattr(value, slot)))
+            for slot in slots if not slot.startswith('_') and slot not in volatile
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_source_state(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _source_state(item)) for key, item in value.items()))
+    return value
+
+
+class DdlCache:
+    """Cache du DDL rendu par objet, avec compteurs reconstruits / réutilisés."""
+
+    def __init__(self, path=DDL_CACHE_FILE, entries=None, version=None):
+        self.path = path
+        self.version = version or converter_version()
+        self.entries = entries if entries is not None else {}
+        self.used = {}
+        self.stats = {}
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DDL_CACHE_FILE):
+        """Charge le cache ; il est ignoré si le convertisseur a changé."""
+        version = converter_version()
+        entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                if payload.get("converter") == version:
+                    entries = payload.get("entries", {})
+                else:
+                    print("ℹ️ Convertisseur modifié : cache DDL invalidé")
+            except (OSError, ValueError) as e:
+                print(f"⚠ Cache DDL illisible ignoré ({path}) : {e}")
+        return cls(path, entries, version)
+
+    def _digest(self, value):
+        if getattr(type(value), '__slots__', None) is None:
+            # Argument simple (ex: stratégie d'index de la PK) : hash direct, non mémorisé
+            return hashlib.sha256(repr(_source_state(value)).encode()).hexdigest()
+        # Les objets du catalogue vivent toute l'exécution : hash calculé une fois.
+        # L'objet est conservé avec son hash, son id ne peut donc pas être réattribué.
+        entry = self._digests.get(id(value))
+        if entry is None or entry[0] is not value:
+            entry = (value, hashlib.sha256(repr(_source_state(value)).encode()).hexdigest())
+            self._digests[id(value)] = entry
+        return entry[1]
+
+    def render(self, renderer, *objects):
+        """
+        Retourne le DDL des objets via le cache, ou l'obtient avec renderer.
+
+        :param renderer: fonction de rendu (ex: generate_ddl_v2.render_table)
+        :param objects: objets du catalogue passés au renderer
+        :return: DDL (ou None si l'objet ne produit pas de DDL)
+        """
+        key = hashlib.sha256(
+            "|".join([renderer.__name__, self.version] + [self._digest(obj) for obj in objects]).encode()
+        ).hexdigest()
+
+        reused = key in self.entries
+        ddl = self.entries[key] if reused else renderer(*objects)
+
+        with self._lock:
+            self.used[key] = ddl
+            counts = self.stats.setdefault(renderer.__name__, [0, 0])
+            counts[1 if reused else 0] += 1
+        return ddl
+
+    @property
+    def rebuilt(self):
+        return sum(counts[0] for counts in self.stats.values())
+
+    @property
+    def reused(self):
+        return sum(counts[1] for counts in self.stats.values())
+
+    def save(self):
+        """Enregistre les entrées utilisées par cette génération (écriture atomique)."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"converter": self.version, "entries": self.used}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def print_stats(self):
+        """Affiche le nombre d'objets reconstruits et réutilisés, par type."""
+        print(f"✓ DDL : {self.rebuilt} objet(s) reconstruit(s), {self.reused} réutilisé(s) depuis le cache")
+        for name, (rebuilt, reused) in sorted(self.stats.items()):
+            print(f"    {name:22} : {rebuilt:>5} reconstruit(s), {reused:>5} réutilisé(s)")
@@ -0,0 +1,271 @@
+"""
+Module ddl_engine.py
+--------------------
+Moteur de génération DDL Oracle parallèle, à partir du catalogue partagé.
+
+Chaque catégorie d'objets (tables, séquences, contraintes, CHECK ENUM,
+index, fonctions, vues, triggers) est rendue dans sa propre tâche et écrite
+dans son propre fichier via un writer bufferisé. Un manifeste ordonné
+(manifest.json) décrit l'ordre d'exécution des fichiers et est mis à jour
+dès qu'une catégorie est terminée : les étapes suivantes (ex: création des
+tables) peuvent démarrer sans attendre la fin de la génération complète.
+Avec un cache DDL (ddl_cache), seuls les objets modifiés sont reconvertis.
+Les catégories marquées "after_load" dans le manifeste (ex: index des clés
+étrangères) sont exécutées après le chargement des données.
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from index_translation import TEXT_PREFERENCES_DDL
+from pk_contention import pk_index_strategy
+from enum_encoding import encoded_enum_types
+from generate_ddl_v2 import (
+    render_table,
+    render_enum_lookup,
+    render_constraint,
+    render_enum_check,
+    render_index,
+    render_fk_index,
+    find_unindexed_foreign_keys,
+    needs_text_preferences,
+    render_sequence,
+    render_view,
+    render_decoding_view,
+    render_trigger,
+    render_routine,
+    render_direct,
+)
+
+
+MANIFEST_FILE = "manifest.json"
+WRITE_BUFFER_SIZE = 1024 * 1024
+DEFAULT_WORKERS = 4
+
+
+def iter_table_ddl(catalog, render=render_direct):
+    for table in catalog.tables.values():
+        yield render(render_table, table)
+
+
+def iter_enum_lookup_ddl(catalog, render=render_direct):
+    for enum_type in encoded_enum_types(catalog):
+        yield render(render_enum_lookup, enum_type)
+
+
+def iter_sequence_ddl(catalog, render=render_direct):
+    for sequence in catalog.sequences:
+        yield render(render_sequence, sequence)
+
+
+def iter_constraint_ddl(catalog, render=render_direct):
+    # PK et UNIQUE de toutes les tables avant les FK qui les référencent
+    for table in catalog.tables.values():
+        if table.primary_key:
+            yield render(render_constraint, table.primary_key, pk_index_strategy(table)[0])
+        for constraint in table.unique:
+            yield render(render_constraint, constraint)
+    for table in catalog.tables.values():
+        for constraint in table.foreign_keys:
+            yield render(render_constraint, constraint)
+
+
+def iter_enum_check_ddl(catalog, render=render_direct):
+    for table, column in catalog.iter_columns():
+        enum_type = catalog.enums.get(column.udt_name) if column.is_enum else None
+        if enum_type is not None:
+            yield render(render_enum_check, table, column, enum_type)
+
+
+def iter_index_ddl(catalog, render=render_direct):
+    if needs_text_preferences(catalog):
+        yield TEXT_PREFERENCES_DDL
+    for table in catalog.tables.values():
+        for index in table.indexes:
+            yield render(render_index, index, table)
+
+
+def iter_fk_index_ddl(catalog, render=render_direct):
+    for _, constraint in find_unindexed_foreign_keys(catalog):
+        yield render(render_fk_index, constraint)
+
+
+def iter_routine_ddl(catalog, render=render_direct):
+    for routine in catalog.routines:
+        yield render(render_routine, routine)
+
+
+def iter_view_ddl(catalog, render=render_direct):
+    for view in catalog.views:
+        yield render(render_view, view)
+
+
+def iter_decoding_view_ddl(catalog, render=render_direct):
+    for table in catalog.tables.values():
+        yield render(render_decoding_view, table)
+
+
+def iter_trigger_ddl(catalog, render=render_direct):
+    for trigger in catalog.triggers:
+        yield render(render_trigger, trigger)
+
+
+# Catégories dans l'ordre d'exécution du script Oracle
+DDL_CATEGORIES = (
+    ('tables', iter_table_ddl),
+    ('enum_lookups', iter_enum_lookup_ddl),
+    ('sequences', iter_sequence_ddl),
+    ('constraints', iter_constraint_ddl),
+    ('enum_checks', iter_enum_check_ddl),
+    ('indexes', iter_index_ddl),
+    ('fk_indexes', iter_fk_index_ddl),
+    ('functions', iter_routine_ddl),
+    ('views', iter_view_ddl),
+    ('decoding_views', iter_decoding_view_ddl),
+    ('triggers', iter_trigger_ddl),
+)
+
+
+def _write_manifest(output_dir, manifest):
+    """Écrit le manifeste de façon atomique."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _render_category(entry, renderer, catalog, output_dir, render=render_direct):
+    """
+    Rend une catégorie dans son fichier. Le fichier est écrit sous un nom
+    temporaire puis renommé : un fichier présent est toujours complet.
+    """
+    path = os.path.join(output_dir, entry["file"])
+    tmp_path = path + ".part"
+    start = time.perf_counter()
+    count = 0
+
+    with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(f"-- {entry['category'].upper()}\n\n")
+        for ddl in renderer(catalog, render):
+            if not ddl:
+                continue
+            f.write(ddl.rstrip())
+            f.write("\n\n")
+            count += 1
+
+    os.replace(tmp_path, path)
+    return count, time.perf_counter() - start
+
+
+def generate_ddl_parallel(catalog, output_dir, max_workers=DEFAULT_WORKERS, categories=DDL_CATEGORIES,
+                          cache=None, after_load=()):
+    """
+    Génère le DDL Oracle de toutes les catégories en parallèle.
+
+    :param catalog: Catalog partagé (catalog_model)
+    :param output_dir: dossier de sortie (un fichier par catégorie + manifest.json)
+    :param max_workers: nombre de catégories rendues simultanément
+    :param categories: séquence (nom, générateur) dans l'ordre d'exécution
+    :param cache: cache DDL (ddl_cache.DdlCache) ou None
+    :param after_load: catégories à exécuter après le chargement des données
+    :return: manifeste (dictionnaire)
+    """
+    render = cache.render if cache is not None else render_direct
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {
+        "schema": catalog.schema,
+        "generated": datetime.now().isoformat(timespec='seconds'),
+        "categories": [
+            {
+                "order": position,
+                "category": name,
+                "file": f"{position:02d}_{name}.sql",
+                "phase": "after_load" if name in after_load else "schema",
+                "status": "pending",
+                "statements": 0,
+                "seconds": None,
+            }
+            for position, (name, _) in enumerate(categories, 1)
+        ],
+    }
+    _write_manifest(output_dir, manifest)
+    lock = threading.Lock()
+
+    print(f"\n{'='*80}")
+    print(f"GÉNÉRATION DDL PARALLÈLE ({len(categories)} catégories, {max_workers} workers)")
+    print(f"{'='*80}\n")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_render_category, entry, renderer, catalog, output_dir, render): entry
+            for entry, (_, renderer) in zip(manifest["categories"], categories)
+        }
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                count, seconds = future.result()
+                entry.update(status="complete", statements=count, seconds=round(seconds, 3))
+                print(f"  ✅ {entry['file']:30} : {count:>6} instruction(s) en {seconds:.2f}s")
+            except Exception as e:
+                entry.update(status="error", error=str(e))
+                print(f"  ❌ {entry['file']:30} : {e}")
+            with lock:
+                _write_manifest(output_dir, manifest)
+
+    duration = time.perf_counter() - start
+    total = sum(entry["statements"] for entry in manifest["categories"])
+    print(f"\n✓ {total} instruction(s) générée(s) en {duration:.2f}s dans {output_dir}")
+    print(f"✓ Ordre d'exécution : {os.path.join(output_dir, MANIFEST_FILE)}")
+    if cache is not None:
+        cache.save()
+        cache.print_stats()
+    print(f"{'='*80}\n")
+
+    return manifest
+
+
+def read_manifest(output_dir):
+    """Relit le manifeste d'un dossier de génération."""
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_ready_files(output_dir, poll_interval=0.2, timeout=None, phase="schema"):
+    """
+    Retourne les fichiers DDL dans l'ordre du manifeste, dès que chacun est
+    complet. Permet de commencer l'exécution des tables pendant que les
+    catégories suivantes sont encore en cours de génération.
+
+    :param output_dir: dossier de génération
+    :param poll_interval: intervalle de relecture du manifeste (secondes)
+    :param timeout: délai maximal d'attente par fichier (secondes)
+    :param phase: "schema" (avant chargement) ou "after_load"
+    """
+    position = 0
+    waited = 0.0
+    while True:
+        entries = read_manifest(output_dir)["categories"]
+        if position >= len(entries):
+            return
+        entry = entries[position]
+        if entry.get("phase", "schema") != phase:
+            position += 1
+            waited = 0.0
+        elif entry["status"] == "complete":
+            yield os.path.join(output_dir, entry["file"])
+            position += 1
+            waited = 0.0
+        elif entry["status"] == "error":
+            raise RuntimeError(f"Génération en échec pour {entry['file']} : {entry.get('error')}")
+        else:
+            if timeout is not None and waited >= timeout:
+                raise TimeoutError(f"Fichier non prêt : {entry['file']}")
+            time.sleep(poll_interval)
+            waited += poll_interval
@@ -22,6 +22,8 @@ if sys.platform == 'win32':
 
 import psycopg2
 
+from catalog_cache import load_postgres_catalog
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -47,36 +49,24 @@ def detect_null_problems():
     print("="*80 + "\n")
     
     try:
+        # Colonnes NOT NULL depuis le catalogue (cache si schéma inchangé)
+        catalog = load_postgres_catalog(PG_CONFIG)
+        tables = list(catalog.tables)
+        
         conn = psycopg2.connect(**PG_CONFIG)
         cursor = conn.cursor()
         
-        # Récupérer toutes les tables
-        cursor.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_type = 'BASE TABLE'
-            ORDER BY table_name
-        """)
-        
-        tables = [row[0] for row in cursor.fetchall()]
-        
         print(f"Analyse de {len(tables)} tables...\n")
         
         problems = []
         
         for table in tables:
-            # Récupérer les colonnes NOT NULL
-            cursor.execute("""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_name = %s
-                AND table_schema = 'public'
-                AND is_nullable = 'NO'
-                ORDER BY ordinal_position
-            """, (table,))
-            
-            not_null_cols = cursor.fetchall()
+            # Colonnes NOT NULL
+            not_null_cols = [
+                (col.name, col.data_type)
+                for col in catalog.tables[table].columns
+                if not col.nullable
+            ]
             
             if not not_null_cols:
                 continue
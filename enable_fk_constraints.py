@@ -1,37 +1,22 @@
 import oracledb
 
+from oracle_batch import set_foreign_keys_status, print_batch_report
+
 ORACLE_CONFIG = {
     'user': 'C##TEST',
     'password': 'admin',
     'dsn': 'localhost:1521/PROJET'
 }
 
-def run_sql(cursor, sql):
-    """Exécute une requête SQL avec gestion d'erreur"""
-    try:
-        cursor.execute(sql)
-        print(f"OK: {sql}")
-    except Exception as e:
-        print(f"Erreur lors de l'exécution de {sql} : {e}")
-
 def enable_fk_constraints():
     """Récupère et réactive toutes les contraintes FK"""
     conn = oracledb.connect(**ORACLE_CONFIG)
     cursor = conn.cursor()
     
-    # Récupérer toutes les contraintes de type Foreign Key (R = Referential)
-    cursor.execute("""
-        SELECT constraint_name, table_name
-        FROM user_constraints
-        WHERE constraint_type = 'R'
-    """)
-    
-    fk_constraints = cursor.fetchall()
-    print(f"Réactivation de {len(fk_constraints)} contraintes FK...")
-    
-    # Activer chaque contrainte
-    for constraint_name, table_name in fk_constraints:
-        run_sql(cursor, f'ALTER TABLE "{table_name}" ENABLE CONSTRAINT "{constraint_name}"')
+    # Un seul lot pour toutes les contraintes de type Foreign Key (R = Referential)
+    results = set_foreign_keys_status(cursor, enabled=True)
+    print(f"Réactivation de {len(results)} contraintes FK")
+    print_batch_report(results)
     
     conn.commit()
     cursor.close()
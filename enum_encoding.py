@@ -0,0 +1,178 @@
+"""
+Module enum_encoding.py
+-----------------------
+Encodage compact des colonnes ENUM des tables volumineuses.
+
+Par défaut une colonne ENUM devient VARCHAR2(longueur max) avec une
+contrainte CHECK (convert_enum_to_check) : chaque ligne stocke le libellé
+complet ('PENDING_VALIDATION' : 19 octets). En mode compact (tables
+listées dans ENUM_ENCODED_TABLES, option --compact-enum de
+generate_migration.py) :
+- la colonne stocke un code NUMBER(3) (rang du libellé dans l'ENUM, à
+  partir de 1 : l'ordre des codes est celui du type PostgreSQL) et la
+  contrainte devient CHECK (colonne BETWEEN 1 AND n) ;
+- une table de correspondance "<enum>_LKP" (code, label) est générée par
+  type ENUM encodé, et la vue "<table>_V" expose les libellés ;
+- le chargement traduit chaque libellé par un dictionnaire précalculé
+  (enum_codes, encode_enum_value) ; un libellé inconnu est une erreur de
+  conversion.
+
+Les prédicats d'index partiels sur une colonne encodée ne sont pas
+traduits (ils comparent des libellés) : l'index est signalé comme non
+traduisible.
+"""
+
+ENUM_CODE_TYPE = 'NUMBER(3)'
+# Nombre maximal de libellés encodables en NUMBER(3)
+MAX_ENUM_CODES = 999
+# Octets stockés par code (longueur comprise) : 1 à 99 -> 3 octets, jusqu'à 999 -> 4
+ENUM_CODE_BYTES = 3
+ENUM_LOOKUP_SUFFIX = "_LKP"
+
+# Tables en mode compact ('*' : toutes les tables)
+ENUM_ENCODED_TABLES = set()
+
+ENUM_LABELS_QUERY = """
+    SELECT t.typname, e.enumlabel
+    FROM pg_type t
+    JOIN pg_enum e ON e.enumtypid = t.oid
+    JOIN pg_namespace n ON n.oid = t.typnamespace
+    WHERE n.nspname = %s
+    ORDER BY t.typname, e.enumsortorder
+"""
+
+
+def configure_enum_encoding(tables):
+    """
+    Enregistre les tables en mode compact (ex: ['order', 'subscription'] ou ['*']).
+
+    :param tables: liste de noms de tables
+    """
+    ENUM_ENCODED_TABLES.update(name.strip() for name in tables if name.strip())
+
+
+def is_encoded_table(table_name, tables=None):
+    tables = ENUM_ENCODED_TABLES if tables is None else tables
+    return '*' in tables or table_name in tables
+
+
+def is_encoded_column(column):
+    """Vrai si la colonne ENUM est stockée sous forme de code."""
+    return column.is_enum and column.oracle_type == ENUM_CODE_TYPE
+
+
+def enum_codes(values):
+    """Dictionnaire libellé -> code (rang à partir de 1) d'un type ENUM."""
+    return {label: code for code, label in enumerate(values, 1)}
+
+
+def encode_enum_value(codes, label):
+    """
+    Code NUMBER(3) d'un libellé ENUM au chargement.
+
+    :param codes: dictionnaire libellé -> code (voir enum_codes)
+    :param label: libellé lu dans PostgreSQL
+    :return: code du libellé
+    :raises ValueError: libellé absent du type ENUM (type modifié depuis l'extraction)
+    """
+    code = codes.get(label)
+    if code is None:
+        raise ValueError(f"libellé ENUM inconnu : {label!r}")
+    return code
+
+
+def get_enum_codes(cursor, schema_name='public'):
+    """
+    Codes de tous les types ENUM du schéma, lus en une requête.
+
+    :param cursor: curseur psycopg2
+    :param schema_name: schéma PostgreSQL
+    :return: {type ENUM: {libellé: code}}
+    """
+    cursor.execute(ENUM_LABELS_QUERY, (schema_name,))
+    labels = {}
+    for enum_name, label in cursor.fetchall():
+        labels.setdefault(enum_name, []).append(label)
+    return {enum_name: enum_codes(values) for enum_name, values in labels.items()}
+
+
+def apply_enum_encoding(catalog, tables=None):
+    """
+    Passe en code NUMBER(3) les colonnes ENUM des tables en mode compact.
+
+    :param catalog: Catalog (types et DEFAULT Oracle modifiés en place)
+    :param tables: noms des tables (défaut : ENUM_ENCODED_TABLES)
+    :return: liste des (table, colonne, type ENUM) encodées
+    """
+    encoded = []
+    for table, column in catalog.iter_columns():
+        enum_type = catalog.enums.get(column.udt_name) if column.is_enum else None
+        if enum_type is None or not enum_type.values or not is_encoded_table(table.name, tables):
+            continue
+        if len(enum_type.values) > MAX_ENUM_CODES:
+            continue
+        if is_encoded_column(column):
+            encoded.append((table, column, enum_type))
+            continue
+        column.oracle_type = ENUM_CODE_TYPE
+        if column.oracle_default:
+            code = enum_codes(enum_type.values).get(column.oracle_default.strip("'"))
+            column.oracle_default = str(code) if code is not None else None
+        encoded.append((table, column, enum_type))
+    return encoded
+
+
+def encoded_enum_types(catalog):
+    """Types ENUM utilisés par au moins une colonne encodée (tables de correspondance à créer)."""
+    names = {column.udt_name for _, column in catalog.iter_columns() if is_encoded_column(column)}
+    return [catalog.enums[name] for name in sorted(names)]
+
+
+def render_code_check(table, column, enum_type):
+    """Contrainte CHECK d'une colonne encodée (même nom que la contrainte sur les libellés)."""
+    name = f"chk_{table.name}_{column.name}"[:30]
+    return (f"ALTER TABLE {table.quoted_name} ADD CONSTRAINT {name} "
+            f"CHECK ({column.quoted_name} BETWEEN 1 AND {len(enum_type.values)});")
+
+
+def estimate_row_savings(catalog, encoded):
+    """
+    Réduction de la taille des lignes par table : libellé moyen (octet de
+    longueur compris) remplacé par un code de ENUM_CODE_BYTES octets.
+
+    :param catalog: Catalog
+    :param encoded: liste (table, colonne, type ENUM) de apply_enum_encoding
+    :return: liste de dictionnaires {table, columns, row_bytes, rows, saved_bytes} (rows None si inconnu)
+    """
+    per_table = {}
+    for table, column, enum_type in encoded:
+        average_label = sum(len(label.encode('utf-8')) for label in enum_type.values) / len(enum_type.values)
+        saving = per_table.setdefault(table.name, {
+            'table': table.name,
+            'columns': [],
+            'row_bytes': 0.0,
+            'rows': table.statistics.get('rows'),
+        })
+        saving['columns'].append(column.name)
+        saving['row_bytes'] += max(average_label + 1 - ENUM_CODE_BYTES, 0)
+
+    savings = list(per_table.values())
+    for saving in savings:
+        saving['saved_bytes'] = saving['rows'] * saving['row_bytes'] if saving['rows'] is not None else None
+    return savings
+
+
+def print_enum_encoding_report(catalog, encoded):
+    """Affiche les colonnes ENUM encodées et la réduction estimée de la taille des lignes."""
+    if not encoded:
+        return
+    savings = estimate_row_savings(catalog, encoded)
+    print(f"🔤 Colonnes ENUM encodées en {ENUM_CODE_TYPE} : {len(encoded)} "
+          f"({len(encoded_enum_types(catalog))} table(s) de correspondance)")
+    for saving in savings:
+        detail = (f", {saving['saved_bytes'] / 1024 / 1024:,.1f} Mo" if saving['saved_bytes'] is not None
+                  else ", nombre de lignes inconnu")
+        print(f"   → {saving['table']} ({', '.join(saving['columns'])}) : "
+              f"-{saving['row_bytes']:.1f} octets par ligne{detail}")
+    total = sum(saving['saved_bytes'] or 0 for saving in savings)
+    print(f"   💾 Stockage économisé estimé : {total / 1024 / 1024:,.1f} Mo")
@@ -3,12 +3,14 @@ import pandas as pd # type: ignore
 #from display_converted_types import afficher_colonnes_converties
 from collection_type_enum import collect_enum_columns, display_enum_conversion,convert_enum_to_check
 from type_mapping import  convert_type
+from catalog_postgres import extract_catalog
 
 
 
 def extract_postgres_schema(connection_params):
     """
     Extrait l'ensemble des objets du schéma PostgreSQL (tables, colonnes, clés primaires, clés étrangères, index, vues et séquences).
+    Les tables sont chargées en une seule passe via catalog_postgres (requêtes pg_catalog ensemblistes).
     Affiche les résultats dans des tableaux en console.
     """
     conn = psycopg2.connect(**connection_params)
@@ -19,24 +21,23 @@ def extract_postgres_schema(connection_params):
         "sequences": {}
     }
 
-    # Extraction des tables
-    cursor.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-    """)
-    tables = cursor.fetchall()
+    # Extraction ensembliste du catalogue (tables, colonnes, PK, FK, index)
+    catalog = extract_catalog(cursor, 'public')
 
-    for (table_name,) in tables:
+    for table_name, table in catalog["tables"].items():
         schema_data["tables"][table_name] = {}
 
-        # Extraction des colonnes
-        cursor.execute(f"""
-            SELECT column_name, data_type, character_maximum_length, numeric_precision, is_nullable
-            FROM information_schema.columns
-            WHERE table_name = '{table_name}'
-        """)
-        columns = cursor.fetchall()
+        # Colonnes
+        columns = [
+            (
+                col["name"],
+                col["data_type"],
+                col["length"],
+                col["precision"],
+                'YES' if col["nullable"] else 'NO',
+            )
+            for col in table["columns"]
+        ]
         schema_data["tables"][table_name]["columns"] = columns
 
         # Afficher les colonnes en tableau
@@ -47,77 +48,40 @@ def extract_postgres_schema(connection_params):
         print(f"\nColonnes de la table {table_name} :")
         print(columns_df)
 
-        # Extraction des clés primaires
-        cursor.execute(f"""
-            SELECT kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-            ON tc.constraint_name = kcu.constraint_name
-            WHERE tc.table_name = '{table_name}' AND tc.constraint_type = 'PRIMARY KEY'
-        """)
-        pk_columns = cursor.fetchall()
-        schema_data["tables"][table_name]["primary_key"] = [col[0] for col in pk_columns]
+        # Clés primaires
+        pk = table["primary_key"]
+        schema_data["tables"][table_name]["primary_key"] = list(pk["columns"]) if pk else []
 
         pk_df = pd.DataFrame(schema_data["tables"][table_name]["primary_key"], columns=["Colonnes clés primaires"])
         print(f"\nClé primaire de la table {table_name} :")
         print(pk_df)
 
-        # Extraction des clés étrangères
-        cursor.execute(f"""
-            SELECT
-                kcu.column_name,
-                ccu.table_name AS foreign_table,
-                ccu.column_name AS foreign_column
-            FROM information_schema.table_constraints AS tc
-            JOIN information_schema.key_column_usage AS kcu
-                ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage AS ccu
-                ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY' AND tc.table_name = '{table_name}';
-        """)
-        fk_constraints = cursor.fetchall()
+        # Clés étrangères
         schema_data["tables"][table_name]["foreign_keys"] = [
             {
-                "column": fk[0],
-                "referenced_table": fk[1],
-                "referenced_column": fk[2],
+                "column": column,
+                "referenced_table": fk["referenced_table"],
+                "referenced_column": ref_column,
             }
-            for fk in fk_constraints
+            for fk in table["foreign_keys"]
+            for column, ref_column in zip(fk["columns"], fk["referenced_columns"])
         ]
 
         fk_df = pd.DataFrame(schema_data["tables"][table_name]["foreign_keys"])
         print(f"\nClés étrangères de la table {table_name} :")
         print(fk_df if not fk_df.empty else "Aucune")
 
-        # Extraction des indexes
-        cursor.execute(f"""
-            SELECT
-                i.relname AS index_name,
-                a.attname AS column_name,
-                ix.indisunique AS is_unique,
-                ix.indisprimary AS is_primary
-            FROM
-                pg_class t,
-                pg_class i,
-                pg_index ix,
-                pg_attribute a
-            WHERE
-                t.oid = ix.indrelid
-                AND i.oid = ix.indexrelid
-                AND a.attrelid = t.oid
-                AND a.attnum = ANY(ix.indkey)
-                AND t.relkind = 'r'
-                AND t.relname = '{table_name}';
-        """)
-        indexes = cursor.fetchall()
+        # Indexes
         schema_data["tables"][table_name]["indexes"] = [
             {
-                "index_name": idx[0],
-                "column_name": idx[1],
-                "is_unique": idx[2],
-                "is_primary": idx[3],
+                "index_name": idx["name"],
+                "column_name": column,
+                "is_unique": idx["unique"],
+                "is_primary": idx["primary"],
             }
-            for idx in indexes
+            for idx in table["indexes"]
+            for column, is_expression in zip(idx["columns"], idx["expressions"])
+            if not is_expression
         ]
 
         index_df = pd.DataFrame(schema_data["tables"][table_name]["indexes"])
@@ -9,291 +9,535 @@ CORRECTIONS:
 ✅ Utilise quote_identifier pour tous les identifiants
 ✅ Génère les contraintes CHECK avec les vrais noms de colonnes
 ✅ Respecte la casse dans les contraintes et index
+✅ Catalogue PostgreSQL chargé une seule fois (catalog_model) et partagé
+✅ Index automatiques sur les colonnes de clés étrangères non indexées
+✅ Index sur expressions et index partiels traduits en index basés sur des fonctions
+✅ GIN jsonb -> JSON search index, trigrammes -> Oracle Text CONTEXT
+✅ BRIN sur colonnes ordonnées -> clustering d'attributs / zone maps (sans B-tree)
+✅ Colonnes INCLUDE conservées en fin de clé (parcours d'index seul)
 """
 
-import psycopg2
-import re
+import hashlib
 
 # Import des modules
-from type_mapping import (
-    convert_type,
-    initialize_enum_conversion,
-    clean_default_value
+from catalog_model import load_catalog, quote_identifier
+
+from collection_type_enum import convert_enum_to_check
+from collections_views import generate_oracle_view_ddl, generate_oracle_materialized_view_ddl
+from collection_triggers import generate_oracle_trigger_ddl
+from collections_functions_procedures import generate_oracle_function_ddl
+from index_expressions import translate_index_keys
+from index_translation import (
+    INDEX_KINDS, TEXT_PREFERENCES_DDL, JSON_TYPES, classify_index, uses_substring_wordlist,
+    render_json_search_index, render_text_index, render_zone_map, estimate_btree_bytes,
+    check_index_width,
 )
+from index_compression import index_compression, recommend_compression, format_savings
+from pk_contention import pk_index_strategy, render_pk_index_clause
+from uuid_storage import raw_uuid_columns, uuid_text_expression
+from generated_columns import render_virtual_clause
+from enum_encoding import ENUM_LOOKUP_SUFFIX, is_encoded_column, encoded_enum_types, render_code_check
 
-from collection_type_enum import collect_enum_columns, get_enum_values, convert_enum_to_check
+# Vue des tables dont des colonnes sont stockées encodées (UUID RAW(16), codes ENUM)
+DECODING_VIEW_SUFFIX = "_V"
 
-def quote_identifier(name):
+def truncate_constraint_name(name, max_length=30):
+    """Tronque un nom de contrainte pour Oracle (max 30 caractères)"""
+    if len(name) <= max_length:
+        return name
+    return name[:max_length]
+
+def render_table(table):
+    """Retourne le CREATE TABLE Oracle d'une table du catalogue"""
+    col_defs = []
+    for column in table.columns:
+        default_clause = f" DEFAULT {column.oracle_default}" if column.oracle_default else ""
+        nullable = "" if column.nullable else " NOT NULL"
+        # Colonnes JSON stockées en texte contrôlées IS JSON (prérequis des
+        # JSON search index) ; le type JSON natif (21c+) est validé par Oracle
+        is_json = (f" CHECK ({column.quoted_name} IS JSON)"
+                   if column.udt_name in JSON_TYPES and column.oracle_type != 'JSON' else "")
+        # Colonne générée traduisible : colonne virtuelle (ni stockée ni chargée)
+        virtual = render_virtual_clause(column, table)
+        if virtual:
+            col_defs.append(f" {column.quoted_name} {column.oracle_type}{virtual}{nullable}")
+            continue
+        col_defs.append(f" {column.quoted_name} {column.oracle_type}{default_clause}{nullable}{is_json}")
+
+    return f"CREATE TABLE {table.quoted_name} (\n" + ",\n".join(col_defs) + "\n);"
+
+def render_constraint(constraint, pk_index='none'):
     """
-    Entoure l'identifiant de guillemets doubles pour préserver la casse
-    dans Oracle. Les guillemets doubles permettent à Oracle de respecter
-    la casse exacte du nom d'objet.
+    Retourne l'ALTER TABLE Oracle d'une contrainte PK, FK ou UNIQUE (ou None).
+    pk_index choisit l'index de la PK : 'none', 'reverse' ou 'hash' (voir pk_contention).
     """
-    if name is None:
+    if not constraint.columns:
         return None
-    return f'"{name}"'
 
-def truncate_constraint_name(name, max_length=30):
-    """Tronque un nom de contrainte pour Oracle (max 30 caractères)"""
+    safe_table_name = quote_identifier(constraint.table)
+    columns_formatted = ", ".join(quote_identifier(col) for col in constraint.columns)
+    prefix = f"ALTER TABLE {safe_table_name} ADD CONSTRAINT {constraint.quoted_name}"
+
+    if constraint.type == "PRIMARY KEY":
+        return f"{prefix} PRIMARY KEY ({columns_formatted}){render_pk_index_clause(constraint, pk_index)};"
+    if constraint.type == "UNIQUE":
+        return f"{prefix} UNIQUE ({columns_formatted});"
+    if constraint.type == "FOREIGN KEY" and constraint.referenced_columns:
+        foreign_table = quote_identifier(constraint.referenced_table)
+        foreign_columns = ", ".join(quote_identifier(col) for col in constraint.referenced_columns)
+        return f"{prefix} FOREIGN KEY ({columns_formatted}) REFERENCES {foreign_table}({foreign_columns});"
+    return None
+
+def render_enum_check(table, column, enum_type):
+    """Retourne l'ALTER TABLE ... ADD CONSTRAINT CHECK d'une colonne ENUM (ou None)"""
+    if not enum_type.values:
+        return None
+    if is_encoded_column(column):
+        return render_code_check(table, column, enum_type)
+
+    _, check_constraint = convert_enum_to_check(
+        table.name, column.name, enum_type.name, list(enum_type.values)
+    )
+    if not check_constraint:
+        return None
+
+    # ✅ PRÉSERVER LA CASSE de la colonne dans la contrainte CHECK
+    check_constraint_quoted = check_constraint.replace(
+        f"({column.name} IN", f"({column.quoted_name} IN"
+    )
+    return f"ALTER TABLE {table.quoted_name} ADD {check_constraint_quoted};"
+
+def render_index(index, table):
+    """
+    Retourne le CREATE INDEX Oracle d'un index autonome (ou None).
+    Les index sur expressions et partiels deviennent des index basés sur des fonctions,
+    les GIN jsonb des JSON search index et les index trigrammes des index Oracle Text.
+    """
+    # Les index des contraintes PK/UNIQUE sont créés avec la contrainte
+    if index.constraint or index.primary:
+        return None
+
+    kind, _ = classify_index(index, table)
+    if kind == 'untranslated':
+        # Signalé par print_index_translation_report
+        return None
+    if kind == 'json_search':
+        return render_json_search_index(index)
+    if kind == 'text_context':
+        return render_text_index(index)
+    if kind == 'zone_map':
+        return render_zone_map(index)
+
+    keys = translate_index_keys(index, table)
+    table_name = quote_identifier(index.table)
+    if index.unique and index.include_columns:
+        # Les colonnes INCLUDE ne participent pas à l'unicité : index UNIQUE sur
+        # la clé seule, plus un index couvrant pour les parcours d'index seul
+        key_part = ", ".join(keys[:index.key_count])
+        return (
+            f"CREATE UNIQUE INDEX {index.quoted_name} ON {table_name} ({key_part}){compression_clause(index)};\n"
+            + render_covering_index(index, table)
+        )
+
+    unique_clause = "UNIQUE " if index.unique else ""
+    return (
+        f"CREATE {unique_clause}INDEX {index.quoted_name} ON {table_name} "
+        f"({', '.join(keys)}){compression_clause(index)};"
+    )
+
+def covering_compression(index):
+    """Compression de l'index couvrant (non UNIQUE) d'un index UNIQUE avec INCLUDE"""
+    statistics = index.statistics
+    return recommend_compression(
+        statistics.get('rows'),
+        statistics.get('n_distinct') or [],
+        statistics.get('key_widths') or [],
+    )
+
+def compression_clause(index, covering=False):
+    """Clause COMPRESS recommandée (préfixée d'un espace), ou chaîne vide"""
+    compression = covering_compression(index) if covering else index_compression(index)
+    return f" {compression['clause']}" if compression else ""
+
+def covering_index_name(index, max_length=30):
+    """Nom de l'index couvrant (clé + INCLUDE) d'un index UNIQUE"""
+    return oracle_object_name(f"{index.name}_COV", max_length)
+
+def render_covering_index(index, table):
+    """Retourne le CREATE INDEX couvrant (clé puis colonnes INCLUDE) d'un index UNIQUE"""
+    keys = translate_index_keys(index, table)
+    return (
+        f"CREATE INDEX {quote_identifier(covering_index_name(index))} "
+        f"ON {quote_identifier(index.table)} ({', '.join(keys)}){compression_clause(index, covering=True)};"
+    )
+
+def needs_text_preferences(catalog):
+    """Vrai si un index trigramme devient un index Oracle Text (préférence WORDLIST requise)"""
+    return any(
+        uses_substring_wordlist(index) and classify_index(index, table)[0] == 'text_context'
+        for table in catalog.tables.values() for index in table.indexes
+    )
+
+def classify_indexes(catalog):
+    """Retourne les index autonomes avec leur forme Oracle : liste (table, index, type, raison)"""
+    return [
+        (table, index) + classify_index(index, table)
+        for table in catalog.tables.values()
+        for index in table.indexes
+        if not index.constraint and not index.primary
+    ]
+
+def find_untranslatable_indexes(catalog):
+    """Retourne les index sans équivalent Oracle, sous forme (table, index, raison)"""
+    return [
+        (table, index, reason)
+        for table, index, kind, reason in classify_indexes(catalog)
+        if kind == 'untranslated'
+    ]
+
+def print_index_translation_report(catalog):
+    """Affiche le nombre d'index par forme Oracle et les index non traduits"""
+    classified = classify_indexes(catalog)
+    counts = {kind: 0 for kind in INDEX_KINDS}
+    for _, _, kind, _ in classified:
+        counts[kind] += 1
+
+    print("🧮 Index traduits : " + ", ".join(f"{kind} {count}" for kind, count in counts.items()))
+    for table, index, kind, reason in classified:
+        if kind in ('json_search', 'text_context', 'zone_map'):
+            print(f"   → {table.name}.{index.name} : {reason}")
+    for table, index, kind, reason in classified:
+        if kind == 'untranslated':
+            print(f"   ⚠ {table.name}.{index.name} : {reason}")
+            print(f"      {index.definition}")
+
+    # Index couvrants (INCLUDE) et largeur de clé
+    for table, index, kind, _ in classified:
+        if kind in ('btree', 'function_based') and index.include_columns:
+            split = f" + {covering_index_name(index)}" if index.unique else ""
+            print(f"   ⊕ {table.name}.{index.name}{split} : INCLUDE ({', '.join(index.include_columns)}) "
+                  f"ajoutées en fin de clé")
+    for table, index, kind, _ in classified:
+        if kind in ('btree', 'function_based'):
+            problem = check_index_width(index, table)
+            if problem:
+                print(f"   ⚠ {table.name}.{index.name} : {problem}")
+
+    # Compression de préfixe (duplication des colonnes de tête)
+    compressed = [
+        (table, index, index_compression(index)) for table, index, kind, _ in classified
+        if kind in ('btree', 'function_based')
+    ]
+    compressed = [(table, index, compression) for table, index, compression in compressed if compression]
+    for table, index, compression in compressed:
+        print(f"   🗜 {table.name}.{index.name} : {compression['clause']}, {compression['reason']}, "
+              f"gain estimé {format_savings(compression)}")
+    if compressed:
+        saved = sum(compression['saved_bytes'] for _, _, compression in compressed)
+        print(f"   💾 Gain estimé de la compression des index : {saved / 1024 / 1024:,.1f} Mo")
+
+    # BRIN sans B-tree équivalent : stockage évité
+    avoided = [
+        estimate_btree_bytes(index) for _, index, kind, _ in classified
+        if index.index_type == 'brin' and kind in ('zone_map', 'untranslated')
+    ]
+    if any(avoided):
+        print(f"   💾 Stockage B-tree évité (BRIN) : {sum(b for b in avoided if b) / 1024 / 1024:,.1f} Mo")
+    return [(table, index, reason) for table, index, kind, reason in classified if kind == 'untranslated']
+
+def oracle_index_keys(table):
+    """
+    Colonnes de tête des index présents dans Oracle après migration :
+    index PK/UNIQUE des contraintes et index autonomes rendus par render_index.
+    """
+    keys = []
+    for constraint in ([table.primary_key] if table.primary_key else []) + table.unique:
+        keys.append(constraint.columns)
+    for index in table.indexes:
+        if not index.constraint and not index.primary and classify_index(index, table)[0] == 'btree':
+            keys.append(index.columns)
+    return keys
+
+def is_foreign_key_indexed(table, constraint):
+    """
+    Une FK est couverte si ses colonnes sont les colonnes de tête d'un index
+    (dans n'importe quel ordre) : sinon Oracle verrouille la table fille et la
+    parcourt entièrement à chaque suppression/mise à jour de clé parente.
+    """
+    fk_columns = set(constraint.columns)
+    return any(
+        set(keys[:len(fk_columns)]) == fk_columns
+        for keys in oracle_index_keys(table)
+    )
+
+def find_unindexed_foreign_keys(catalog):
+    """Retourne les FK du catalogue sans index support, sous forme (table, contrainte)"""
+    return [
+        (table, constraint)
+        for table in catalog.tables.values()
+        for constraint in table.foreign_keys
+        if constraint.columns and not is_foreign_key_indexed(table, constraint)
+    ]
+
+def oracle_object_name(name, max_length=30):
+    """Nom d'objet Oracle (suffixe de hash si le nom doit être tronqué)"""
     if len(name) <= max_length:
         return name
-    return name[:max_length]
+    suffix = hashlib.sha1(name.encode()).hexdigest()[:6]
+    return f"{name[:max_length - 7]}_{suffix}"
+
+def fk_index_name(constraint, max_length=30):
+    """Nom de l'index support d'une FK"""
+    return oracle_object_name(f"IX_{constraint.name}", max_length)
+
+def render_fk_index(constraint):
+    """Retourne le CREATE INDEX support d'une clé étrangère"""
+    columns_formatted = ", ".join(quote_identifier(col) for col in constraint.columns)
+    return (
+        f"CREATE INDEX {quote_identifier(fk_index_name(constraint))} "
+        f"ON {quote_identifier(constraint.table)} ({columns_formatted});"
+    )
+
+def enum_lookup_name(enum_name, max_length=30):
+    """Nom de la table de correspondance code -> libellé d'un type ENUM encodé"""
+    return oracle_object_name(f"{enum_name}{ENUM_LOOKUP_SUFFIX}", max_length)
+
+def render_enum_lookup(enum_type):
+    """Retourne la table de correspondance (code, label) d'un type ENUM encodé et ses lignes"""
+    lookup = quote_identifier(enum_lookup_name(enum_type.name))
+    max_length = max(len(label) for label in enum_type.values)
+    rows = "\n".join(
+        f"INSERT INTO {lookup} (\"code\", \"label\") VALUES ({code}, '{label.replace(chr(39), chr(39) * 2)}');"
+        for code, label in enumerate(enum_type.values, 1)
+    )
+    return (
+        f"CREATE TABLE {lookup} (\n"
+        f" \"code\" NUMBER(3) PRIMARY KEY,\n"
+        f" \"label\" VARCHAR2({max_length}) NOT NULL UNIQUE\n"
+        f") ORGANIZATION INDEX;\n{rows}\nCOMMIT;"
+    )
+
+def decoding_view_name(table, max_length=30):
+    """Nom de la vue décodée d'une table (UUID RAW(16) en texte, codes ENUM en libellés)"""
+    return oracle_object_name(f"{table.name}{DECODING_VIEW_SUFFIX}", max_length)
+
+def _decoded_column(column, uuid_columns):
+    if column in uuid_columns:
+        return f"  {uuid_text_expression('t.' + column.quoted_name)} AS {column.quoted_name}"
+    if is_encoded_column(column):
+        lookup = quote_identifier(enum_lookup_name(column.udt_name))
+        return (f"  (SELECT l.\"label\" FROM {lookup} l WHERE l.\"code\" = t.{column.quoted_name}) "
+                f"AS {column.quoted_name}")
+    return f"  t.{column.quoted_name}"
+
+def render_decoding_view(table):
+    """
+    Retourne la vue exposant une table sous sa forme PostgreSQL (ou None) :
+    UUID RAW(16) en texte canonique, codes ENUM traduits par la table de correspondance.
+    """
+    uuid_columns = raw_uuid_columns(table)
+    if not uuid_columns and not any(is_encoded_column(column) for column in table.columns):
+        return None
+    select_list = ",\n".join(_decoded_column(column, uuid_columns) for column in table.columns)
+    return (
+        f"CREATE OR REPLACE VIEW {quote_identifier(decoding_view_name(table))} AS\nSELECT\n"
+        f"{select_list}\nFROM {table.quoted_name} t;"
+    )
+
+def render_sequence(sequence):
+    """Retourne le CREATE SEQUENCE Oracle d'une séquence manuelle (ou None)"""
+    # Les séquences des colonnes serial/identity sont remplacées par IDENTITY
+    if sequence.is_owned:
+        return None
 
-def generate_tables(connection_params):
+    start_value = sequence.start_value
+    if sequence.last_value is not None:
+        start_value = sequence.last_value + sequence.increment_by
+
+    clauses = [f"START WITH {start_value}", f"INCREMENT BY {sequence.increment_by}"]
+    if sequence.min_value is not None:
+        clauses.append(f"MINVALUE {sequence.min_value}")
+    if sequence.max_value is not None:
+        clauses.append(f"MAXVALUE {sequence.max_value}")
+    clauses.append("CYCLE" if sequence.cycle else "NOCYCLE")
+
+    return f"CREATE SEQUENCE {sequence.quoted_name} {' '.join(clauses)};"
+
+def render_view(view):
+    """Retourne le DDL Oracle d'une vue ou vue matérialisée"""
+    if view.materialized:
+        return generate_oracle_materialized_view_ddl(view.quoted_name, view.definition)
+    return generate_oracle_view_ddl(view.quoted_name, view.definition)
+
+def render_trigger(trigger):
+    """Retourne le DDL Oracle d'un trigger métier (ou None)"""
+    # Les triggers d'auto-incrémentation sont remplacés par IDENTITY
+    if trigger.is_auto_increment:
+        return None
+    return generate_oracle_trigger_ddl(
+        quote_identifier(trigger.name),
+        quote_identifier(trigger.table),
+        trigger.timing,
+        trigger.event,
+        trigger.function_definition or '',
+    )
+
+def render_routine(routine):
+    """Retourne le DDL Oracle d'une fonction ou procédure (ou None)"""
+    # Les fonctions trigger sont intégrées aux triggers
+    if routine.is_trigger_function:
+        return None
+    return generate_oracle_function_ddl(
+        routine.name,
+        routine.arguments,
+        None if routine.is_procedure else routine.return_type,
+        routine.definition,
+        is_procedure=routine.is_procedure,
+    )
+
+def render_direct(renderer, *objects):
+    """Rend un objet sans cache (même signature que ddl_cache.DdlCache.render)"""
+    return renderer(*objects)
+
+def generate_tables(connection_params, catalog=None, render=render_direct):
     """Génère les CREATE TABLE avec préservation de la casse"""
-    conn = psycopg2.connect(**connection_params)
-    cursor = conn.cursor()
-    initialize_enum_conversion(cursor)
-    enum_columns = collect_enum_columns(cursor)
-
-    # Créer un mapping type_enum -> VARCHAR2 type
-    enum_mapping = {}
-    for col in enum_columns:
-        enum_type = col["enum_type"]
-        if enum_type not in enum_mapping:
-            enum_values = get_enum_values(cursor, enum_type)
-            max_length = max(len(val) for val in enum_values) if enum_values else 255
-            enum_mapping[enum_type] = f"VARCHAR2({max_length})"
-
-    cursor.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-        ORDER BY table_name
-    """)
-
-    tables = [row[0] for row in cursor.fetchall()]
+    catalog = catalog or load_catalog(connection_params)
 
     print("-- CRÉATION DES TABLES")
     print()
 
-    for table in tables:
-        # ✅ PRÉSERVER LA CASSE avec guillemets doubles
-        safe_table_name = quote_identifier(table)
-
-        cursor.execute("""
-            SELECT
-                column_name, udt_name, data_type,
-                character_maximum_length, column_default,
-                numeric_precision, numeric_scale, is_nullable
-            FROM information_schema.columns
-            WHERE table_name = %s
-            ORDER BY ordinal_position
-        """, (table,))
-
-        columns = cursor.fetchall()
-
-        print(f"CREATE TABLE {safe_table_name} (")
-
-        col_defs = []
-        for row in columns:
-            column_name, udt_name, data_type = row[0], row[1], row[2]
-            char_max_len, col_default = row[3], row[4]
-            num_precision, num_scale, is_nullable = row[5], row[6], row[7]
-
-            # ✅ PRÉSERVER LA CASSE de la colonne
-            safe_column_name = quote_identifier(column_name)
-
-            # Type Oracle
-            if udt_name in enum_mapping:
-                oracle_type = enum_mapping[udt_name]
-            elif col_default and 'nextval(' in str(col_default):
-                oracle_type = convert_type('serial')
-            elif data_type in ('numeric', 'decimal') and num_precision:
-                oracle_type = f"NUMBER({num_precision},{num_scale or 0})"
-            elif char_max_len and data_type in ('character varying', 'varchar'):
-                oracle_type = f"VARCHAR2({char_max_len})"
-            elif data_type == 'uuid':
-                oracle_type = 'VARCHAR2(36)'
-            elif data_type in ('jsonb', 'json'):
-                oracle_type = 'CLOB'
-            elif data_type == 'boolean':
-                oracle_type = 'NUMBER(1)'
-            else:
-                oracle_type = convert_type(data_type)
-
-            # DEFAULT
-            default_clause = ""
-            if col_default and 'nextval(' not in str(col_default):
-                cleaned = clean_default_value(col_default)
-                if cleaned:
-                    default_clause = f" DEFAULT {cleaned}"
-
-            nullable = "" if is_nullable == 'YES' else " NOT NULL"
-
-            col_defs.append(f" {safe_column_name} {oracle_type}{default_clause}{nullable}")
-
-        print(",\n".join(col_defs))
-        print(");")
+    for table in catalog.tables.values():
+        print(render(render_table, table))
         print()
 
-    cursor.close()
-    conn.close()
-
-def generate_constraints(connection_params):
+def generate_constraints(connection_params, catalog=None, render=render_direct):
     """Génère les contraintes PRIMARY KEY, FOREIGN KEY, UNIQUE avec préservation de casse"""
-    conn = psycopg2.connect(**connection_params)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-        ORDER BY table_name
-    """)
-
-    tables = [row[0] for row in cursor.fetchall()]
+    catalog = catalog or load_catalog(connection_params)
 
     print("-- CONTRAINTES")
     print()
 
-    for table in tables:
-        # ✅ PRÉSERVER LA CASSE
-        safe_table_name = quote_identifier(table)
-
-        cursor.execute("""
-            SELECT constraint_name, constraint_type
-            FROM information_schema.table_constraints
-            WHERE table_name = %s AND table_schema = 'public'
-        """, (table,))
-
-        constraints = cursor.fetchall()
-
-        for const_name, const_type in constraints:
-            # ✅ PRÉSERVER LA CASSE du nom de contrainte
-            oracle_const_name = truncate_constraint_name(const_name)
-            safe_const_name = quote_identifier(oracle_const_name)
-
-            cursor.execute("""
-                SELECT column_name
-                FROM information_schema.key_column_usage
-                WHERE constraint_name = %s AND table_name = %s
-                ORDER BY ordinal_position
-            """, (const_name, table))
-
-            # ✅ PRÉSERVER LA CASSE des colonnes
-            columns = [quote_identifier(row[0]) for row in cursor.fetchall()]
-            columns_formatted = ", ".join(columns) if columns else ""
-
-            if const_type == "PRIMARY KEY" and columns_formatted:
-                print(f"ALTER TABLE {safe_table_name} ADD CONSTRAINT {safe_const_name} PRIMARY KEY ({columns_formatted});")
-
-            elif const_type == "FOREIGN KEY" and columns_formatted:
-                cursor.execute("""
-                    SELECT ccu.table_name, ccu.column_name
-                    FROM information_schema.constraint_column_usage AS ccu
-                    WHERE ccu.constraint_name = %s
-                """, (const_name,))
-
-                fk_info = cursor.fetchone()
-                if fk_info:
-                    # ✅ PRÉSERVER LA CASSE des tables et colonnes FK
-                    foreign_table = quote_identifier(fk_info[0])
-                    foreign_column = quote_identifier(fk_info[1])
-                    print(f"ALTER TABLE {safe_table_name} ADD CONSTRAINT {safe_const_name} FOREIGN KEY ({columns_formatted}) REFERENCES {foreign_table}({foreign_column});")
-
-            elif const_type == "UNIQUE" and columns_formatted:
-                print(f"ALTER TABLE {safe_table_name} ADD CONSTRAINT {safe_const_name} UNIQUE ({columns_formatted});")
-
+    # PK et UNIQUE de toutes les tables avant les FK qui les référencent
+    for table in catalog.tables.values():
+        if table.primary_key:
+            ddl = render(render_constraint, table.primary_key, pk_index_strategy(table)[0])
+            if ddl:
+                print(ddl)
+        for constraint in table.unique:
+            ddl = render(render_constraint, constraint)
+            if ddl:
+                print(ddl)
         print()
 
-    cursor.close()
-    conn.close()
+    for table in catalog.tables.values():
+        for constraint in table.foreign_keys:
+            ddl = render(render_constraint, constraint)
+            if ddl:
+                print(ddl)
+        if table.foreign_keys:
+            print()
 
-def generate_enum_checks(connection_params):
+def generate_enum_checks(connection_params, catalog=None, render=render_direct):
     """Génère les contraintes CHECK pour les ENUM avec préservation de casse"""
-    conn = psycopg2.connect(**connection_params)
-    cursor = conn.cursor()
-    initialize_enum_conversion(cursor)
-    enum_columns = collect_enum_columns(cursor)
+    catalog = catalog or load_catalog(connection_params)
 
     print("-- CONTRAINTES CHECK POUR LES TYPES ENUM")
     print()
 
-    for col in enum_columns:
-        table_name = col["table"]
-        column_name = col["column"]  # ✅ VRAI nom de colonne avec casse préservée
-        enum_type = col["enum_type"]
-
-        # Récupérer les valeurs ENUM
-        enum_values = get_enum_values(cursor, enum_type)
-
-        if enum_values:
-            # Générer la contrainte CHECK
-            oracle_type, check_constraint = convert_enum_to_check(
-                table_name, column_name, enum_type, enum_values
-            )
-
-            if check_constraint:
-                # ✅ PRÉSERVER LA CASSE de la table
-                safe_table_name = quote_identifier(table_name)
-                
-                # ✅ PRÉSERVER LA CASSE dans la contrainte CHECK
-                check_constraint_quoted = check_constraint.replace(
-                    f'"{column_name}"', quote_identifier(column_name)
-                )
-                
-                print(f"ALTER TABLE {safe_table_name} ADD {check_constraint_quoted};")
+    for table, column in catalog.iter_columns():
+        enum_type = catalog.enums.get(column.udt_name) if column.is_enum else None
+        if enum_type is None:
+            continue
 
-        print()
+        ddl = render(render_enum_check, table, column, enum_type)
+        if ddl:
+            print(ddl)
 
-    cursor.close()
-    conn.close()
+        print()
 
-def generate_indexes(connection_params):
+def generate_indexes(connection_params, catalog=None, render=render_direct):
     """Génère les INDEX avec préservation de casse"""
-    conn = psycopg2.connect(**connection_params)
-    cursor = conn.cursor()
+    catalog = catalog or load_catalog(connection_params)
 
-    cursor.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-        ORDER BY table_name
-    """)
+    print("-- INDEX")
+    print()
 
-    tables = [row[0] for row in cursor.fetchall()]
+    if needs_text_preferences(catalog):
+        print(TEXT_PREFERENCES_DDL)
+        print()
+
+    for table in catalog.tables.values():
+        for index in table.indexes:
+            ddl = render(render_index, index, table)
+            if ddl:
+                print(ddl)
 
-    print("-- INDEX")
     print()
 
-    for table in tables:
-        safe_table_name = quote_identifier(table)
+def generate_fk_indexes(connection_params, catalog=None, render=render_direct):
+    """Génère les index support des clés étrangères non indexées"""
+    catalog = catalog or load_catalog(connection_params)
 
-        cursor.execute("""
-            SELECT indexname, indexdef
-            FROM pg_indexes
-            WHERE tablename = %s AND schemaname = 'public'
-                AND indexname NOT LIKE 'pg_toast%%'
-        """, (table,))
+    print("-- INDEX DES CLÉS ÉTRANGÈRES NON INDEXÉES")
+    print()
 
-        indexes = cursor.fetchall()
+    for table, constraint in find_unindexed_foreign_keys(catalog):
+        print(f"-- FK {constraint.name} : {table.name}({', '.join(constraint.columns)}) -> {constraint.referenced_table}")
+        print(render(render_fk_index, constraint))
 
-        for index_name, index_def in indexes:
-            # ✅ PRÉSERVER LA CASSE du nom d'index
-            safe_index_name = quote_identifier(index_name)
+    print()
 
-            # Extraire les colonnes de la définition d'index
-            match = re.search(r'ON\s+\w+\s+\((.*)\)', index_def, re.IGNORECASE)
-            if match:
-                columns_str = match.group(1)
-                # ✅ PRÉSERVER LA CASSE des colonnes
-                columns = [quote_identifier(col.strip()) for col in columns_str.split(',')]
-                columns_formatted = ", ".join(columns)
+def generate_enum_lookups(connection_params, catalog=None, render=render_direct):
+    """Génère les tables de correspondance des types ENUM encodés en NUMBER(3)"""
+    catalog = catalog or load_catalog(connection_params)
 
-                # Vérifier si c'est un index UNIQUE
-                if 'UNIQUE' in index_def.upper():
-                    print(f"CREATE UNIQUE INDEX {safe_index_name} ON {safe_table_name} ({columns_formatted});")
-                else:
-                    print(f"CREATE INDEX {safe_index_name} ON {safe_table_name} ({columns_formatted});")
+    enum_types = encoded_enum_types(catalog)
+    if not enum_types:
+        return
 
+    print("-- TABLES DE CORRESPONDANCE DES ENUM ENCODÉS")
     print()
+    for enum_type in enum_types:
+        print(render(render_enum_lookup, enum_type))
+        print()
 
-    cursor.close()
-    conn.close()
+def generate_decoding_views(connection_params, catalog=None, render=render_direct):
+    """Génère les vues décodées des tables dont des colonnes sont stockées encodées"""
+    catalog = catalog or load_catalog(connection_params)
+
+    views = [render(render_decoding_view, table) for table in catalog.tables.values()]
+    views = [ddl for ddl in views if ddl]
+    if not views:
+        return
+
+    print("-- VUES DÉCODÉES (UUID RAW(16), CODES ENUM)")
+    print()
+    for ddl in views:
+        print(ddl)
+        print()
+
+def print_fk_index_report(catalog):
+    """Affiche les FK couvertes par un index existant et celles qui reçoivent un index généré"""
+    generated = find_unindexed_foreign_keys(catalog)
+    total = sum(len(table.foreign_keys) for table in catalog.tables.values())
+
+    print(f"🔗 Clés étrangères : {total}, déjà indexées : {total - len(generated)}, "
+          f"index générés : {len(generated)}")
+    for table, constraint in generated:
+        print(f"   + {fk_index_name(constraint):30} {table.name}({', '.join(constraint.columns)})")
+    return generated
+
+def generate_complete_migration(connection_params, catalog=None, cache=None, fk_indexes=True):
+    """
+    Génère la migration complète avec préservation de casse.
+    Le catalogue PostgreSQL est chargé une seule fois et partagé par tous les générateurs.
+    Avec un cache (ddl_cache.DdlCache), seuls les objets modifiés sont reconvertis.
+    Avec fk_indexes=False, les index des FK non indexées ne sont pas générés
+    (ils sont alors créés après le chargement, voir generate_fk_indexes).
+    """
+    catalog = catalog or load_catalog(connection_params)
+    render = cache.render if cache is not None else render_direct
 
-def generate_complete_migration(connection_params):
-    """Génère la migration complète avec préservation de casse"""
     print()
     print("-- ============================================================================")
     print("-- MIGRATION POSTGRESQL → ORACLE (VERSION 3 - PRESERVE CASE)")
@@ -303,10 +547,14 @@ def generate_complete_migration(connection_params):
     print("-- ============================================================================")
     print()
 
-    generate_tables(connection_params)
-    generate_constraints(connection_params)
-    generate_enum_checks(connection_params)
-    generate_indexes(connection_params)
+    generate_tables(connection_params, catalog, render)
+    generate_enum_lookups(connection_params, catalog, render)
+    generate_constraints(connection_params, catalog, render)
+    generate_enum_checks(connection_params, catalog, render)
+    generate_indexes(connection_params, catalog, render)
+    if fk_indexes:
+        generate_fk_indexes(connection_params, catalog, render)
+    generate_decoding_views(connection_params, catalog, render)
 
     print("-- ============================================================================")
     print("-- FIN DE LA MIGRATION")
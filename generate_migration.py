@@ -5,6 +5,12 @@ Génère un fichier SQL Oracle avec contraintes CHECK CORRIGÉES.
 
 UTILISATION:
     python generate_migration_v2.py
+    python generate_migration_v2.py --refresh            (ignore le cache du catalogue)
+    python generate_migration_v2.py --snapshot FICHIER   (hors ligne, sans connexion)
+    python generate_migration_v2.py --output-dir DOSSIER (un fichier par catégorie, en parallèle)
+    python generate_migration_v2.py --no-cache           (reconvertit tous les objets)
+    python generate_migration_v2.py --fk-indexes-after-load
+                                    (index des FK non indexées créés après le chargement)
 
 RÉSULTAT:
     migration_oracle_V2.sql (avec contraintes CHECK correctes)
@@ -12,6 +18,7 @@ RÉSULTAT:
 
 import sys
 import os
+import argparse
 from datetime import datetime
 
 # ============================================================================
@@ -20,6 +27,9 @@ from datetime import datetime
 
 BASE_DIR = r"D:\MEMOIRE\PROJET"
 OUTPUT_FILE = os.path.join(BASE_DIR, "schemas_oracle.sql")
+# Index des FK créés après le chargement (--fk-indexes-after-load) ; les index
+# différés par le plan d'usage ont leur propre script (collection_indexes.py)
+POST_LOAD_FILE = os.path.join(BASE_DIR, "schemas_oracle_post_load.sql")
 
 CONNECTION_PARAMS = {
     'host': 'localhost',
@@ -47,7 +57,59 @@ def print_header():
     print("   ✅ Plus de références aux types ENUM")
     print()
 
-def generate_sql():
+def load_migration_catalog(snapshot=None, refresh=False, size_text=False, size_numeric=False):
+    """
+    Charge le catalogue PostgreSQL : depuis un snapshot (hors ligne) ou
+    depuis le cache persistant, réextrait seulement si le schéma a changé.
+    Avec size_text (--size-text), les colonnes texte/JSON sont dimensionnées d'après
+    les données au lieu de rester en CLOB / VARCHAR2(4000),
+    avec size_numeric (--size-numeric) les colonnes numeric sans précision
+    (NUMBER(p[,s]) avec NUMERIC_HEADROOM_DIGITS chiffres de marge au lieu de NUMBER) ;
+    les UUID sont stockés selon uuid_storage.UUID_STORAGE (--uuid-raw) et les ENUM
+    des tables enum_encoding.ENUM_ENCODED_TABLES en code NUMBER(3) (--compact-enum).
+    """
+    from catalog_cache import load_snapshot, load_postgres_catalog
+    from text_sizing import size_text_columns
+    from numeric_sizing import size_numeric_columns
+    from uuid_storage import apply_uuid_storage, print_uuid_storage_report
+    from enum_encoding import apply_enum_encoding, print_enum_encoding_report
+
+    if snapshot:
+        catalog = load_snapshot(snapshot)
+        if size_text or size_numeric:
+            print("ℹ️ Mode hors ligne : colonnes texte/JSON et numeric non dimensionnées (types par défaut)")
+    else:
+        catalog = load_postgres_catalog(CONNECTION_PARAMS, refresh=refresh)
+        if size_text:
+            size_text_columns(CONNECTION_PARAMS, catalog)
+        if size_numeric:
+            size_numeric_columns(CONNECTION_PARAMS, catalog)
+    print_uuid_storage_report(catalog, apply_uuid_storage(catalog))
+    print_enum_encoding_report(catalog, apply_enum_encoding(catalog))
+    return catalog
+
+def load_ddl_cache(use_cache=True):
+    """Cache du DDL converti par objet (None si désactivé)"""
+    from ddl_cache import DdlCache
+
+    return DdlCache.load() if use_cache else None
+
+def write_post_load_file(catalog, cache):
+    """Écrit les index des FK non indexées dans le script exécuté après le chargement"""
+    from generate_ddl_v2 import generate_fk_indexes, render_direct
+
+    render = cache.render if cache is not None else render_direct
+    with open(POST_LOAD_FILE, 'w', encoding='utf-8') as f:
+        f.write("-- INDEX À CRÉER APRÈS LE CHARGEMENT DES DONNÉES\n\n")
+        original_stdout = sys.stdout
+        sys.stdout = f
+        try:
+            generate_fk_indexes(CONNECTION_PARAMS, catalog, render)
+        finally:
+            sys.stdout = original_stdout
+
+def generate_sql(snapshot=None, refresh=False, use_cache=True, fk_indexes_after_load=False, size_text=False,
+                 size_numeric=False):
     """Génère le fichier SQL V2"""
     print("="*80)
     print("GÉNÉRATION EN COURS")
@@ -60,10 +122,19 @@ def generate_sql():
     
     try:
         print("1. Import du module generate_ddl_v2...")
-        from generate_ddl_v2 import generate_complete_migration
+        from generate_ddl_v2 import (
+            generate_complete_migration, print_fk_index_report, print_index_translation_report
+        )
+        from pk_contention import print_hot_pk_report
+        from generated_columns import print_generated_column_report
         print("   ✅ Module importé")
         print()
         
+        print("   Chargement du catalogue PostgreSQL...")
+        catalog = load_migration_catalog(snapshot, refresh, size_text, size_numeric)
+        cache = load_ddl_cache(use_cache)
+        print()
+        
         print(f"2. Création du fichier : {OUTPUT_FILE}")
         with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
             
@@ -105,9 +176,11 @@ WHENEVER SQLERROR CONTINUE;
             original_stdout = sys.stdout
             sys.stdout = f
             
-            generate_complete_migration(CONNECTION_PARAMS)
-            
-            sys.stdout = original_stdout
+            try:
+                generate_complete_migration(CONNECTION_PARAMS, catalog, cache,
+                                            fk_indexes=not fk_indexes_after_load)
+            finally:
+                sys.stdout = original_stdout
             
             f.write("""
 
@@ -124,6 +197,22 @@ COMMIT;
 """)
             
             print("   ✅ DDL généré")
+            print("   ", end="")
+            print_fk_index_report(catalog)
+            print("   ", end="")
+            print_index_translation_report(catalog)
+            print_hot_pk_report(catalog)
+            print_generated_column_report(catalog)
+            if fk_indexes_after_load:
+                write_post_load_file(catalog, cache)
+                print(f"   ✅ Index des FK à créer après chargement : {POST_LOAD_FILE}")
+            elif os.path.exists(POST_LOAD_FILE):
+                # Index des FK créés avec le schéma : l'ancien script de ce module est obsolète
+                os.remove(POST_LOAD_FILE)
+            if cache is not None:
+                cache.save()
+                print("   ", end="")
+                cache.print_stats()
             print("   ✅ Footer écrit")
         
         print()
@@ -153,6 +242,30 @@ COMMIT;
     finally:
         os.chdir(original_dir)
 
+def generate_sql_parallel(output_dir, snapshot=None, refresh=False, use_cache=True, fk_indexes_after_load=False,
+                          size_text=False, size_numeric=False):
+    """Génère un fichier SQL par catégorie d'objets, en parallèle, avec un manifeste"""
+    from ddl_engine import generate_ddl_parallel
+    from generate_ddl_v2 import print_fk_index_report, print_index_translation_report
+    from pk_contention import print_hot_pk_report
+    from generated_columns import print_generated_column_report
+    
+    try:
+        catalog = load_migration_catalog(snapshot, refresh, size_text, size_numeric)
+        after_load = ('fk_indexes',) if fk_indexes_after_load else ()
+        manifest = generate_ddl_parallel(catalog, output_dir, cache=load_ddl_cache(use_cache),
+                                         after_load=after_load)
+        print_fk_index_report(catalog)
+        print_index_translation_report(catalog)
+        print_hot_pk_report(catalog)
+        print_generated_column_report(catalog)
+        return all(entry["status"] == "complete" for entry in manifest["categories"])
+    except Exception as e:
+        print(f"\n❌ ERREUR: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def print_success():
     """Affiche le message de succès"""
     print()
@@ -182,10 +295,52 @@ def print_success():
 
 def main():
     """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Génération du DDL Oracle")
+    parser.add_argument('--snapshot', help="snapshot de catalogue à utiliser hors ligne")
+    parser.add_argument('--refresh', action='store_true', help="ignorer le cache du catalogue")
+    parser.add_argument('--output-dir', help="générer un fichier par catégorie dans ce dossier")
+    parser.add_argument('--no-cache', action='store_true', help="reconvertir tous les objets (ignorer le cache DDL)")
+    parser.add_argument('--fk-indexes-after-load', action='store_true',
+                        help="créer les index des FK non indexées après le chargement des données")
+    parser.add_argument('--size-text', action='store_true',
+                        help="dimensionner les colonnes texte/JSON d'après les données "
+                             "(VARCHAR2(n) au lieu de CLOB / VARCHAR2(4000))")
+    parser.add_argument('--size-numeric', action='store_true',
+                        help="dimensionner les colonnes numeric sans précision d'après les données "
+                             "(NUMBER(p[,s]) avec 2 chiffres entiers de marge au lieu de NUMBER)")
+    parser.add_argument('--uuid-raw', action='store_true',
+                        help="stocker les UUID en RAW(16) (vues <table>_V pour la forme texte)")
+    parser.add_argument('--hot-pk', action='append', default=[], metavar='TABLE=STRATÉGIE',
+                        help="index de la PK par table : none, reverse ou hash ('*=hash' pour toutes les PK chaudes) ; "
+                             "sans cette option les PK chaudes sont seulement signalées")
+    parser.add_argument('--compact-enum', action='append', default=[], metavar='TABLE',
+                        help="stocker les ENUM de la table en code NUMBER(3) ('*' pour toutes les tables)")
+    parser.add_argument('--target', default='19c', choices=('12c', '19c', '21c', '23ai'),
+                        help="version Oracle cible : JSON natif en 21c, JSON et BOOLEAN natifs en 23ai")
+    args = parser.parse_args()
+    
     try:
+        from target_profile import set_target
+        from pk_contention import configure_pk_strategies
+        set_target(args.target)
+        configure_pk_strategies(args.hot_pk)
+        if args.compact_enum:
+            from enum_encoding import configure_enum_encoding
+            configure_enum_encoding(args.compact_enum)
+        if args.uuid_raw:
+            import uuid_storage
+            uuid_storage.UUID_STORAGE = 'raw'
         print_header()
         
-        if not generate_sql():
+        if args.output_dir:
+            if not generate_sql_parallel(args.output_dir, args.snapshot, args.refresh, not args.no_cache,
+                                         args.fk_indexes_after_load, args.size_text, args.size_numeric):
+                print("\n❌ Échec de la génération\n")
+                sys.exit(1)
+            return
+        
+        if not generate_sql(args.snapshot, args.refresh, not args.no_cache, args.fk_indexes_after_load,
+                            args.size_text, args.size_numeric):
             print("\n❌ Échec de la génération\n")
             sys.exit(1)
         
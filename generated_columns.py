@@ -0,0 +1,78 @@
+"""
+Module generated_columns.py
+---------------------------
+Colonnes générées PostgreSQL (GENERATED ALWAYS AS (...) STORED).
+
+Une colonne générée est dérivée des autres colonnes de la ligne : au lieu
+de la transférer et de la stocker, elle devient une colonne virtuelle
+Oracle (GENERATED ALWAYS AS (...) VIRTUAL) quand son expression est
+traduisible (même traduction que les index sur expression, voir
+index_expressions). Le chargement exclut les colonnes virtuelles du
+SELECT et de l'INSERT (colonnes VIRTUAL_COLUMN = 'YES' du dictionnaire).
+
+Une expression non traduisible, ou une colonne LOB (non virtualisable),
+donne une colonne ordinaire alimentée par le chargement, comme avant.
+"""
+
+from index_expressions import translate_expression, UntranslatableExpression
+from index_translation import LOB_TYPES
+from target_profile import native_boolean
+
+
+def virtual_expression(column, table):
+    """
+    Expression Oracle de la colonne virtuelle d'une colonne générée.
+
+    :param column: Column (column.generated renseigné)
+    :param table: Table de la colonne
+    :return: tuple (expression Oracle ou None, raison si non virtualisable)
+    """
+    if not column.generated:
+        return None, None
+    if column.oracle_type.split('(')[0] in LOB_TYPES:
+        return None, f"type {column.oracle_type} non virtualisable"
+    try:
+        # Contexte condition : booléens seuls comparés à 1 (CASE WHEN active ...),
+        # colonnes ENUM encodées refusées (l'expression compare des libellés)
+        expression = translate_expression(column.generated, table, condition=True)
+    except UntranslatableExpression as e:
+        return None, str(e)
+    if column.data_type == 'boolean' and not native_boolean():
+        # Prédicat -> NUMBER(1), NULL conservé
+        expression = f"CASE WHEN {expression} THEN 1 WHEN NOT ({expression}) THEN 0 END"
+    return expression, None
+
+
+def render_virtual_clause(column, table):
+    """Clause GENERATED ALWAYS AS (...) VIRTUAL d'une colonne générée traduisible (ou '')."""
+    expression, _ = virtual_expression(column, table)
+    if expression is None:
+        return ""
+    return f" GENERATED ALWAYS AS ({expression}) VIRTUAL"
+
+
+def find_generated_columns(catalog):
+    """
+    Colonnes générées du catalogue et leur traduction.
+
+    :param catalog: Catalog
+    :return: liste de tuples (table, colonne, expression Oracle ou None, raison)
+    """
+    return [
+        (table, column) + virtual_expression(column, table)
+        for table, column in catalog.iter_columns()
+        if column.generated
+    ]
+
+
+def print_generated_column_report(catalog):
+    """Affiche les colonnes générées converties en colonnes virtuelles et celles chargées comme données."""
+    generated = find_generated_columns(catalog)
+    if not generated:
+        return
+    virtual = [entry for entry in generated if entry[2] is not None]
+    print(f"🧬 Colonnes générées : {len(generated)}, virtuelles (non transférées) : {len(virtual)}")
+    for table, column, expression, reason in generated:
+        if expression is None:
+            print(f"   ⚠ {table.name}.{column.name} : stockée et chargée ({reason})")
+            print(f"      {column.generated}")
@@ -0,0 +1,406 @@
+"""
+Module index_builder.py
+-----------------------
+Construction parallèle des index Oracle, ordonnée par taille de table.
+
+Les CREATE INDEX d'un script (ex: schemas_oracle_post_load*.sql, fichiers
+05_indexes.sql / 06_fk_indexes.sql de ddl_engine) ne sont plus exécutés
+en série dans l'ordre du script :
+- la taille de chaque table est estimée côté PostgreSQL
+  (pg_total_relation_size) ;
+- un degré PARALLEL est choisi par index selon cette taille ;
+- les plus gros index sont lancés en premier, plusieurs constructions
+  tournent en même temps sur des sessions distinctes, tant que la somme
+  des degrés reste dans le budget CPU ;
+- le degré est remis à NOPARALLEL après chaque construction ;
+- ONLINE n'est ajouté que sur demande (--online) : inutile après le
+  chargement (aucune écriture concurrente) et réservé à l'Enterprise
+  Edition (ORA-00439 en Standard Edition / XE) ;
+- l'avancement est lu dans v$session_longops (si la vue est accessible).
+
+Les autres instructions du script (préférences Oracle Text, clustering...)
+sont exécutées avant, en série, dans l'ordre du script.
+
+UTILISATION:
+    python index_builder.py FICHIER.sql [FICHIER.sql ...] [--sessions N] [--cpu-budget N] [--online]
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import oracledb
+
+from sql_script_executor import iter_statements, print_execution_report, write_execution_report, error_code, IGNORED_ERRORS
+
+
+BUILD_SESSIONS = 4
+# Volume de table confié à chaque serveur parallèle
+BYTES_PER_PARALLEL_SERVER = 256 * 1024 * 1024
+# En dessous, construction en série
+SERIAL_THRESHOLD_BYTES = 64 * 1024 * 1024
+MAX_DEGREE = 16
+# Intervalle de lecture de v$session_longops (secondes)
+PROGRESS_INTERVAL = 10
+
+TABLE_SIZES_QUERY = """
+    SELECT c.relname, pg_total_relation_size(c.oid)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %(schema)s
+      AND c.relkind IN ('r', 'p')
+"""
+
+CPU_COUNT_QUERY = "SELECT value FROM v$parameter WHERE name = 'cpu_count'"
+
+SESSION_ID_QUERY = "SELECT SYS_CONTEXT('USERENV', 'SID') FROM dual"
+
+LONGOPS_QUERY = """
+    SELECT sid, opname, target, sofar, totalwork, units, time_remaining
+    FROM v$session_longops
+    WHERE totalwork > 0
+      AND sofar < totalwork
+"""
+
+# Seuls les index B-tree / bitmap acceptent PARALLEL et ONLINE
+DOMAIN_INDEX = re.compile(r"\bINDEXTYPE\s+IS\b|^\s*CREATE\s+SEARCH\s+INDEX\b", re.IGNORECASE)
+
+
+class IndexBuild:
+    """Construction d'index planifiée : instruction, taille de la table, degré."""
+
+    __slots__ = ('statement', 'table', 'size_bytes', 'degree', 'parallelizable')
+
+    def __init__(self, statement, table, size_bytes, degree, parallelizable):
+        self.statement = statement
+        self.table = table
+        self.size_bytes = size_bytes
+        self.degree = degree
+        self.parallelizable = parallelizable
+
+    def __repr__(self):
+        return f"IndexBuild({self.statement.object_name!r}, {self.table!r}, degré {self.degree})"
+
+
+def get_table_sizes(pg_config, schema_name='public'):
+    """
+    Taille totale (table, index, TOAST) de chaque table PostgreSQL.
+
+    :param pg_config: paramètres de connexion psycopg2
+    :param schema_name: schéma source
+    :return: dictionnaire {table: octets}
+    """
+    import psycopg2
+
+    conn = psycopg2.connect(**pg_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(TABLE_SIZES_QUERY, {'schema': schema_name})
+            return dict(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+def parallel_degree(size_bytes, cpu_budget):
+    """Degré PARALLEL d'une construction selon la taille de la table."""
+    if not size_bytes or size_bytes < SERIAL_THRESHOLD_BYTES:
+        return 1
+    degree = math.ceil(size_bytes / BYTES_PER_PARALLEL_SERVER)
+    return max(2, min(degree, MAX_DEGREE, cpu_budget))
+
+
+def plan_builds(statements, table_sizes, cpu_budget):
+    """
+    Associe à chaque CREATE INDEX la taille de sa table et un degré PARALLEL,
+    du plus gros au plus petit.
+
+    :param statements: instructions de type 'index' (sql_script_executor.Statement)
+    :param table_sizes: dictionnaire {table: octets}
+    :param cpu_budget: nombre de serveurs parallèles utilisables simultanément
+    :return: liste d'IndexBuild triée par taille décroissante
+    """
+    builds = []
+    for statement in statements:
+        table = statement.tables[0] if statement.tables else None
+        size = table_sizes.get(table)
+        if size is None and table is not None:
+            size = table_sizes.get(table.lower())
+        parallelizable = not DOMAIN_INDEX.search(statement.text)
+        degree = parallel_degree(size, cpu_budget) if parallelizable else 1
+        builds.append(IndexBuild(statement, table, size or 0, degree, parallelizable))
+    builds.sort(key=lambda build: -build.size_bytes)
+    return builds
+
+
+def build_options_sql(build, online=False):
+    """Instruction CREATE INDEX avec les clauses PARALLEL / ONLINE."""
+    sql = build.statement.text.rstrip().rstrip(';')
+    if not build.parallelizable:
+        return sql
+    if build.degree > 1:
+        sql += f" PARALLEL {build.degree}"
+    if online:
+        sql += " ONLINE"
+    return sql
+
+
+def _format_size(size_bytes):
+    return f"{size_bytes / 1024 / 1024:,.0f} Mo"
+
+
+class IndexBuilder:
+    """Ordonnanceur des constructions d'index sur plusieurs sessions Oracle."""
+
+    def __init__(self, oracle_config, sessions=BUILD_SESSIONS, cpu_budget=None, online=False,
+                 ignored_errors=IGNORED_ERRORS, verbose=True):
+        self.oracle_config = oracle_config
+        self.sessions = sessions
+        self.cpu_budget = cpu_budget
+        self.online = online
+        self.ignored_errors = set(ignored_errors)
+        self.verbose = verbose
+        self.results = []
+        self._local = threading.local()
+        self._connections = []
+        self._sessions_by_sid = {}
+        self._lock = threading.Lock()
+        self._slots = threading.Condition()
+        self._running = 0
+        self._degrees_used = 0
+
+    def _cursor(self):
+        """Curseur de la session propre au thread courant."""
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            conn = oracledb.connect(**self.oracle_config)
+            cursor = self._local.cursor = conn.cursor()
+            cursor.execute(SESSION_ID_QUERY)
+            sid = int(cursor.fetchone()[0])
+            with self._lock:
+                self._connections.append(conn)
+                self._local.sid = sid
+        return cursor
+
+    def _resolve_cpu_budget(self, cursor):
+        """Budget CPU : paramètre cpu_count de l'instance, sinon CPU locaux."""
+        if self.cpu_budget:
+            return self.cpu_budget
+        try:
+            cursor.execute(CPU_COUNT_QUERY)
+            row = cursor.fetchone()
+            if row:
+                return int(row[0])
+        except oracledb.Error:
+            pass
+        return os.cpu_count() or BUILD_SESSIONS
+
+    def _record(self, statement, status, seconds=0.0, error=None):
+        result = {
+            'index': statement.index,
+            'source': statement.source,
+            'line': statement.line,
+            'kind': statement.kind,
+            'object': statement.object_name,
+            'status': status,
+            'seconds': round(seconds, 4),
+            'error': error,
+        }
+        with self._lock:
+            self.results.append(result)
+        return result
+
+    def _execute(self, statement):
+        """Exécution en série (instructions hors CREATE INDEX)."""
+        start = time.perf_counter()
+        try:
+            self._cursor().execute(statement.text)
+            return self._record(statement, 'ok', time.perf_counter() - start)
+        except Exception as e:
+            status = 'exists' if error_code(e) in self.ignored_errors else 'error'
+            return self._record(statement, status, time.perf_counter() - start, e)
+
+    def _build(self, build):
+        statement = build.statement
+        start = time.perf_counter()
+        try:
+            cursor = self._cursor()
+            with self._lock:
+                self._sessions_by_sid[self._local.sid] = statement.object_name
+            cursor.execute(build_options_sql(build, self.online))
+            if build.degree > 1:
+                # Le degré resterait sur l'index et influencerait les plans d'exécution
+                cursor.execute(f'ALTER INDEX "{statement.object_name}" NOPARALLEL')
+            result = self._record(statement, 'ok', time.perf_counter() - start)
+        except Exception as e:
+            status = 'exists' if error_code(e) in self.ignored_errors else 'error'
+            result = self._record(statement, status, time.perf_counter() - start, e)
+        finally:
+            with self._slots:
+                self._running -= 1
+                self._degrees_used -= build.degree
+                self._slots.notify_all()
+
+        if self.verbose:
+            icon = {'ok': '✅', 'exists': '⚠️'}.get(result['status'], '❌')
+            detail = f" : {str(result['error'])[:80]}" if result['error'] else ''
+            print(f"  {icon} {statement.object_name:30} {build.table or '':25} "
+                  f"degré {build.degree:>2}  {result['seconds']:8.2f}s{detail}")
+        return result
+
+    def _next_build(self, pending, cpu_budget):
+        """Plus gros index dont le degré tient dans le budget restant (attend sinon)."""
+        with self._slots:
+            while True:
+                if self._running < self.sessions:
+                    available = cpu_budget - self._degrees_used
+                    for position, build in enumerate(pending):
+                        # Un index plus large que le budget passe seul
+                        if build.degree <= available or self._running == 0:
+                            self._running += 1
+                            self._degrees_used += build.degree
+                            return pending.pop(position)
+                self._slots.wait()
+
+    def _monitor(self, stop):
+        """Affiche périodiquement l'avancement lu dans v$session_longops."""
+        try:
+            conn = oracledb.connect(**self.oracle_config)
+        except oracledb.Error:
+            return
+        try:
+            cursor = conn.cursor()
+            while not stop.wait(PROGRESS_INTERVAL):
+                try:
+                    cursor.execute(LONGOPS_QUERY)
+                    rows = cursor.fetchall()
+                except oracledb.Error as e:
+                    print(f"ℹ️ Avancement indisponible (v$session_longops) : {str(e)[:80]}")
+                    return
+                with self._lock:
+                    names = dict(self._sessions_by_sid)
+                for sid, opname, target, sofar, totalwork, units, remaining in rows:
+                    # Les serveurs parallèles ont leur propre SID : on affiche aussi la cible
+                    name = names.get(sid, target or opname)
+                    print(f"  ⏳ {name:30} {opname[:25]:25} {sofar / totalwork:6.1%} "
+                          f"({sofar:,}/{totalwork:,} {units or ''}), reste ~{remaining or 0}s")
+        finally:
+            conn.close()
+
+    def run(self, sources, table_sizes):
+        """
+        Exécute les scripts : instructions hors index en série, puis les
+        CREATE INDEX en parallèle, du plus gros au plus petit.
+
+        :param sources: chemin d'un script ou itérable de chemins
+        :param table_sizes: dictionnaire {table: octets} (get_table_sizes)
+        :return: liste des résultats (un dictionnaire par instruction)
+        """
+        if isinstance(sources, (str, os.PathLike)):
+            sources = [sources]
+
+        index_statements = []
+        index = 1
+        try:
+            for path in sources:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for statement in iter_statements(f, os.path.basename(path), index):
+                        index = statement.index + 1
+                        if statement.kind == 'directive':
+                            continue
+                        if statement.kind == 'index':
+                            index_statements.append(statement)
+                        else:
+                            self._execute(statement)
+
+            cpu_budget = self._resolve_cpu_budget(self._cursor())
+            pending = plan_builds(index_statements, table_sizes, cpu_budget)
+            total_size = sum(build.size_bytes for build in pending)
+
+            print(f"\n{'='*80}")
+            print(f"CONSTRUCTION DES INDEX : {len(pending)} index, {_format_size(total_size)} de tables, "
+                  f"{self.sessions} session(s), budget CPU {cpu_budget}")
+            print(f"{'='*80}\n")
+
+            stop = threading.Event()
+            monitor = threading.Thread(target=self._monitor, args=(stop,), daemon=True)
+            monitor.start()
+            try:
+                with ThreadPoolExecutor(max_workers=self.sessions) as executor:
+                    while pending:
+                        executor.submit(self._build, self._next_build(pending, cpu_budget))
+            finally:
+                stop.set()
+                monitor.join(timeout=PROGRESS_INTERVAL)
+        finally:
+            for conn in self._connections:
+                try:
+                    conn.commit()
+                    conn.close()
+                except oracledb.Error:
+                    pass
+
+        self.results.sort(key=lambda r: r['index'])
+        return self.results
+
+
+def build_indexes(sources, oracle_config, pg_config=None, sessions=BUILD_SESSIONS, cpu_budget=None,
+                  report_path=None, schema_name='public', online=False):
+    """
+    Construit les index des scripts en parallèle et affiche le bilan.
+
+    :param sources: chemin d'un script ou itérable de chemins
+    :param oracle_config: paramètres de connexion oracledb
+    :param pg_config: paramètres psycopg2 pour la taille des tables (sinon ordre du script)
+    :param sessions: nombre de constructions simultanées
+    :param cpu_budget: somme maximale des degrés PARALLEL (défaut : cpu_count Oracle)
+    :param report_path: fichier CSV du rapport par instruction (optionnel)
+    :param schema_name: schéma PostgreSQL source
+    :param online: construction ONLINE (Enterprise Edition, tables en cours d'utilisation)
+    :return: liste des résultats
+    """
+    table_sizes = {}
+    if pg_config:
+        try:
+            table_sizes = get_table_sizes(pg_config, schema_name)
+        except Exception as e:
+            print(f"⚠ Taille des tables indisponible, ordre du script conservé : {e}")
+
+    builder = IndexBuilder(oracle_config, sessions=sessions, cpu_budget=cpu_budget, online=online)
+    start = time.perf_counter()
+    results = builder.run(sources, table_sizes)
+    duration = time.perf_counter() - start
+
+    print_execution_report(results)
+    print(f"✓ {len(results)} instruction(s) traitée(s) en {duration:.2f}s sur {sessions} session(s)")
+    if report_path:
+        write_execution_report(results, report_path)
+        print(f"✓ Rapport détaillé : {report_path}")
+    return results
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    from migration_complete import ORACLE_CONFIG, PG_CONFIG
+
+    parser = argparse.ArgumentParser(description="Construction parallèle des index Oracle")
+    parser.add_argument('scripts', nargs='+', help="scripts SQL contenant les CREATE INDEX")
+    parser.add_argument('--sessions', type=int, default=BUILD_SESSIONS, help="constructions simultanées")
+    parser.add_argument('--cpu-budget', type=int, help="somme maximale des degrés PARALLEL")
+    parser.add_argument('--report', help="rapport CSV par instruction")
+    parser.add_argument('--online', action='store_true',
+                        help="construction ONLINE (Enterprise Edition, tables déjà utilisées)")
+    args = parser.parse_args()
+
+    results = build_indexes(args.scripts, ORACLE_CONFIG, PG_CONFIG, sessions=args.sessions,
+                            cpu_budget=args.cpu_budget, report_path=args.report, online=args.online)
+    if any(r['status'] == 'error' for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
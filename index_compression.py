@@ -0,0 +1,150 @@
+"""
+Module index_compression.py
+---------------------------
+Recommandation de compression des index B-tree Oracle à partir de la
+duplication des colonnes de tête (pg_stats.n_distinct).
+
+- COMPRESS n          : compression de préfixe ; chaque valeur distincte des
+                        n premières colonnes n'est stockée qu'une fois par bloc
+                        feuille. Retenue quand le préfixe se répète en moyenne
+                        au moins PREFIX_MIN_REPEATS fois.
+- COMPRESS ADVANCED LOW : compression avancée (option Advanced Compression),
+                        qui choisit le préfixe bloc par bloc et ne grossit
+                        jamais l'index ; retenue pour une duplication modérée
+                        quand l'option est disponible.
+
+Un index UNIQUE ne peut compresser que ses n-1 premières colonnes : un index
+UNIQUE sur une seule colonne n'est jamais compressé.
+"""
+
+from catalog_statistics import resolve_n_distinct, get_column_statistics
+from index_translation import BTREE_ENTRY_OVERHEAD, BTREE_FILL_FACTOR
+
+
+# Répétitions moyennes du préfixe à partir desquelles COMPRESS n est rentable
+PREFIX_MIN_REPEATS = 4
+# Répétitions moyennes minimales pour COMPRESS ADVANCED LOW
+ADVANCED_MIN_REPEATS = 1.5
+# Option Advanced Compression (Enterprise Edition, licence séparée)
+ADVANCED_COMPRESSION_AVAILABLE = False
+# Espace utile d'un bloc feuille de 8 Ko et coût d'une entrée de préfixe
+LEAF_BLOCK_BYTES = 8000
+PREFIX_ENTRY_OVERHEAD = 4
+
+
+def estimate_prefix_savings(rows, distinct_prefixes, prefix_bytes, entry_bytes):
+    """
+    Octets économisés par la compression d'un préfixe.
+
+    Chaque ligne perd son préfixe ; chaque valeur distincte du préfixe est
+    stockée une fois par bloc feuille où elle apparaît.
+
+    :param rows: nombre de lignes indexées
+    :param distinct_prefixes: valeurs distinctes du préfixe
+    :param prefix_bytes: largeur moyenne du préfixe
+    :param entry_bytes: largeur moyenne d'une entrée non compressée
+    :return: octets économisés (négatif si la compression grossit l'index)
+    """
+    entries_per_block = max(1, LEAF_BLOCK_BYTES // max(1, entry_bytes))
+    repeats = rows / distinct_prefixes
+    stored_prefixes = rows / min(repeats, entries_per_block)
+    saved = rows * prefix_bytes - stored_prefixes * (prefix_bytes + PREFIX_ENTRY_OVERHEAD)
+    return int(saved / BTREE_FILL_FACTOR)
+
+
+def recommend_compression(rows, n_distincts, widths, unique=False):
+    """
+    Choisit la compression d'un index B-tree.
+
+    :param rows: nombre de lignes de la table (None si inconnu)
+    :param n_distincts: pg_stats.n_distinct des colonnes de la clé, dans l'ordre
+    :param widths: pg_stats.avg_width des colonnes de la clé, dans l'ordre
+    :param unique: True pour un index UNIQUE (préfixe limité à n-1 colonnes)
+    :return: dictionnaire {clause, prefix, repeats, estimated_bytes, saved_bytes, reason} ou None
+    """
+    key_count = len(n_distincts)
+    max_prefix = key_count - 1 if unique else key_count
+    if not rows or max_prefix < 1 or len(widths) < key_count or any(w is None for w in widths):
+        return None
+
+    entry_bytes = sum(widths) + BTREE_ENTRY_OVERHEAD
+    estimated_bytes = int(rows * entry_bytes / BTREE_FILL_FACTOR)
+
+    best = None
+    distinct = 1
+    for prefix in range(1, max_prefix + 1):
+        column_distinct = resolve_n_distinct(n_distincts[prefix - 1], rows)
+        if column_distinct is None:
+            break
+        # Sans statistique étendue : produit des cardinalités, borné par le nombre de lignes
+        distinct = min(distinct * column_distinct, rows)
+        saved = estimate_prefix_savings(rows, distinct, sum(widths[:prefix]), entry_bytes)
+        if best is None or saved > best[2]:
+            best = (prefix, rows / distinct, saved)
+
+    if best is None:
+        return None
+
+    prefix, repeats, saved = best
+    if repeats >= PREFIX_MIN_REPEATS and saved > 0:
+        clause = f"COMPRESS {prefix}"
+        reason = f"préfixe de {prefix} colonne(s) répété {repeats:,.0f} fois en moyenne"
+    elif ADVANCED_COMPRESSION_AVAILABLE and repeats >= ADVANCED_MIN_REPEATS:
+        clause = "COMPRESS ADVANCED LOW"
+        saved = max(saved, 0)
+        reason = f"duplication modérée ({repeats:,.1f} répétitions), préfixe choisi par bloc"
+    else:
+        return None
+
+    return {
+        'clause': clause,
+        'prefix': prefix,
+        'repeats': repeats,
+        'estimated_bytes': estimated_bytes,
+        'saved_bytes': saved,
+        'reason': reason,
+    }
+
+
+def index_compression(index):
+    """
+    Compression recommandée d'un index du catalogue (statistiques extraites avec l'index).
+
+    :param index: Index du catalogue
+    :return: voir recommend_compression
+    """
+    statistics = index.statistics
+    return recommend_compression(
+        statistics.get('rows'),
+        statistics.get('n_distinct') or [],
+        statistics.get('key_widths') or [],
+        index.unique,
+    )
+
+
+def analyze_index_compression(cursor, table_name, columns, unique=False):
+    """
+    Compression recommandée d'un index à partir des statistiques du schéma.
+
+    :param cursor: curseur psycopg2
+    :param table_name: nom de la table
+    :param columns: colonnes de la clé, dans l'ordre de l'index
+    :param unique: True pour un index UNIQUE
+    :return: voir recommend_compression
+    """
+    statistics = get_column_statistics(cursor)
+    column_stats = [statistics.columns.get((table_name, column)) or {} for column in columns]
+    return recommend_compression(
+        statistics.row_count(table_name),
+        [stats.get('n_distinct') for stats in column_stats],
+        [stats.get('avg_width') for stats in column_stats],
+        unique,
+    )
+
+
+def format_savings(compression):
+    """Texte du gain estimé : '12.3 Mo sur 40.0 Mo (31%)'."""
+    estimated = compression['estimated_bytes']
+    saved = compression['saved_bytes']
+    share = saved / estimated if estimated else 0
+    return f"{saved / 1024 / 1024:,.1f} Mo sur {estimated / 1024 / 1024:,.1f} Mo ({share:.0%})"
@@ -0,0 +1,316 @@
+"""
+Module index_expressions.py
+---------------------------
+Traduction des index PostgreSQL sur expressions et des index partiels en
+index Oracle basés sur des fonctions.
+
+- Index sur expression : lower((email)::text) -> LOWER("email")
+- Index partiel        : (status) WHERE (active = true)
+                         -> (CASE WHEN "active" = 1 THEN "status" END)
+                         (CASE WHEN "active" THEN ... avec le BOOLEAN natif 23ai)
+  Sans BOOLEAN natif, active IS TRUE devient "active" = 1 et
+  active IS NOT TRUE devient LNNVL("active" = 1) (lignes NULL comprises).
+  Oracle n'indexe pas les entrées dont toutes les clés sont NULL : l'index
+  ne contient que les lignes du prédicat, comme l'index PostgreSQL
+  (un index UNIQUE partiel garde la même sémantique).
+
+Les expressions sont découpées en jetons ; seules les fonctions et
+opérateurs connus sont traduits. Tout le reste est signalé comme non
+traduisible (l'index n'est alors pas créé).
+"""
+
+import re
+
+from catalog_model import quote_identifier
+from target_profile import boolean_literal, native_boolean
+from enum_encoding import is_encoded_column
+
+
+# Fonctions PostgreSQL -> Oracle (déterministes, utilisables dans un index)
+FUNCTION_MAP = {
+    'lower': 'LOWER',
+    'upper': 'UPPER',
+    'coalesce': 'COALESCE',
+    'trim': 'TRIM',
+    'ltrim': 'LTRIM',
+    'rtrim': 'RTRIM',
+    'substr': 'SUBSTR',
+    'substring': 'SUBSTR',
+    'length': 'LENGTH',
+    'char_length': 'LENGTH',
+    'abs': 'ABS',
+    'round': 'ROUND',
+    'trunc': 'TRUNC',
+    'floor': 'FLOOR',
+    'ceil': 'CEIL',
+    'mod': 'MOD',
+    'nullif': 'NULLIF',
+}
+
+# date_trunc('unité', col) -> TRUNC(col, 'format')
+DATE_TRUNC_FORMATS = {
+    'year': 'YYYY',
+    'quarter': 'Q',
+    'month': 'MM',
+    'week': 'IW',
+    'day': 'DD',
+    'hour': 'HH24',
+    'minute': 'MI',
+}
+
+KEYWORDS = {
+    'and': 'AND', 'or': 'OR', 'not': 'NOT', 'is': 'IS', 'null': 'NULL',
+    'in': 'IN', 'between': 'BETWEEN', 'like': 'LIKE', 'case': 'CASE',
+    'when': 'WHEN', 'then': 'THEN', 'else': 'ELSE', 'end': 'END',
+}
+# true / false : littéral selon la version cible (1/0 ou TRUE/FALSE)
+BOOLEAN_KEYWORDS = ('true', 'false')
+
+OPERATORS = {
+    '=': '=', '<>': '<>', '!=': '<>', '<': '<', '>': '>', '<=': '<=', '>=': '>=',
+    '+': '+', '-': '-', '*': '*', '/': '/', '||': '||',
+    '~~': 'LIKE', '!~~': 'NOT LIKE',
+}
+
+COMPARISON_OPERATORS = {'=', '<>', '!=', '<', '>', '<=', '>=', '~~', '!~~', 'is', 'in', 'between', 'like'}
+
+# Casts ajoutés par pg_get_indexdef / pg_get_expr : (email)::text, 'x'::character varying
+CAST_PATTERN = re.compile(
+    r'::\s*(?:"[^"]+"|character varying|timestamp (?:with|without) time zone|'
+    r'time (?:with|without) time zone|double precision|[a-z_][a-z0-9_]*)(?:\(\d+(?:,\d+)?\))?(?:\[\])?',
+    re.IGNORECASE,
+)
+
+# col = ANY (ARRAY[...]) / col <> ALL (ARRAY[...]) : forme de IN / NOT IN après pg_get_expr
+# (parenthèse supplémentaire ANY ((ARRAY[...])::text[]) consommée seulement si présente)
+ANY_ARRAY_PATTERN = re.compile(r'=\s*ANY\s*\((\()?ARRAY\[([^\]]*)\](?(1)\))\)', re.IGNORECASE)
+ALL_ARRAY_PATTERN = re.compile(r'<>\s*ALL\s*\((\()?ARRAY\[([^\]]*)\](?(1)\))\)', re.IGNORECASE)
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<quoted>"(?:[^"]|"")+")
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<operator>!~~|~~|<>|!=|<=|>=|\|\||->>|->|[=<>+\-*/])
+  | (?P<punct>[(),])
+""", re.VERBOSE)
+
+
+class UntranslatableExpression(ValueError):
+    """Expression d'index sans équivalent Oracle connu."""
+
+
+def tokenize(expression):
+    """Découpe une expression PostgreSQL (sans casts) en jetons (type, valeur)."""
+    expression = CAST_PATTERN.sub('', expression)
+    expression = ANY_ARRAY_PATTERN.sub(r'IN (\2)', expression)
+    expression = ALL_ARRAY_PATTERN.sub(r'NOT IN (\2)', expression)
+    tokens = []
+    position = 0
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise UntranslatableExpression(f"syntaxe non reconnue : {expression[position:position + 20]!r}")
+        kind = match.lastgroup
+        if kind != 'space':
+            tokens.append((kind, match.group()))
+        position = match.end()
+    return tokens
+
+
+def _is_bare(previous, following):
+    """Vrai si le jeton n'est pas un opérande de comparaison ou d'opération."""
+    for _, value in (previous, following):
+        if value is not None and (value.lower() in COMPARISON_OPERATORS or value in OPERATORS):
+            return False
+    return True
+
+
+def _translate_tokens(tokens, table, condition=False):
+    output = []
+    index = 0
+    while index < len(tokens):
+        kind, value = tokens[index]
+        following = tokens[index + 1] if index + 1 < len(tokens) else (None, None)
+        previous = tokens[index - 1] if index > 0 else (None, None)
+
+        if kind in ('string', 'number', 'punct'):
+            output.append(value)
+        elif kind == 'operator':
+            if value not in OPERATORS:
+                raise UntranslatableExpression(f"opérateur {value} non supporté")
+            output.append(OPERATORS[value])
+        elif kind in ('word', 'quoted'):
+            name = value[1:-1].replace('""', '"') if kind == 'quoted' else value
+            lowered = name.lower()
+
+            if following == ('punct', '(') and kind == 'word' and lowered not in KEYWORDS:
+                if lowered == 'date_trunc':
+                    index = _translate_date_trunc(tokens, index, table, output, condition)
+                    continue
+                if lowered == 'btrim':
+                    index = _translate_btrim(tokens, index, table, output, condition)
+                    continue
+                if lowered not in FUNCTION_MAP:
+                    raise UntranslatableExpression(f"fonction {name}() non supportée")
+                output.append(FUNCTION_MAP[lowered] + '(')
+                index += 2
+                continue
+            elif table.column(name) is not None:
+                column = table.column(name)
+                # ENUM stocké en code : le prédicat compare des libellés
+                if condition and is_encoded_column(column):
+                    raise UntranslatableExpression(f"colonne ENUM encodée {name} dans le prédicat")
+                output.append(column.quoted_name)
+                # Colonne booléenne utilisée seule comme condition (WHERE active) :
+                # une condition valide telle quelle avec le BOOLEAN natif (23ai)
+                if (condition and column.data_type == 'boolean' and not native_boolean()
+                        and _is_bare(previous, following)):
+                    output.append('= 1')
+            elif kind == 'word' and lowered == 'is' and not native_boolean() and _is_boolean_test(tokens, index):
+                index = _translate_boolean_test(tokens, index, table, output)
+                continue
+            elif kind == 'word' and lowered in BOOLEAN_KEYWORDS:
+                output.append(boolean_literal(lowered == 'true'))
+            elif kind == 'word' and lowered in KEYWORDS:
+                output.append(KEYWORDS[lowered])
+            else:
+                raise UntranslatableExpression(f"identifiant {name} inconnu")
+        index += 1
+    return output
+
+
+def _is_boolean_test(tokens, index):
+    """Vrai si tokens[index] (IS) introduit IS [NOT] TRUE / IS [NOT] FALSE."""
+    following = [value.lower() for _, value in tokens[index + 1:index + 3]]
+    if following[:1] == ['not']:
+        following = following[1:]
+    return following[:1] in (['true'], ['false'])
+
+
+def _translate_boolean_test(tokens, index, table, output):
+    """
+    col IS [NOT] TRUE / FALSE sans BOOLEAN natif (booléens en NUMBER(1)) :
+    IS TRUE -> col = 1, IS NOT TRUE -> LNNVL(col = 1) (vrai aussi si col est
+    NULL) ; retourne l'index du jeton suivant.
+    """
+    operand = tokens[index - 1] if index > 0 else (None, None)
+    name = operand[1][1:-1].replace('""', '"') if operand[0] == 'quoted' else operand[1]
+    column = table.column(name) if operand[0] in ('word', 'quoted') else None
+    if column is None or column.data_type != 'boolean':
+        raise UntranslatableExpression("IS TRUE / IS FALSE sur une expression autre qu'une colonne booléenne")
+
+    negated = tokens[index + 1][1].lower() == 'not'
+    literal_index = index + 2 if negated else index + 1
+    value = boolean_literal(tokens[literal_index][1].lower() == 'true')
+    if negated:
+        output[-1] = f"LNNVL({column.quoted_name} = {value})"
+    else:
+        output.append(f"= {value}")
+    return literal_index + 1
+
+
+def _function_arguments(tokens, index):
+    """
+    Arguments d'un appel de fonction (tokens[index] = nom, tokens[index + 1] = '(').
+
+    :return: tuple (liste des arguments en jetons, index du jeton suivant l'appel)
+    """
+    arguments = [[]]
+    depth = 1
+    end = index + 2
+    while end < len(tokens) and depth:
+        token = tokens[end]
+        if token == ('punct', '('):
+            depth += 1
+        elif token == ('punct', ')'):
+            depth -= 1
+        if depth == 1 and token == ('punct', ','):
+            arguments.append([])
+        elif depth:
+            arguments[-1].append(token)
+        end += 1
+    if depth:
+        raise UntranslatableExpression("parenthèses non équilibrées")
+    return arguments, end
+
+
+def _translate_date_trunc(tokens, index, table, output, condition=False):
+    """date_trunc('unité', expr) -> TRUNC(expr, 'format') ; retourne l'index du jeton suivant."""
+    arguments, end = _function_arguments(tokens, index)
+    if len(arguments) != 2 or len(arguments[0]) != 1 or arguments[0][0][0] != 'string':
+        raise UntranslatableExpression("date_trunc() sans unité littérale")
+    unit = arguments[0][0][1].strip("'").lower()
+    if unit not in DATE_TRUNC_FORMATS:
+        raise UntranslatableExpression(f"date_trunc('{unit}') non supporté")
+
+    argument = _translate_tokens(arguments[1], table, condition)
+    output.append(f"TRUNC({_join(argument)}, '{DATE_TRUNC_FORMATS[unit]}')")
+    return end
+
+
+def _translate_btrim(tokens, index, table, output, condition=False):
+    """
+    btrim(expr) -> TRIM(expr), btrim(expr, 'c') -> TRIM(BOTH 'c' FROM expr) ;
+    TRIM Oracle ne retire qu'un seul caractère : un ensemble de plusieurs
+    caractères n'est pas traduisible. Retourne l'index du jeton suivant.
+    """
+    arguments, end = _function_arguments(tokens, index)
+    argument = _join(_translate_tokens(arguments[0], table, condition))
+    if len(arguments) == 1:
+        output.append(f"TRIM({argument})")
+        return end
+    characters = arguments[1]
+    if (len(arguments) != 2 or len(characters) != 1 or characters[0][0] != 'string'
+            or len(characters[0][1][1:-1].replace("''", "'")) != 1):
+        raise UntranslatableExpression("btrim() avec plusieurs caractères à retirer non supporté")
+    output.append(f"TRIM(BOTH {characters[0][1]} FROM {argument})")
+    return end
+
+
+def _join(parts):
+    """Assemble les jetons traduits (sans espace après '(' ni avant ')' et ',')."""
+    text = ""
+    for part in parts:
+        if text and not text.endswith('(') and part not in (')', ','):
+            text += " "
+        text += part
+    return text
+
+
+def translate_expression(expression, table, condition=False):
+    """
+    Traduit une expression PostgreSQL (clé d'index ou prédicat) en Oracle.
+
+    :param expression: texte issu de pg_get_indexdef / pg_get_expr
+    :param table: Table du catalogue (colonnes et types)
+    :param condition: True pour un prédicat (booléens comparés à 1)
+    :return: expression Oracle
+    :raises UntranslatableExpression: fonction, opérateur ou identifiant non supporté
+    """
+    return _join(_translate_tokens(tokenize(expression), table, condition))
+
+
+def translate_index_keys(index, table):
+    """
+    Clés Oracle d'un index sur expressions et/ou partiel.
+
+    :param index: Index du catalogue
+    :param table: Table de l'index
+    :return: liste des clés Oracle (colonnes ou expressions)
+    :raises UntranslatableExpression: si une clé ou le prédicat n'est pas traduisible
+    """
+    keys = []
+    for key, is_expression in zip(index.columns, index.expressions):
+        keys.append(translate_expression(key, table) if is_expression else quote_identifier(key))
+
+    if index.predicate:
+        condition = translate_expression(index.predicate, table, condition=True)
+        keys = [f"CASE WHEN {condition} THEN {key} END" for key in keys]
+    return keys
+
+
+def is_function_based(index):
+    """Vrai si l'index devient un index basé sur des fonctions dans Oracle."""
+    return index.has_expressions or bool(index.predicate)
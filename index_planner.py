@@ -0,0 +1,239 @@
+"""
+Module index_planner.py
+-----------------------
+Planification de la migration des index selon leur usage réel en production.
+
+Chaque index PostgreSQL est classé dans un des trois niveaux suivants :
+- create_now        : index UNIQUE hors contrainte, à créer avec les tables
+                      (ils garantissent l'intégrité dès le chargement) ;
+- create_after_load : index utilisés (pg_stat_user_indexes.idx_scan, requêtes
+                      de pg_stat_statements) ou portant une clé étrangère,
+                      construits en une passe après le chargement des données ;
+- skip_candidate    : index jamais parcourus sur la période observée, sans
+                      requête correspondante : candidats à ne pas migrer.
+
+Le rapport indique le temps de construction estimé de chaque niveau et
+l'espace économisé en ne migrant pas les index inutilisés.
+"""
+
+import re
+from datetime import datetime, timezone
+
+import psycopg2
+
+
+# Débit de construction d'index estimé côté Oracle (octets/seconde)
+BUILD_THROUGHPUT = 50 * 1024 * 1024
+# Nombre minimal de parcours pour considérer un index comme utilisé
+MIN_INDEX_SCANS = 1
+# Période d'observation minimale avant de proposer une suppression
+MIN_OBSERVATION_DAYS = 7
+# Nombre maximal de requêtes lues dans pg_stat_statements
+MAX_STATEMENTS = 5000
+
+TIERS = ('create_now', 'create_after_load', 'skip_candidate')
+
+INDEX_USAGE_QUERY = """
+    SELECT
+        s.relname AS table_name,
+        s.indexrelname AS index_name,
+        s.idx_scan,
+        s.idx_tup_read,
+        pg_relation_size(s.indexrelid) AS size_bytes,
+        i.indisunique,
+        i.indisprimary,
+        con.conname AS constraint_name,
+        ARRAY(
+            SELECT a.attname::text
+            FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            ORDER BY k.ord
+        ) AS columns
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    LEFT JOIN pg_constraint con ON con.conindid = s.indexrelid AND con.contype IN ('p', 'u', 'x')
+    WHERE s.schemaname = %(schema)s
+    ORDER BY s.relname, s.indexrelname
+"""
+
+FK_COLUMNS_QUERY = """
+    SELECT c.relname, ARRAY(
+        SELECT a.attname::text
+        FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+        ORDER BY k.ord
+    )
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %(schema)s
+      AND con.contype = 'f'
+"""
+
+STATS_RESET_QUERY = """
+    SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()
+"""
+
+STATEMENTS_QUERY = """
+    SELECT query, calls
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY calls DESC
+    LIMIT %(limit)s
+"""
+
+
+def _fetch_statements(cursor):
+    """Requêtes de pg_stat_statements (liste vide si l'extension est absente)."""
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    if cursor.fetchone() is None:
+        return []
+    try:
+        cursor.execute(STATEMENTS_QUERY, {'limit': MAX_STATEMENTS})
+        return cursor.fetchall()
+    except psycopg2.Error as e:
+        # Extension installée mais non chargée (shared_preload_libraries) ou droits insuffisants
+        if not cursor.connection.autocommit:
+            cursor.connection.rollback()
+        print(f"ℹ️ pg_stat_statements indisponible : {str(e).strip()[:80]}")
+        return []
+
+
+def statement_calls(statements, table_name, columns):
+    """
+    Nombre d'appels des requêtes qui filtrent la table sur la colonne de tête de l'index.
+
+    :param statements: liste (requête normalisée, appels)
+    :param table_name: table de l'index
+    :param columns: colonnes de l'index
+    :return: nombre total d'appels correspondants
+    """
+    if not columns:
+        return 0
+    table_pattern = re.compile(rf'\b"?{re.escape(table_name)}"?\b', re.IGNORECASE)
+    column_pattern = re.compile(rf'\b"?{re.escape(columns[0])}"?\s*(=|<|>|IN\b|BETWEEN\b|LIKE\b)', re.IGNORECASE)
+    return sum(
+        calls for query, calls in statements
+        if table_pattern.search(query) and column_pattern.search(query)
+    )
+
+
+def estimate_build_seconds(size_bytes):
+    """Temps de construction estimé d'un index à partir de sa taille PostgreSQL."""
+    return size_bytes / BUILD_THROUGHPUT
+
+
+def classify_index(index, fk_columns, observation_days):
+    """
+    Détermine le niveau d'un index.
+
+    :param index: dictionnaire d'usage (voir plan_indexes)
+    :param fk_columns: ensemble de (table, tuple de colonnes) des clés étrangères
+    :param observation_days: durée couverte par les statistiques (None si inconnue)
+    :return: tuple (niveau, raison)
+    """
+    if index['unique']:
+        return 'create_now', "index UNIQUE : intégrité garantie dès le chargement"
+
+    columns = tuple(index['columns'])
+    supports_fk = any(
+        table == index['table'] and columns[:len(fk)] == fk
+        for table, fk in fk_columns
+    )
+    if supports_fk:
+        return 'create_after_load', "porte une clé étrangère (validation FK, suppressions en cascade)"
+    if index['idx_scan'] >= MIN_INDEX_SCANS:
+        return 'create_after_load', f"{index['idx_scan']:,} parcours"
+    if index['statement_calls']:
+        return 'create_after_load', f"{index['statement_calls']:,} appel(s) de requêtes correspondantes"
+    if observation_days is not None and observation_days < MIN_OBSERVATION_DAYS:
+        return 'create_after_load', f"non utilisé, mais statistiques sur {observation_days} jour(s) seulement"
+    return 'skip_candidate', "aucun parcours ni requête correspondante"
+
+
+def plan_indexes(cursor, schema_name='public'):
+    """
+    Classe les index du schéma selon leur usage.
+
+    :param cursor: curseur psycopg2 connecté à PostgreSQL
+    :param schema_name: schéma analysé
+    :return: dictionnaire {index_name: {table, columns, idx_scan, size_bytes,
+             statement_calls, tier, reason, build_seconds}} (hors index de contraintes)
+    """
+    cursor.execute(STATS_RESET_QUERY)
+    row = cursor.fetchone()
+    stats_reset = row[0] if row else None
+    observation_days = None
+    if stats_reset is not None:
+        observation_days = (datetime.now(timezone.utc) - stats_reset).days
+
+    cursor.execute(FK_COLUMNS_QUERY, {'schema': schema_name})
+    fk_columns = {(table, tuple(columns)) for table, columns in cursor.fetchall()}
+
+    statements = _fetch_statements(cursor)
+
+    cursor.execute(INDEX_USAGE_QUERY, {'schema': schema_name})
+    plan = {}
+    for (table_name, index_name, idx_scan, idx_tup_read, size_bytes,
+         is_unique, is_primary, constraint_name, columns) in cursor.fetchall():
+        # Les index de PK/UNIQUE sont créés avec leur contrainte
+        if is_primary or constraint_name:
+            continue
+
+        index = {
+            'name': index_name,
+            'table': table_name,
+            'columns': list(columns),
+            'unique': is_unique,
+            'idx_scan': idx_scan or 0,
+            'idx_tup_read': idx_tup_read or 0,
+            'size_bytes': size_bytes or 0,
+            'statement_calls': statement_calls(statements, table_name, list(columns)),
+            'build_seconds': estimate_build_seconds(size_bytes or 0),
+        }
+        index['tier'], index['reason'] = classify_index(index, fk_columns, observation_days)
+        plan[index_name] = index
+
+    return plan
+
+
+def _format_size(size_bytes):
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if size_bytes < 1024 or unit == 'Go':
+            return f"{size_bytes:,.0f} {unit}" if unit == 'o' else f"{size_bytes:,.1f} {unit}"
+        size_bytes /= 1024
+
+
+def print_index_plan(plan):
+    """Affiche le plan : index par niveau, temps de construction estimé et espace économisé."""
+    print(f"\n{'='*80}")
+    print("PLAN DE MIGRATION DES INDEX (USAGE RÉEL)")
+    print(f"{'='*80}\n")
+
+    labels = {
+        'create_now': "🟢 À créer avec les tables",
+        'create_after_load': "🟡 À créer après le chargement",
+        'skip_candidate': "⚪ Candidats à ne pas migrer",
+    }
+
+    for tier in TIERS:
+        indexes = [idx for idx in plan.values() if idx['tier'] == tier]
+        if not indexes:
+            continue
+        total_size = sum(idx['size_bytes'] for idx in indexes)
+        total_seconds = sum(idx['build_seconds'] for idx in indexes)
+        print(f"{labels[tier]} : {len(indexes)} index, {_format_size(total_size)}, "
+              f"construction estimée {total_seconds:.1f}s")
+        for idx in indexes:
+            print(f"   - {idx['table']}.{idx['name']} ({', '.join(idx['columns'])}) "
+                  f"{_format_size(idx['size_bytes'])} : {idx['reason']}")
+        print()
+
+    skipped = [idx for idx in plan.values() if idx['tier'] == 'skip_candidate']
+    if skipped:
+        saved_size = sum(idx['size_bytes'] for idx in skipped)
+        saved_seconds = sum(idx['build_seconds'] for idx in skipped)
+        print(f"💾 Espace économisé si les candidats ne sont pas migrés : {_format_size(saved_size)}")
+        print(f"⏱ Temps de construction économisé : {saved_seconds:.1f}s (+ maintenance à chaque DML)")
+
+    print(f"{'='*80}\n")
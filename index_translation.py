@@ -0,0 +1,264 @@
+"""
+Module index_translation.py
+---------------------------
+Choix de la forme Oracle de chaque index PostgreSQL autonome.
+
+- btree          : index B-tree sur colonnes ;
+- function_based : index sur expressions ou partiel (voir index_expressions) ;
+- json_search    : GIN sur une colonne json/jsonb -> JSON search index
+                   (CREATE SEARCH INDEX ... FOR JSON, colonne contrôlée IS JSON) ;
+- text_context   : GIN/GiST trigramme (pg_trgm) ou tsvector -> index Oracle
+                   Text CONTEXT, avec politique de synchronisation ;
+- zone_map       : BRIN sur colonnes naturellement ordonnées (|pg_stats.correlation|
+                   élevée) -> clustering d'attributs (+ zone map si disponible),
+                   sans index : le chargement est trié sur ces colonnes ;
+- untranslated   : aucun équivalent (ex: GIN sur tableau, BRIN sur colonne
+                   non ordonnée), signalé.
+
+Les colonnes INCLUDE (...) sont ajoutées en fin de clé pour conserver les
+parcours d'index seul ; la largeur de clé est contrôlée par rapport aux
+limites Oracle.
+"""
+
+import re
+
+from catalog_model import quote_identifier
+from index_expressions import translate_index_keys, is_function_based, UntranslatableExpression
+
+
+INDEX_KINDS = ('btree', 'function_based', 'json_search', 'text_context', 'zone_map', 'untranslated')
+
+# Méthodes d'accès PostgreSQL sans équivalent B-tree
+INVERTED_METHODS = ('gin', 'gist', 'spgist')
+JSON_TYPES = ('json', 'jsonb')
+TEXT_SEARCH_TYPES = ('tsvector',)
+TRIGRAM_OPCLASSES = ('gin_trgm_ops', 'gist_trgm_ops')
+
+# Synchronisation des index Oracle Text / JSON après chaque COMMIT
+TEXT_SYNC_POLICY = "ON COMMIT"
+# Liste de mots avec index de sous-chaînes : LIKE '%x%' via CONTAINS(col, '%x%')
+TEXT_WORDLIST = "MIG_SUBSTRING_WL"
+
+# Corrélation minimale (valeur absolue) entre ordre physique et valeurs pour un BRIN
+BRIN_MIN_CORRELATION = 0.9
+# Zone maps matérialisées : Exadata / Autonomous Database uniquement
+ZONEMAPS_AVAILABLE = False
+# Taille d'une entrée B-tree hors clé (ROWID, en-tête de ligne) et taux de remplissage
+BTREE_ENTRY_OVERHEAD = 12
+BTREE_FILL_FACTOR = 0.9
+
+# Limites des index B-tree Oracle (bloc de 8 Ko)
+ORACLE_MAX_KEY_BYTES = 6398
+ORACLE_MAX_INDEX_COLUMNS = 32
+
+# Taille maximale stockée par type Oracle (octets)
+ORACLE_TYPE_BYTES = {
+    'NUMBER': 22,
+    'FLOAT': 22,
+    'INTEGER': 22,
+    'DATE': 7,
+    'TIMESTAMP': 11,
+    'TIMESTAMP WITH TIME ZONE': 13,
+    'TIMESTAMP WITH LOCAL TIME ZONE': 11,
+    'INTERVAL DAY TO SECOND': 11,
+    'INTERVAL YEAR TO MONTH': 5,
+    'BINARY_FLOAT': 4,
+    'BINARY_DOUBLE': 8,
+    'BOOLEAN': 1,
+}
+LOB_TYPES = ('CLOB', 'NCLOB', 'BLOB', 'XMLTYPE', 'LONG', 'JSON')
+
+TEXT_PREFERENCES_DDL = f"""BEGIN
+  CTX_DDL.CREATE_PREFERENCE('{TEXT_WORDLIST}', 'BASIC_WORDLIST');
+  CTX_DDL.SET_ATTRIBUTE('{TEXT_WORDLIST}', 'SUBSTRING_INDEX', 'TRUE');
+  CTX_DDL.SET_ATTRIBUTE('{TEXT_WORDLIST}', 'PREFIX_INDEX', 'TRUE');
+EXCEPTION
+  -- DRG-10701 : préférence déjà créée
+  WHEN OTHERS THEN
+    IF SQLCODE != -20000 THEN RAISE; END IF;
+END;
+/"""
+
+
+def classify_index(index, table):
+    """
+    Détermine la forme Oracle d'un index autonome.
+
+    :param index: Index du catalogue (hors index de contraintes)
+    :param table: Table de l'index
+    :return: tuple (type d'index Oracle parmi INDEX_KINDS, raison)
+    """
+    if index.index_type in INVERTED_METHODS:
+        if len(index.key_columns) != 1 or index.has_expressions:
+            return 'untranslated', f"{index.index_type.upper()} multi-colonnes ou sur expression"
+
+        column = table.column(index.columns[0])
+        opclass = index.opclasses[0] if index.opclasses else None
+        note = " (prédicat ignoré)" if index.predicate else ""
+
+        if column is not None and column.udt_name in JSON_TYPES and index.index_type == 'gin':
+            return 'json_search', f"GIN {column.udt_name} -> JSON search index{note}"
+        if opclass in TRIGRAM_OPCLASSES:
+            return 'text_context', f"{opclass} -> Oracle Text CONTEXT (sous-chaînes){note}"
+        if column is not None and column.udt_name in TEXT_SEARCH_TYPES:
+            return 'text_context', f"tsvector -> Oracle Text CONTEXT{note}"
+        method = f"{index.index_type.upper()} {opclass}" if opclass else index.index_type.upper()
+        return 'untranslated', f"{method} sans équivalent Oracle"
+
+    if index.index_type == 'brin':
+        return _classify_brin(index, table)
+
+    if is_function_based(index):
+        try:
+            translate_index_keys(index, table)
+        except UntranslatableExpression as e:
+            return 'untranslated', str(e)
+        return 'function_based', "index basé sur des fonctions"
+
+    return 'btree', "B-tree"
+
+
+def is_naturally_ordered(index):
+    """Vrai si toutes les colonnes du BRIN suivent l'ordre physique de la table."""
+    correlations = index.statistics.get('correlations') or []
+    return bool(correlations) and len(correlations) == len(index.key_columns) and all(
+        correlation is not None and abs(correlation) >= BRIN_MIN_CORRELATION
+        for correlation in correlations
+    )
+
+
+def _classify_brin(index, table):
+    if index.has_expressions:
+        return 'untranslated', "BRIN sur expression"
+    correlations = index.statistics.get('correlations') or []
+    if not is_naturally_ordered(index):
+        known = [f"{c:.2f}" for c in correlations if c is not None]
+        detail = f"corrélation {', '.join(known)}" if known else "corrélation inconnue (ANALYZE requis)"
+        return 'untranslated', f"BRIN sur colonne non ordonnée ({detail}) : aucun index créé"
+
+    # Un seul clustering d'attributs par table : le premier BRIN ordonné l'emporte
+    for other in table.indexes:
+        if other is index:
+            break
+        if other.index_type == 'brin' and not other.has_expressions and is_naturally_ordered(other):
+            return 'untranslated', f"clustering déjà défini par {other.name}"
+
+    strategy = "clustering + zone map" if ZONEMAPS_AVAILABLE else "clustering, chargement trié"
+    return 'zone_map', f"BRIN (corrélation {min(abs(c) for c in correlations):.2f}) -> {strategy}"
+
+
+def estimate_btree_bytes(index):
+    """
+    Taille estimée d'un B-tree Oracle équivalent (lignes x largeur des clés),
+    c'est-à-dire le stockage évité quand aucun index n'est créé.
+    """
+    rows = index.statistics.get('rows')
+    widths = index.statistics.get('key_widths') or []
+    if not rows or not widths or any(width is None for width in widths):
+        return None
+    return int(rows * (sum(widths) + BTREE_ENTRY_OVERHEAD) / BTREE_FILL_FACTOR)
+
+
+def render_zone_map(index):
+    """ALTER TABLE ... ADD CLUSTERING BY LINEAR ORDER (avec ou sans zone map)."""
+    columns_formatted = ", ".join(quote_identifier(col) for col in index.key_columns)
+    zonemap = "WITH MATERIALIZED ZONEMAP" if ZONEMAPS_AVAILABLE else "WITHOUT MATERIALIZED ZONEMAP"
+    return (
+        f"ALTER TABLE {quote_identifier(index.table)} "
+        f"ADD CLUSTERING BY LINEAR ORDER ({columns_formatted}) {zonemap};"
+    )
+
+
+def oracle_type_bytes(oracle_type):
+    """
+    Taille maximale d'une valeur dans une clé d'index (None pour un LOB, non indexable).
+
+    :param oracle_type: type Oracle (ex: 'VARCHAR2(120)', 'NUMBER(10)')
+    :return: nombre d'octets ou None
+    """
+    oracle_type = oracle_type.split(' GENERATED')[0].strip().upper()
+    base = re.sub(r'\(.*?\)', '', oracle_type).strip()
+    if base in LOB_TYPES:
+        return None
+    match = re.match(r'(N?VARCHAR2|N?CHAR|RAW)\((\d+)(?:\s+(CHAR|BYTE))?\)', oracle_type)
+    if match:
+        kind, length, semantics = match.group(1), int(match.group(2)), match.group(3)
+        if kind.startswith('N'):
+            return length * 2
+        # Sémantique CHAR en AL32UTF8 : jusqu'à 4 octets par caractère
+        return length * 4 if semantics == 'CHAR' else length
+    if base.startswith('TIMESTAMP'):
+        return ORACLE_TYPE_BYTES['TIMESTAMP WITH TIME ZONE' if 'TIME ZONE' in base else 'TIMESTAMP']
+    return ORACLE_TYPE_BYTES.get(base, 22)
+
+
+def check_index_width(index, table):
+    """
+    Vérifie la largeur d'un index B-tree (clé + colonnes INCLUDE) dans Oracle.
+
+    :param index: Index du catalogue
+    :param table: Table de l'index
+    :return: message d'anomalie, ou None si l'index respecte les limites
+    """
+    if len(index.columns) > ORACLE_MAX_INDEX_COLUMNS:
+        return f"{len(index.columns)} colonnes (maximum Oracle {ORACLE_MAX_INDEX_COLUMNS})"
+
+    total = 0
+    for name, is_expression in zip(index.columns, index.expressions):
+        column = None if is_expression else table.column(name)
+        if column is None or column.oracle_type is None:
+            # Largeur d'une expression inconnue : non comptée
+            continue
+        size = oracle_type_bytes(column.oracle_type)
+        if size is None:
+            return f"colonne {name} de type {column.oracle_type} non indexable"
+        total += size
+
+    if total > ORACLE_MAX_KEY_BYTES:
+        return f"clé de {total:,} octets > {ORACLE_MAX_KEY_BYTES:,} (ORA-01450)"
+    return None
+
+
+def get_brin_load_order(catalog):
+    """
+    Colonnes de tri du chargement : colonne de tête des BRIN convertis en
+    clustering d'attributs (même décision que le DDL, voir classify_index),
+    pour que les lignes arrivent dans Oracle dans l'ordre physique.
+
+    :param catalog: Catalog PostgreSQL
+    :return: dictionnaire {table: (colonne, ordre décroissant)}
+    """
+    order = {}
+    for table in catalog.tables.values():
+        for index in table.indexes:
+            if index.index_type == 'brin' and classify_index(index, table)[0] == 'zone_map':
+                correlation = index.statistics['correlations'][0]
+                order[table.name] = (index.key_columns[0], correlation < 0)
+                break
+    return order
+
+
+def uses_substring_wordlist(index):
+    """Vrai si l'index CONTEXT remplace un index trigramme (recherche de sous-chaînes)."""
+    return bool(index.opclasses) and index.opclasses[0] in TRIGRAM_OPCLASSES
+
+
+def render_json_search_index(index):
+    """CREATE SEARCH INDEX ... FOR JSON (la colonne porte la contrainte IS JSON)."""
+    return (
+        f"CREATE SEARCH INDEX {index.quoted_name} ON {quote_identifier(index.table)} "
+        f"({quote_identifier(index.columns[0])}) FOR JSON "
+        f"PARAMETERS ('SYNC ({TEXT_SYNC_POLICY})');"
+    )
+
+
+def render_text_index(index):
+    """CREATE INDEX ... INDEXTYPE IS CTXSYS.CONTEXT avec synchronisation."""
+    parameters = f"SYNC ({TEXT_SYNC_POLICY})"
+    if uses_substring_wordlist(index):
+        parameters = f"WORDLIST {TEXT_WORDLIST} {parameters}"
+    return (
+        f"CREATE INDEX {index.quoted_name} ON {quote_identifier(index.table)} "
+        f"({quote_identifier(index.columns[0])}) INDEXTYPE IS CTXSYS.CONTEXT "
+        f"PARAMETERS ('{parameters}');"
+    )
@@ -8,6 +8,7 @@ MIGRATION DONNÉES AVEC CORRECTIONS COMPLÈTES
 ✅ Gestion CORRECTE des dates (format Oracle)
 ✅ Gestion des NULL et valeurs NULL invalides
 ✅ Diagnostic détaillé des erreurs
+✅ Chargement trié sur la colonne des BRIN ordonnés (clustering d'attributs Oracle)
 """
 
 import sys
@@ -37,6 +38,11 @@ except:
             return f'"{name}"'
         return name
 
+from catalog_cache import load_postgres_catalog
+from index_translation import get_brin_load_order
+from uuid_storage import uuid_to_raw
+from enum_encoding import get_enum_codes, encode_enum_value
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -94,6 +100,8 @@ def discover_table_and_column_mapping():
         ORDER BY table_name
         """)
         pg_tables = [row[0] for row in pg_cursor.fetchall()]
+        # Codes des ENUM (colonnes stockées en NUMBER(3) en mode compact)
+        codes_by_enum = get_enum_codes(pg_cursor)
 
         # Créer le mapping
         table_mapping = {}
@@ -125,9 +133,10 @@ def discover_table_and_column_mapping():
 
             # Récupérer les colonnes Oracle
             oracle_cursor.execute(f"""
-            SELECT column_name, data_type, nullable
-            FROM user_tab_columns
+            SELECT column_name, data_type, nullable, virtual_column
+            FROM user_tab_cols
             WHERE table_name = '{oracle_table}'
+              AND hidden_column = 'NO'
             ORDER BY column_id
             """)
             oracle_columns = {row[0]: row for row in oracle_cursor.fetchall()}
@@ -152,6 +161,9 @@ def discover_table_and_column_mapping():
                     oracle_conn.close()
                     pg_conn.close()
                     return None
+                # Colonne virtuelle (colonne générée) : calculée par Oracle, non chargée
+                if oracle_columns[oracle_col][3] == 'YES':
+                    continue
 
                 col_map[pg_col] = oracle_col
                 col_types[pg_col] = {
@@ -161,6 +173,8 @@ def discover_table_and_column_mapping():
                     'oracle_type': oracle_columns[oracle_col][1],
                     'oracle_nullable': oracle_columns[oracle_col][2]
                 }
+                if pg_data_type == 'USER-DEFINED' and oracle_columns[oracle_col][1] == 'NUMBER':
+                    col_types[pg_col]['enum_codes'] = codes_by_enum.get(pg_udt_type)
 
             column_mapping[pg_table] = col_map
             column_types_mapping[pg_table] = col_types
@@ -287,29 +301,46 @@ def convert_value_for_oracle(value, col_type_info):
         return value
 
     if pg_type == 'boolean':
+        # BOOLEAN natif (cible 23ai) : bind booléen Python
+        if oracle_type == 'BOOLEAN':
+            return bool(value)
         return 1 if value else 0
 
     if pg_type in ('json', 'jsonb') or pg_udt in ('json', 'jsonb'):
+        # Type JSON natif (cible 21c+) : l'objet décodé par psycopg2 est lié
+        # tel quel (DB_TYPE_JSON), sans aller-retour par le texte
+        if oracle_type == 'JSON':
+            return value
         if isinstance(value, (dict, list)):
-            return json.dumps(value)
+            return json.dumps(value, ensure_ascii=False)
         return str(value)
 
     if pg_type == 'uuid' or pg_udt == 'uuid':
+        # Mode --uuid-raw : 16 octets binaires pour une colonne RAW(16)
+        if oracle_type == 'RAW':
+            return uuid_to_raw(value)
         return str(value)
 
     if pg_type == 'USER-DEFINED':
+        # ENUM en mode compact : code NUMBER(3) du libellé
+        codes = col_type_info.get('enum_codes')
+        if codes is not None:
+            return encode_enum_value(codes, value)
         return str(value)
 
     if isinstance(value, list):
-        return json.dumps(value)
+        return json.dumps(value, ensure_ascii=False)
 
     return value
 
 # ============================================================================
 # ÉTAPE 4 : MIGRATION DONNÉES
 # ============================================================================
-def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
-    """Migre une table avec correction des dates et NULL"""
+def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn, load_order=None):
+    """
+    Migre une table avec correction des dates et NULL.
+    load_order = (colonne, décroissant) : lignes insérées dans l'ordre de cette colonne.
+    """
     try:
         pg_cursor = pg_conn.cursor()
 
@@ -331,12 +362,16 @@ def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
         WHERE table_name = %s AND table_schema = 'public'
         ORDER BY ordinal_position
         """, (pg_table_name,))
-        pg_column_names = [row[0] for row in pg_cursor.fetchall()]
+        # Colonnes chargées (hors colonnes virtuelles Oracle, absentes du mapping)
+        pg_column_names = [row[0] for row in pg_cursor.fetchall() if row[0] in column_map]
 
         col_list_pg = ', '.join([f'"{col}"' for col in pg_column_names])
         col_list_ora = ', '.join([f'"{column_map[col]}"' for col in pg_column_names])
 
         select_query = f'SELECT {col_list_pg} FROM "{pg_table_name}"'
+        if load_order:
+            order_column, descending = load_order
+            select_query += f' ORDER BY "{order_column}"' + (' DESC' if descending else '')
         placeholders = ', '.join([f':{i+1}' for i in range(len(pg_column_names))])
         insert_query = f'INSERT INTO "{oracle_table_name}" ({col_list_ora}) VALUES ({placeholders})'
 
@@ -345,6 +380,10 @@ def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
         pg_cursor_batch.execute(select_query)
 
         oracle_cursor = oracle_conn.cursor()
+        json_columns = [column_types[col].get('oracle_type') == 'JSON' for col in pg_column_names]
+        if any(json_columns):
+            oracle_cursor.setinputsizes(*[oracledb.DB_TYPE_JSON if is_json else None
+                                          for is_json in json_columns])
         batch = []
 
         total_inserted = 0
@@ -420,6 +459,12 @@ def migrate_all_tables(mapping_info, table_order):
         oracle_conn = oracledb.connect(**ORACLE_CONFIG)
         print("✅ Connecté à Oracle\n")
 
+        # Tables dont un BRIN suit l'ordre physique : chargement trié sur sa colonne
+        # (BRIN convertis en clustering d'attributs par le DDL, catalogue en cache)
+        load_orders = get_brin_load_order(load_postgres_catalog(PG_CONFIG))
+        for table_name, (column_name, descending) in load_orders.items():
+            print(f"ℹ️ {table_name} chargée triée sur {column_name}{' DESC' if descending else ''}")
+
         print(f"Migration de {len(table_order)} tables\n")
         print("-"*80)
 
@@ -431,7 +476,8 @@ def migrate_all_tables(mapping_info, table_order):
         for pg_table in table_order:
             if pg_table not in mapping_info['tables']:
                 continue
-            success, rows = migrate_table(pg_table, mapping_info, pg_conn, oracle_conn)
+            success, rows = migrate_table(pg_table, mapping_info, pg_conn, oracle_conn,
+                                          load_orders.get(pg_table))
             if success:
                 total_tables_success += 1
                 total_rows += rows
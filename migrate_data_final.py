@@ -29,6 +29,10 @@ import json
 from datetime import datetime
 
 sys.path.insert(0, r"D:\MEMOIRE\PROJET")
+from catalog_cache import load_postgres_catalog, load_oracle_catalog_cached
+from catalog_mapping import build_mapping, print_unmatched_report
+from uuid_storage import uuid_to_raw
+from enum_encoding import encode_enum_value
 try:
     from type_mapping import quote_identifier_if_needed
 except:
@@ -72,6 +76,9 @@ DEFAULT_VALUES_BY_TYPE = {
     'FLOAT': 0.0,
     'DATE': datetime(1900, 1, 1),
     'TIMESTAMP': datetime(1900, 1, 1),
+    'RAW': bytes(16),
+    'BOOLEAN': False,
+    'JSON': {},
 }
 
 # ============================================================================
@@ -149,129 +156,31 @@ def clean_oracle_tables():
 # ÉTAPE 1 : DÉCOUVERTE MAPPING + CONTRAINTES NOT NULL
 # ============================================================================
 
-def discover_mapping_and_constraints():
+def discover_mapping_and_constraints(catalog):
     """
     Découvre :
     - Le mapping tables/colonnes
     - Quelles colonnes sont NOT NULL dans Oracle
+
+    Les colonnes PostgreSQL proviennent du catalogue partagé (catalog_model),
+    les colonnes Oracle d'une seule requête user_tab_columns (catalog_oracle).
+    Les tables ou colonnes sans correspondance sont signalées en bloc.
     """
     print("\n" + "="*80)
     print("ÉTAPE 1 : DÉCOUVERTE DU MAPPING & CONTRAINTES")
     print("="*80 + "\n")
     
     try:
-        oracle_conn = oracledb.connect(**ORACLE_CONFIG)
-        oracle_cursor = oracle_conn.cursor()
+        oracle_catalog = load_oracle_catalog_cached(ORACLE_CONFIG)
         
-        pg_conn = psycopg2.connect(**PG_CONFIG)
-        pg_cursor = pg_conn.cursor()
+        print(f"Analyse de {len(catalog.tables)} tables...\n")
         
-        # Récupérer les tables
-        oracle_cursor.execute("""
-            SELECT table_name 
-            FROM user_tables 
-            WHERE table_name NOT LIKE 'BIN$%'
-        """)
+        mapping_info = build_mapping(catalog, oracle_catalog)
+        print_unmatched_report(mapping_info)
         
-        oracle_tables = {row[0] for row in oracle_cursor.fetchall()}
+        print(f"✅ Mapping créé pour {len(mapping_info['tables'])} tables\n")
         
-        pg_cursor.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_type = 'BASE TABLE'
-        """)
-        
-        pg_tables = [row[0] for row in pg_cursor.fetchall()]
-        
-        table_mapping = {}
-        column_mapping = {}
-        column_types_mapping = {}
-        not_null_constraints = {}  # {table: {column: True/False, ...}, ...}
-        
-        print(f"Analyse de {len(pg_tables)} tables...\n")
-        
-        for pg_table in pg_tables:
-            # Trouver la table Oracle correspondante
-            oracle_table = None
-            for ora_table in oracle_tables:
-                if ora_table.lower() == pg_table.lower():
-                    oracle_table = ora_table
-                    break
-            
-            if oracle_table is None:
-                continue
-            
-            table_mapping[pg_table] = oracle_table
-            
-            # Récupérer les colonnes PostgreSQL
-            pg_cursor.execute("""
-                SELECT column_name, data_type, udt_name, is_nullable
-                FROM information_schema.columns
-                WHERE table_name = %s AND table_schema = 'public'
-                ORDER BY ordinal_position
-            """, (pg_table,))
-            
-            pg_columns_info = pg_cursor.fetchall()
-            pg_columns = {col[0]: col for col in pg_columns_info}
-            
-            # Récupérer les colonnes Oracle + NOT NULL
-            oracle_cursor.execute(f"""
-                SELECT column_name, data_type, nullable
-                FROM user_tab_columns
-                WHERE table_name = '{oracle_table}'
-                ORDER BY column_id
-            """)
-            
-            oracle_columns = {row[0]: row for row in oracle_cursor.fetchall()}
-            
-            col_map = {}
-            col_types = {}
-            col_nullable = {}
-            
-            for pg_col, pg_info in pg_columns.items():
-                pg_data_type = pg_info[1]
-                pg_udt_type = pg_info[2]
-                
-                # Trouver la colonne Oracle
-                oracle_col = None
-                for ora_col in oracle_columns.keys():
-                    if ora_col.lower() == pg_col.lower():
-                        oracle_col = ora_col
-                        break
-                
-                if oracle_col is None:
-                    oracle_conn.close()
-                    pg_conn.close()
-                    return None
-                
-                col_map[pg_col] = oracle_col
-                col_types[pg_col] = {
-                    'pg_type': pg_data_type,
-                    'pg_udt': pg_udt_type,
-                    'oracle_type': oracle_columns[oracle_col][1],
-                    'oracle_nullable': oracle_columns[oracle_col][2]  # 'Y' ou 'N'
-                }
-                
-                # Enregistrer si la colonne est NOT NULL dans Oracle
-                is_not_null = oracle_columns[oracle_col][2] == 'N'
-                col_nullable[pg_col] = is_not_null
-            
-            column_mapping[pg_table] = col_map
-            column_types_mapping[pg_table] = col_types
-            not_null_constraints[pg_table] = col_nullable
-        
-        oracle_conn.close()
-        pg_conn.close()
-        
-        print(f"✅ Mapping créé pour {len(table_mapping)} tables\n")
-        
-        return {
-            'tables': table_mapping,
-            'columns': column_mapping,
-            'column_types': column_types_mapping,
-            'not_null': not_null_constraints
-        }
+        return mapping_info
         
     except Exception as e:
         print(f"❌ Erreur : {e}\n")
@@ -283,28 +192,20 @@ def discover_mapping_and_constraints():
 # ÉTAPE 2 : DÉTECTION ORDRE TABLES
 # ============================================================================
 
-def get_tables_order_auto(pg_table_names):
-    """Détecte l'ordre des tables"""
+def get_tables_order_auto(pg_table_names, catalog):
+    """Détecte l'ordre des tables à partir des FK du catalogue"""
     print("\n" + "="*80)
     print("ÉTAPE 2 : ORDRE DE MIGRATION")
     print("="*80 + "\n")
     
     try:
-        conn = psycopg2.connect(**PG_CONFIG)
-        cursor = conn.cursor()
-        
         all_tables = pg_table_names
         
-        cursor.execute("""
-            SELECT tc.table_name AS from_table, ccu.table_name AS to_table
-            FROM information_schema.table_constraints AS tc
-            JOIN information_schema.constraint_column_usage AS ccu
-            ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-            AND tc.table_schema = 'public'
-        """)
-        
-        dependencies = cursor.fetchall()
+        dependencies = [
+            (fk.table, fk.referenced_table)
+            for table in catalog.tables.values()
+            for fk in table.foreign_keys
+        ]
         
         dep_graph = {table: [] for table in all_tables}
         
@@ -328,9 +229,6 @@ def get_tables_order_auto(pg_table_names):
         
         print(f"✅ Ordre calculé ({len(ordered_tables)} tables)\n")
         
-        cursor.close()
-        conn.close()
-        
         return ordered_tables
         
     except Exception as e:
@@ -390,27 +288,36 @@ def convert_value_for_oracle(value, col_type_info, is_not_null):
     if 'timestamp' in pg_type.lower():
         return format_timestamp_for_oracle(value)
     
-    # BOOLEAN
+    # BOOLEAN (BOOLEAN natif en cible 23ai)
     if pg_type == 'boolean':
+        if col_type_info.get('oracle_type', '') == 'BOOLEAN':
+            return bool(value)
         return 1 if value else 0
     
-    # JSON
+    # JSON (type JSON natif en cible 21c+ : objet lié tel quel, sans json.dumps)
     if pg_type in ('json', 'jsonb') or pg_udt in ('json', 'jsonb'):
+        if col_type_info.get('oracle_type', '') == 'JSON':
+            return value
         if isinstance(value, (dict, list)):
-            return json.dumps(value)
+            return json.dumps(value, ensure_ascii=False)
         return str(value)
     
-    # UUID
+    # UUID (mode --uuid-raw : 16 octets binaires pour une colonne RAW(16))
     if pg_type == 'uuid' or pg_udt == 'uuid':
+        if col_type_info.get('oracle_type', '') == 'RAW':
+            return uuid_to_raw(value)
         return str(value)
     
-    # USER-DEFINED
+    # USER-DEFINED (ENUM en mode compact : code NUMBER(3) du libellé)
     if pg_type == 'USER-DEFINED':
+        codes = col_type_info.get('enum_codes')
+        if codes is not None:
+            return encode_enum_value(codes, value)
         return str(value)
     
     # ARRAYS
     if isinstance(value, list):
-        return json.dumps(value)
+        return json.dumps(value, ensure_ascii=False)
     
     return value
 
@@ -418,8 +325,8 @@ def convert_value_for_oracle(value, col_type_info, is_not_null):
 # ÉTAPE 4 : MIGRATION DONNÉES
 # ============================================================================
 
-def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
-    """Migre une table avec gestion des NULL"""
+def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn, table):
+    """Migre une table avec gestion des NULL (colonnes issues du catalogue)"""
     try:
         pg_cursor = pg_conn.cursor()
         
@@ -439,21 +346,15 @@ def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
             pg_cursor.close()
             return True, 0
         
-        # Récupérer les colonnes
-        pg_cursor.execute("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = %s AND table_schema = 'public'
-            ORDER BY ordinal_position
-        """, (pg_table_name,))
-        
-        pg_column_names = [row[0] for row in pg_cursor.fetchall()]
+        # Colonnes chargées (hors colonnes virtuelles Oracle, absentes du mapping)
+        columns = [col for col in table.columns if col.name in column_map]
+        pg_column_names = [col.name for col in columns]
         
         # Construire les requêtes
-        col_list_pg = ', '.join([f'"{col}"' for col in pg_column_names])
+        col_list_pg = ', '.join([col.quoted_name for col in columns])
         col_list_ora = ', '.join([f'"{column_map[col]}"' for col in pg_column_names])
         
-        select_query = f'SELECT {col_list_pg} FROM "{pg_table_name}"'
+        select_query = f'SELECT {col_list_pg} FROM {table.quoted_name}'
         placeholders = ', '.join([f':{i+1}' for i in range(len(pg_column_names))])
         insert_query = f'INSERT INTO "{oracle_table_name}" ({col_list_ora}) VALUES ({placeholders})'
         
@@ -463,6 +364,10 @@ def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
         pg_cursor_batch.execute(select_query)
         
         oracle_cursor = oracle_conn.cursor()
+        json_columns = [column_types[col].get('oracle_type') == 'JSON' for col in pg_column_names]
+        if any(json_columns):
+            oracle_cursor.setinputsizes(*[oracledb.DB_TYPE_JSON if is_json else None
+                                          for is_json in json_columns])
         
         batch = []
         total_inserted = 0
@@ -511,7 +416,7 @@ def migrate_table(pg_table_name, mapping_info, pg_conn, oracle_conn):
         print(f"❌ ERREUR : {str(e)[:70]}")
         return False, 0
 
-def migrate_all_tables(mapping_info, table_order):
+def migrate_all_tables(mapping_info, table_order, catalog):
     """Migre toutes les tables"""
     print("\n" + "="*80)
     print("ÉTAPE 4 : MIGRATION DES DONNÉES")
@@ -534,7 +439,9 @@ def migrate_all_tables(mapping_info, table_order):
             if pg_table not in mapping_info['tables']:
                 continue
             
-            success, rows = migrate_table(pg_table, mapping_info, pg_conn, oracle_conn)
+            success, rows = migrate_table(
+                pg_table, mapping_info, pg_conn, oracle_conn, catalog.tables[pg_table]
+            )
             
             if success:
                 total_tables_success += 1
@@ -610,8 +517,11 @@ def main():
         if not clean_oracle_tables():
             return
     
+    # Catalogue PostgreSQL : chargé une seule fois (cache si schéma inchangé)
+    catalog = load_postgres_catalog(PG_CONFIG)
+    
     # ÉTAPE 1 : Mapping
-    mapping_info = discover_mapping_and_constraints()
+    mapping_info = discover_mapping_and_constraints(catalog)
     
     if mapping_info is None:
         print("\n❌ Impossible de créer le mapping.\n")
@@ -620,7 +530,7 @@ def main():
     pg_table_names = list(mapping_info['tables'].keys())
     
     # ÉTAPE 2 : Ordre
-    table_order = get_tables_order_auto(pg_table_names)
+    table_order = get_tables_order_auto(pg_table_names, catalog)
     
     if not table_order:
         print("\n❌ Impossible de calculer l'ordre.\n")
@@ -641,7 +551,7 @@ def main():
         return
     
     # ÉTAPE 3-4 : Migrer
-    tables_migrated, total_rows, duration, errors = migrate_all_tables(mapping_info, table_order)
+    tables_migrated, total_rows, duration, errors = migrate_all_tables(mapping_info, table_order, catalog)
     
     # ÉTAPE 5 : Rapport
     print_final_report(tables_migrated, len(table_order), total_rows, duration, errors)
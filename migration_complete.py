@@ -30,6 +30,10 @@ if sys.platform == 'win32':
 import psycopg2
 import oracledb
 
+from sql_script_executor import execute_script
+from index_builder import build_indexes
+from oracle_batch import set_foreign_keys_status, print_batch_report
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -51,6 +55,14 @@ ORACLE_CONFIG = {
 }
 
 SQL_FILE = os.path.join(BASE_DIR, "schemas_oracle.sql")
+# Scripts d'index différés : index des FK (generate_migration.py --fk-indexes-after-load)
+# et index du plan d'usage (collection_indexes.py)
+POST_LOAD_FILES = (
+    os.path.join(BASE_DIR, "schemas_oracle_post_load.sql"),
+    os.path.join(BASE_DIR, "schemas_oracle_post_load_indexes.sql"),
+)
+DDL_REPORT_FILE = os.path.join(BASE_DIR, "ddl_execution_report.csv")
+DDL_SESSIONS = 4
 BATCH_SIZE = 1000
 COMMIT_FREQUENCY = 10
 
@@ -181,50 +193,21 @@ def step_2_execute_ddl():
     print("="*80 + "\n")
     
     try:
-        print(f"Lecture du fichier DDL : {SQL_FILE}\n")
+        print(f"Exécution du fichier DDL : {SQL_FILE}\n")
+        
+        # Découpage en flux (chaînes, commentaires, blocs PL/SQL, directives
+        # SQL*Plus) et exécution parallèle selon les dépendances entre tables
+        results = execute_script(SQL_FILE, ORACLE_CONFIG, sessions=DDL_SESSIONS,
+                                 report_path=DDL_REPORT_FILE)
         
-        with open(SQL_FILE, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
+        success_count = sum(1 for r in results if r['status'] in ('ok', 'exists'))
+        error_count = len(results) - success_count
         
-        print(f"Connexion à Oracle...\n")
+        print(f"\n✅ Exécution DDL complétée : {success_count} OK, {error_count} erreurs")
         
         conn = oracledb.connect(**ORACLE_CONFIG)
         cursor = conn.cursor()
         
-        # Diviser en statements individuels
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-        
-        success_count = 0
-        error_count = 0
-        
-        print(f"Exécution de {len(statements)} statements SQL...\n")
-        
-        for i, statement in enumerate(statements, 1):
-            # Ignorer les commentaires et les lignes vides
-            if statement.startswith('--') or not statement.strip():
-                continue
-            
-            try:
-                cursor.execute(statement)
-                success_count += 1
-                
-                # Afficher les DDL de création
-                if 'CREATE TABLE' in statement:
-                    table_name = statement.split('CREATE TABLE')[1].split('(')[0].strip().strip('"')
-                    print(f"  [{i:3d}] ✅ CREATE TABLE : {table_name}")
-                    
-            except Exception as e:
-                error_count += 1
-                # Certaines erreurs sont acceptables (ex: table existe déjà)
-                if 'already exists' in str(e) or 'ORA-00955' in str(e):
-                    print(f"  [{i:3d}] ⚠️ Table existe déjà (ignoré)")
-                else:
-                    print(f"  [{i:3d}] ❌ Erreur : {str(e)[:60]}")
-        
-        conn.commit()
-        
-        print(f"\n✅ Exécution DDL complétée : {success_count} OK, {error_count} erreurs")
-        
         # Vérifier les tables créées
         cursor.execute("SELECT COUNT(*) FROM user_tables")
         table_count = cursor.fetchone()[0]
@@ -257,22 +240,10 @@ def step_3_disable_fk():
         conn = oracledb.connect(**ORACLE_CONFIG)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT constraint_name, table_name
-            FROM user_constraints
-            WHERE constraint_type = 'R'
-            ORDER BY table_name
-        """)
-        
-        fk_constraints = cursor.fetchall()
-        print(f"Désactivation de {len(fk_constraints)} contraintes FK...\n")
-        
-        for constraint_name, table_name in fk_constraints:
-            try:
-                cursor.execute(f'ALTER TABLE "{table_name}" DISABLE CONSTRAINT "{constraint_name}"')
-                print(f"  ✅ {table_name}.{constraint_name}")
-            except Exception as e:
-                print(f"  ⚠️ {table_name}.{constraint_name} : {str(e)[:50]}")
+        # Une seule série d'allers-retours pour toutes les contraintes
+        results = set_foreign_keys_status(cursor, enabled=False)
+        print(f"Désactivation de {len(results)} contraintes FK...\n")
+        print_batch_report(results)
         
         conn.commit()
         print(f"\n✅ Contraintes FK désactivées")
@@ -317,6 +288,37 @@ def step_4_migrate_data():
         print(f"❌ ERREUR MIGRATION : {e}")
         return False
 
+# ============================================================================
+# ÉTAPE 4b : INDEX CRÉÉS APRÈS LE CHARGEMENT
+# ============================================================================
+
+def step_4b_post_load_indexes():
+    """Crée les index différés (generate_migration.py --fk-indexes-after-load, plan d'usage de collection_indexes.py), en parallèle"""
+    print("\n" + "="*80)
+    print("ÉTAPE 4b : INDEX CRÉÉS APRÈS LE CHARGEMENT")
+    print("="*80 + "\n")
+    
+    post_load_files = [path for path in POST_LOAD_FILES if os.path.exists(path)]
+    if not post_load_files:
+        print("ℹ️ Aucun index différé (index créés avec le schéma)")
+        return True
+    
+    try:
+        results = []
+        for path in post_load_files:
+            print(f"Exécution du fichier : {path}\n")
+            results += build_indexes(path, ORACLE_CONFIG, PG_CONFIG, sessions=DDL_SESSIONS)
+        
+        success_count = sum(1 for r in results if r['status'] in ('ok', 'exists'))
+        error_count = len(results) - success_count
+        print(f"\n✅ Index post-chargement : {success_count} OK, {error_count} erreurs")
+        
+        return error_count == 0
+        
+    except Exception as e:
+        print(f"❌ ERREUR INDEX POST-CHARGEMENT : {e}")
+        return False
+
 # ============================================================================
 # ÉTAPE 5 : RÉACTIVATION CONTRAINTES FK
 # ============================================================================
@@ -333,28 +335,9 @@ def step_5_enable_fk():
         conn = oracledb.connect(**ORACLE_CONFIG)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT constraint_name, table_name
-            FROM user_constraints
-            WHERE constraint_type = 'R'
-            AND status = 'DISABLED'
-            ORDER BY table_name
-        """)
-        
-        fk_constraints = cursor.fetchall()
-        print(f"Réactivation de {len(fk_constraints)} contraintes FK...\n")
-        
-        success_count = 0
-        error_count = 0
-        
-        for constraint_name, table_name in fk_constraints:
-            try:
-                cursor.execute(f'ALTER TABLE "{table_name}" ENABLE CONSTRAINT "{constraint_name}"')
-                print(f"  ✅ {table_name}.{constraint_name}")
-                success_count += 1
-            except Exception as e:
-                print(f"  ❌ {table_name}.{constraint_name} : {str(e)[:50]}")
-                error_count += 1
+        results = set_foreign_keys_status(cursor, enabled=True, only_status='DISABLED')
+        print(f"Réactivation de {len(results)} contraintes FK...\n")
+        success_count, error_count = print_batch_report(results)
         
         conn.commit()
         print(f"\n✅ Réactivation complétée : {success_count} OK, {error_count} erreurs")
@@ -455,6 +438,7 @@ def main():
         ("Exécution DDL", step_2_execute_ddl),
         ("Désactivation FK", step_3_disable_fk),
         ("Migration Données", step_4_migrate_data),
+        ("Index post-chargement", step_4b_post_load_indexes),
         ("Réactivation FK", step_5_enable_fk),
         ("Rapport Final", step_6_final_report),
     ]
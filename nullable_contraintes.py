@@ -1,3 +1,6 @@
+from oracle_batch import execute_ddl_batch
+
+
 def get_problematic_not_null_columns(oracle_conn, table_name):
     """
     Identifie les colonnes NOT NULL dans Oracle pour une table donnée.
@@ -12,24 +15,41 @@ def get_problematic_not_null_columns(oracle_conn, table_name):
     cursor.close()
     return not_null_cols
 
-def disable_not_null_constraints(oracle_conn, table_name, columns):
+def set_not_null_constraints(oracle_conn, columns_by_table, not_null):
     """
-    Désactive temporairement la contrainte NOT NULL en modifiant la colonne pour accepter NULL.
+    Modifie la contrainte NOT NULL de plusieurs colonnes, sur plusieurs tables,
+    en un seul lot (un aller-retour pour des centaines de colonnes).
+
+    :param oracle_conn: connexion Oracle
+    :param columns_by_table: {table: [colonnes]}
+    :param not_null: True pour appliquer NOT NULL, False pour accepter NULL
+    :return: résultats par colonne (voir oracle_batch.execute_ddl_batch)
     """
+    clause = 'NOT NULL' if not_null else 'NULL'
+    items = [
+        (f"{table_name}.{col}", f'ALTER TABLE "{table_name}" MODIFY ("{col}" {clause})')
+        for table_name, columns in columns_by_table.items()
+        for col in columns
+    ]
     cursor = oracle_conn.cursor()
-    for col in columns:
-        sql = f'ALTER TABLE "{table_name}" MODIFY ("{col}" NULL)'
-        cursor.execute(sql)
+    results = execute_ddl_batch(cursor, items)
     cursor.close()
     oracle_conn.commit()
 
+    failed = [r for r in results if r['error']]
+    if failed:
+        details = "; ".join(f"{r['label']} : {r['error']}" for r in failed)
+        raise RuntimeError(f"{len(failed)} modification(s) {clause} en échec : {details}")
+    return results
+
+def disable_not_null_constraints(oracle_conn, table_name, columns):
+    """
+    Désactive temporairement la contrainte NOT NULL en modifiant la colonne pour accepter NULL.
+    """
+    return set_not_null_constraints(oracle_conn, {table_name: columns}, not_null=False)
+
 def enable_not_null_constraints(oracle_conn, table_name, columns):
     """
     Réactive la contrainte NOT NULL en modifiant la colonne pour l’appliquer.
     """
-    cursor = oracle_conn.cursor()
-    for col in columns:
-        sql = f'ALTER TABLE "{table_name}" MODIFY ("{col}" NOT NULL)'
-        cursor.execute(sql)
-    cursor.close()
-    oracle_conn.commit()
+    return set_not_null_constraints(oracle_conn, {table_name: columns}, not_null=True)
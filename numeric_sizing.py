@@ -0,0 +1,198 @@
+"""
+Module numeric_sizing.py
+------------------------
+Dimensionnement des colonnes numeric sans précision d'après les données.
+
+Un numeric PostgreSQL sans précision devient un NUMBER Oracle sans
+précision : jusqu'à 22 octets par valeur et aucune contrainte de domaine.
+Pour chaque colonne candidate, un seul parcours agrégé par table mesure le
+minimum, le maximum et la plus grande échelle utilisée (scale()) ; le type
+est remplacé par :
+- NUMBER(p) si aucune valeur n'a de décimales (type entier) ;
+- NUMBER(p,s) sinon, s étant l'échelle maximale observée ;
+p couvrant les chiffres entiers observés plus NUMERIC_HEADROOM_DIGITS (2) :
+une colonne dont le maximum observé est 4 750 (4 chiffres) devient
+NUMBER(6), soit une marge d'un facteur 100 avant ORA-01438 ; au-delà, la
+colonne doit être élargie par ALTER TABLE ... MODIFY.
+
+Les valeurs qui ne tiennent pas dans un NUMBER(38) exact (plus de 38
+chiffres significatifs, NaN, Infinity) conservent le NUMBER. Une échelle
+de APPROXIMATE_SCALE décimales ou plus (résultats de calculs, pas des
+montants) est proposée en BINARY_DOUBLE si ALLOW_BINARY_DOUBLE est vrai :
+la précision exacte n'y est de toute façon pas exploitable.
+
+Les colonnes real / double precision restent BINARY_FLOAT / BINARY_DOUBLE.
+
+Le dimensionnement est optionnel (--size-numeric de generate_migration.py
+et schema_diff.py) : sans l'option, les colonnes restent en NUMBER.
+"""
+
+import psycopg2
+from psycopg2 import sql
+
+
+# Précision maximale d'un NUMBER Oracle
+NUMBER_MAX_PRECISION = 38
+# Chiffres entiers ajoutés au maximum observé
+NUMERIC_HEADROOM_DIGITS = 2
+# Échelle à partir de laquelle les décimales sont considérées approchées
+APPROXIMATE_SCALE = 15
+# Autoriser BINARY_DOUBLE pour ces colonnes (arrondi à ~16 chiffres significatifs)
+ALLOW_BINARY_DOUBLE = False
+
+NUMERIC_TYPES = ('numeric', 'decimal')
+
+
+def is_sizing_candidate(column):
+    """Vrai si la colonne est un numeric sans précision déclarée (converti en NUMBER)."""
+    return column.data_type in NUMERIC_TYPES and column.precision is None and column.oracle_type == 'NUMBER'
+
+
+def integer_digits(value):
+    """Nombre de chiffres de la partie entière d'un Decimal (0 si |value| < 1)."""
+    if not value:
+        return 0
+    return max(0, value.adjusted() + 1)
+
+
+def choose_numeric_type(minimum, maximum, max_scale):
+    """
+    Type Oracle d'une colonne numeric à partir de son profil.
+
+    :param minimum: plus petite valeur (Decimal, None si aucune valeur)
+    :param maximum: plus grande valeur (Decimal)
+    :param max_scale: plus grande échelle utilisée
+    :return: tuple (type Oracle ou None pour conserver NUMBER, raison)
+    """
+    if minimum is None or maximum is None:
+        return None, "aucune valeur non NULL"
+    if not (minimum.is_finite() and maximum.is_finite()):
+        return None, "valeurs NaN / Infinity"
+
+    scale = max_scale or 0
+    digits = max(integer_digits(minimum), integer_digits(maximum))
+    observed = f"[{minimum}, {maximum}], {scale} décimale(s)"
+
+    if scale >= APPROXIMATE_SCALE:
+        if ALLOW_BINARY_DOUBLE:
+            return 'BINARY_DOUBLE', f"{observed} : décimales approchées"
+        return None, f"{observed} : échelle trop grande pour un NUMBER(p,s) utile"
+    if digits + scale > NUMBER_MAX_PRECISION:
+        return None, f"{observed} : plus de {NUMBER_MAX_PRECISION} chiffres significatifs"
+
+    precision = min(digits + NUMERIC_HEADROOM_DIGITS + scale, NUMBER_MAX_PRECISION)
+    if scale == 0:
+        return f"NUMBER({precision})", f"{observed} : valeurs entières"
+    return f"NUMBER({precision},{scale})", observed
+
+
+def _profile_table(cursor, schema_name, table, columns):
+    """
+    Minimum, maximum et échelle maximale de chaque colonne, en un seul parcours.
+
+    :return: {colonne: (minimum, maximum, échelle maximale)}
+    """
+    query = sql.SQL("SELECT {aggregates} FROM {table}").format(
+        aggregates=sql.SQL(', ').join(
+            sql.SQL("min({column}), max({column}), max(scale({column}))").format(
+                column=sql.Identifier(column.name)
+            )
+            for column in columns
+        ),
+        table=sql.Identifier(schema_name, table.name),
+    )
+    cursor.execute(query)
+    row = cursor.fetchone()
+    return {column.name: tuple(row[3 * i:3 * i + 3]) for i, column in enumerate(columns)}
+
+
+def analyze_numeric_columns(cursor, catalog, schema_name='public'):
+    """
+    Profile les colonnes numeric sans précision et choisit leur type Oracle.
+
+    :param cursor: curseur psycopg2
+    :param catalog: Catalog
+    :param schema_name: schéma PostgreSQL
+    :return: liste de dictionnaires {table, column, current, oracle_type,
+             minimum, maximum, max_scale, reason}
+    """
+    decisions = []
+    for table in catalog.tables.values():
+        columns = [column for column in table.columns if is_sizing_candidate(column)]
+        if not columns:
+            continue
+        table_decisions = [{
+            'table': table.name,
+            'column': column.name,
+            'current': column.oracle_type,
+            'oracle_type': None,
+            'minimum': None,
+            'maximum': None,
+            'max_scale': None,
+            'reason': None,
+        } for column in columns]
+        decisions.extend(table_decisions)
+
+        try:
+            profiles = _profile_table(cursor, schema_name, table, columns)
+        except psycopg2.Error as e:
+            if not cursor.connection.autocommit:
+                cursor.connection.rollback()
+            for decision in table_decisions:
+                decision['reason'] = f"mesure impossible : {str(e).strip()[:60]}"
+            continue
+        for decision in table_decisions:
+            minimum, maximum, max_scale = profiles[decision['column']]
+            decision.update(minimum=minimum, maximum=maximum, max_scale=max_scale)
+            decision['oracle_type'], decision['reason'] = choose_numeric_type(minimum, maximum, max_scale)
+
+    return decisions
+
+
+def apply_numeric_sizing(catalog, decisions):
+    """Remplace le type Oracle des colonnes dimensionnées ; retourne le nombre de colonnes modifiées."""
+    changed = 0
+    for decision in decisions:
+        if decision['oracle_type'] is None or decision['oracle_type'] == decision['current']:
+            continue
+        column = catalog.tables[decision['table']].column(decision['column'])
+        column.oracle_type = decision['oracle_type']
+        changed += 1
+    return changed
+
+
+def size_numeric_columns(connection_params, catalog, schema_name='public', verbose=True):
+    """
+    Dimensionne les colonnes numeric sans précision d'après les données PostgreSQL.
+
+    :param connection_params: paramètres de connexion PostgreSQL
+    :param catalog: Catalog (types Oracle modifiés en place)
+    :param schema_name: schéma PostgreSQL
+    :param verbose: afficher le rapport des décisions
+    :return: liste des décisions (voir analyze_numeric_columns)
+    """
+    conn = psycopg2.connect(**connection_params)
+    try:
+        with conn.cursor() as cursor:
+            decisions = analyze_numeric_columns(cursor, catalog, schema_name)
+    finally:
+        conn.close()
+    apply_numeric_sizing(catalog, decisions)
+    if verbose:
+        print_numeric_sizing_report(decisions)
+    return decisions
+
+
+def print_numeric_sizing_report(decisions):
+    """Affiche le type retenu pour chaque colonne numeric sans précision."""
+    if not decisions:
+        return
+    sized = [d for d in decisions if d['oracle_type']]
+    kept = [d for d in decisions if d['oracle_type'] is None]
+
+    print(f"🔢 Colonnes numeric sans précision : {len(sized)} dimensionnée(s), {len(kept)} inchangée(s)")
+    for decision in sized + kept:
+        icon = '→' if decision['oracle_type'] else 'ℹ️'
+        target = decision['oracle_type'] or decision['current']
+        print(f"   {icon} {decision['table']}.{decision['column']} : "
+              f"{decision['current']} -> {target} : {decision['reason']}")
@@ -0,0 +1,104 @@
+"""
+Module oracle_batch.py
+----------------------
+Exécution groupée d'instructions DDL Oracle (désactivation/réactivation de
+contraintes, modification NOT NULL, suppressions...).
+
+Au lieu d'un cursor.execute par objet, les instructions sont envoyées par
+lots via executemany d'un bloc PL/SQL anonyme : chaque instruction est
+exécutée par EXECUTE IMMEDIATE dans son propre bloc BEGIN/EXCEPTION, et le
+message d'erreur éventuel est retourné dans une variable OUT par élément.
+Un lot de plusieurs centaines d'instructions coûte un seul aller-retour
+réseau, tout en conservant un résultat par instruction.
+"""
+
+
+BATCH_SIZE = 500
+MAX_ERROR_LENGTH = 1024
+
+# Bloc exécuté une fois par instruction, en un seul aller-retour par lot
+BATCH_BLOCK = """
+    BEGIN
+        EXECUTE IMMEDIATE :1;
+        :2 := NULL;
+    EXCEPTION
+        WHEN OTHERS THEN
+            :2 := SQLERRM;
+    END;
+"""
+
+
+def execute_ddl_batch(cursor, items, batch_size=BATCH_SIZE):
+    """
+    Exécute une liste d'instructions DDL par lots, avec capture d'erreur par instruction.
+
+    :param cursor: curseur oracledb
+    :param items: liste de (libellé, instruction SQL)
+    :param batch_size: nombre d'instructions par aller-retour
+    :return: liste de dictionnaires {label, sql, error} (error=None si succès)
+    """
+    results = []
+    items = list(items)
+
+    for start in range(0, len(items), batch_size):
+        chunk = items[start:start + batch_size]
+        errors = cursor.var(str, MAX_ERROR_LENGTH, arraysize=len(chunk))
+        cursor.setinputsizes(None, errors)
+        cursor.executemany(BATCH_BLOCK, [(sql,) for _, sql in chunk])
+
+        for (label, sql), error in zip(chunk, errors.values):
+            results.append({'label': label, 'sql': sql, 'error': error})
+
+    return results
+
+
+def print_batch_report(results, show_success=False):
+    """
+    Affiche le bilan d'un lot : nombre de succès et détail des erreurs.
+
+    :param results: résultats de execute_ddl_batch
+    :param show_success: affiche aussi chaque instruction réussie
+    :return: (nombre de succès, nombre d'erreurs)
+    """
+    success_count = 0
+    error_count = 0
+    for result in results:
+        if result['error']:
+            error_count += 1
+            print(f"  ❌ {result['label']} : {result['error'][:80]}")
+        else:
+            success_count += 1
+            if show_success:
+                print(f"  ✅ {result['label']}")
+
+    print(f"  → {success_count} OK, {error_count} erreur(s) sur {len(results)} instruction(s)")
+    return success_count, error_count
+
+
+def set_foreign_keys_status(cursor, enabled, only_status=None):
+    """
+    Active ou désactive toutes les contraintes FK du schéma en un minimum d'allers-retours.
+
+    :param cursor: curseur oracledb
+    :param enabled: True pour ENABLE, False pour DISABLE
+    :param only_status: filtre sur le statut actuel ('ENABLED' / 'DISABLED')
+    :return: résultats par contrainte
+    """
+    query = """
+        SELECT constraint_name, table_name
+        FROM user_constraints
+        WHERE constraint_type = 'R'
+    """
+    params = {}
+    if only_status:
+        query += " AND status = :status"
+        params['status'] = only_status
+    cursor.execute(query + " ORDER BY table_name", params)
+
+    action = 'ENABLE' if enabled else 'DISABLE'
+    items = [
+        (f"{table_name}.{constraint_name}",
+         f'ALTER TABLE "{table_name}" {action} CONSTRAINT "{constraint_name}"')
+        for constraint_name, table_name in cursor.fetchall()
+    ]
+    return execute_ddl_batch(cursor, items)
@@ -0,0 +1,158 @@
+"""
+Module pk_contention.py
+-----------------------
+Index de clé primaire des tables à fort débit d'insertion.
+
+Une clé alimentée par une séquence (IDENTITY, DEFAULT nextval) insère
+toujours dans le bloc feuille le plus à droite du B-tree : sous charge
+concurrente, toutes les sessions se disputent ce bloc ('buffer busy waits',
+'enq: TX - index contention'). Pour les tables dont le débit d'insertion
+observé (pg_stat_user_tables.n_tup_ins) dépasse HOT_INSERT_RATE, l'index de
+la PK peut être :
+- reverse : index à clé inversée ; les valeurs consécutives sont réparties
+            sur tout l'index (les parcours d'intervalle sur la PK ne peuvent
+            plus l'utiliser) ;
+- hash    : index global partitionné par hachage sur HASH_PARTITIONS
+            partitions (option Partitioning) ; les parcours d'intervalle
+            restent possibles ;
+- none    : index B-tree standard.
+
+Par défaut aucune stratégie n'est appliquée : les PK chaudes sont seulement
+signalées (print_hot_pk_report). Le choix se fait par table ou pour toutes
+les PK chaudes ('*') avec l'option --hot-pk de generate_migration.py
+(PK_INDEX_STRATEGIES, DEFAULT_HOT_PK_STRATEGY).
+"""
+
+from catalog_model import quote_identifier
+
+
+PK_INDEX_CHOICES = ('none', 'reverse', 'hash')
+# Débit moyen d'insertion (lignes/seconde) à partir duquel la PK est « chaude »
+HOT_INSERT_RATE = 50
+# Stratégie appliquée aux PK chaudes sans configuration explicite ('*=...' de --hot-pk)
+DEFAULT_HOT_PK_STRATEGY = 'none'
+# Nombre de partitions des index globaux par hachage (puissance de 2)
+HASH_PARTITIONS = 16
+# Stratégie par table : {table: 'none' | 'reverse' | 'hash'}
+PK_INDEX_STRATEGIES = {}
+
+SEQUENCE_TYPES = ('smallint', 'integer', 'bigint', 'numeric')
+
+
+def configure_pk_strategies(specs):
+    """
+    Enregistre les stratégies par table (ex: ['order=hash', 'audit_log=reverse', 'event=none']).
+    Le nom '*' remplace la stratégie par défaut des PK chaudes.
+
+    :param specs: liste de chaînes TABLE=STRATÉGIE
+    :raises ValueError: format ou stratégie invalide
+    """
+    global DEFAULT_HOT_PK_STRATEGY
+    for spec in specs:
+        table_name, _, strategy = spec.partition('=')
+        strategy = strategy.strip().lower()
+        if not table_name or strategy not in PK_INDEX_CHOICES:
+            raise ValueError(f"--hot-pk {spec!r} : attendu TABLE={'|'.join(PK_INDEX_CHOICES)}")
+        if table_name.strip() == '*':
+            DEFAULT_HOT_PK_STRATEGY = strategy
+        else:
+            PK_INDEX_STRATEGIES[table_name.strip()] = strategy
+
+
+def is_sequence_driven(table):
+    """Vrai si la PK est une colonne numérique alimentée par une séquence ou IDENTITY."""
+    if table.primary_key is None or len(table.primary_key.columns) != 1:
+        return False
+    column = table.column(table.primary_key.columns[0])
+    if column is None or column.data_type not in SEQUENCE_TYPES:
+        return False
+    return bool(column.identity) or (column.default or '').startswith('nextval(')
+
+
+def insert_rate(table):
+    """Débit moyen d'insertion observé (lignes/seconde), ou None sans statistiques."""
+    inserts = table.statistics.get('inserts')
+    seconds = table.statistics.get('observed_seconds')
+    if inserts is None or not seconds:
+        return None
+    return inserts / seconds
+
+
+def is_hot_primary_key(table):
+    """Vrai si la PK est séquentielle et que le débit d'insertion atteint HOT_INSERT_RATE."""
+    if table.primary_key is None or not is_sequence_driven(table):
+        return False
+    rate = insert_rate(table)
+    return rate is not None and rate >= HOT_INSERT_RATE
+
+
+def pk_index_strategy(table):
+    """
+    Stratégie d'index de la PK d'une table.
+
+    :param table: Table du catalogue
+    :return: tuple (stratégie, raison)
+    """
+    if table.primary_key is None:
+        return 'none', "pas de clé primaire"
+    if table.name in PK_INDEX_STRATEGIES:
+        return PK_INDEX_STRATEGIES[table.name], "configuré pour la table"
+    if not is_sequence_driven(table):
+        return 'none', "clé non séquentielle"
+    rate = insert_rate(table)
+    if rate is None:
+        return 'none', "débit d'insertion inconnu"
+    if rate < HOT_INSERT_RATE:
+        return 'none', f"{rate:,.1f} insertions/s"
+    return DEFAULT_HOT_PK_STRATEGY, f"clé séquentielle, {rate:,.1f} insertions/s (seuil {HOT_INSERT_RATE})"
+
+
+def render_pk_index_clause(constraint, strategy):
+    """
+    Clause USING INDEX (CREATE UNIQUE INDEX ...) de la PK (préfixée d'un espace),
+    ou chaîne vide pour un index standard.
+    """
+    if strategy == 'none':
+        return ""
+    columns_formatted = ", ".join(quote_identifier(col) for col in constraint.columns)
+    index = (
+        f"CREATE UNIQUE INDEX {constraint.quoted_name} "
+        f"ON {quote_identifier(constraint.table)} ({columns_formatted})"
+    )
+    if strategy == 'reverse':
+        index += " REVERSE"
+    else:
+        index += f" GLOBAL PARTITION BY HASH ({columns_formatted}) PARTITIONS {HASH_PARTITIONS}"
+    return f" USING INDEX ({index})"
+
+
+def find_hot_primary_keys(catalog):
+    """
+    Retourne les PK chaudes et les PK à index particulier, sous forme
+    (table, stratégie, raison) ; la stratégie vaut 'none' pour une PK chaude
+    sans stratégie configurée.
+    """
+    hot = []
+    for table in catalog.tables.values():
+        strategy, reason = pk_index_strategy(table)
+        if strategy != 'none' or is_hot_primary_key(table):
+            hot.append((table, strategy, reason))
+    return hot
+
+
+def print_hot_pk_report(catalog):
+    """Affiche les PK à forte contention d'insertion et l'index retenu pour chacune"""
+    hot = find_hot_primary_keys(catalog)
+    if not hot:
+        return hot
+    labels = {
+        'none': "index standard",
+        'reverse': "index à clé inversée",
+        'hash': f"index global HASH ({HASH_PARTITIONS} partitions)",
+    }
+    print(f"🔥 PK à forte contention d'insertion : {len(hot)}")
+    for table, strategy, reason in hot:
+        print(f"   → {table.name}.{table.primary_key.name} : {labels[strategy]} ({reason})")
+    if any(strategy == 'none' for _, strategy, _ in hot):
+        print("   ℹ️  Appliquer un index inversé ou HASH : --hot-pk TABLE=reverse|hash ('*=...' pour toutes)")
+    return hot
@@ -0,0 +1,519 @@
+# -*- coding: utf-8 -*-
+"""
+Script: schema_diff.py
+----------------------
+Mode différentiel : compare le catalogue PostgreSQL au dictionnaire Oracle
+en place (user_tab_columns, user_constraints, user_indexes) et produit un
+script minimal de changements, sans supprimer ni recharger les données :
+
+- tables manquantes : CREATE TABLE ;
+- colonnes manquantes ou différentes : ALTER TABLE ADD / MODIFY ;
+- contraintes et index manquants ou modifiés : ADD CONSTRAINT / CREATE INDEX ;
+- tables de correspondance des ENUM encodés (<enum>_LKP) et vues décodées
+  (<table>_V) manquantes : créées ; les vues sont recréées quand les
+  colonnes de leur table changent ;
+- objets en trop dans Oracle : DROP (commentés sauf avec --drop) ; les
+  tables de correspondance ENUM ne sont jamais supprimées.
+
+Les changements sont ordonnés (suppressions de FK d'abord, FK ajoutées
+après les clés) et peuvent être appliqués directement par lots
+(oracle_batch) au lieu de passer par cleanup_oracle + rechargement complet.
+
+UTILISATION:
+    python schema_diff.py                       (écrit schema_diff.sql)
+    python schema_diff.py --apply               (applique les changements)
+    python schema_diff.py --drop --apply        (supprime aussi les objets en trop)
+"""
+
+import os
+import re
+import sys
+import argparse
+from datetime import datetime
+
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+from catalog_model import quote_identifier
+from catalog_mapping import normalize_name
+from generate_ddl_v2 import (
+    render_table, render_constraint, render_enum_check, render_index, covering_index_name,
+    render_enum_lookup, enum_lookup_name, render_decoding_view, decoding_view_name,
+)
+from enum_encoding import encoded_enum_types
+from index_translation import classify_index, JSON_TYPES
+from pk_contention import pk_index_strategy
+from generated_columns import render_virtual_clause
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BASE_DIR = r"D:\MEMOIRE\PROJET"
+OUTPUT_FILE = os.path.join(BASE_DIR, "schema_diff.sql")
+
+PG_CONFIG = {
+    'host': 'localhost',
+    'port': 5432,
+    'database': 'AURA',
+    'user': 'postgres',
+    'password': 'admin'
+}
+
+ORACLE_CONFIG = {
+    'user': 'C##TEST',
+    'password': 'admin',
+    'dsn': 'localhost:1521/PROJET'
+}
+
+# Ordre d'application des changements
+PHASES = (
+    'drop_fk',
+    'drop_constraint',
+    'drop_index',
+    'create_table',
+    'create_lookup',
+    'add_column',
+    'modify_column',
+    'add_key',
+    'add_check',
+    'add_fk',
+    'create_index',
+    'create_view',
+    'drop_column',
+    'drop_table',
+)
+
+ORACLE_CONSTRAINT_TYPES = {
+    'PRIMARY KEY': 'P',
+    'UNIQUE': 'U',
+    'FOREIGN KEY': 'R',
+}
+
+# ============================================================================
+# COMPARAISON DES TYPES
+# ============================================================================
+
+def expected_type_signature(oracle_type):
+    """Signature comparable du type Oracle généré pour une colonne PostgreSQL."""
+    signature = oracle_type.upper().replace(' GENERATED BY DEFAULT AS IDENTITY', '').strip()
+    return re.sub(r"^NUMBER\((\d+),\s*0\)$", r"NUMBER(\1)", signature)
+
+
+def actual_type_signature(column):
+    """Signature comparable d'une colonne du dictionnaire Oracle."""
+    data_type = column["data_type"]
+    if data_type in ('VARCHAR2', 'NVARCHAR2', 'CHAR', 'NCHAR'):
+        return f"{data_type}({column['char_length']})"
+    if data_type == 'NUMBER':
+        if column["precision"] is None:
+            return 'NUMBER'
+        if not column["scale"]:
+            return f"NUMBER({column['precision']})"
+        return f"NUMBER({column['precision']},{column['scale']})"
+    if data_type == 'RAW':
+        return f"RAW({column['data_length']})"
+    if data_type.startswith(('TIMESTAMP', 'INTERVAL')):
+        # Précisions implicites du dictionnaire : TIMESTAMP(6), DAY(2) TO SECOND(6)
+        return re.sub(r"\(\d+\)", '', data_type)
+    return data_type
+
+
+def base_type(signature):
+    return signature.split('(')[0]
+
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def _change(changes, phase, table, obj, sql, destructive=False, manual=False):
+    changes.append({
+        'phase': phase,
+        'table': table,
+        'object': obj,
+        'sql': sql.rstrip().rstrip(';'),
+        'destructive': destructive,
+        'manual': manual,
+    })
+
+
+def _column_definition(column, table, with_default=True):
+    virtual = render_virtual_clause(column, table)
+    if virtual:
+        return f"{column.quoted_name} {column.oracle_type}{virtual}"
+    default_clause = f" DEFAULT {column.oracle_default}" if with_default and column.oracle_default else ""
+    is_json = (f" CHECK ({column.quoted_name} IS JSON)"
+               if column.udt_name in JSON_TYPES and column.oracle_type != 'JSON' else "")
+    return f"{column.quoted_name} {column.oracle_type}{default_clause}{is_json}"
+
+
+def _diff_columns(changes, table, oracle_table):
+    oracle_columns = {
+        normalize_name(name): col for name, col in oracle_table["columns"].items()
+    }
+    table_name = quote_identifier(oracle_table["name"])
+
+    for column in table.columns:
+        oracle_col = oracle_columns.pop(normalize_name(column.name), None)
+
+        if oracle_col is None:
+            definition = _column_definition(column, table)
+            if not column.nullable and column.oracle_default:
+                definition += " NOT NULL"
+            elif not column.nullable:
+                # Sans DEFAULT : colonne ajoutée nullable, NOT NULL appliqué à part
+                # (seul ce MODIFY échoue si la table contient déjà des lignes)
+                _change(changes, 'modify_column', table.name, column.name,
+                        f"ALTER TABLE {table_name} MODIFY ({column.quoted_name} NOT NULL)")
+            _change(changes, 'add_column', table.name, column.name,
+                    f"ALTER TABLE {table_name} ADD ({definition})")
+            continue
+
+        column_name = quote_identifier(oracle_col["name"])
+        expected = expected_type_signature(column.oracle_type)
+        actual = actual_type_signature(oracle_col)
+        if expected != actual:
+            if base_type(expected) == base_type(actual):
+                _change(changes, 'modify_column', table.name, column.name,
+                        f"ALTER TABLE {table_name} MODIFY ({column_name} {column.oracle_type.split(' GENERATED')[0]})")
+            else:
+                # Changement de famille (ex: VARCHAR2 → CLOB) : migration manuelle des données
+                _change(changes, 'modify_column', table.name, column.name,
+                        f"-- {table.name}.{column.name} : {actual} → {expected} (conversion manuelle requise)",
+                        manual=True)
+
+        if column.nullable != oracle_col["nullable"]:
+            clause = "NULL" if column.nullable else "NOT NULL"
+            _change(changes, 'modify_column', table.name, column.name,
+                    f"ALTER TABLE {table_name} MODIFY ({column_name} {clause})")
+
+    for extra in oracle_columns.values():
+        _change(changes, 'drop_column', table.name, extra["name"],
+                f"ALTER TABLE {table_name} DROP COLUMN {quote_identifier(extra['name'])}",
+                destructive=True)
+
+
+def _expected_constraints(catalog, table):
+    """Contraintes attendues dans Oracle : {nom normalisé: (type Oracle, colonnes, phase, DDL)}."""
+    expected = {}
+    keys = ([table.primary_key] if table.primary_key else []) + table.unique
+    for constraint in keys + table.foreign_keys:
+        pk_index = pk_index_strategy(table)[0] if constraint is table.primary_key else 'none'
+        ddl = render_constraint(constraint, pk_index)
+        if ddl is None:
+            continue
+        phase = 'add_fk' if constraint.type == 'FOREIGN KEY' else 'add_key'
+        columns = tuple(normalize_name(col) for col in constraint.columns)
+        expected[normalize_name(constraint.name[:30])] = (
+            ORACLE_CONSTRAINT_TYPES[constraint.type], columns, phase, ddl,
+        )
+
+    for column in table.columns:
+        enum_type = catalog.enums.get(column.udt_name) if column.is_enum else None
+        if enum_type is None:
+            continue
+        ddl = render_enum_check(table, column, enum_type)
+        if ddl:
+            name = f"chk_{table.name}_{column.name}"[:30]
+            expected[normalize_name(name)] = ('C', (normalize_name(column.name),), 'add_check', ddl)
+
+    return expected
+
+
+def _diff_constraints(changes, catalog, table, oracle_table):
+    table_name = quote_identifier(oracle_table["name"])
+    expected = _expected_constraints(catalog, table)
+    existing = {
+        normalize_name(name): constraint
+        for name, constraint in oracle_table["constraints"].items()
+        if not constraint["generated"]
+    }
+
+    for name, (constraint_type, columns, phase, ddl) in expected.items():
+        current = existing.pop(name, None)
+        if current is not None:
+            same_columns = tuple(normalize_name(col) for col in current["columns"]) == columns
+            if current["type"] == constraint_type and same_columns:
+                continue
+            drop_phase = 'drop_fk' if current["type"] == 'R' else 'drop_constraint'
+            _change(changes, drop_phase, table.name, current["name"],
+                    f"ALTER TABLE {table_name} DROP CONSTRAINT {quote_identifier(current['name'])}")
+        _change(changes, phase, table.name, name, ddl)
+
+    for extra in existing.values():
+        drop_phase = 'drop_fk' if extra["type"] == 'R' else 'drop_constraint'
+        _change(changes, drop_phase, table.name, extra["name"],
+                f"ALTER TABLE {table_name} DROP CONSTRAINT {quote_identifier(extra['name'])}",
+                destructive=True)
+
+
+def _diff_index(changes, existing, table, name, ddl, kind, columns, unique):
+    current = existing.pop(normalize_name(name), None)
+    if current is not None:
+        if kind in ('json_search', 'text_context'):
+            same_columns = current["index_type"] == 'DOMAIN'
+        elif kind == 'function_based':
+            # Colonnes virtuelles SYS_NC...$ côté Oracle : seul le type d'index est comparé
+            same_columns = current["index_type"].startswith('FUNCTION-BASED')
+        else:
+            same_columns = [normalize_name(col) for col in current["columns"]] == \
+                [normalize_name(col) for col in columns]
+        if same_columns and current["unique"] == unique:
+            return
+        _change(changes, 'drop_index', table.name, current["name"],
+                f"DROP INDEX {quote_identifier(current['name'])}")
+    _change(changes, 'create_index', table.name, name, ddl)
+
+
+def _diff_indexes(changes, table, oracle_table):
+    existing = {
+        normalize_name(name): index
+        for name, index in oracle_table["indexes"].items()
+        if not index["constraint_backed"] and not name.startswith('SYS_')
+    }
+
+    for index in table.indexes:
+        ddl = render_index(index, table)
+        kind, _ = classify_index(index, table)
+        # Clustering d'attributs (BRIN) : propriété de la table, pas un index Oracle
+        if ddl is None or kind == 'zone_map':
+            continue
+        if index.unique and index.include_columns and kind in ('btree', 'function_based'):
+            # UNIQUE sur la clé + index couvrant (clé + INCLUDE)
+            unique_ddl, covering_ddl = ddl.split("\n", 1)
+            _diff_index(changes, existing, table, index.name, unique_ddl, kind, index.key_columns, True)
+            _diff_index(changes, existing, table, covering_index_name(index), covering_ddl, kind,
+                        index.columns, False)
+        else:
+            _diff_index(changes, existing, table, index.name, ddl, kind, index.columns, index.unique)
+
+    for extra in existing.values():
+        _change(changes, 'drop_index', table.name, extra["name"],
+                f"DROP INDEX {quote_identifier(extra['name'])}", destructive=True)
+
+
+def _diff_enum_lookups(changes, catalog, oracle_tables):
+    """Crée les tables de correspondance manquantes des types ENUM encodés (--compact-enum)."""
+    for enum_type in encoded_enum_types(catalog):
+        lookup = enum_lookup_name(enum_type.name)
+        if oracle_tables.pop(normalize_name(lookup), None) is not None:
+            continue
+        # CREATE TABLE, INSERT des libellés et COMMIT : une instruction par changement
+        for statement in render_enum_lookup(enum_type).split(";\n"):
+            _change(changes, 'create_lookup', lookup, lookup, statement)
+
+
+def _diff_decoding_views(changes, catalog, oracle_catalog):
+    """Crée les vues décodées manquantes, et les recrée si les colonnes de leur table changent."""
+    existing = {normalize_name(name) for name in oracle_catalog.get("views", [])}
+    changed_tables = {
+        change['table'] for change in changes
+        if change['phase'] in ('add_column', 'modify_column', 'drop_column')
+    }
+    for table in catalog.tables.values():
+        ddl = render_decoding_view(table)
+        if ddl is None:
+            continue
+        view = decoding_view_name(table)
+        if normalize_name(view) in existing and table.name not in changed_tables:
+            continue
+        _change(changes, 'create_view', table.name, view, ddl)
+
+
+def diff_schema(catalog, oracle_catalog):
+    """
+    Compare le catalogue PostgreSQL et le dictionnaire Oracle.
+
+    :param catalog: Catalog PostgreSQL (catalog_model)
+    :param oracle_catalog: dictionnaire Oracle (catalog_oracle)
+    :return: liste ordonnée de changements {phase, table, object, sql, destructive, manual}
+    """
+    changes = []
+    oracle_tables = {
+        normalize_name(name): table for name, table in oracle_catalog["tables"].items()
+    }
+
+    for table in catalog.tables.values():
+        oracle_table = oracle_tables.pop(normalize_name(table.name), None)
+
+        if oracle_table is None:
+            _change(changes, 'create_table', table.name, table.name, render_table(table))
+            empty = {"name": table.name, "columns": {}, "constraints": {}, "indexes": {}}
+            _diff_constraints(changes, catalog, table, empty)
+            _diff_indexes(changes, table, empty)
+            continue
+
+        _diff_columns(changes, table, oracle_table)
+        _diff_constraints(changes, catalog, table, oracle_table)
+        _diff_indexes(changes, table, oracle_table)
+
+    _diff_enum_lookups(changes, catalog, oracle_tables)
+    _diff_decoding_views(changes, catalog, oracle_catalog)
+
+    # Tables de correspondance ENUM (encodées ou non dans ce schéma) : jamais supprimées
+    lookup_tables = {normalize_name(enum_lookup_name(name)) for name in catalog.enums}
+    for name, extra in oracle_tables.items():
+        # Tables techniques Oracle (journaux de vues matérialisées, Oracle Text...)
+        if '$' in extra["name"] or name in lookup_tables:
+            continue
+        _change(changes, 'drop_table', extra["name"], extra["name"],
+                f"DROP TABLE {quote_identifier(extra['name'])} CASCADE CONSTRAINTS PURGE",
+                destructive=True)
+
+    changes.sort(key=lambda change: PHASES.index(change['phase']))
+    return changes
+
+
+# ============================================================================
+# SORTIE ET APPLICATION
+# ============================================================================
+
+def print_diff_summary(changes):
+    """Affiche le nombre de changements par phase."""
+    print(f"\n{'='*80}")
+    print("DIFFÉRENCES POSTGRESQL → ORACLE")
+    print(f"{'='*80}\n")
+
+    if not changes:
+        print("✅ Schéma Oracle à jour : aucun changement")
+        return
+
+    for phase in PHASES:
+        phase_changes = [c for c in changes if c['phase'] == phase]
+        if phase_changes:
+            print(f"  {phase:17} : {len(phase_changes):>5}")
+
+    destructive = sum(1 for c in changes if c['destructive'])
+    manual = sum(1 for c in changes if c['manual'])
+    if destructive:
+        print(f"\n⚠ {destructive} suppression(s) d'objets absents de PostgreSQL")
+    if manual:
+        print(f"⚠ {manual} changement(s) de type à traiter manuellement")
+
+
+def write_diff_script(changes, path, allow_drops=False):
+    """
+    Écrit le script de changements.
+
+    :param changes: résultat de diff_schema
+    :param path: fichier SQL de sortie
+    :param allow_drops: si False, les suppressions sont écrites en commentaire
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("-- ============================================================================\n")
+        f.write("-- SCRIPT DIFFÉRENTIEL POSTGRESQL → ORACLE\n")
+        f.write(f"-- Date génération : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"-- Changements     : {len(changes)}\n")
+        f.write("-- ============================================================================\n")
+
+        current_phase = None
+        for change in changes:
+            if change['phase'] != current_phase:
+                current_phase = change['phase']
+                f.write(f"\n-- {current_phase.upper()}\n\n")
+            if change['manual']:
+                f.write(f"{change['sql']}\n")
+            elif change['destructive'] and not allow_drops:
+                f.write(f"-- {change['sql']};\n")
+            else:
+                f.write(f"{change['sql']};\n")
+
+
+def apply_changes(cursor, changes, allow_drops=False):
+    """
+    Applique les changements par lots, dans l'ordre des phases.
+
+    :param cursor: curseur oracledb
+    :param changes: résultat de diff_schema
+    :param allow_drops: applique aussi les suppressions
+    :return: résultats par instruction (voir oracle_batch.execute_ddl_batch)
+    """
+    from oracle_batch import execute_ddl_batch, print_batch_report
+
+    results = []
+    for phase in PHASES:
+        items = [
+            (f"{change['table']}.{change['object']}", change['sql'])
+            for change in changes
+            if change['phase'] == phase and not change['manual']
+            and (allow_drops or not change['destructive'])
+        ]
+        if not items:
+            continue
+        print(f"\n{phase} ({len(items)})")
+        phase_results = execute_ddl_batch(cursor, items)
+        print_batch_report(phase_results)
+        results.extend(phase_results)
+    return results
+
+
+# ============================================================================
+# FONCTION PRINCIPALE
+# ============================================================================
+
+def main():
+    """Compare les schémas et écrit ou applique le script différentiel"""
+    parser = argparse.ArgumentParser(description="Diff de schéma PostgreSQL → Oracle")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="script SQL de sortie")
+    parser.add_argument('--apply', action='store_true', help="appliquer les changements dans Oracle")
+    parser.add_argument('--drop', action='store_true', help="supprimer les objets absents de PostgreSQL")
+    parser.add_argument('--refresh', action='store_true', help="ignorer le cache des catalogues")
+    parser.add_argument('--size-text', action='store_true',
+                        help="colonnes texte/JSON dimensionnées d'après les données (comme generate_migration.py)")
+    parser.add_argument('--size-numeric', action='store_true',
+                        help="colonnes numeric sans précision dimensionnées d'après les données (comme generate_migration.py)")
+    parser.add_argument('--uuid-raw', action='store_true', help="UUID stockés en RAW(16)")
+    parser.add_argument('--compact-enum', action='append', default=[], metavar='TABLE',
+                        help="ENUM de la table stockés en code NUMBER(3) ('*' pour toutes)")
+    parser.add_argument('--target', default='19c', choices=('12c', '19c', '21c', '23ai'),
+                        help="version Oracle cible (types JSON / BOOLEAN natifs)")
+    args = parser.parse_args()
+
+    import oracledb
+    from target_profile import set_target
+    set_target(args.target)
+    from catalog_cache import load_postgres_catalog, load_oracle_catalog_cached
+    from text_sizing import size_text_columns
+    from numeric_sizing import size_numeric_columns
+    from uuid_storage import apply_uuid_storage
+    from enum_encoding import apply_enum_encoding
+
+    catalog = load_postgres_catalog(PG_CONFIG, refresh=args.refresh)
+    if args.size_text:
+        # Mêmes types que generate_migration.py --size-text pour les colonnes texte/JSON
+        size_text_columns(PG_CONFIG, catalog)
+    if args.size_numeric:
+        size_numeric_columns(PG_CONFIG, catalog)
+    apply_uuid_storage(catalog, 'raw' if args.uuid_raw else 'text')
+    apply_enum_encoding(catalog, set(args.compact_enum))
+    oracle_catalog = load_oracle_catalog_cached(ORACLE_CONFIG, refresh=args.refresh)
+
+    changes = diff_schema(catalog, oracle_catalog)
+    print_diff_summary(changes)
+
+    write_diff_script(changes, args.output, allow_drops=args.drop)
+    print(f"\n✓ Script différentiel : {args.output}")
+
+    if args.apply and changes:
+        conn = oracledb.connect(**ORACLE_CONFIG)
+        try:
+            cursor = conn.cursor()
+            results = apply_changes(cursor, changes, allow_drops=args.drop)
+            cursor.close()
+        finally:
+            conn.close()
+        errors = sum(1 for r in results if r['error'])
+        print(f"\n{'✅' if not errors else '❌'} {len(results) - errors} changement(s) appliqué(s), {errors} erreur(s)")
+        return errors == 0
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,497 @@
+"""
+Module sql_script_executor.py
+-----------------------------
+Exécution en flux d'un script SQL Oracle (schemas_oracle.sql ou fichiers
+produits par ddl_engine).
+
+Le script est lu ligne par ligne et découpé par un vrai tokenizer :
+- chaînes '...' et identifiants "..." (un ';' à l'intérieur ne coupe rien) ;
+- commentaires -- et /* ... */ ;
+- blocs PL/SQL (CREATE FUNCTION/PROCEDURE/PACKAGE/TRIGGER/TYPE, DECLARE,
+  BEGIN) terminés par une ligne '/' ;
+- directives SQL*Plus (SET, PROMPT, WHENEVER, EXEC, ...).
+
+Chaque instruction est placée dans un graphe de dépendances au fil de la
+lecture : les instructions sur des tables différentes s'exécutent en
+parallèle sur plusieurs sessions Oracle, celles qui touchent une même table
+restent dans l'ordre du script (contraintes après leur table, FK après la
+clé primaire de la table référencée). Les objets non analysés (vues,
+fonctions, triggers...) servent de barrière. Le temps et le résultat de
+chaque instruction sont rapportés.
+"""
+
+import os
+import re
+import csv
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import oracledb
+
+
+DEFAULT_SESSIONS = 4
+MAX_PENDING_PER_SESSION = 64
+
+# Erreurs signifiant que l'objet existe déjà (relance du script)
+IGNORED_ERRORS = {
+    'ORA-00955',  # nom déjà utilisé par un objet existant
+    'ORA-02260',  # la table ne peut avoir qu'une clé primaire
+    'ORA-02261',  # clé unique ou primaire déjà existante
+    'ORA-02275',  # contrainte référentielle déjà existante
+    'ORA-01408',  # liste de colonnes déjà indexée
+    'ORA-02264',  # nom déjà utilisé par une contrainte existante
+}
+
+SQLPLUS_DIRECTIVES = {
+    'SET', 'PROMPT', 'SPOOL', 'WHENEVER', 'EXIT', 'QUIT', 'REM', 'REMARK',
+    'SHOW', 'DEFINE', 'UNDEFINE', 'COLUMN', 'TTITLE', 'BTITLE', 'CLEAR',
+    'BREAK', 'COMPUTE', 'EXEC', 'EXECUTE', 'CONNECT', 'DISCONNECT', 'PAUSE',
+    'HOST', 'ACCEPT', 'VARIABLE', 'PRINT', 'TIMING', 'START', '@', '@@',
+}
+
+PLSQL_START = re.compile(
+    r"^(CREATE\s+(OR\s+REPLACE\s+)?((NON)?EDITIONABLE\s+)?"
+    r"(FUNCTION|PROCEDURE|PACKAGE|TRIGGER|TYPE)\b|DECLARE\b|BEGIN\b)"
+)
+
+SPECIAL_CHARS = re.compile(r"['\";/-]")
+
+IDENTIFIER = r'("[^"]+"|[\w$#]+)(?:\.("[^"]+"|[\w$#]+))?'
+
+STATEMENT_PATTERNS = (
+    ('table', re.compile(r"^CREATE\s+(?:GLOBAL\s+TEMPORARY\s+)?TABLE\s+" + IDENTIFIER)),
+    ('index', re.compile(r"^CREATE\s+(?:UNIQUE\s+|BITMAP\s+|SEARCH\s+)?INDEX\s+" + IDENTIFIER + r"\s+ON\s+" + IDENTIFIER)),
+    ('constraint', re.compile(r"^ALTER\s+TABLE\s+" + IDENTIFIER + r".*?\bREFERENCES\s+" + IDENTIFIER, re.S)),
+    ('alter', re.compile(r"^ALTER\s+TABLE\s+" + IDENTIFIER)),
+    ('comment', re.compile(r"^COMMENT\s+ON\s+(?:TABLE|COLUMN)\s+" + IDENTIFIER)),
+    ('drop', re.compile(r"^DROP\s+TABLE\s+" + IDENTIFIER)),
+    ('dml', re.compile(r"^(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+" + IDENTIFIER)),
+    ('sequence', re.compile(r"^CREATE\s+SEQUENCE\s+" + IDENTIFIER)),
+)
+
+ERROR_CODE = re.compile(r"(ORA-\d{5}|DPY-\d{4})")
+
+
+class Statement:
+    """Instruction extraite d'un script SQL."""
+
+    __slots__ = ('index', 'source', 'line', 'text', 'kind', 'object_name', 'tables', 'is_plsql')
+
+    def __init__(self, index, source, line, text, kind, object_name=None, tables=(), is_plsql=False):
+        self.index = index
+        self.source = source
+        self.line = line
+        self.text = text
+        self.kind = kind
+        self.object_name = object_name
+        self.tables = tuple(tables)
+        self.is_plsql = is_plsql
+
+    @property
+    def is_barrier(self):
+        """Instruction non analysée : exécutée seule, après tout ce qui précède."""
+        return self.kind not in ('table', 'index', 'constraint', 'alter', 'comment',
+                                 'drop', 'dml', 'sequence', 'directive')
+
+    def __repr__(self):
+        return f"Statement({self.index}, {self.kind!r}, {self.object_name!r})"
+
+
+def normalize_identifier(identifier):
+    """Nom Oracle effectif : casse conservée entre guillemets, majuscules sinon."""
+    if identifier.startswith('"'):
+        return identifier.strip('"')
+    return identifier.upper()
+
+
+def classify_statement(header):
+    """
+    Détermine le type d'une instruction et les tables qu'elle touche.
+
+    :param header: début de l'instruction, sans commentaires, en majuscules
+                   hors identifiants entre guillemets
+    :return: (type, nom de l'objet, tables touchées)
+    """
+    for kind, pattern in STATEMENT_PATTERNS:
+        match = pattern.match(header)
+        if not match:
+            continue
+        groups = match.groups()
+        if kind == 'index':
+            index_name = normalize_identifier(groups[1] or groups[0])
+            table = normalize_identifier(groups[3] or groups[2])
+            return kind, index_name, (table,)
+        if kind == 'constraint':
+            table = normalize_identifier(groups[1] or groups[0])
+            referenced = normalize_identifier(groups[3] or groups[2])
+            return kind, table, tuple(dict.fromkeys((table, referenced)))
+        name = normalize_identifier(groups[1] or groups[0])
+        if kind == 'sequence':
+            return kind, name, ()
+        return kind, name, (name,)
+
+    words = header.split()[:8]
+    if words[:1] == ['CREATE']:
+        words = [w for w in words[1:] if w not in ('OR', 'REPLACE', 'EDITIONABLE', 'NONEDITIONABLE')]
+        name = normalize_identifier(words[1].split('(')[0]) if len(words) > 1 else None
+        return (words[0].lower() if words else 'create'), name, ()
+    return (words[0].lower() if words else 'unknown'), None, ()
+
+
+def _header_text(code):
+    """Normalise le début d'une instruction pour l'analyse (majuscules hors guillemets)."""
+    parts = re.split(r'("[^"]*")', code)
+    return ' '.join(
+        ''.join(part if part.startswith('"') else part.upper() for part in parts).split()
+    )
+
+
+def iter_statements(lines, source=None, start_index=1):
+    """
+    Découpe un script SQL en instructions, en flux (ligne par ligne).
+
+    :param lines: itérable de lignes (ex: fichier ouvert)
+    :param source: nom du fichier (pour le rapport)
+    :param start_index: numéro de la première instruction
+    :return: générateur de Statement
+    """
+    index = start_index
+    buffer = []
+    header = []
+    header_size = 0
+    has_code = False
+    is_plsql = False
+    start_line = None
+    quote = None
+    in_comment = False
+
+    def emit():
+        nonlocal index, buffer, header, header_size, has_code, is_plsql, start_line
+        text = ''.join(buffer).strip()
+        if not is_plsql:
+            text = text.rstrip(';').rstrip()
+        kind, name, tables = classify_statement(_header_text(''.join(header)))
+        statement = Statement(index, source, start_line, text, kind, name, tables, is_plsql)
+        index += 1
+        buffer, header, header_size = [], [], 0
+        has_code, is_plsql, start_line = False, False, None
+        return statement
+
+    def add_code(text, line_no):
+        nonlocal has_code, start_line, header_size
+        if not has_code:
+            text = text.lstrip()
+            if not text:
+                return
+            has_code = True
+            start_line = line_no
+        buffer.append(text)
+        if header_size < 400:
+            header.append(text)
+            header_size += len(text)
+
+    for line_no, line in enumerate(lines, 1):
+        if quote is None and not in_comment:
+            stripped = line.strip()
+            if stripped == '/':
+                # Terminateur SQL*Plus : exécute le bloc en cours
+                if has_code:
+                    yield emit()
+                continue
+            if not has_code and stripped:
+                first_word = stripped.split(None, 1)[0].rstrip(';').upper()
+                if first_word.startswith('@'):
+                    first_word = '@@' if first_word.startswith('@@') else '@'
+                if first_word in SQLPLUS_DIRECTIVES:
+                    yield Statement(index, source, line_no, stripped.rstrip(';'), 'directive', first_word)
+                    index += 1
+                    continue
+
+        i = 0
+        length = len(line)
+        while i < length:
+            if in_comment:
+                end = line.find('*/', i)
+                stop = length if end < 0 else end + 2
+                if has_code:
+                    buffer.append(line[i:stop])
+                in_comment = end < 0
+                i = stop
+                continue
+
+            if quote is not None:
+                end = line.find(quote, i)
+                stop = length if end < 0 else end + 1
+                buffer.append(line[i:stop])
+                if header_size < 400:
+                    header.append(line[i:stop])
+                    header_size += stop - i
+                if end >= 0:
+                    quote = None
+                i = stop
+                continue
+
+            match = SPECIAL_CHARS.search(line, i)
+            if match is None:
+                add_code(line[i:], line_no)
+                break
+
+            pos = match.start()
+            char = line[pos]
+            if pos > i:
+                add_code(line[i:pos], line_no)
+
+            if char == '-' and line.startswith('--', pos):
+                if has_code:
+                    buffer.append(line[pos:])
+                break
+            if char == '/' and line.startswith('/*', pos):
+                in_comment = True
+                if has_code:
+                    buffer.append('/*')
+                i = pos + 2
+                continue
+            if char in ("'", '"'):
+                add_code(char, line_no)
+                quote = char
+                i = pos + 1
+                continue
+            if char == ';':
+                if not is_plsql and PLSQL_START.match(_header_text(''.join(header))):
+                    is_plsql = True
+                if is_plsql:
+                    add_code(';', line_no)
+                    i = pos + 1
+                    continue
+                if has_code:
+                    yield emit()
+                i = pos + 1
+                continue
+
+            add_code(char, line_no)
+            i = pos + 1
+
+    if has_code:
+        yield emit()
+
+
+def error_code(error):
+    """Code ORA-xxxxx / DPY-xxxx d'une erreur Oracle (None si absent)."""
+    match = ERROR_CODE.search(str(error))
+    return match.group(1) if match else None
+
+
+class ScriptExecutor:
+    """
+    Exécute des instructions SQL sur plusieurs sessions Oracle en respectant
+    les dépendances entre tables.
+    """
+
+    def __init__(self, oracle_config, sessions=DEFAULT_SESSIONS, ignored_errors=IGNORED_ERRORS,
+                 stop_on_error=False, verbose=True):
+        self.oracle_config = oracle_config
+        self.sessions = sessions
+        self.ignored_errors = set(ignored_errors)
+        self.stop_on_error = stop_on_error
+        self.verbose = verbose
+        self.results = []
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+
+    def _cursor(self):
+        """Curseur de la session propre au thread courant."""
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            conn = oracledb.connect(**self.oracle_config)
+            with self._lock:
+                self._connections.append(conn)
+            cursor = self._local.cursor = conn.cursor()
+        return cursor
+
+    def _record(self, statement, status, seconds=0.0, error=None):
+        result = {
+            'index': statement.index,
+            'source': statement.source,
+            'line': statement.line,
+            'kind': statement.kind,
+            'object': statement.object_name,
+            'status': status,
+            'seconds': round(seconds, 4),
+            'error': error,
+        }
+        with self._lock:
+            self.results.append(result)
+            if self.verbose and (status in ('error', 'warning') or statement.kind == 'table'):
+                icon = {'ok': '✅', 'exists': '⚠️', 'warning': '⚠️'}.get(status, '❌')
+                label = f"{statement.kind} {statement.object_name or ''}".strip()
+                detail = f" : {str(error)[:80]}" if error else ''
+                print(f"  [{statement.index:4d}] {icon} {label} ({seconds:.2f}s){detail}")
+        return result
+
+    def _execute(self, statement, dependencies, parents):
+        wait(dependencies)
+
+        if self._abort.is_set():
+            return self._record(statement, 'skipped', error="arrêt demandé (WHENEVER SQLERROR EXIT)")
+        for parent in parents:
+            failed = parent.exception() is not None or parent.result()['status'] in ('error', 'skipped')
+            if failed:
+                return self._record(statement, 'skipped', error="création de la table en échec")
+
+        start = time.perf_counter()
+        try:
+            cursor = self._cursor()
+            cursor.execute(statement.text)
+            warning = getattr(cursor, 'warning', None)
+            if warning is not None:
+                return self._record(statement, 'warning', time.perf_counter() - start, warning)
+            return self._record(statement, 'ok', time.perf_counter() - start)
+        except Exception as e:
+            seconds = time.perf_counter() - start
+            if error_code(e) in self.ignored_errors:
+                return self._record(statement, 'exists', seconds, e)
+            if self.stop_on_error:
+                self._abort.set()
+            return self._record(statement, 'error', seconds, e)
+
+    def _apply_directive(self, statement):
+        """Applique une directive SQL*Plus ; retourne l'instruction PL/SQL d'un EXEC."""
+        words = statement.text.split()
+        if statement.object_name == 'WHENEVER' and len(words) >= 3 and words[1].upper() == 'SQLERROR':
+            self.stop_on_error = words[2].upper() == 'EXIT'
+        elif statement.object_name in ('EXEC', 'EXECUTE') and len(words) > 1:
+            body = statement.text.split(None, 1)[1].rstrip(';')
+            return Statement(statement.index, statement.source, statement.line,
+                             f"BEGIN {body}; END;", 'plsql', words[1].split('(')[0], (), True)
+        return None
+
+    def run(self, sources):
+        """
+        Exécute un ou plusieurs scripts, dans l'ordre, en flux.
+
+        :param sources: chemin d'un script ou itérable de chemins
+                        (ex: ddl_engine.iter_ready_files(dossier))
+        :return: liste des résultats (un dictionnaire par instruction)
+        """
+        if isinstance(sources, (str, os.PathLike)):
+            sources = [sources]
+
+        last_barrier = None
+        since_barrier = []
+        last_by_table = {}
+        created_by = {}
+        pending = threading.BoundedSemaphore(self.sessions * MAX_PENDING_PER_SESSION)
+        index = 1
+
+        with ThreadPoolExecutor(max_workers=self.sessions) as executor:
+            try:
+                for path in sources:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for statement in iter_statements(f, os.path.basename(path), index):
+                            index = statement.index + 1
+
+                            if statement.kind == 'directive':
+                                statement = self._apply_directive(statement)
+                                if statement is None:
+                                    continue
+
+                            if statement.is_barrier:
+                                dependencies = since_barrier + ([last_barrier] if last_barrier else [])
+                            else:
+                                dependencies = [last_by_table[t] for t in statement.tables if t in last_by_table]
+                                if last_barrier:
+                                    dependencies.append(last_barrier)
+                            parents = [created_by[t] for t in statement.tables
+                                       if t in created_by and statement.kind != 'table']
+
+                            pending.acquire()
+                            future = executor.submit(self._execute, statement, dependencies, parents)
+                            future.add_done_callback(lambda _: pending.release())
+
+                            if statement.is_barrier:
+                                last_barrier = future
+                                since_barrier = []
+                                last_by_table = {}
+                            else:
+                                since_barrier.append(future)
+                                for table in statement.tables:
+                                    last_by_table[table] = future
+                                if statement.kind == 'table':
+                                    created_by[statement.object_name] = future
+            finally:
+                executor.shutdown(wait=True)
+                for conn in self._connections:
+                    try:
+                        conn.commit()
+                        conn.close()
+                    except oracledb.Error:
+                        pass
+
+        self.results.sort(key=lambda r: r['index'])
+        return self.results
+
+
+def print_execution_report(results, slowest=10):
+    """Affiche le bilan d'exécution : totaux par type, erreurs et instructions les plus lentes."""
+    by_status = {}
+    by_kind = {}
+    for result in results:
+        by_status[result['status']] = by_status.get(result['status'], 0) + 1
+        count, seconds = by_kind.get(result['kind'], (0, 0.0))
+        by_kind[result['kind']] = (count + 1, seconds + result['seconds'])
+
+    print(f"\n{'='*80}")
+    print("BILAN D'EXÉCUTION DU SCRIPT")
+    print(f"{'='*80}\n")
+    print("  " + ", ".join(f"{status}: {count}" for status, count in sorted(by_status.items())))
+    print()
+    for kind, (count, seconds) in sorted(by_kind.items(), key=lambda item: -item[1][1]):
+        print(f"  {kind:15} : {count:>6} instruction(s), {seconds:8.2f}s cumulées")
+
+    errors = [r for r in results if r['status'] in ('error', 'skipped')]
+    if errors:
+        print(f"\n❌ {len(errors)} instruction(s) en échec :")
+        for r in errors:
+            print(f"  - {r['source']}:{r['line']} {r['kind']} {r['object'] or ''} : {str(r['error'])[:100]}")
+
+    if results and slowest:
+        print(f"\n⏱ {slowest} instruction(s) les plus lentes :")
+        for r in sorted(results, key=lambda r: -r['seconds'])[:slowest]:
+            print(f"  {r['seconds']:8.2f}s  {r['source']}:{r['line']} {r['kind']} {r['object'] or ''}")
+    print(f"{'='*80}\n")
+
+
+def write_execution_report(results, path):
+    """Écrit le rapport par instruction (temps, statut, erreur) au format CSV."""
+    fields = ['index', 'source', 'line', 'kind', 'object', 'status', 'seconds', 'error']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({**result, 'error': str(result['error']) if result['error'] else ''})
+
+
+def execute_script(sources, oracle_config, sessions=DEFAULT_SESSIONS, report_path=None):
+    """
+    Exécute un script SQL Oracle en parallèle et affiche le bilan.
+
+    :param sources: chemin d'un script ou itérable de chemins
+    :param oracle_config: paramètres de connexion oracledb
+    :param sessions: nombre de sessions Oracle simultanées
+    :param report_path: fichier CSV du rapport par instruction (optionnel)
+    :return: liste des résultats
+    """
+    executor = ScriptExecutor(oracle_config, sessions=sessions)
+    start = time.perf_counter()
+    results = executor.run(sources)
+    duration = time.perf_counter() - start
+
+    print_execution_report(results)
+    print(f"✓ {len(results)} instruction(s) traitée(s) en {duration:.2f}s sur {sessions} session(s)")
+    if report_path:
+        write_execution_report(results, report_path)
+        print(f"✓ Rapport détaillé : {report_path}")
+    return results
@@ -0,0 +1,62 @@
+"""
+Module target_profile.py
+------------------------
+Profil de la version Oracle cible : types natifs disponibles.
+
+- 12c, 19c : booléens en NUMBER(1) (0/1), JSON en CLOB contrôlé IS JSON ;
+- 21c      : type JSON natif (binaire OSON), booléens en NUMBER(1) ;
+- 23ai     : types JSON et BOOLEAN natifs (TRUE/FALSE).
+
+Le profil actif (TARGET, option --target de generate_migration.py) est lu
+par la conversion des types et des DEFAULT (type_mapping), le DDL (contrôle
+IS JSON, prédicats d'index) et les conversions du chargement des données.
+"""
+
+
+TARGET_PROFILES = {
+    '12c': {'native_json': False, 'native_boolean': False},
+    '19c': {'native_json': False, 'native_boolean': False},
+    '21c': {'native_json': True, 'native_boolean': False},
+    '23ai': {'native_json': True, 'native_boolean': True},
+}
+
+# Version Oracle cible
+TARGET = '19c'
+
+
+def set_target(version):
+    """
+    Sélectionne le profil de la version cible.
+
+    :param version: '12c', '19c', '21c' ou '23ai'
+    :raises ValueError: version inconnue
+    """
+    global TARGET
+    if version not in TARGET_PROFILES:
+        raise ValueError(f"version cible inconnue : {version!r} ({', '.join(TARGET_PROFILES)})")
+    TARGET = version
+
+
+def native_json():
+    """Vrai si la cible dispose du type JSON natif (21c et plus)."""
+    return TARGET_PROFILES[TARGET]['native_json']
+
+
+def native_boolean():
+    """Vrai si la cible dispose du type BOOLEAN en SQL (23ai)."""
+    return TARGET_PROFILES[TARGET]['native_boolean']
+
+
+def boolean_type():
+    return 'BOOLEAN' if native_boolean() else 'NUMBER(1)'
+
+
+def json_type():
+    return 'JSON' if native_json() else 'CLOB'
+
+
+def boolean_literal(value):
+    """Littéral SQL d'un booléen : TRUE/FALSE en 23ai, 1/0 sinon."""
+    if native_boolean():
+        return 'TRUE' if value else 'FALSE'
+    return '1' if value else '0'
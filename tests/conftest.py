@@ -0,0 +1,124 @@
+"""
+Fixtures communes : catalogue PostgreSQL brut minimal (format de
+catalog_postgres.extract_catalog) et réinitialisation des options globales.
+"""
+
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import enum_encoding  # noqa: E402
+import target_profile  # noqa: E402
+from catalog_model import build_catalog  # noqa: E402
+
+
+def _column(position, name, data_type, udt_name=None, **extra):
+    column = {
+        "position": position, "name": name, "data_type": data_type,
+        "udt_name": udt_name or data_type, "is_enum": False, "length": None,
+        "precision": None, "scale": None, "nullable": True, "default": None,
+        "identity": None,
+    }
+    column.update(extra)
+    return column
+
+
+def _index(name, columns, index_type="btree", unique=False, primary=False,
+           expressions=None, predicate=None, constraint=None):
+    return {
+        "name": name, "index_type": index_type, "unique": unique, "primary": primary,
+        "columns": columns, "expressions": expressions or [False] * len(columns),
+        "predicate": predicate, "definition": "", "constraint": constraint,
+    }
+
+
+RAW_CATALOG = {
+    "schema": "public",
+    "tables": {
+        "account": {
+            "oid": 1,
+            "name": "account",
+            "columns": [
+                _column(1, "id", "integer", "int4", nullable=False,
+                        default="nextval('account_id_seq'::regclass)"),
+                _column(2, "email", "character varying", "varchar", length=120, nullable=False),
+                _column(3, "role", "USER-DEFINED", "role_enum", is_enum=True,
+                        default="'ADMIN'::role_enum"),
+                _column(4, "accountId", "uuid", "uuid"),
+                _column(5, "bio", "text", "text"),
+                _column(6, "active", "boolean", "bool", nullable=False, default="true"),
+                _column(7, "meta", "jsonb", "jsonb"),
+                _column(8, "amount", "numeric", "numeric"),
+            ],
+            "primary_key": {"name": "account_pkey", "type": "PRIMARY KEY", "columns": ["id"],
+                            "definition": "PRIMARY KEY (id)"},
+            "foreign_keys": [],
+            "unique": [{"name": "account_email_key", "type": "UNIQUE", "columns": ["email"],
+                        "definition": "UNIQUE (email)"}],
+            "checks": [],
+            "indexes": [
+                _index("account_pkey", ["id"], unique=True, primary=True, constraint="account_pkey"),
+                _index("account_email_key", ["email"], unique=True, constraint="account_email_key"),
+                _index("idx_lower_email", ["lower((email)::text)"], expressions=[True]),
+                _index("idx_active_role", ["role"], predicate="(active = true)"),
+                _index("idx_meta", ["meta"], index_type="gin"),
+            ],
+        },
+        "order": {
+            "oid": 2,
+            "name": "order",
+            "columns": [
+                _column(1, "id", "bigint", "int8", nullable=False, identity="d"),
+                _column(2, "accountId", "integer", "int4", nullable=False),
+                _column(3, "status", "USER-DEFINED", "order_status", is_enum=True, nullable=False),
+                _column(4, "created", "timestamp without time zone", "timestamp",
+                        nullable=False, default="now()"),
+            ],
+            "primary_key": {"name": "order_pkey", "type": "PRIMARY KEY", "columns": ["id"],
+                            "definition": "PRIMARY KEY (id)"},
+            "foreign_keys": [{"name": "order_account_fkey", "type": "FOREIGN KEY",
+                              "columns": ["accountId"], "referenced_table": "account",
+                              "referenced_columns": ["id"], "on_delete": "a",
+                              "definition": "FOREIGN KEY"}],
+            "unique": [],
+            "checks": [],
+            "indexes": [
+                _index("order_pkey", ["id"], unique=True, primary=True, constraint="order_pkey"),
+                _index("idx_order_created", ["created"], index_type="brin"),
+            ],
+        },
+    },
+    "enums": {"role_enum": ["ADMIN", "USER"], "order_status": ["PENDING", "PENDING_VALIDATION", "DONE"]},
+    "sequences": [
+        {"name": "account_id_seq", "start_value": 1, "min_value": 1, "max_value": 2147483647,
+         "increment_by": 1, "last_value": 10, "cycle": False, "owner_table": "account",
+         "owner_column": "id"},
+    ],
+    "views": [],
+    "triggers": [],
+    "routines": [],
+}
+
+
+@pytest.fixture(autouse=True)
+def default_options():
+    """Profil 19c et aucun encodage ENUM avant et après chaque test."""
+    target_profile.set_target('19c')
+    enum_encoding.ENUM_ENCODED_TABLES.clear()
+    yield
+    target_profile.set_target('19c')
+    enum_encoding.ENUM_ENCODED_TABLES.clear()
+
+
+@pytest.fixture
+def raw_catalog():
+    return copy.deepcopy(RAW_CATALOG)
+
+
+@pytest.fixture
+def catalog(raw_catalog):
+    return build_catalog(raw_catalog)
@@ -0,0 +1,81 @@
+import catalog_cache
+
+
+class FakeCursor:
+    def __init__(self, fingerprint, last_values):
+        self.fingerprint = fingerprint
+        self.last_values = last_values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return (self.fingerprint,)
+
+    def fetchall(self):
+        return list(self.last_values.items())
+
+
+class FakeConnection:
+    def __init__(self, fingerprint, last_values):
+        self.fingerprint = fingerprint
+        self.last_values = last_values
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self.fingerprint, self.last_values)
+
+    def close(self):
+        self.closed = True
+
+
+def _load(monkeypatch, tmp_path, raw_catalog, fingerprint, last_values=None):
+    extractions = []
+
+    def extract(cursor, schema):
+        extractions.append(schema)
+        return raw_catalog
+
+    conn = FakeConnection(fingerprint, last_values or {})
+    monkeypatch.setattr(catalog_cache.psycopg2, "connect", lambda **params: conn)
+    monkeypatch.setattr(catalog_cache, "extract_catalog", extract)
+    catalog = catalog_cache.load_postgres_catalog({"database": "db"}, cache_dir=str(tmp_path))
+    assert conn.closed
+    return catalog, extractions
+
+
+def test_fingerprint_covers_statistics_freshness():
+    query = catalog_cache.POSTGRES_FINGERPRINT_QUERY
+    assert "pg_stat_user_tables" in query
+    assert "last_autoanalyze" in query
+    assert "n_tup_ins" not in query
+
+
+def test_unchanged_fingerprint_reuses_snapshot(monkeypatch, tmp_path, raw_catalog):
+    _, first = _load(monkeypatch, tmp_path, raw_catalog, "v1")
+    catalog, second = _load(monkeypatch, tmp_path, raw_catalog, "v1")
+
+    assert first == ["public"]
+    assert second == []
+    assert set(catalog.tables) == {"account", "order"}
+
+
+def test_new_statistics_reload_catalog(monkeypatch, tmp_path, raw_catalog):
+    _load(monkeypatch, tmp_path, raw_catalog, "v1")
+    _, extractions = _load(monkeypatch, tmp_path, raw_catalog, "v1-analyzed")
+
+    assert extractions == ["public"]
+
+
+def test_cached_catalog_reads_live_sequence_values(monkeypatch, tmp_path, raw_catalog):
+    _load(monkeypatch, tmp_path, raw_catalog, "v1")
+    catalog, extractions = _load(monkeypatch, tmp_path, raw_catalog, "v1", {"account_id_seq": 5000})
+
+    assert extractions == []
+    assert [(s.name, s.last_value) for s in catalog.sequences] == [("account_id_seq", 5000)]
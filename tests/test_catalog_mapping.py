@@ -0,0 +1,77 @@
+from catalog_mapping import build_mapping
+
+
+def _oracle_column(name, data_type, nullable=True, virtual=False):
+    return {"name": name, "data_type": data_type, "nullable": nullable, "virtual": virtual}
+
+
+def _oracle_table(name, *columns):
+    return {"name": name, "columns": {column["name"]: column for column in columns}}
+
+
+def _oracle_catalog(*tables):
+    return {"tables": {table["name"]: table for table in tables}}
+
+
+ACCOUNT = _oracle_table(
+    "ACCOUNT",
+    _oracle_column("ID", "NUMBER", nullable=False),
+    _oracle_column("EMAIL", "VARCHAR2", nullable=False),
+    _oracle_column("ROLE", "VARCHAR2"),
+    _oracle_column("ACCOUNTID", "VARCHAR2"),
+    _oracle_column("BIO", "CLOB"),
+    _oracle_column("ACTIVE", "NUMBER", nullable=False),
+    _oracle_column("META", "CLOB"),
+    _oracle_column("AMOUNT", "NUMBER"),
+)
+
+
+def test_tables_and_columns_matched_case_insensitively(catalog):
+    mapping = build_mapping(catalog, _oracle_catalog(ACCOUNT))
+
+    assert mapping['tables'] == {"account": "ACCOUNT"}
+    assert mapping['columns']["account"]["accountId"] == "ACCOUNTID"
+    assert mapping['column_types']["account"]["email"] == {
+        'pg_type': 'character varying',
+        'pg_udt': 'varchar',
+        'oracle_type': 'VARCHAR2',
+        'oracle_nullable': 'N',
+    }
+    assert mapping['not_null']["account"]["email"] is True
+    assert mapping['not_null']["account"]["bio"] is False
+
+
+def test_unmatched_objects_are_collected(catalog):
+    account = _oracle_table("ACCOUNT", *[c for c in ACCOUNT["columns"].values() if c["name"] != "BIO"],
+                            _oracle_column("LEGACY", "VARCHAR2"))
+    mapping = build_mapping(catalog, _oracle_catalog(account))
+
+    assert mapping['tables'] == {}
+    assert mapping['unmatched']['tables'] == ["order"]
+    assert mapping['unmatched']['columns'] == [("account", "bio")]
+    assert mapping['unmatched']['extra_oracle_columns'] == [("ACCOUNT", "LEGACY")]
+
+
+def test_virtual_columns_are_not_loaded(catalog):
+    account = _oracle_table("ACCOUNT", *[c for c in ACCOUNT["columns"].values() if c["name"] != "AMOUNT"],
+                            _oracle_column("AMOUNT", "NUMBER", virtual=True))
+    mapping = build_mapping(catalog, _oracle_catalog(account))
+
+    assert "amount" not in mapping['columns']["account"]
+    assert mapping['unmatched']['columns'] == []
+
+
+def test_encoded_enum_column_carries_codes(catalog):
+    order = _oracle_table(
+        "ORDER",
+        _oracle_column("ID", "NUMBER", nullable=False),
+        _oracle_column("ACCOUNTID", "NUMBER", nullable=False),
+        _oracle_column("STATUS", "NUMBER", nullable=False),
+        _oracle_column("CREATED", "TIMESTAMP(6)", nullable=False),
+    )
+    mapping = build_mapping(catalog, _oracle_catalog(ACCOUNT, order))
+
+    assert mapping['column_types']["order"]["status"]['enum_codes'] == {
+        "PENDING": 1, "PENDING_VALIDATION": 2, "DONE": 3,
+    }
+    assert 'enum_codes' not in mapping['column_types']["account"]["role"]
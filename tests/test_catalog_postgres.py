@@ -0,0 +1,50 @@
+import pytest
+
+import catalog_postgres
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_extract_postgres_catalog_closes_connection(monkeypatch, raw_catalog):
+    conn = FakeConnection()
+    monkeypatch.setattr(catalog_postgres.psycopg2, "connect", lambda **params: conn)
+    monkeypatch.setattr(catalog_postgres, "extract_catalog", lambda cursor, schema: raw_catalog)
+
+    assert catalog_postgres.extract_postgres_catalog({}) is raw_catalog
+    assert conn.closed
+
+
+def test_extract_postgres_catalog_closes_connection_on_error(monkeypatch):
+    conn = FakeConnection()
+
+    def fail(cursor, schema):
+        raise RuntimeError("extraction")
+
+    monkeypatch.setattr(catalog_postgres.psycopg2, "connect", lambda **params: conn)
+    monkeypatch.setattr(catalog_postgres, "extract_catalog", fail)
+
+    with pytest.raises(RuntimeError):
+        catalog_postgres.extract_postgres_catalog({})
+    assert conn.closed
+
+
+def test_trigger_function_joined_on_oid():
+    assert "tg.tgfoid" in catalog_postgres.TRIGGERS_QUERY
+    assert "proname" not in catalog_postgres.TRIGGERS_QUERY
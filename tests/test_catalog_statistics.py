@@ -0,0 +1,117 @@
+import psycopg2
+import pytest
+
+import catalog_statistics
+from catalog_statistics import (
+    ATTNUMS_QUERY, COLUMN_STATS_QUERY, EXT_STATS_QUERY, TABLE_STATS_QUERY,
+    ColumnStatistics, get_column_statistics, resolve_n_distinct,
+)
+
+
+class FakeConnection:
+    autocommit = False
+    dsn = "dbname=test"
+
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    """Répond aux requêtes de statistiques ; EXT_STATS_QUERY échoue si ext_error."""
+
+    def __init__(self, ext_error=False, sample=(120, 30)):
+        self.connection = FakeConnection()
+        self.ext_error = ext_error
+        self.sample = sample
+        self.executed = []
+        self.rows = []
+        self.results = {
+            TABLE_STATS_QUERY: [("order", 10_000.0, 200), ("event", -1.0, 5000), ("empty", 0.0, 0)],
+            COLUMN_STATS_QUERY: [
+                ("order", "status", 3.0, 0.0, 0.1, 8),
+                ("order", "accountId", -0.25, 0.0, 0.0, 4),
+                ("order", "created", -1.0, 0.0, 0.99, 8),
+                ("order", "note", 0.0, 0.9, None, 40),
+            ],
+            ATTNUMS_QUERY: [("order", 2, "accountId"), ("order", 3, "status")],
+            EXT_STATS_QUERY: [("order", '{"2, 3": 4213}')],
+        }
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        if query is EXT_STATS_QUERY and self.ext_error:
+            raise psycopg2.Error("column \"n_distinct\" does not exist")
+        self.rows = self.results[query] if isinstance(query, str) else [self.sample]
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+
+def test_resolve_n_distinct():
+    assert resolve_n_distinct(42, 1000) == 42
+    # Négatif : fraction du nombre de lignes
+    assert resolve_n_distinct(-0.5, 1000) == 500
+    assert resolve_n_distinct(0, 1000) is None
+    assert resolve_n_distinct(None, 1000) is None
+
+
+def test_single_column_cardinality_from_pg_stats():
+    statistics = ColumnStatistics(FakeCursor(), 'sales')
+
+    assert statistics.cardinality("order", ["status"]) == (10_000, 3, 0.0003, 'pg_stats')
+    assert statistics.cardinality("order", ["accountId"]) == (10_000, 2500, 0.25, 'pg_stats')
+    assert statistics.cardinality("order", ["created"])[1:] == (10_000, 1.0, 'pg_stats')
+    assert statistics.cursor.executed[0][1] == {'schema': 'sales'}
+
+
+def test_multi_column_uses_extended_statistics():
+    statistics = ColumnStatistics(FakeCursor())
+
+    assert statistics.cardinality("order", ["status", "accountId"]) == (10_000, 4213, 0.4213, 'pg_stats_ext')
+    # Sans statistique étendue : produit des cardinalités borné par le nombre de lignes
+    assert statistics.cardinality("order", ["status", "created"])[1:] == (10_000, 1.0, 'pg_stats')
+
+
+def test_missing_extended_statistics_fall_back_to_product(capsys):
+    cursor = FakeCursor(ext_error=True)
+    statistics = ColumnStatistics(cursor)
+
+    assert statistics.extended == {}
+    assert cursor.connection.rollbacks == 1
+    assert "Statistiques étendues indisponibles" in capsys.readouterr().out
+    assert statistics.cardinality("order", ["status", "accountId"])[1:] == (7500, 0.75, 'pg_stats')
+
+
+def test_unanalyzed_table_is_sampled_once():
+    cursor = FakeCursor(sample=(50, 5))
+    statistics = ColumnStatistics(cursor)
+    queries = len(cursor.executed)
+
+    # reltuples = -1 : jamais analysée ; 5000 pages -> échantillon de SAMPLE_PERCENT %
+    result = statistics.cardinality("event", ["kind"])
+    assert result == (5000, 500, 0.1, 'tablesample')
+    assert statistics.cardinality("event", ["kind"]) == result
+    assert len(cursor.executed) == queries + 1
+
+
+def test_unknown_n_distinct_is_sampled():
+    statistics = ColumnStatistics(FakeCursor(sample=(10_000, 10)))
+
+    # n_distinct = 0 (inconnu) ; 200 pages : table lue entièrement
+    assert statistics.cardinality("order", ["note"]) == (10_000, 10, 0.001, 'tablesample')
+    assert statistics.row_count("empty") is None
+
+
+def test_statistics_are_loaded_once_per_schema(monkeypatch):
+    monkeypatch.setattr(catalog_statistics, '_STATISTICS', {})
+    cursor = FakeCursor()
+
+    first = get_column_statistics(cursor, 'sales')
+    assert get_column_statistics(cursor, 'sales') is first
+    assert get_column_statistics(cursor, 'public') is not first
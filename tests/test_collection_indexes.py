@@ -0,0 +1,82 @@
+from catalog_model import build_catalog
+import collection_indexes
+from collection_indexes import convert_index_type_with_analysis, generate_oracle_index_ddl_smart
+from index_translation import TEXT_WORDLIST
+
+
+def _index(catalog, table_name, index_name):
+    table = catalog.tables[table_name]
+    return next(index for index in table.indexes if index.name == index_name), table
+
+
+def test_json_gin_uses_common_classification(catalog):
+    index, table = _index(catalog, "account", "idx_meta")
+
+    assert convert_index_type_with_analysis(None, index, table)[0] == 'JSON_SEARCH'
+    ddl, _ = generate_oracle_index_ddl_smart(None, index, table)
+    assert ddl.startswith('CREATE SEARCH INDEX "idx_meta" ON "account" ("meta") FOR JSON')
+
+
+def test_trigram_index_gets_substring_wordlist(raw_catalog):
+    raw_catalog["tables"]["account"]["indexes"].append({
+        "name": "idx_email_trgm", "index_type": "gin", "unique": False, "primary": False,
+        "columns": ["email"], "expressions": [False], "predicate": None, "definition": "",
+        "constraint": None, "opclasses": ["gin_trgm_ops"],
+    })
+    catalog = build_catalog(raw_catalog)
+    index, table = _index(catalog, "account", "idx_email_trgm")
+
+    ddl, _ = generate_oracle_index_ddl_smart(None, index, table)
+    assert convert_index_type_with_analysis(None, index, table)[0] == 'CONTEXT'
+    assert f"CTX_DDL.CREATE_PREFERENCE('{TEXT_WORDLIST}'" in ddl
+    assert f"PARAMETERS ('WORDLIST {TEXT_WORDLIST} SYNC (ON COMMIT)')" in ddl
+
+
+def test_unordered_brin_is_not_migrated(catalog):
+    index, table = _index(catalog, "order", "idx_order_created")
+
+    oracle_type, reason = convert_index_type_with_analysis(None, index, table)
+    ddl, _ = generate_oracle_index_ddl_smart(None, index, table)
+    assert oracle_type == 'NONE'
+    assert "corrélation inconnue" in reason
+    assert ddl.startswith("-- idx_order_created non migré")
+
+
+def test_partial_index_is_function_based(catalog):
+    index, table = _index(catalog, "account", "idx_active_role")
+
+    ddl, _ = generate_oracle_index_ddl_smart(None, index, table)
+    assert ddl == ('CREATE INDEX "idx_active_role" ON "account" '
+                   '(CASE WHEN ("active" = 1) THEN "role" END);\n')
+
+
+def test_constraint_index_has_no_ddl(catalog):
+    index, table = _index(catalog, "account", "account_pkey")
+
+    ddl, recommendation = generate_oracle_index_ddl_smart(None, index, table)
+    assert ddl is None
+    assert recommendation == "index créé avec sa contrainte"
+
+
+def test_scalar_gin_statistics_use_the_index_schema(raw_catalog, monkeypatch):
+    raw_catalog["tables"]["account"]["indexes"].append({
+        "name": "idx_email_gin", "index_type": "gin", "unique": False, "primary": False,
+        "columns": ["email"], "expressions": [False], "predicate": None, "definition": "",
+        "constraint": None, "opclasses": [],
+    })
+    index, table = _index(build_catalog(raw_catalog), "account", "idx_email_gin")
+    schemas = []
+
+    class FakeStatistics:
+        def cardinality(self, table_name, columns):
+            return 1000, 3, 0.003, 'pg_stats'
+
+    def fake_get_column_statistics(cursor, schema_name='public'):
+        schemas.append(schema_name)
+        return FakeStatistics()
+
+    monkeypatch.setattr(collection_indexes, 'get_column_statistics', fake_get_column_statistics)
+    ddl, _ = generate_oracle_index_ddl_smart(None, index, table, schema_name='sales')
+
+    assert schemas == ['sales']
+    assert ddl.startswith('CREATE BITMAP INDEX "idx_email_gin"')
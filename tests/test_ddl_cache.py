@@ -0,0 +1,82 @@
+import ddl_cache
+from ddl_cache import DdlCache
+from generate_ddl_v2 import render_constraint, render_table
+
+
+def _cache(tmp_path, version="v1"):
+    return DdlCache(str(tmp_path / "ddl_cache.json"), version=version)
+
+
+def test_unchanged_objects_are_reused(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(ddl_cache, 'converter_version', lambda: "v1")
+    first = DdlCache.load(str(tmp_path / "ddl_cache.json"))
+    ddl = first.render(render_table, catalog.tables["order"])
+    first.save()
+
+    second = DdlCache.load(first.path)
+
+    assert second.render(render_table, catalog.tables["order"]) == ddl
+    assert (first.rebuilt, first.reused) == (1, 0)
+    assert (second.rebuilt, second.reused) == (0, 1)
+
+
+def test_modified_object_is_rebuilt(catalog, tmp_path):
+    cache = _cache(tmp_path)
+    table = catalog.tables["order"]
+    cache.render(render_table, table)
+
+    table.column("status").nullable = True
+    other = DdlCache(cache.path, entries=dict(cache.used), version="v1")
+    ddl = other.render(render_table, table)
+
+    assert (other.rebuilt, other.reused) == (1, 0)
+    assert ddl == render_table(table)
+
+
+def test_statistics_do_not_invalidate_entries(catalog, tmp_path):
+    cache = _cache(tmp_path)
+    table = catalog.tables["order"]
+    cache.render(render_table, table)
+
+    table.statistics["inserts"] = 1_000_000
+    other = DdlCache(cache.path, entries=dict(cache.used), version="v1")
+    other.render(render_table, table)
+
+    assert other.reused == 1
+
+
+def test_plain_arguments_are_part_of_the_key(catalog, tmp_path):
+    cache = _cache(tmp_path)
+    primary_key = catalog.tables["order"].primary_key
+
+    standard = cache.render(render_constraint, primary_key, 'none')
+    reverse = cache.render(render_constraint, primary_key, ''.join(['rev', 'erse']))
+
+    assert standard == render_constraint(primary_key, 'none')
+    assert reverse == render_constraint(primary_key, 'reverse')
+    assert reverse != standard
+    assert cache.rebuilt == 2
+
+
+def test_converter_change_invalidates_cache(catalog, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(ddl_cache, 'converter_version', lambda: "v1")
+    cache = DdlCache.load(str(tmp_path / "ddl_cache.json"))
+    cache.render(render_table, catalog.tables["order"])
+    cache.save()
+
+    assert DdlCache.load(cache.path).entries == cache.used
+
+    monkeypatch.setattr(ddl_cache, 'converter_version', lambda: "v2")
+    reloaded = DdlCache.load(cache.path)
+
+    assert reloaded.entries == {}
+    assert "cache DDL invalidé" in capsys.readouterr().out
+
+
+def test_converter_version_depends_on_target(monkeypatch):
+    import target_profile
+
+    version_19c = ddl_cache.converter_version()
+    target_profile.set_target('23ai')
+
+    assert ddl_cache.converter_version() != version_19c
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import ddl_engine
+from ddl_engine import (
+    DDL_CATEGORIES, MANIFEST_FILE, _render_category, generate_ddl_parallel, iter_ready_files, read_manifest,
+)
+
+
+def test_every_category_is_written_in_execution_order(catalog, tmp_path):
+    manifest = generate_ddl_parallel(catalog, str(tmp_path), after_load=('fk_indexes',))
+
+    assert [entry["category"] for entry in manifest["categories"]] == [name for name, _ in DDL_CATEGORIES]
+    assert all(entry["status"] == "complete" for entry in manifest["categories"])
+    assert read_manifest(str(tmp_path)) == manifest
+    assert not [name for name in os.listdir(tmp_path) if name.endswith((".part", ".tmp"))]
+
+    entries = {entry["category"]: entry for entry in manifest["categories"]}
+    assert entries["tables"]["file"] == "01_tables.sql"
+    assert entries["tables"]["statements"] == 2
+    assert entries["fk_indexes"]["phase"] == "after_load"
+    tables = (tmp_path / "01_tables.sql").read_text(encoding="utf-8")
+    assert tables.startswith("-- TABLES\n\n")
+    assert 'CREATE TABLE "order"' in tables
+
+
+def test_category_file_appears_only_when_complete(catalog, tmp_path):
+    entry = {"category": "tables", "file": "01_tables.sql"}
+
+    def failing(catalog, render):
+        yield "CREATE TABLE t (a NUMBER);"
+        raise RuntimeError("rendu interrompu")
+
+    with pytest.raises(RuntimeError):
+        _render_category(entry, failing, catalog, str(tmp_path))
+    assert not (tmp_path / "01_tables.sql").exists()
+
+    def empty_items(catalog, render):
+        yield None
+        yield "CREATE TABLE t (a NUMBER);   \n"
+
+    count, _ = _render_category(entry, empty_items, catalog, str(tmp_path))
+    assert count == 1
+    assert (tmp_path / "01_tables.sql").read_text(encoding="utf-8") == \
+        "-- TABLES\n\nCREATE TABLE t (a NUMBER);\n\n"
+    assert not (tmp_path / "01_tables.sql.part").exists()
+
+
+def test_failed_category_is_reported_in_manifest(catalog, tmp_path):
+    def broken(catalog, render):
+        raise ValueError("objet invalide")
+        yield
+
+    categories = (('tables', ddl_engine.iter_table_ddl), ('views', broken))
+    manifest = generate_ddl_parallel(catalog, str(tmp_path), categories=categories)
+
+    assert [entry["status"] for entry in manifest["categories"]] == ["complete", "error"]
+    assert manifest["categories"][1]["error"] == "objet invalide"
+    with pytest.raises(RuntimeError, match="02_views.sql"):
+        list(iter_ready_files(str(tmp_path)))
+
+
+def test_ready_files_follow_phase(catalog, tmp_path):
+    generate_ddl_parallel(catalog, str(tmp_path), after_load=('fk_indexes',))
+
+    schema_files = [os.path.basename(path) for path in iter_ready_files(str(tmp_path))]
+    after_load = [os.path.basename(path) for path in iter_ready_files(str(tmp_path), phase="after_load")]
+
+    assert "07_fk_indexes.sql" not in schema_files
+    assert schema_files[0] == "01_tables.sql"
+    assert len(schema_files) == len(DDL_CATEGORIES) - 1
+    assert after_load == ["07_fk_indexes.sql"]
+
+
+def test_pending_file_times_out(catalog, tmp_path):
+    ddl_engine._write_manifest(str(tmp_path), {"categories": [
+        {"order": 1, "category": "tables", "file": "01_tables.sql", "phase": "schema", "status": "pending"},
+    ]})
+
+    with pytest.raises(TimeoutError):
+        list(iter_ready_files(str(tmp_path), poll_interval=0.01, timeout=0.03))
+    assert (tmp_path / MANIFEST_FILE).exists()
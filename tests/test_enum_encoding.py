@@ -0,0 +1,27 @@
+import pytest
+
+from enum_encoding import enum_codes, encode_enum_value, apply_enum_encoding, configure_enum_encoding
+
+
+def test_codes_follow_enum_order():
+    assert enum_codes(["PENDING", "PENDING_VALIDATION", "DONE"]) == {
+        "PENDING": 1, "PENDING_VALIDATION": 2, "DONE": 3,
+    }
+    assert enum_codes([]) == {}
+
+
+def test_encode_enum_value():
+    codes = enum_codes(["ADMIN", "USER"])
+
+    assert encode_enum_value(codes, "USER") == 2
+    with pytest.raises(ValueError, match="libellé ENUM inconnu : 'GUEST'"):
+        encode_enum_value(codes, "GUEST")
+
+
+def test_encoded_table_columns_become_codes(catalog):
+    configure_enum_encoding(["order"])
+    encoded = apply_enum_encoding(catalog)
+
+    assert [(t.name, c.name, e.name) for t, c, e in encoded] == [("order", "status", "order_status")]
+    assert catalog.tables["order"].column("status").oracle_type == "NUMBER(3)"
+    assert catalog.tables["account"].column("role").oracle_type != "NUMBER(3)"
@@ -0,0 +1,46 @@
+from catalog_model import build_catalog
+from generate_ddl_v2 import find_unindexed_foreign_keys, generate_fk_indexes, render_fk_index
+
+
+def _add_index(raw_catalog, name, columns, index_type="btree"):
+    raw_catalog["tables"]["order"]["indexes"].append({
+        "name": name, "index_type": index_type, "unique": False, "primary": False,
+        "columns": columns, "expressions": [False] * len(columns), "predicate": None,
+        "definition": "", "constraint": None, "opclasses": [],
+    })
+    return build_catalog(raw_catalog)
+
+
+def test_unindexed_foreign_key_gets_an_index(catalog, capsys):
+    assert [(t.name, c.name) for t, c in find_unindexed_foreign_keys(catalog)] == [
+        ("order", "order_account_fkey"),
+    ]
+    constraint = catalog.tables["order"].foreign_keys[0]
+    assert render_fk_index(constraint) == \
+        'CREATE INDEX "IX_order_account_fkey" ON "order" ("accountId");'
+
+    generate_fk_indexes(None, catalog)
+    output = capsys.readouterr().out
+    assert '-- FK order_account_fkey : order(accountId) -> account' in output
+    assert 'CREATE INDEX "IX_order_account_fkey"' in output
+
+
+def test_leading_column_index_covers_the_foreign_key(raw_catalog):
+    catalog = _add_index(raw_catalog, "idx_order_account_created", ["accountId", "created"])
+
+    assert find_unindexed_foreign_keys(catalog) == []
+
+
+def test_non_leading_or_non_btree_index_does_not_cover(raw_catalog):
+    assert find_unindexed_foreign_keys(_add_index(raw_catalog, "idx_created_account", ["created", "accountId"]))
+    raw_catalog["tables"]["order"]["indexes"].pop()
+    assert find_unindexed_foreign_keys(_add_index(raw_catalog, "idx_account_gin", ["accountId"], "gin"))
+
+
+def test_long_fk_index_name_is_truncated_with_hash(catalog):
+    constraint = catalog.tables["order"].foreign_keys[0]
+    constraint.name = "order_account_reference_foreign_key"
+
+    name = render_fk_index(constraint).split('"')[1]
+    assert len(name) == 30
+    assert name.startswith("IX_order_account_refer")
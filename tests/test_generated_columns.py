@@ -0,0 +1,65 @@
+from catalog_model import build_catalog
+from generated_columns import find_generated_columns, render_virtual_clause, virtual_expression
+from target_profile import set_target
+
+
+def _generated(raw_catalog, name, data_type, udt_name, expression, **extra):
+    columns = raw_catalog["tables"]["account"]["columns"]
+    columns.append({
+        "position": len(columns) + 1, "name": name, "data_type": data_type, "udt_name": udt_name,
+        "is_enum": False, "length": None, "precision": None, "scale": None, "nullable": True,
+        "default": None, "identity": None, "generated": expression, **extra,
+    })
+    catalog = build_catalog(raw_catalog)
+    table = catalog.tables["account"]
+    return table.column(name), table
+
+
+def test_translatable_expression_becomes_virtual(raw_catalog):
+    column, table = _generated(raw_catalog, "email_lower", "character varying", "varchar",
+                               "lower((email)::text)", length=120)
+
+    assert virtual_expression(column, table) == ('LOWER(("email"))', None)
+    assert render_virtual_clause(column, table) == ' GENERATED ALWAYS AS (LOWER(("email"))) VIRTUAL'
+
+
+def test_boolean_expression_is_wrapped_in_number_case(raw_catalog):
+    column, table = _generated(raw_catalog, "is_rich", "boolean", "bool", "(amount > (1000)::numeric)")
+
+    expression, reason = virtual_expression(column, table)
+    assert reason is None
+    assert expression == ('CASE WHEN ("amount" > (1000)) THEN 1 '
+                          'WHEN NOT (("amount" > (1000))) THEN 0 END')
+
+
+def test_native_boolean_keeps_the_predicate(raw_catalog):
+    set_target('23ai')
+    column, table = _generated(raw_catalog, "is_rich", "boolean", "bool", "(amount > (1000)::numeric)")
+
+    assert virtual_expression(column, table) == ('("amount" > (1000))', None)
+
+
+def test_lob_column_is_loaded_as_data(raw_catalog):
+    column, table = _generated(raw_catalog, "bio_upper", "text", "text", "upper(bio)")
+
+    expression, reason = virtual_expression(column, table)
+    assert expression is None
+    assert reason == "type CLOB non virtualisable"
+    assert render_virtual_clause(column, table) == ""
+
+
+def test_untranslatable_expression_is_loaded_as_data(raw_catalog):
+    column, table = _generated(raw_catalog, "email_md5", "text", "text", "md5((email)::text)")
+    column.oracle_type = 'VARCHAR2(32)'
+
+    expression, reason = virtual_expression(column, table)
+    assert expression is None
+    assert reason
+    assert render_virtual_clause(column, table) == ""
+
+
+def test_regular_columns_are_not_generated(catalog):
+    email = catalog.tables["account"].column("email")
+
+    assert virtual_expression(email, catalog.tables["account"]) == (None, None)
+    assert find_generated_columns(catalog) == []
@@ -0,0 +1,43 @@
+from index_builder import plan_builds, build_options_sql, parallel_degree, SERIAL_THRESHOLD_BYTES
+from sql_script_executor import iter_statements, error_code
+
+GIGABYTE = 1024 ** 3
+
+SCRIPT = """CREATE INDEX ix_small ON small (a);
+CREATE INDEX ix_big ON big (b);
+CREATE INDEX ix_text ON big (c) INDEXTYPE IS CTXSYS.CONTEXT PARAMETERS ('SYNC (ON COMMIT)');
+"""
+
+
+def _builds(cpu_budget=8):
+    statements = list(iter_statements(SCRIPT.splitlines(keepends=True)))
+    return plan_builds(statements, {'SMALL': 1024, 'BIG': 2 * GIGABYTE}, cpu_budget)
+
+
+def test_largest_tables_first_and_domain_indexes_serial():
+    builds = _builds()
+
+    assert [b.statement.object_name for b in builds] == ['IX_BIG', 'IX_TEXT', 'IX_SMALL']
+    assert [b.degree for b in builds] == [8, 1, 1]
+    assert not builds[1].parallelizable
+
+
+def test_parallel_degree_bounds():
+    assert parallel_degree(SERIAL_THRESHOLD_BYTES - 1, 8) == 1
+    assert parallel_degree(SERIAL_THRESHOLD_BYTES, 8) == 2
+    assert parallel_degree(100 * GIGABYTE, 4) == 4
+
+
+def test_online_is_opt_in():
+    big, text, small = _builds()
+
+    assert build_options_sql(big) == "CREATE INDEX ix_big ON big (b) PARALLEL 8"
+    assert build_options_sql(big, online=True) == "CREATE INDEX ix_big ON big (b) PARALLEL 8 ONLINE"
+    assert build_options_sql(small) == "CREATE INDEX ix_small ON small (a)"
+    assert build_options_sql(text, online=True).endswith("PARAMETERS ('SYNC (ON COMMIT)')")
+
+
+def test_error_code():
+    assert error_code(Exception("ORA-00439: fonctionnalité non activée : Online Index Build")) == 'ORA-00439'
+    assert error_code(Exception("DPY-4011: connexion fermée")) == 'DPY-4011'
+    assert error_code(Exception("autre erreur")) is None
@@ -0,0 +1,47 @@
+import index_compression
+from index_compression import recommend_compression, estimate_prefix_savings
+
+
+def test_repeated_prefix_is_compressed():
+    # 1 000 000 lignes, 50 statuts : préfixe répété 20 000 fois
+    compression = recommend_compression(1_000_000, [50, -1], [8, 8])
+
+    assert compression['clause'] == "COMPRESS 1"
+    assert compression['prefix'] == 1
+    assert compression['repeats'] == 20_000
+    assert 0 < compression['saved_bytes'] < compression['estimated_bytes']
+
+
+def test_unique_single_column_is_never_compressed():
+    assert recommend_compression(1_000_000, [10], [8], unique=True) is None
+
+
+def test_unique_index_compresses_at_most_n_minus_one_columns():
+    compression = recommend_compression(1_000_000, [100, -1], [16, 8], unique=True)
+
+    assert compression['clause'] == "COMPRESS 1"
+
+
+def test_negative_n_distinct_is_a_fraction_of_rows():
+    # -0.5 : une valeur pour deux lignes, sous le seuil de répétitions
+    assert recommend_compression(1_000_000, [-0.5], [8]) is None
+
+
+def test_missing_statistics():
+    assert recommend_compression(None, [50], [8]) is None
+    assert recommend_compression(1000, [50], [None]) is None
+    assert recommend_compression(1000, [0], [8]) is None
+
+
+def test_moderate_duplication_uses_advanced_compression_when_available(monkeypatch):
+    assert recommend_compression(1_000_000, [-0.5], [8]) is None
+
+    monkeypatch.setattr(index_compression, 'ADVANCED_COMPRESSION_AVAILABLE', True)
+    compression = recommend_compression(1_000_000, [-0.5], [8])
+    assert compression['clause'] == "COMPRESS ADVANCED LOW"
+    assert compression['saved_bytes'] >= 0
+
+
+def test_prefix_savings_can_be_negative():
+    # Préfixe presque unique : stocker le préfixe coûte plus que ce qu'il économise
+    assert estimate_prefix_savings(1000, 1000, 8, 20) < 0
@@ -0,0 +1,83 @@
+import pytest
+
+import target_profile
+from enum_encoding import apply_enum_encoding
+from index_expressions import translate_expression, translate_index_keys, UntranslatableExpression
+
+
+def _translate(catalog, expression, condition=False):
+    return translate_expression(expression, catalog.tables["account"], condition)
+
+
+def test_expression_keys(catalog):
+    assert _translate(catalog, "lower((email)::text)") == 'LOWER(("email"))'
+    assert _translate(catalog, "date_trunc('month'::text, id)") == "TRUNC(\"id\", 'MM')"
+    assert _translate(catalog, "COALESCE(role, 'USER'::role_enum)") == "COALESCE(\"role\", 'USER')"
+
+
+def test_partial_index_predicate(catalog):
+    index = next(index for index in catalog.tables["account"].indexes if index.name == "idx_active_role")
+    assert translate_index_keys(index, catalog.tables["account"]) == ['CASE WHEN ("active" = 1) THEN "role" END']
+
+
+def test_bare_boolean_condition(catalog):
+    assert _translate(catalog, "(active AND (role = 'ADMIN'))", condition=True) == \
+        "(\"active\" = 1 AND (\"role\" = 'ADMIN'))"
+    assert _translate(catalog, "(NOT active)", condition=True) == '(NOT "active" = 1)'
+
+
+@pytest.mark.parametrize("predicate, expected", [
+    ("(role = ANY (ARRAY['ADMIN'::role_enum, 'USER'::role_enum]))", "(\"role\" IN ('ADMIN', 'USER'))"),
+    ("((email)::text = ANY ((ARRAY['a'::character varying, 'b'::character varying])::text[]))",
+     "((\"email\") IN ('a', 'b'))"),
+    ("(role <> ALL (ARRAY['ADMIN'::role_enum]))", "(\"role\" NOT IN ('ADMIN'))"),
+])
+def test_array_comparisons_become_in(catalog, predicate, expected):
+    assert _translate(catalog, predicate, condition=True) == expected
+
+
+@pytest.mark.parametrize("predicate, expected", [
+    ("(active IS TRUE)", '("active" = 1)'),
+    ("(active IS FALSE)", '("active" = 0)'),
+    ("(active IS NOT TRUE)", '(LNNVL("active" = 1))'),
+    ("(active IS NOT FALSE)", '(LNNVL("active" = 0))'),
+    ("(active IS NOT NULL)", '("active" IS NOT NULL)'),
+])
+def test_boolean_tests(catalog, predicate, expected):
+    assert _translate(catalog, predicate, condition=True) == expected
+
+
+def test_boolean_tests_with_native_boolean(catalog):
+    target_profile.set_target('23ai')
+    assert _translate(catalog, "(active IS NOT TRUE)", condition=True) == '("active" IS NOT TRUE)'
+    assert _translate(catalog, "active", condition=True) == '"active"'
+
+
+def test_boolean_test_on_expression_is_untranslatable(catalog):
+    with pytest.raises(UntranslatableExpression):
+        _translate(catalog, "((id > 0) IS TRUE)", condition=True)
+
+
+def test_btrim(catalog):
+    assert _translate(catalog, "btrim((email)::text)") == 'TRIM(("email"))'
+    assert _translate(catalog, "btrim((email)::text, 'x'::text)") == "TRIM(BOTH 'x' FROM (\"email\"))"
+    assert _translate(catalog, "btrim(email, '''')") == "TRIM(BOTH '''' FROM \"email\")"
+    with pytest.raises(UntranslatableExpression):
+        _translate(catalog, "btrim((email)::text, 'xy'::text)")
+
+
+@pytest.mark.parametrize("expression", [
+    "md5((email)::text)",
+    "(meta ->> 'key'::text)",
+    "date_trunc('millennium'::text, id)",
+    "lower(unknown_column)",
+])
+def test_untranslatable(catalog, expression):
+    with pytest.raises(UntranslatableExpression):
+        _translate(catalog, expression)
+
+
+def test_encoded_enum_in_predicate_is_untranslatable(catalog):
+    apply_enum_encoding(catalog, tables={'account'})
+    with pytest.raises(UntranslatableExpression):
+        _translate(catalog, "(role = 'ADMIN'::role_enum)", condition=True)
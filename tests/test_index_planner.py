@@ -0,0 +1,94 @@
+import os
+
+from catalog_model import build_catalog
+from collection_indexes import catalog_index_map, split_constraint_indexes, write_post_load_indexes
+from index_planner import classify_index, statement_calls
+
+
+def _usage(name, columns, unique=False, idx_scan=0, statement_calls=0, table="order"):
+    return {'name': name, 'table': table, 'columns': columns, 'unique': unique,
+            'idx_scan': idx_scan, 'statement_calls': statement_calls}
+
+
+def test_classify_index_tiers():
+    fk_columns = {("order", ("accountId",))}
+
+    assert classify_index(_usage("ux", ["ref"], unique=True), fk_columns, 30)[0] == 'create_now'
+    assert classify_index(_usage("ix_fk", ["accountId", "created"]), fk_columns, 30)[0] == 'create_after_load'
+    assert classify_index(_usage("ix_used", ["created"], idx_scan=12), fk_columns, 30)[0] == 'create_after_load'
+    assert classify_index(_usage("ix_query", ["created"], statement_calls=3), fk_columns, 30)[0] == 'create_after_load'
+    assert classify_index(_usage("ix_new", ["created"]), fk_columns, 2)[0] == 'create_after_load'
+    assert classify_index(_usage("ix_dead", ["created"]), fk_columns, 30)[0] == 'skip_candidate'
+
+
+def test_statement_calls_match_leading_column():
+    statements = [('SELECT * FROM "order" WHERE "status" = $1', 40),
+                  ('SELECT * FROM "order" WHERE created > $1', 2),
+                  ('SELECT * FROM account WHERE status = $1', 7)]
+
+    assert statement_calls(statements, "order", ["status", "created"]) == 40
+
+
+def _index(name, kind, table="account"):
+    return {'name': name, 'table': table, 'type': kind, 'columns': ["id"], 'index_type': 'btree',
+            'definition': ''}
+
+
+def test_constraint_indexes_come_from_the_catalog(raw_catalog):
+    account = raw_catalog["tables"]["account"]
+    account["primary_key"]["name"] = "pk_account"
+    account["indexes"][0].update(name="pk_account", constraint="pk_account")
+    account["indexes"].append({
+        "name": "ux_account_email_lower", "index_type": "btree", "unique": True, "primary": False,
+        "columns": ["email"], "expressions": [False], "predicate": None, "definition": "",
+        "constraint": None, "opclasses": [],
+    })
+    catalog_indexes = catalog_index_map(build_catalog(raw_catalog))
+    indexes_data = {
+        'primary_key': [],
+        'unique': [_index("account_email_key", 'unique'), _index("ux_account_email_lower", 'unique')],
+        'foreign_key': [],
+        # Nom sans « _pkey » : classé manuel par analyze_indexes
+        'manual': [_index("pk_account", 'manual'), _index("idx_meta", 'manual'),
+                   _index("order_2024_created_idx", 'manual', table="order_2024")],
+    }
+
+    auto_indexes, converted, missing = split_constraint_indexes(indexes_data, catalog_indexes)
+
+    assert [idx['name'] for idx in auto_indexes] == ["account_email_key", "pk_account"]
+    assert [idx['name'] for idx in converted] == ["ux_account_email_lower", "idx_meta"]
+    assert [idx['name'] for idx in missing] == ["order_2024_created_idx"]
+
+
+def test_post_load_file_contains_deferred_indexes(tmp_path):
+    path = tmp_path / "schemas_oracle_post_load_indexes.sql"
+    write_post_load_indexes(str(path), ['CREATE INDEX ix_a\n  ON "order" (a);\n'])
+
+    content = path.read_text(encoding='utf-8')
+    assert content.startswith("-- INDEX À CRÉER APRÈS LE CHARGEMENT")
+    assert 'CREATE INDEX ix_a\n  ON "order" (a);' in content
+
+
+def test_step_4b_builds_every_post_load_script(tmp_path, monkeypatch):
+    import collection_indexes
+    import generate_migration
+    import migration_complete
+
+    # Un script par producteur : aucun n'écrase l'autre
+    assert os.path.basename(collection_indexes.POST_LOAD_FILE) != os.path.basename(generate_migration.POST_LOAD_FILE)
+
+    fk_file = tmp_path / "schemas_oracle_post_load.sql"
+    plan_file = tmp_path / "schemas_oracle_post_load_indexes.sql"
+    fk_file.write_text("CREATE INDEX ix_fk ON t (a);\n", encoding="utf-8")
+    plan_file.write_text("CREATE INDEX ix_plan ON t (b);\n", encoding="utf-8")
+    built = []
+
+    def fake_build_indexes(path, *args, **kwargs):
+        built.append(path)
+        return [{'status': 'ok'}]
+
+    monkeypatch.setattr(migration_complete, 'POST_LOAD_FILES', (str(fk_file), str(plan_file)))
+    monkeypatch.setattr(migration_complete, 'build_indexes', fake_build_indexes)
+
+    assert migration_complete.step_4b_post_load_indexes()
+    assert built == [str(fk_file), str(plan_file)]
@@ -0,0 +1,38 @@
+from catalog_model import build_catalog
+from index_translation import classify_index, get_brin_load_order
+
+
+def _with_brin_statistics(raw_catalog, *correlations):
+    indexes = raw_catalog["tables"]["order"]["indexes"]
+    brin = next(index for index in indexes if index["index_type"] == "brin")
+    brin["statistics"] = {"correlations": list(correlations[:1])}
+    for position, correlation in enumerate(correlations[1:], 1):
+        indexes.append(dict(brin, name=f"idx_order_created_{position}",
+                            statistics={"correlations": [correlation]}))
+    return build_catalog(raw_catalog)
+
+
+def test_ordered_brin_drives_load_order(raw_catalog):
+    catalog = _with_brin_statistics(raw_catalog, 0.98)
+
+    assert get_brin_load_order(catalog) == {"order": ("created", False)}
+
+
+def test_descending_correlation_loads_in_descending_order(raw_catalog):
+    catalog = _with_brin_statistics(raw_catalog, -0.95)
+
+    assert get_brin_load_order(catalog) == {"order": ("created", True)}
+
+
+def test_unordered_brin_has_no_load_order(raw_catalog):
+    assert get_brin_load_order(_with_brin_statistics(raw_catalog, 0.4)) == {}
+    assert get_brin_load_order(build_catalog(raw_catalog)) == {}
+
+
+def test_load_order_follows_the_clustering_brin(raw_catalog):
+    catalog = _with_brin_statistics(raw_catalog, 0.3, -0.99, 0.97)
+    table = catalog.tables["order"]
+    kinds = [classify_index(index, table)[0] for index in table.indexes if index.index_type == 'brin']
+
+    assert kinds == ['untranslated', 'zone_map', 'untranslated']
+    assert get_brin_load_order(catalog) == {"order": ("created", True)}
@@ -0,0 +1,21 @@
+from decimal import Decimal
+
+from numeric_sizing import choose_numeric_type
+
+
+def test_integer_column_gets_two_digits_of_headroom():
+    oracle_type, _ = choose_numeric_type(Decimal("-12"), Decimal("4750"), 0)
+
+    assert oracle_type == "NUMBER(6)"
+
+
+def test_decimal_column_keeps_observed_scale():
+    oracle_type, _ = choose_numeric_type(Decimal("0.5"), Decimal("999.99"), 2)
+
+    assert oracle_type == "NUMBER(7,2)"
+
+
+def test_unsizable_columns_keep_number():
+    assert choose_numeric_type(None, None, None)[0] is None
+    assert choose_numeric_type(Decimal("NaN"), Decimal("1"), 0)[0] is None
+    assert choose_numeric_type(Decimal("0"), Decimal("1.123456789012345"), 15)[0] is None
@@ -0,0 +1,97 @@
+from oracle_batch import BATCH_BLOCK, BATCH_SIZE, execute_ddl_batch, print_batch_report, set_foreign_keys_status
+
+
+class FakeVar:
+    def __init__(self, arraysize):
+        self.values = [None] * arraysize
+
+
+class FakeCursor:
+    """Curseur oracledb simulé : les instructions contenant 'FAIL' lèvent une erreur."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.batches = []
+        self.queries = []
+        self.errors = None
+
+    def var(self, kind, size, arraysize):
+        self.errors = FakeVar(arraysize)
+        return self.errors
+
+    def setinputsizes(self, *sizes):
+        assert sizes[1] is self.errors
+
+    def executemany(self, statement, parameters):
+        assert statement == BATCH_BLOCK
+        self.batches.append([sql for (sql,) in parameters])
+        for position, (sql,) in enumerate(parameters):
+            if "FAIL" in sql:
+                self.errors.values[position] = f"ORA-00942: table or view does not exist ({sql})"
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_statements_are_sent_in_chunks():
+    items = [(f"t{i}", f"DROP TABLE t{i}") for i in range(5)]
+    cursor = FakeCursor()
+
+    results = execute_ddl_batch(cursor, items, batch_size=2)
+
+    assert [len(batch) for batch in cursor.batches] == [2, 2, 1]
+    assert [result['label'] for result in results] == ["t0", "t1", "t2", "t3", "t4"]
+    assert all(result['error'] is None for result in results)
+
+
+def test_default_chunk_is_batch_size():
+    cursor = FakeCursor()
+
+    execute_ddl_batch(cursor, [(str(i), f"DROP TABLE t{i}") for i in range(BATCH_SIZE + 1)])
+
+    assert [len(batch) for batch in cursor.batches] == [BATCH_SIZE, 1]
+
+
+def test_errors_are_captured_per_statement(capsys):
+    items = [("a", "DROP TABLE a"), ("b", "DROP TABLE FAIL_b"), ("c", "DROP TABLE c")]
+
+    results = execute_ddl_batch(FakeCursor(), items, batch_size=2)
+
+    assert [result['error'] is not None for result in results] == [False, True, False]
+    assert results[1]['error'].startswith("ORA-00942")
+    assert print_batch_report(results) == (2, 1)
+    assert "❌ b : ORA-00942" in capsys.readouterr().out
+
+
+def test_no_statement_means_no_round_trip():
+    cursor = FakeCursor()
+
+    assert execute_ddl_batch(cursor, []) == []
+    assert cursor.batches == []
+
+
+def test_foreign_keys_are_toggled_in_one_batch():
+    cursor = FakeCursor(rows=[("order_account_fkey", "order"), ("item_order_fkey", "item")])
+
+    results = set_foreign_keys_status(cursor, enabled=True, only_status='DISABLED')
+
+    query, params = cursor.queries[0]
+    assert "status = :status" in query
+    assert params == {'status': 'DISABLED'}
+    assert cursor.batches == [[
+        'ALTER TABLE "order" ENABLE CONSTRAINT "order_account_fkey"',
+        'ALTER TABLE "item" ENABLE CONSTRAINT "item_order_fkey"',
+    ]]
+    assert [result['label'] for result in results] == ["order.order_account_fkey", "item.item_order_fkey"]
+
+
+def test_disable_without_status_filter():
+    cursor = FakeCursor(rows=[("order_account_fkey", "order")])
+
+    set_foreign_keys_status(cursor, enabled=False)
+
+    assert cursor.queries[0][1] == {}
+    assert cursor.batches == [['ALTER TABLE "order" DISABLE CONSTRAINT "order_account_fkey"']]
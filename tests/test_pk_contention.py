@@ -0,0 +1,64 @@
+import pytest
+
+import pk_contention
+from catalog_model import build_catalog
+from pk_contention import (
+    configure_pk_strategies, pk_index_strategy, find_hot_primary_keys, render_pk_index_clause,
+)
+
+
+@pytest.fixture(autouse=True)
+def pk_options(monkeypatch):
+    monkeypatch.setattr(pk_contention, 'DEFAULT_HOT_PK_STRATEGY', 'none')
+    monkeypatch.setattr(pk_contention, 'PK_INDEX_STRATEGIES', {})
+
+
+def _hot_catalog(raw_catalog):
+    # 360 000 insertions en 1 heure : 100/s pour order, 1/s pour account
+    raw_catalog["tables"]["order"]["statistics"] = {"inserts": 360_000, "observed_seconds": 3600}
+    raw_catalog["tables"]["account"]["statistics"] = {"inserts": 3600, "observed_seconds": 3600}
+    return build_catalog(raw_catalog)
+
+
+def test_hot_pk_is_reported_but_not_changed_by_default(raw_catalog):
+    catalog = _hot_catalog(raw_catalog)
+
+    strategy, reason = pk_index_strategy(catalog.tables["order"])
+    assert strategy == 'none'
+    assert "100.0 insertions/s" in reason
+    assert pk_index_strategy(catalog.tables["account"]) == ('none', "1.0 insertions/s")
+    assert [(t.name, s) for t, s, _ in find_hot_primary_keys(catalog)] == [("order", 'none')]
+
+
+def test_wildcard_applies_to_hot_pks_only(raw_catalog):
+    catalog = _hot_catalog(raw_catalog)
+    configure_pk_strategies(['*=reverse'])
+
+    assert pk_index_strategy(catalog.tables["order"])[0] == 'reverse'
+    assert pk_index_strategy(catalog.tables["account"])[0] == 'none'
+
+
+def test_table_strategy_overrides_statistics(catalog):
+    configure_pk_strategies(['account=hash'])
+
+    assert pk_index_strategy(catalog.tables["account"]) == ('hash', "configuré pour la table")
+    assert pk_index_strategy(catalog.tables["order"]) == ('none', "débit d'insertion inconnu")
+    assert [(t.name, s) for t, s, _ in find_hot_primary_keys(catalog)] == [("account", 'hash')]
+
+
+def test_invalid_spec_is_rejected():
+    with pytest.raises(ValueError):
+        configure_pk_strategies(['order=bitmap'])
+    with pytest.raises(ValueError):
+        configure_pk_strategies(['=hash'])
+
+
+def test_render_pk_index_clause(catalog):
+    constraint = catalog.tables["order"].primary_key
+
+    assert render_pk_index_clause(constraint, 'none') == ""
+    assert render_pk_index_clause(constraint, 'reverse') == \
+        ' USING INDEX (CREATE UNIQUE INDEX "order_pkey" ON "order" ("id") REVERSE)'
+    assert render_pk_index_clause(constraint, 'hash').endswith(
+        'GLOBAL PARTITION BY HASH ("id") PARTITIONS 16)'
+    )
@@ -0,0 +1,147 @@
+from enum_encoding import configure_enum_encoding, apply_enum_encoding
+from schema_diff import diff_schema, PHASES
+
+
+def _column(name, data_type, nullable=True, char_length=None, precision=None, scale=None):
+    return {"name": name, "data_type": data_type, "data_length": None, "char_length": char_length,
+            "precision": precision, "scale": scale, "nullable": nullable, "virtual": False}
+
+
+def _order_table(*columns, constraints=None, indexes=None):
+    columns = columns or (
+        _column("id", "NUMBER", nullable=False, precision=19, scale=0),
+        _column("accountId", "NUMBER", nullable=False, precision=10, scale=0),
+        _column("status", "VARCHAR2", nullable=False, char_length=18),
+        _column("created", "TIMESTAMP(6)", nullable=False),
+    )
+    return {
+        "name": "order",
+        "columns": {column["name"]: column for column in columns},
+        "constraints": constraints if constraints is not None else {
+            "order_pkey": {"name": "order_pkey", "type": "P", "columns": ["id"], "generated": False},
+            "order_account_fkey": {"name": "order_account_fkey", "type": "R", "columns": ["accountId"],
+                                   "generated": False},
+            "CHK_ORDER_STATUS": {"name": "CHK_ORDER_STATUS", "type": "C", "columns": ["status"],
+                                 "generated": False},
+        },
+        "indexes": indexes or {},
+    }
+
+
+def _order_changes(catalog, table):
+    del catalog.tables["account"]
+    return diff_schema(catalog, {"tables": {"order": table}})
+
+
+def test_missing_tables_are_created_in_phase_order(catalog):
+    changes = diff_schema(catalog, {"tables": {}})
+
+    phases = [change['phase'] for change in changes]
+    assert phases == sorted(phases, key=PHASES.index)
+    assert [c['object'] for c in changes if c['phase'] == 'create_table'] == ["account", "order"]
+    assert any(c['phase'] == 'add_fk' and c['object'] == "order_account_fkey" for c in changes)
+    # BRIN : clustering d'attributs, pas d'index Oracle
+    assert not any(c['object'] == "idx_order_created" for c in changes)
+    assert not any(c['destructive'] for c in changes)
+
+
+def test_identical_table_has_no_change(catalog):
+    assert _order_changes(catalog, _order_table()) == []
+
+
+def test_column_changes(catalog):
+    table = _order_table(
+        _column("id", "NUMBER", nullable=False, precision=19, scale=0),
+        _column("accountId", "VARCHAR2", nullable=False, char_length=10),
+        _column("status", "VARCHAR2", nullable=True, char_length=10),
+        _column("legacy", "VARCHAR2", char_length=5),
+    )
+    changes = {(c['phase'], c['object']): c for c in _order_changes(catalog, table)}
+
+    assert changes[('modify_column', 'accountId')]['manual']
+    status = [c['sql'] for key, c in changes.items() if key == ('modify_column', 'status')]
+    assert status == ['ALTER TABLE "order" MODIFY ("status" NOT NULL)']
+    assert changes[('add_column', 'created')]['sql'] == \
+        'ALTER TABLE "order" ADD ("created" TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL)'
+    assert changes[('drop_column', 'legacy')]['destructive']
+
+
+def test_same_family_type_change_is_modified(catalog):
+    table = _order_table(
+        _column("id", "NUMBER", nullable=False, precision=19, scale=0),
+        _column("accountId", "NUMBER", nullable=False, precision=10, scale=0),
+        _column("status", "VARCHAR2", nullable=False, char_length=10),
+        _column("created", "TIMESTAMP(6)", nullable=False),
+    )
+    changes = _order_changes(catalog, table)
+
+    assert [(c['phase'], c['sql']) for c in changes] == [
+        ('modify_column', 'ALTER TABLE "order" MODIFY ("status" VARCHAR2(18))'),
+    ]
+
+
+def test_extra_oracle_objects_are_dropped_except_technical_tables(catalog):
+    oracle_catalog = {"tables": {
+        "order": _order_table(),
+        "OLD_TABLE": {"name": "OLD_TABLE", "columns": {}, "constraints": {}, "indexes": {}},
+        "DR$IDX$I": {"name": "DR$IDX$I", "columns": {}, "constraints": {}, "indexes": {}},
+    }}
+    del catalog.tables["account"]
+    changes = diff_schema(catalog, oracle_catalog)
+
+    assert [(c['phase'], c['object'], c['destructive']) for c in changes] == [
+        ('drop_table', 'OLD_TABLE', True),
+    ]
+
+
+def test_enum_lookup_tables_are_created_and_never_dropped(catalog):
+    configure_enum_encoding(["order"])
+    apply_enum_encoding(catalog)
+    del catalog.tables["account"]
+    oracle_catalog = {"tables": {
+        "order": _order_table(_column("id", "NUMBER", nullable=False, precision=19, scale=0),
+                              _column("accountId", "NUMBER", nullable=False, precision=10, scale=0),
+                              _column("status", "NUMBER", nullable=False, precision=3, scale=0),
+                              _column("created", "TIMESTAMP(6)", nullable=False)),
+        # Reste d'un encodage précédent de account.role
+        "ROLE_ENUM_LKP": {"name": "ROLE_ENUM_LKP", "columns": {}, "constraints": {}, "indexes": {}},
+    }, "views": []}
+
+    changes = diff_schema(catalog, oracle_catalog)
+
+    assert not any(c['phase'] == 'drop_table' for c in changes)
+    lookup = [c['sql'] for c in changes if c['phase'] == 'create_lookup']
+    assert lookup[0].startswith('CREATE TABLE "order_status_LKP"')
+    assert lookup[1:] == [
+        'INSERT INTO "order_status_LKP" ("code", "label") VALUES (1, \'PENDING\')',
+        'INSERT INTO "order_status_LKP" ("code", "label") VALUES (2, \'PENDING_VALIDATION\')',
+        'INSERT INTO "order_status_LKP" ("code", "label") VALUES (3, \'DONE\')',
+        'COMMIT',
+    ]
+    assert [(c['object'], c['sql'].split(" AS")[0]) for c in changes if c['phase'] == 'create_view'] == [
+        ("order_V", 'CREATE OR REPLACE VIEW "order_V"'),
+    ]
+
+
+def test_existing_decoding_view_is_kept_until_columns_change(catalog):
+    configure_enum_encoding(["order"])
+    apply_enum_encoding(catalog)
+    del catalog.tables["account"]
+    columns = [_column("id", "NUMBER", nullable=False, precision=19, scale=0),
+               _column("accountId", "NUMBER", nullable=False, precision=10, scale=0),
+               _column("status", "NUMBER", nullable=False, precision=3, scale=0),
+               _column("created", "TIMESTAMP(6)", nullable=False)]
+    lookup = {"name": "order_status_LKP", "columns": {}, "constraints": {}, "indexes": {}}
+    checks = {"order_pkey": {"name": "order_pkey", "type": "P", "columns": ["id"], "generated": False},
+              "order_account_fkey": {"name": "order_account_fkey", "type": "R", "columns": ["accountId"],
+                                     "generated": False},
+              "chk_order_status": {"name": "chk_order_status", "type": "C", "columns": ["status"],
+                                   "generated": False}}
+
+    unchanged = diff_schema(catalog, {"tables": {"order": _order_table(*columns, constraints=checks),
+                                                 "order_status_LKP": lookup}, "views": ["order_V"]})
+    added = diff_schema(catalog, {"tables": {"order": _order_table(*columns[:3], constraints=checks),
+                                             "order_status_LKP": lookup}, "views": ["order_V"]})
+
+    assert unchanged == []
+    assert [c['phase'] for c in added] == ['add_column', 'create_view']
@@ -0,0 +1,66 @@
+from sql_script_executor import iter_statements, classify_statement
+
+
+def _statements(script):
+    return list(iter_statements(script.splitlines(keepends=True), source="test.sql"))
+
+
+def test_splits_on_semicolons_outside_strings_and_comments():
+    statements = _statements(
+        "-- création ; commentaire\n"
+        "CREATE TABLE \"order\" (id NUMBER, note VARCHAR2(20) DEFAULT 'a;b');\n"
+        "/* bloc ; commentaire */\n"
+        "INSERT INTO t VALUES ('x'';y');\n"
+    )
+
+    assert [s.kind for s in statements] == ['table', 'dml']
+    assert statements[0].object_name == "order"
+    assert statements[0].text.endswith("DEFAULT 'a;b')")
+    assert statements[1].text == "INSERT INTO t VALUES ('x'';y')"
+    assert statements[1].tables == ("T",)
+    assert [s.line for s in statements] == [2, 4]
+    assert [s.index for s in statements] == [1, 2]
+
+
+def test_plsql_block_runs_until_slash():
+    statements = _statements(
+        "CREATE OR REPLACE TRIGGER trg BEFORE INSERT ON t FOR EACH ROW\n"
+        "BEGIN\n"
+        "  :NEW.id := 1;\n"
+        "END;\n"
+        "/\n"
+        "DROP TABLE t;\n"
+    )
+
+    assert len(statements) == 2
+    assert statements[0].is_plsql
+    assert statements[0].text.endswith("END;")
+    assert statements[0].is_barrier
+    assert statements[1].kind == 'drop'
+
+
+def test_sqlplus_directives_are_separate_statements():
+    statements = _statements("SET DEFINE OFF;\n@other.sql\nCREATE SEQUENCE s;\n")
+
+    assert [(s.kind, s.object_name) for s in statements] == [
+        ('directive', 'SET'), ('directive', '@'), ('sequence', 'S'),
+    ]
+
+
+def test_multiline_comment_and_trailing_statement_without_semicolon():
+    statements = _statements("/* début\n fin */ CREATE INDEX ix ON t (a)\n")
+
+    assert len(statements) == 1
+    assert statements[0].kind == 'index'
+    assert statements[0].object_name == 'IX'
+    assert statements[0].tables == ('T',)
+
+
+def test_classify_foreign_key_touches_both_tables():
+    kind, name, tables = classify_statement(
+        'ALTER TABLE "order" ADD CONSTRAINT fk FOREIGN KEY (A) REFERENCES ACCOUNT (ID)'
+    )
+
+    assert kind == 'constraint'
+    assert name == 'order'
+    assert tables == ('order', 'ACCOUNT')
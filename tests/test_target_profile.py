@@ -0,0 +1,55 @@
+import pytest
+
+import target_profile
+from catalog_model import build_catalog
+from generate_ddl_v2 import render_table
+from target_profile import set_target, boolean_type, json_type, boolean_literal
+from type_mapping import clean_default_value, convert_column_type, convert_type
+
+
+PROFILES = [
+    # (version, booléen, JSON, littéral TRUE)
+    ('12c', 'NUMBER(1)', 'CLOB', '1'),
+    ('19c', 'NUMBER(1)', 'CLOB', '1'),
+    ('21c', 'NUMBER(1)', 'JSON', '1'),
+    ('23ai', 'BOOLEAN', 'JSON', 'TRUE'),
+]
+
+
+@pytest.mark.parametrize("version, boolean, json, true_literal", PROFILES)
+def test_profile_types(version, boolean, json, true_literal):
+    set_target(version)
+
+    assert boolean_type() == boolean
+    assert json_type() == json
+    assert boolean_literal(True) == true_literal
+    assert boolean_literal(False) == ('FALSE' if true_literal == 'TRUE' else '0')
+
+
+@pytest.mark.parametrize("version, boolean, json, true_literal", PROFILES)
+def test_type_mapping_follows_profile(version, boolean, json, true_literal):
+    set_target(version)
+
+    assert convert_type('boolean') == boolean
+    assert convert_column_type('boolean') == boolean
+    assert convert_type('jsonb') == json
+    assert convert_column_type('json') == json
+    assert clean_default_value('true') == true_literal
+    assert clean_default_value("'PENDING'::order_status") == "'PENDING'"
+
+
+@pytest.mark.parametrize("version, boolean, json, true_literal", PROFILES)
+def test_catalog_and_ddl_follow_profile(raw_catalog, version, boolean, json, true_literal):
+    set_target(version)
+    account = build_catalog(raw_catalog).tables["account"]
+
+    assert account.column("active").oracle_type == boolean
+    assert account.column("meta").oracle_type == json
+    # Contrôle IS JSON seulement quand le JSON est stocké en CLOB
+    assert ('IS JSON' in render_table(account)) == (json == 'CLOB')
+
+
+def test_unknown_target_is_rejected():
+    with pytest.raises(ValueError, match="version cible inconnue"):
+        set_target('11g')
+    assert target_profile.TARGET == '19c'
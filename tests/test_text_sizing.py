@@ -0,0 +1,79 @@
+import pytest
+
+import migrate_data_complete
+import migrate_data_final
+import text_sizing
+from text_sizing import choose_text_type, is_sizing_candidate, _measure_table
+
+
+def test_short_values_get_a_varchar2_with_headroom():
+    # 120 octets x 1.5 = 180, arrondi au multiple de 50 supérieur
+    assert choose_text_type(120)[0] == "VARCHAR2(200)"
+    assert choose_text_type(0)[0] == "VARCHAR2(50)"
+
+
+def test_headroom_is_capped_at_the_varchar2_limit():
+    assert choose_text_type(3500)[0] == "VARCHAR2(4000)"
+    assert choose_text_type(4001)[0] == "CLOB"
+    assert choose_text_type(4001, limit=32767)[0] == "VARCHAR2(6050)"
+
+
+def test_no_value_keeps_the_default_type():
+    assert choose_text_type(None) == (None, "aucune valeur non NULL")
+
+
+def test_extended_strings_raise_the_limit(monkeypatch):
+    monkeypatch.setattr(text_sizing, 'EXTENDED_STRINGS', True)
+
+    assert choose_text_type(10_000)[0] == "VARCHAR2(15000)"
+
+
+def test_sizing_candidates(catalog):
+    account = catalog.tables["account"]
+
+    assert is_sizing_candidate(account.column("bio"))
+    assert is_sizing_candidate(account.column("meta"))
+    # varchar(120) : longueur déclarée conservée ; ENUM et numeric hors périmètre
+    assert not is_sizing_candidate(account.column("email"))
+    assert not is_sizing_candidate(account.column("role"))
+    assert not is_sizing_candidate(account.column("amount"))
+
+
+def test_native_json_is_not_sized(catalog):
+    meta = catalog.tables["account"].column("meta")
+    meta.oracle_type = 'JSON'
+
+    assert not is_sizing_candidate(meta)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+
+    def fetchone(self):
+        return (10, 20)
+
+
+def test_json_is_measured_in_its_loaded_form(catalog):
+    account = catalog.tables["account"]
+    cursor = FakeCursor()
+
+    maxima = _measure_table(cursor, "public", account, [account.column("bio"), account.column("meta")])
+
+    assert maxima == {"bio": 10, "meta": 20}
+    query = repr(cursor.queries[0])
+    assert "SQL('::jsonb::text')" in query
+    assert query.count("SQL('::text')") == 1
+
+
+@pytest.mark.parametrize("convert, extra", [
+    (migrate_data_complete.convert_value_for_oracle, ()),
+    (migrate_data_final.convert_value_for_oracle, (False,)),
+])
+def test_loaders_write_json_as_utf8(convert, extra):
+    column = {'pg_type': 'jsonb', 'pg_udt': 'jsonb', 'oracle_type': 'CLOB'}
+
+    assert convert({"ville": "Orléans"}, column, *extra) == '{"ville": "Orléans"}'
@@ -0,0 +1,44 @@
+import uuid
+
+import pytest
+
+from uuid_storage import apply_uuid_storage, uuid_to_raw, uuid_text_expression, estimate_uuid_savings
+
+
+VALUE = "6f1c2a4e-8b3d-4c5e-9f70-112233445566"
+
+
+def test_uuid_to_raw_from_text_and_uuid():
+    raw = uuid_to_raw(VALUE)
+
+    assert len(raw) == 16
+    assert raw == uuid.UUID(VALUE).bytes
+    assert uuid_to_raw(uuid.UUID(VALUE)) == raw
+    assert uuid_to_raw(VALUE.upper()) == raw
+    # Aller-retour : même valeur que la forme texte de la vue <table>_V
+    assert str(uuid.UUID(bytes=raw)) == VALUE
+
+
+def test_uuid_to_raw_rejects_invalid_text():
+    with pytest.raises(ValueError):
+        uuid_to_raw("not-a-uuid")
+
+
+def test_apply_raw_storage_converts_uuid_columns(catalog):
+    catalog.tables["account"].statistics["rows"] = 1000
+    converted = apply_uuid_storage(catalog, 'raw')
+
+    assert [(t.name, c.name, c.oracle_type) for t, c in converted] == [("account", "accountId", "RAW(16)")]
+    assert estimate_uuid_savings(catalog, converted) == [
+        {'table': "account", 'column': "accountId", 'rows': 1000, 'indexes': 0, 'saved_bytes': 20_000},
+    ]
+
+
+def test_text_storage_keeps_types(catalog):
+    assert apply_uuid_storage(catalog, 'text') == []
+    with pytest.raises(ValueError):
+        apply_uuid_storage(catalog, 'binary')
+
+
+def test_uuid_text_expression():
+    assert uuid_text_expression('"accountId"').startswith('LOWER(REGEXP_REPLACE(RAWTOHEX("accountId"), ')
@@ -0,0 +1,205 @@
+"""
+Module text_sizing.py
+---------------------
+Dimensionnement des colonnes texte et JSON d'après les données.
+
+convert_type convertit chaque colonne text / json / jsonb en CLOB et les
+varchar sans longueur en VARCHAR2(4000). Un CLOB est bien plus lent qu'un
+VARCHAR2 à l'insertion, à la lecture et à l'indexation : pour chaque
+colonne candidate, la longueur maximale en octets est mesurée et le type
+est remplacé par VARCHAR2(n) quand les données tiennent avec une marge
+(TEXT_HEADROOM), jusqu'à 4000 octets, ou 32767 avec MAX_STRING_SIZE =
+EXTENDED (EXTENDED_STRINGS). Le CLOB n'est conservé que si nécessaire.
+
+Le dimensionnement est optionnel (--size-text de generate_migration.py et
+schema_diff.py) : sans l'option, les types par défaut sont conservés.
+
+- pg_stats.avg_width sert de préfiltre : une colonne dont la largeur
+  moyenne dépasse déjà la limite reste en CLOB sans parcours ;
+- les autres colonnes d'une table sont mesurées en un seul parcours
+  (max(octet_length(...)) de toutes les colonnes candidates) ;
+- les colonnes json / jsonb sont mesurées sous la forme écrite par le
+  chargement (json.dumps(..., ensure_ascii=False) : texte jsonb normalisé,
+  caractères non ASCII en UTF-8 et non en échappements \\uXXXX de 6 octets).
+"""
+
+import math
+
+import psycopg2
+from psycopg2 import sql
+
+from catalog_statistics import get_column_statistics
+
+
+# Base Oracle en MAX_STRING_SIZE = EXTENDED (VARCHAR2 jusqu'à 32767 octets)
+EXTENDED_STRINGS = False
+VARCHAR2_MAX_BYTES = 4000
+VARCHAR2_MAX_EXTENDED_BYTES = 32767
+# Marge appliquée à la longueur maximale observée
+TEXT_HEADROOM = 1.5
+# Les tailles sont arrondies au multiple supérieur
+SIZE_GRANULE = 50
+
+# Types PostgreSQL candidats (texte sans limite, JSON)
+SIZED_TYPES = ('text', 'json', 'jsonb', 'character varying')
+
+
+def varchar2_limit():
+    """Taille maximale d'un VARCHAR2 (octets) selon MAX_STRING_SIZE."""
+    return VARCHAR2_MAX_EXTENDED_BYTES if EXTENDED_STRINGS else VARCHAR2_MAX_BYTES
+
+
+def is_sizing_candidate(column):
+    """Vrai si le type Oracle de la colonne vient d'une conversion sans longueur."""
+    # Type JSON natif (cible 21c+) : conservé, il n'a pas le coût d'un CLOB
+    if column.is_enum or column.data_type not in SIZED_TYPES or column.oracle_type == 'JSON':
+        return False
+    if column.data_type == 'character varying':
+        return column.length is None
+    return True
+
+
+def choose_text_type(max_bytes, limit=None):
+    """
+    Type Oracle d'une colonne texte à partir de sa longueur maximale observée.
+
+    :param max_bytes: longueur maximale en octets (None si aucune valeur)
+    :param limit: taille maximale d'un VARCHAR2 (défaut : varchar2_limit())
+    :return: tuple (type Oracle ou None pour conserver le type, raison)
+    """
+    limit = limit or varchar2_limit()
+    if max_bytes is None:
+        return None, "aucune valeur non NULL"
+    if max_bytes > limit:
+        return 'CLOB', f"maximum {max_bytes:,} octets > {limit:,}"
+    size = math.ceil(max(max_bytes, 1) * TEXT_HEADROOM / SIZE_GRANULE) * SIZE_GRANULE
+    if size > limit:
+        return f"VARCHAR2({limit})", f"maximum {max_bytes:,} octets (marge réduite à la limite VARCHAR2)"
+    return f"VARCHAR2({size})", f"maximum {max_bytes:,} octets (+{TEXT_HEADROOM - 1:.0%} de marge)"
+
+
+def _measured_text(column):
+    """Expression SQL du texte chargé dans Oracle pour une colonne candidate."""
+    if column.data_type in ('json', 'jsonb'):
+        # Même sérialisation que json.dumps (séparateurs ', ' et ': ') après décodage
+        return sql.SQL("{}::jsonb::text").format(sql.Identifier(column.name))
+    return sql.SQL("{}::text").format(sql.Identifier(column.name))
+
+
+def _measure_table(cursor, schema_name, table, columns):
+    """Longueur maximale en octets de chaque colonne, en un seul parcours : {colonne: octets}."""
+    query = sql.SQL("SELECT {maxima} FROM {table}").format(
+        maxima=sql.SQL(', ').join(
+            sql.SQL("max(octet_length({}))").format(_measured_text(column))
+            for column in columns
+        ),
+        table=sql.Identifier(schema_name, table.name),
+    )
+    cursor.execute(query)
+    return dict(zip((column.name for column in columns), cursor.fetchone()))
+
+
+def analyze_text_columns(cursor, catalog, schema_name='public'):
+    """
+    Mesure les colonnes candidates et choisit leur type Oracle.
+
+    :param cursor: curseur psycopg2
+    :param catalog: Catalog
+    :param schema_name: schéma PostgreSQL
+    :return: liste de dictionnaires {table, column, pg_type, current, oracle_type,
+             avg_width, max_bytes, reason}
+    """
+    statistics = get_column_statistics(cursor, schema_name)
+    limit = varchar2_limit()
+    decisions = []
+
+    for table in catalog.tables.values():
+        measured = []
+        for column in table.columns:
+            if not is_sizing_candidate(column):
+                continue
+            avg_width = (statistics.columns.get((table.name, column.name)) or {}).get('avg_width')
+            decision = {
+                'table': table.name,
+                'column': column.name,
+                'pg_type': column.data_type,
+                'current': column.oracle_type,
+                'oracle_type': None,
+                'avg_width': avg_width,
+                'max_bytes': None,
+                'reason': None,
+            }
+            decisions.append(decision)
+            # Préfiltre : largeur moyenne déjà au-delà de la limite
+            if avg_width is not None and avg_width > limit:
+                decision['oracle_type'] = 'CLOB'
+                decision['reason'] = f"largeur moyenne {avg_width:,} octets (pg_stats)"
+            else:
+                measured.append((column, decision))
+
+        if not measured:
+            continue
+        try:
+            maxima = _measure_table(cursor, schema_name, table, [column for column, _ in measured])
+        except psycopg2.Error as e:
+            if not cursor.connection.autocommit:
+                cursor.connection.rollback()
+            for _, decision in measured:
+                decision['reason'] = f"mesure impossible : {str(e).strip()[:60]}"
+            continue
+        for column, decision in measured:
+            decision['max_bytes'] = maxima.get(column.name)
+            decision['oracle_type'], decision['reason'] = choose_text_type(decision['max_bytes'], limit)
+
+    return decisions
+
+
+def apply_text_sizing(catalog, decisions):
+    """Remplace le type Oracle des colonnes dimensionnées ; retourne le nombre de colonnes modifiées."""
+    changed = 0
+    for decision in decisions:
+        if decision['oracle_type'] is None or decision['oracle_type'] == decision['current']:
+            continue
+        column = catalog.tables[decision['table']].column(decision['column'])
+        column.oracle_type = decision['oracle_type']
+        changed += 1
+    return changed
+
+
+def size_text_columns(connection_params, catalog, schema_name='public', verbose=True):
+    """
+    Dimensionne les colonnes texte / JSON du catalogue d'après les données PostgreSQL.
+
+    :param connection_params: paramètres de connexion PostgreSQL
+    :param catalog: Catalog (types Oracle modifiés en place)
+    :param schema_name: schéma PostgreSQL
+    :param verbose: afficher le rapport des décisions
+    :return: liste des décisions (voir analyze_text_columns)
+    """
+    conn = psycopg2.connect(**connection_params)
+    try:
+        with conn.cursor() as cursor:
+            decisions = analyze_text_columns(cursor, catalog, schema_name)
+    finally:
+        conn.close()
+    apply_text_sizing(catalog, decisions)
+    if verbose:
+        print_text_sizing_report(decisions)
+    return decisions
+
+
+def print_text_sizing_report(decisions):
+    """Affiche le type retenu pour chaque colonne texte / JSON."""
+    if not decisions:
+        return
+    varchar = [d for d in decisions if d['oracle_type'] and d['oracle_type'].startswith('VARCHAR2')]
+    clob = [d for d in decisions if d['oracle_type'] == 'CLOB']
+    kept = [d for d in decisions if d['oracle_type'] is None]
+
+    print(f"📏 Colonnes texte/JSON dimensionnées : {len(varchar)} VARCHAR2, {len(clob)} CLOB, "
+          f"{len(kept)} inchangée(s) (limite VARCHAR2 {varchar2_limit():,} octets)")
+    for decision in varchar + clob + kept:
+        icon = {'CLOB': '⚠'}.get(decision['oracle_type'], '→' if decision['oracle_type'] else 'ℹ️')
+        target = decision['oracle_type'] or decision['current']
+        print(f"   {icon} {decision['table']}.{decision['column']} ({decision['pg_type']}) : "
+              f"{decision['current']} -> {target} : {decision['reason']}")
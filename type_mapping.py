@@ -13,6 +13,8 @@ CORRECTIONS APPORTÉES:
 
 import re
 
+from target_profile import boolean_type, json_type, boolean_literal
+
 # Dictionnaire global pour stocker la conversion des ENUM
 enum_conversion = {}
 
@@ -41,10 +43,10 @@ def clean_default_value(default_value):
     
     Corrections:
     - Supprime ::numeric, ::text, ::character varying, etc.
-    - Convertit false/true en 0/1
+    - Convertit false/true en 0/1 (FALSE/TRUE en 23ai, voir target_profile)
     - Supprime les références de type ENUM comme (table.column_enum)
     - Convertit now() en SYSTIMESTAMP
-    - Convertit uuid_generate_v4() en SYS_GUID()
+    - Convertit uuid_generate_v4() / gen_random_uuid() en SYS_GUID()
     """
     if not default_value:
         return None
@@ -59,14 +61,14 @@ def clean_default_value(default_value):
     # Exemple: 'ADMIN'(account.role_enum) → 'ADMIN'
     default_str = re.sub(r'\([a-zA-Z_]+\.[a-zA-Z_]+\)', '', default_str)
     
-    # Convertir les booléens
+    # Convertir les booléens (0/1, ou FALSE/TRUE avec le type BOOLEAN natif)
     if default_str.lower() == 'false':
-        return '0'
+        return boolean_literal(False)
     if default_str.lower() == 'true':
-        return '1'
+        return boolean_literal(True)
     
     # Convertir les fonctions PostgreSQL
-    if 'uuid_generate_v4()' in default_str:
+    if 'uuid_generate_v4()' in default_str or 'gen_random_uuid()' in default_str:
         return 'SYS_GUID()'
     if 'now()' in default_str.lower():
         return 'SYSTIMESTAMP'
@@ -141,7 +143,7 @@ def convert_type(pg_type, length=None, precision=None, scale=None):
     
     # Types booléens
     elif pg_type_lower == 'boolean':
-        return 'NUMBER(1)'
+        return boolean_type()
     
     # UUID
     elif pg_type_lower == 'uuid':
@@ -149,7 +151,7 @@ def convert_type(pg_type, length=None, precision=None, scale=None):
     
     # JSON/JSONB
     elif pg_type_lower in ('json', 'jsonb'):
-        return 'CLOB'
+        return json_type()
     
     # Types XML
     elif pg_type_lower == 'xml':
@@ -171,6 +173,54 @@ def convert_type(pg_type, length=None, precision=None, scale=None):
     else:
         return 'VARCHAR2(4000)'
 
+def convert_column_type(data_type, udt_name=None, length=None, precision=None,
+                        scale=None, default=None, enum_values=None):
+    """
+    Détermine le type Oracle d'une colonne PostgreSQL à partir de ses métadonnées.
+
+    :param data_type: type PostgreSQL (format information_schema)
+    :param udt_name: nom du type sous-jacent (ex: nom du type ENUM)
+    :param length: longueur maximale (types caractères)
+    :param precision: précision numérique
+    :param scale: échelle numérique
+    :param default: valeur DEFAULT PostgreSQL brute
+    :param enum_values: valeurs ENUM si la colonne utilise un type ENUM
+    :return: type Oracle
+    """
+    if enum_values is not None:
+        max_length = max(len(val) for val in enum_values) if enum_values else 255
+        return f"VARCHAR2({max_length})"
+    if default and 'nextval(' in str(default):
+        return convert_type('serial')
+    if data_type in ('numeric', 'decimal') and precision:
+        return f"NUMBER({precision},{scale or 0})"
+    if length and data_type in ('character varying', 'varchar'):
+        return f"VARCHAR2({length})"
+    if data_type == 'uuid':
+        return 'VARCHAR2(36)'
+    if data_type in ('jsonb', 'json'):
+        return json_type()
+    if data_type == 'boolean':
+        return boolean_type()
+    return convert_type(data_type)
+
+def convert_type_in_context(pg_type, context='column'):
+    """
+    Convertit un type PostgreSQL pour un paramètre ou un type de retour PL/SQL.
+    Les paramètres PL/SQL n'acceptent ni taille ni clause IDENTITY.
+
+    :param pg_type: type PostgreSQL (ex: 'character varying', 'numeric(10,2)')
+    :param context: 'column', 'parameter' ou 'return'
+    :return: type Oracle
+    """
+    base_type = re.sub(r'\(.*\)', '', pg_type).strip()
+    oracle_type = convert_type(base_type)
+    if context == 'column':
+        return oracle_type
+
+    oracle_type = oracle_type.replace(' GENERATED BY DEFAULT AS IDENTITY', '')
+    return re.sub(r'\(.*\)', '', oracle_type).strip()
+
 def get_oracle_reserved_words():
     """
     Retourne la liste des mots réservés Oracle qui nécessitent des guillemets.
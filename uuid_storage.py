@@ -0,0 +1,117 @@
+"""
+Module uuid_storage.py
+----------------------
+Stockage compact des colonnes UUID en RAW(16).
+
+Par défaut un uuid devient VARCHAR2(36) : 37 octets par valeur (longueur
+comprise) au lieu de 17 en RAW(16), dans la table comme dans chaque PK, FK
+et index qui le contient. Le mode 'raw' (generate_migration.py --uuid-raw) :
+- type les colonnes uuid en RAW(16) ; le DEFAULT SYS_GUID() (converti de
+  uuid_generate_v4() / gen_random_uuid()) produit directement un RAW(16) ;
+- convertit les valeurs au chargement (uuid_to_raw : 16 octets binaires) ;
+- génère pour chaque table concernée une vue "<table>_V" exposant la forme
+  texte canonique (8-4-4-4-12, minuscules) sous le nom de la colonne.
+"""
+
+import uuid
+
+
+UUID_STORAGE_MODES = ('text', 'raw')
+# Mode actif : 'text' (VARCHAR2(36)) ou 'raw' (RAW(16))
+UUID_STORAGE = 'text'
+
+UUID_RAW_TYPE = 'RAW(16)'
+# Octets stockés par valeur, octet de longueur compris
+UUID_TEXT_BYTES = 37
+UUID_RAW_BYTES = 17
+
+# Forme texte canonique d'un RAW(16)
+UUID_TEXT_EXPRESSION = (
+    "LOWER(REGEXP_REPLACE(RAWTOHEX({column}), "
+    "'^(.{{8}})(.{{4}})(.{{4}})(.{{4}})(.{{12}})$', '\\1-\\2-\\3-\\4-\\5'))"
+)
+
+
+def is_uuid_column(column):
+    return column.data_type == 'uuid' or column.udt_name == 'uuid'
+
+
+def apply_uuid_storage(catalog, mode=None):
+    """
+    Applique le mode de stockage aux colonnes uuid du catalogue.
+
+    :param catalog: Catalog (types Oracle modifiés en place)
+    :param mode: 'text' ou 'raw' (défaut : UUID_STORAGE)
+    :return: liste des (table, colonne) converties en RAW(16)
+    """
+    mode = mode or UUID_STORAGE
+    if mode not in UUID_STORAGE_MODES:
+        raise ValueError(f"mode de stockage UUID inconnu : {mode!r}")
+    if mode != 'raw':
+        return []
+
+    converted = []
+    for table, column in catalog.iter_columns():
+        if is_uuid_column(column):
+            column.oracle_type = UUID_RAW_TYPE
+            converted.append((table, column))
+    return converted
+
+
+def uuid_to_raw(value):
+    """Valeur uuid PostgreSQL (str ou uuid.UUID) -> 16 octets pour une colonne RAW(16)."""
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    return bytes.fromhex(value.replace('-', ''))
+
+
+def uuid_text_expression(column_sql):
+    """Expression SQL Oracle de la forme texte canonique d'une colonne RAW(16)."""
+    return UUID_TEXT_EXPRESSION.format(column=column_sql)
+
+
+def raw_uuid_columns(table):
+    """Colonnes uuid stockées en RAW(16) d'une table."""
+    return [column for column in table.columns if is_uuid_column(column) and column.oracle_type == UUID_RAW_TYPE]
+
+
+def estimate_uuid_savings(catalog, converted):
+    """
+    Stockage économisé par colonne convertie : valeurs de la table et entrées
+    des index (PK, UNIQUE, index autonomes) qui contiennent la colonne.
+
+    :param catalog: Catalog
+    :param converted: liste (table, colonne) de apply_uuid_storage
+    :return: liste de dictionnaires {table, column, rows, indexes, saved_bytes} (rows None si inconnu)
+    """
+    per_value = UUID_TEXT_BYTES - UUID_RAW_BYTES
+    savings = []
+    for table, column in converted:
+        key_sets = [c.columns for c in ([table.primary_key] if table.primary_key else []) + table.unique]
+        key_sets += [index.columns for index in table.indexes if not index.constraint and not index.primary]
+        key_sets += [fk.columns for fk in table.foreign_keys]
+        indexes = len({tuple(columns) for columns in key_sets if column.name in columns})
+        rows = table.statistics.get('rows')
+        savings.append({
+            'table': table.name,
+            'column': column.name,
+            'rows': rows,
+            'indexes': indexes,
+            'saved_bytes': rows * per_value * (1 + indexes) if rows is not None else None,
+        })
+    return savings
+
+
+def print_uuid_storage_report(catalog, converted):
+    """Affiche les colonnes converties en RAW(16) et le stockage économisé."""
+    if not converted:
+        return
+    savings = estimate_uuid_savings(catalog, converted)
+    print(f"🔑 Colonnes UUID en RAW(16) : {len(converted)} "
+          f"({UUID_TEXT_BYTES - UUID_RAW_BYTES} octets économisés par valeur et par entrée d'index)")
+    for saving in savings:
+        detail = (f"{saving['saved_bytes'] / 1024 / 1024:,.1f} Mo" if saving['saved_bytes'] is not None
+                  else "nombre de lignes inconnu")
+        print(f"   → {saving['table']}.{saving['column']} : {saving['indexes']} index/clé(s), {detail}")
+    total = sum(saving['saved_bytes'] or 0 for saving in savings)
+    print(f"   💾 Stockage économisé estimé : {total / 1024 / 1024:,.1f} Mo")